@@ -67,6 +67,13 @@ from src.middleware.input_sanitization import (
     CSRFProtectionMiddleware,
 )
 from src.middleware.edge_cache import EdgeCacheMiddleware
+from src.middleware.query_profiling import QueryProfilingMiddleware
+from src.middleware.read_consistency import (
+    CONSISTENCY_HEADER,
+    ReadConsistencyMiddleware,
+)
+from src.services.query_monitoring import query_monitor
+from src.services.read_replicas import get_replica_manager
 from src.utils.logging import setup_logging
 from src.api.monitoring import setup_monitoring
 
@@ -85,14 +92,24 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
 
     # Initialize database
+    monitored_engine = None
     try:
-        from src.core.database import init_db
+        from src.core.database import init_db, sync_engine
 
         init_db()
         logger.info("Database initialized")
+
+        # Per-request statement counts and N+1 detection
+        query_monitor.start_monitoring(sync_engine)
+        monitored_engine = sync_engine
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
 
+    # Track replica replay positions for read-your-writes routing
+    replica_manager = get_replica_manager()
+    if replica_manager is not None:
+        replica_manager.start_lag_monitor()
+
     # Initialize Redis if configured
     if settings.redis_url:
         try:
@@ -108,6 +125,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Shutdown
     logger.info("Shutting down application")
 
+    if replica_manager is not None:
+        replica_manager.stop_lag_monitor()
+
+    if monitored_engine is not None:
+        query_monitor.stop_monitoring(monitored_engine)
+
     # Close Redis connection
     if hasattr(app.state, "redis"):
         await app.state.redis.close()
@@ -147,7 +170,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-API-Version", "X-Request-ID"],
+    expose_headers=["X-API-Version", "X-Request-ID", CONSISTENCY_HEADER],
     max_age=3600,  # 1 hour cache for preflight requests
 )
 
@@ -182,6 +205,12 @@ app.middleware("http")(version_middleware)
 # WebAuthn middleware for biometric endpoints
 app.add_middleware(WebAuthnMiddleware)
 
+# Read-your-writes replica routing (X-Min-LSN consistency token)
+app.add_middleware(ReadConsistencyMiddleware)
+
+# Database statements per request (N+1 detection)
+app.add_middleware(QueryProfilingMiddleware)
+
 # Include routers
 
 # Health check endpoints
@@ -0,0 +1,36 @@
+-- Migration: Add keyed-HMAC blind index companion columns for encrypted PHI
+-- Created: 2026-10-18
+
+-- Equality blind indexes (<column>_bidx) and prefix tokens (<column>_bidx_prefix)
+ALTER TABLE patients_encrypted_example
+    ADD COLUMN IF NOT EXISTS last_name_bidx VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS last_name_bidx_prefix VARCHAR(64)[],
+    ADD COLUMN IF NOT EXISTS email_bidx VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS phone_primary_bidx VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS phone_secondary_bidx VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS ssn_bidx VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS passport_number_bidx VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS national_id_bidx VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS date_of_birth_encrypted_bidx VARCHAR(64);
+
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_last_name_bidx
+    ON patients_encrypted_example (last_name_bidx);
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_last_name_bidx_prefix
+    ON patients_encrypted_example USING gin (last_name_bidx_prefix);
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_email_bidx
+    ON patients_encrypted_example (email_bidx);
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_phone_primary_bidx
+    ON patients_encrypted_example (phone_primary_bidx);
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_phone_secondary_bidx
+    ON patients_encrypted_example (phone_secondary_bidx);
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_ssn_bidx
+    ON patients_encrypted_example (ssn_bidx);
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_passport_number_bidx
+    ON patients_encrypted_example (passport_number_bidx);
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_national_id_bidx
+    ON patients_encrypted_example (national_id_bidx);
+CREATE INDEX IF NOT EXISTS ix_patients_encrypted_example_date_of_birth_encrypted_bidx
+    ON patients_encrypted_example (date_of_birth_encrypted_bidx);
+
+-- Existing rows are indexed with
+-- src.models.encrypted_fields.reindex_blind_indexes(PatientEncrypted, session)
@@ -0,0 +1,49 @@
+-- Migration: Add checkpointed GDPR export jobs
+-- Created: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS gdpr_export_jobs (
+    id UUID PRIMARY KEY,
+    data_subject_id UUID NOT NULL,
+    requester_id UUID NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    categories JSON NOT NULL,
+    -- Per category: keyset cursor, record count, written segments, done flag
+    progress JSON NOT NULL DEFAULT '{}',
+    encrypted_data_key TEXT,
+    archive_path VARCHAR(500),
+    record_count INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id VARCHAR(64),
+    -- Host or shared volume holding the segments; resumes stay on it
+    storage_id VARCHAR(255),
+    lease_expires_at TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    deleted_by UUID
+);
+
+CREATE INDEX IF NOT EXISTS idx_gdpr_export_jobs_subject
+    ON gdpr_export_jobs (data_subject_id);
+
+-- Pending, failed and abandoned exports in GDPRStreamingExporter.resume_exports()
+CREATE INDEX IF NOT EXISTS idx_gdpr_export_status_lease
+    ON gdpr_export_jobs (status, lease_expires_at);
+
+-- Keyset pages in GDPRStreamingExporter._page() read each category by
+-- subject in (created_at, id) order
+CREATE INDEX IF NOT EXISTS idx_health_records_patient_keyset
+    ON health_records (patient_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_file_attachments_patient_keyset
+    ON file_attachments (patient_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_documents_patient_keyset
+    ON documents (patient_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_translations_patient_keyset
+    ON translations (patient_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_access_logs_patient_keyset
+    ON access_logs (patient_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_patient_keyset
+    ON audit_logs (patient_id, created_at, id);
@@ -0,0 +1,79 @@
+-- Migration: Add durable mass-notification campaigns
+-- Created: 2026-10-18
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'notificationpriority') THEN
+        CREATE TYPE notificationpriority AS ENUM ('LOW', 'NORMAL', 'HIGH', 'URGENT');
+    END IF;
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_type WHERE typname = 'notificationcampaignstatus'
+    ) THEN
+        CREATE TYPE notificationcampaignstatus AS ENUM (
+            'PENDING', 'RUNNING', 'COMPLETED', 'CANCELLED'
+        );
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS notification_campaigns (
+    id UUID PRIMARY KEY,
+    notification_type VARCHAR(50) NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    priority notificationpriority NOT NULL DEFAULT 'NORMAL',
+    channels JSON NOT NULL,
+    data JSON,
+    status notificationcampaignstatus NOT NULL DEFAULT 'PENDING',
+    total_recipients INTEGER NOT NULL DEFAULT 0,
+    created_by UUID,
+    worker_id VARCHAR(64),
+    lease_expires_at TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    deleted_by UUID
+);
+
+-- Pending and abandoned campaigns in NotificationFanout.resume_campaigns()
+CREATE INDEX IF NOT EXISTS idx_campaign_status_lease
+    ON notification_campaigns (status, lease_expires_at);
+
+CREATE TABLE IF NOT EXISTS notification_campaign_recipients (
+    id UUID PRIMARY KEY,
+    campaign_id UUID NOT NULL REFERENCES notification_campaigns(id),
+    position INTEGER NOT NULL,
+    user_id UUID NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    deleted_by UUID
+);
+
+-- Window reads from a channel cursor in NotificationFanout._run_channel()
+CREATE UNIQUE INDEX IF NOT EXISTS idx_campaign_recipient_position
+    ON notification_campaign_recipients (campaign_id, position);
+
+CREATE TABLE IF NOT EXISTS notification_campaign_progress (
+    id UUID PRIMARY KEY,
+    campaign_id UUID NOT NULL REFERENCES notification_campaigns(id),
+    channel VARCHAR(20) NOT NULL,
+    cursor INTEGER NOT NULL DEFAULT 0,
+    sent_count INTEGER NOT NULL DEFAULT 0,
+    failed_count INTEGER NOT NULL DEFAULT 0,
+    skipped_count INTEGER NOT NULL DEFAULT 0,
+    completed_at TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMP WITH TIME ZONE,
+    deleted_by UUID
+);
+
+-- Per-channel checkpoint updates in NotificationFanout._checkpoint()
+CREATE UNIQUE INDEX IF NOT EXISTS idx_campaign_progress_channel
+    ON notification_campaign_progress (campaign_id, channel);
+
+-- Channels each user chose, read per window in NotificationFanout._load_contacts()
+ALTER TABLE user_auth
+    ADD COLUMN IF NOT EXISTS notification_preferences TEXT;
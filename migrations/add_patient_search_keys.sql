@@ -0,0 +1,32 @@
+-- Migration: Add patient search key index for registration desk lookups
+-- Created: 2026-10-18
+
+-- Normalized and phonetic lookup keys (names, UNHCR numbers, E.164 phones, email)
+CREATE TABLE IF NOT EXISTS patient_search_keys (
+    patient_id UUID NOT NULL REFERENCES patients(id) ON DELETE CASCADE,
+    key_type VARCHAR(20) NOT NULL,
+    key_value VARCHAR(255) NOT NULL,
+    PRIMARY KEY (patient_id, key_type, key_value)
+);
+
+-- Equality and prefix (LIKE 'abc%') lookups by key
+CREATE INDEX IF NOT EXISTS idx_patient_search_key_lookup
+    ON patient_search_keys (key_type, key_value text_pattern_ops, patient_id);
+
+-- Keyset pagination order used by patient search
+CREATE INDEX IF NOT EXISTS idx_patient_search_order
+    ON patients (family_name, given_name, id)
+    WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_patient_created_keyset
+    ON patients (created_at, id)
+    WHERE deleted_at IS NULL;
+
+-- Substring camp filters (ILIKE '%camp%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_patient_camp_trgm
+    ON patients USING gin (current_camp gin_trgm_ops);
+
+-- Existing rows are indexed with
+-- src.models.patient_search_key.rebuild_patient_search_keys(session)
@@ -0,0 +1,51 @@
+-- Migration: Add normalized health record access grants
+-- Created: 2026-10-18
+
+-- One row per viewer authorized on a record (replaces scanning the
+-- health_records.authorized_viewers JSONB list)
+CREATE TABLE IF NOT EXISTS record_access_grants (
+    id UUID PRIMARY KEY,
+    viewer_id VARCHAR(100) NOT NULL,
+    record_id UUID NOT NULL REFERENCES health_records(id) ON DELETE CASCADE,
+    patient_id UUID NOT NULL REFERENCES patients(id) ON DELETE CASCADE,
+    granted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Correlated EXISTS probe used by HealthRecord.access_predicate()
+CREATE INDEX IF NOT EXISTS idx_record_access_grant_lookup
+    ON record_access_grants (viewer_id, record_id, expires_at);
+
+CREATE INDEX IF NOT EXISTS idx_record_access_grant_patient
+    ON record_access_grants (viewer_id, patient_id);
+
+CREATE INDEX IF NOT EXISTS idx_record_access_grant_record
+    ON record_access_grants (record_id);
+
+-- Copy existing authorized_viewers entries; HealthRecord.check_access()
+-- only reads grant rows. Timestamps in the JSON list are naive UTC.
+INSERT INTO record_access_grants
+    (id, viewer_id, record_id, patient_id, granted_at, expires_at)
+SELECT
+    gen_random_uuid(),
+    viewer->>'viewer_id',
+    hr.id,
+    hr.patient_id,
+    COALESCE(
+        (NULLIF(viewer->>'authorized_at', '')::timestamp AT TIME ZONE 'UTC'),
+        CURRENT_TIMESTAMP
+    ),
+    NULLIF(viewer->>'expires_at', '')::timestamp AT TIME ZONE 'UTC'
+FROM health_records hr
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE jsonb_typeof(hr.authorized_viewers)
+        WHEN 'array' THEN hr.authorized_viewers
+        ELSE '[]'::jsonb
+    END
+) AS viewer
+WHERE jsonb_typeof(viewer) = 'object'
+  AND COALESCE(viewer->>'viewer_id', '') <> ''
+  AND NOT EXISTS (
+      SELECT 1 FROM record_access_grants g
+      WHERE g.record_id = hr.id AND g.viewer_id = viewer->>'viewer_id'
+  );
@@ -0,0 +1,16 @@
+-- Migration: Add the shard directory of rebalanced shard keys
+-- Created: 2026-10-18
+
+-- Apply to the shard directory database (DatabaseShardManager.configure_directory),
+-- not to the shards. One row per shard key moved off its computed shard;
+-- every router resolves these before hashing the key.
+CREATE TABLE IF NOT EXISTS shard_key_overrides (
+    table_name VARCHAR(100) NOT NULL,
+    shard_key VARCHAR(255) NOT NULL,
+    shard_id VARCHAR(100) NOT NULL,
+    moved_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (table_name, shard_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_shard_key_overrides_shard
+    ON shard_key_overrides (shard_id);
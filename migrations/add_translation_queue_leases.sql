@@ -0,0 +1,29 @@
+-- Migration: Add lease-based claiming to the translation queue
+-- Created: 2026-10-18
+
+-- Dequeue order stored per entry (1 = critical ... 4 = low) so claims can
+-- read pending work in index order instead of sorting a CASE expression
+ALTER TABLE translation_queue
+    ADD COLUMN IF NOT EXISTS priority_rank INTEGER NOT NULL DEFAULT 3;
+
+-- Claimed entries return to the queue when the lease is not renewed
+ALTER TABLE translation_queue
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+
+UPDATE translation_queue
+SET priority_rank = CASE priority
+    WHEN 'critical' THEN 1
+    WHEN 'high' THEN 2
+    WHEN 'normal' THEN 3
+    WHEN 'low' THEN 4
+    ELSE 3
+END;
+
+-- Priority-aware dequeue: SELECT ... FOR UPDATE SKIP LOCKED in
+-- TranslationQueueService.claim_translations()
+CREATE INDEX IF NOT EXISTS idx_queue_dequeue
+    ON translation_queue (status, priority_rank, created_at);
+
+-- Expired lease sweep in TranslationQueueService.requeue_expired_leases()
+CREATE INDEX IF NOT EXISTS idx_queue_lease_expiry
+    ON translation_queue (status, lease_expires_at);
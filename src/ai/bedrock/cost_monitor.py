@@ -1,16 +1,20 @@
 """Cost monitoring and alerting for Bedrock usage.
 
 This module tracks Bedrock costs in real-time and provides
-alerts when spending approaches configured thresholds.
+alerts when spending approaches configured thresholds. Usage metrics are
+aggregated in process and published to CloudWatch in batches, and
+thresholds are evaluated against the aggregated totals at each flush.
 """
 
+import threading
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 
+from src.ai.bedrock.usage_metrics import UsageAggregator
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -47,14 +51,49 @@ class BedrockCostMonitor:
         },
     }
 
-    def __init__(self) -> None:
-        """Initialize cost monitor."""
+    # Cumulative per-user cost alert thresholds
+    COST_THRESHOLDS = {
+        "warning": Decimal("50"),
+        "alert": Decimal("100"),
+        "critical": Decimal("200"),
+    }
+
+    def __init__(
+        self,
+        metrics_sink: Optional[Any] = None,
+        flush_interval: float = 60.0,
+        max_pending_series: int = 500,
+    ) -> None:
+        """Initialize cost monitor.
+
+        Args:
+            metrics_sink: Destination for metrics (defaults to CloudWatch;
+                pass a LocalMetricSink in tests)
+            flush_interval: Seconds between metric flushes
+            max_pending_series: Pending metric series that force a flush
+        """
         self.ce_client = boto3.client("ce")  # Cost Explorer
         self.cloudwatch = boto3.client("cloudwatch")
         self.budgets = boto3.client("budgets")
+        self.metrics_sink = metrics_sink or self.cloudwatch
         self.usage_data: Dict[str, Dict] = {}
+        self.cache_savings: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        # Users with usage since the last threshold check, and the alert
+        # levels each user has already been alerted for
+        self._pending_users: Set[str] = set()
+        self._alerted_levels: Dict[str, Set[str]] = {}
         self._load_budgets()
 
+        self.metrics = UsageAggregator(
+            self.metrics_sink,
+            namespace="HavenHealth/Bedrock",
+            flush_interval=flush_interval,
+            max_series=max_pending_series,
+            on_flush=self._evaluate_thresholds,
+        )
+        self.metrics.start()
+
     def _load_budgets(self) -> None:
         """Load budget configurations."""
         try:
@@ -65,7 +104,7 @@ class BedrockCostMonitor:
                 for budget in response.get("Budgets", [])
                 if "bedrock" in budget["BudgetName"].lower()
             }
-        except ClientError as e:
+        except (BotoCoreError, ClientError) as e:
             logger.error(f"Failed to load budgets: {e}")
             self.budget_configs = {}
 
@@ -97,101 +136,120 @@ class BedrockCostMonitor:
         request_metadata: Optional[Dict] = None,
     ) -> None:
         """Track usage for a specific request."""
-        _ = request_metadata  # Mark as intentionally unused
         cost = self.calculate_token_cost(model_id, input_tokens, output_tokens)
 
         # Update in-memory tracking
-        if user_id not in self.usage_data:
-            self.usage_data[user_id] = {
-                "total_cost": Decimal("0"),
-                "requests": 0,
-                "tokens": {"input": 0, "output": 0},
-                "by_model": {},
-            }
-
-        user_data = self.usage_data[user_id]
-        user_data["total_cost"] += cost
-        user_data["requests"] += 1
-        user_data["tokens"]["input"] += input_tokens
-        user_data["tokens"]["output"] += output_tokens
-
-        if model_id not in user_data["by_model"]:
-            user_data["by_model"][model_id] = {
-                "cost": Decimal("0"),
-                "requests": 0,
-                "tokens": {"input": 0, "output": 0},
-            }
-
-        model_data = user_data["by_model"][model_id]
-        model_data["cost"] += cost
-        model_data["requests"] += 1
-        model_data["tokens"]["input"] += input_tokens
-        model_data["tokens"]["output"] += output_tokens
+        with self._lock:
+            if user_id not in self.usage_data:
+                self.usage_data[user_id] = {
+                    "total_cost": Decimal("0"),
+                    "requests": 0,
+                    "tokens": {"input": 0, "output": 0},
+                    "by_model": {},
+                }
 
-        # Send metrics to CloudWatch
-        self._send_cloudwatch_metrics(
-            user_id, model_id, cost, input_tokens, output_tokens
-        )
+            user_data = self.usage_data[user_id]
+            user_data["total_cost"] += cost
+            user_data["requests"] += 1
+            user_data["tokens"]["input"] += input_tokens
+            user_data["tokens"]["output"] += output_tokens
+
+            if model_id not in user_data["by_model"]:
+                user_data["by_model"][model_id] = {
+                    "cost": Decimal("0"),
+                    "requests": 0,
+                    "tokens": {"input": 0, "output": 0},
+                }
 
-        # Check thresholds
-        self._check_cost_thresholds(user_id, user_data["total_cost"])
+            model_data = user_data["by_model"][model_id]
+            model_data["cost"] += cost
+            model_data["requests"] += 1
+            model_data["tokens"]["input"] += input_tokens
+            model_data["tokens"]["output"] += output_tokens
+            self._pending_users.add(user_id)
+
+        # Aggregated and published by the background flush; thresholds are
+        # checked there too
+        dimensions = {"UserId": user_id, "ModelId": model_id}
+        self.metrics.add("TokenCost", float(cost), dimensions)
+        self.metrics.add("InputTokens", input_tokens, dimensions, unit="Count")
+        self.metrics.add("OutputTokens", output_tokens, dimensions, unit="Count")
+        latency = (request_metadata or {}).get("latency_seconds")
+        if latency is not None:
+            self.metrics.observe(
+                "RequestLatency", latency, {"ModelId": model_id}, unit="Seconds"
+            )
 
-    def _send_cloudwatch_metrics(
+    def record_cache_hit(
         self,
-        user_id: str,
         model_id: str,
-        cost: Decimal,
         input_tokens: int,
         output_tokens: int,
+        latency_saved: float,
+        use_case: str = "default",
     ) -> None:
-        """Send usage metrics to CloudWatch."""
-        try:
-            self.cloudwatch.put_metric_data(
-                Namespace="HavenHealth/Bedrock",
-                MetricData=[
-                    {
-                        "MetricName": "TokenCost",
-                        "Value": float(cost),
-                        "Unit": "None",
-                        "Dimensions": [
-                            {"Name": "UserId", "Value": user_id},
-                            {"Name": "ModelId", "Value": model_id},
-                        ],
-                    },
-                    {
-                        "MetricName": "InputTokens",
-                        "Value": input_tokens,
-                        "Unit": "Count",
-                        "Dimensions": [
-                            {"Name": "UserId", "Value": user_id},
-                            {"Name": "ModelId", "Value": model_id},
-                        ],
-                    },
-                    {
-                        "MetricName": "OutputTokens",
-                        "Value": output_tokens,
-                        "Unit": "Count",
-                        "Dimensions": [
-                            {"Name": "UserId", "Value": user_id},
-                            {"Name": "ModelId", "Value": model_id},
-                        ],
-                    },
-                ],
-            )
-        except ClientError as e:
-            logger.error(f"Failed to send CloudWatch metrics: {e}")
+        """Record a request answered from the LLM response cache."""
+        cost = self.calculate_token_cost(model_id, input_tokens, output_tokens)
 
-    def _check_cost_thresholds(self, user_id: str, total_cost: Decimal) -> None:
-        """Check if user has exceeded cost thresholds."""
-        # Define thresholds
-        thresholds = {
-            "warning": Decimal("50"),
-            "alert": Decimal("100"),
-            "critical": Decimal("200"),
+        with self._lock:
+            if model_id not in self.cache_savings:
+                self.cache_savings[model_id] = {
+                    "hits": 0,
+                    "cost_saved": Decimal("0"),
+                    "tokens_saved": {"input": 0, "output": 0},
+                    "latency_saved_seconds": 0.0,
+                    "by_use_case": {},
+                }
+
+            savings = self.cache_savings[model_id]
+            savings["hits"] += 1
+            savings["cost_saved"] += cost
+            savings["tokens_saved"]["input"] += input_tokens
+            savings["tokens_saved"]["output"] += output_tokens
+            savings["latency_saved_seconds"] += latency_saved
+            by_use_case = savings["by_use_case"]
+            by_use_case[use_case] = by_use_case.get(use_case, 0) + 1
+
+        dimensions = {"ModelId": model_id, "UseCase": use_case}
+        self.metrics.add("CacheHits", 1, dimensions, unit="Count")
+        self.metrics.add("CostSaved", float(cost), dimensions)
+        self.metrics.observe("LatencySaved", latency_saved, dimensions)
+
+    def get_cache_savings(self) -> Dict[str, Any]:
+        """Get cost and latency saved by LLM response cache hits."""
+        return {
+            "total_hits": sum(s["hits"] for s in self.cache_savings.values()),
+            "total_cost_saved": sum(
+                (s["cost_saved"] for s in self.cache_savings.values()), Decimal("0")
+            ),
+            "total_latency_saved_seconds": sum(
+                s["latency_saved_seconds"] for s in self.cache_savings.values()
+            ),
+            "by_model": self.cache_savings,
         }
 
-        for level, threshold in thresholds.items():
-            if total_cost >= threshold:
+    def flush_metrics(self) -> int:
+        """Publish buffered usage metrics now; return the datums sent."""
+        return self.metrics.flush()
+
+    def close(self) -> None:
+        """Stop the background flush and publish remaining metrics."""
+        self.metrics.close()
+
+    def _evaluate_thresholds(self) -> None:
+        """Check thresholds for users with usage since the last flush."""
+        with self._lock:
+            users, self._pending_users = self._pending_users, set()
+            totals = {user: self.usage_data[user]["total_cost"] for user in users}
+        for user_id, total_cost in totals.items():
+            self._check_cost_thresholds(user_id, total_cost)
+
+    def _check_cost_thresholds(self, user_id: str, total_cost: Decimal) -> None:
+        """Alert once for each threshold the user's total has newly crossed."""
+        alerted = self._alerted_levels.setdefault(user_id, set())
+        for level, threshold in self.COST_THRESHOLDS.items():
+            if total_cost >= threshold and level not in alerted:
+                alerted.add(level)
                 self._create_cost_alert(user_id, level, total_cost, threshold)
 
     def _create_cost_alert(
@@ -199,7 +257,7 @@ class BedrockCostMonitor:
     ) -> None:
         """Create cost alert in CloudWatch."""
         try:
-            self.cloudwatch.put_metric_data(
+            self.metrics_sink.put_metric_data(
                 Namespace="HavenHealth/Bedrock/Alerts",
                 MetricData=[
                     {
@@ -0,0 +1,241 @@
+"""Buffered, aggregated CloudWatch metrics for Bedrock usage.
+
+Publishing one put_metric_data call per model request adds a network round
+trip to every LLM call. The aggregator instead accumulates samples in
+process and publishes them from a background thread, every flush interval
+or sooner once enough distinct series are pending:
+
+- add() folds values into a CloudWatch statistic set (count, sum, min,
+  max), which keeps Sum/Average/Minimum/Maximum exact
+- observe() folds values into a log-scale histogram published as
+  Values/Counts, from which CloudWatch derives percentiles
+
+Metrics held in process are lost if the process dies without close(), so
+at most one flush interval of usage goes unreported.
+"""
+
+import atexit
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# CloudWatch accepts up to 1000 datums per put_metric_data request
+MAX_DATUMS_PER_REQUEST = 1000
+
+SeriesKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def histogram_bucket(value: float) -> float:
+    """Round a value up to its power-of-two bucket."""
+    if value <= 0:
+        return 0.0
+    return float(2 ** math.ceil(math.log2(value)))
+
+
+class LocalMetricSink:
+    """In-memory stand-in for the CloudWatch client, for tests and local runs."""
+
+    def __init__(self) -> None:
+        """Initialize local metric sink."""
+        self.requests: List[Dict[str, Any]] = []
+
+    def put_metric_data(self, Namespace: str, MetricData: List[Dict]) -> None:
+        """Record a put_metric_data request."""
+        # pylint: disable=invalid-name
+        self.requests.append({"Namespace": Namespace, "MetricData": MetricData})
+
+    def datums(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every datum received, optionally for one namespace."""
+        return [
+            datum
+            for request in self.requests
+            if namespace is None or request["Namespace"] == namespace
+            for datum in request["MetricData"]
+        ]
+
+
+class UsageAggregator:
+    """Accumulates metric samples and publishes them in batches."""
+
+    def __init__(
+        self,
+        sink: Any,
+        namespace: str,
+        flush_interval: float = 60.0,
+        max_series: int = 500,
+        on_flush: Optional[Callable[[], None]] = None,
+    ):
+        """Initialize usage aggregator.
+
+        Args:
+            sink: CloudWatch client or LocalMetricSink
+            namespace: CloudWatch namespace metrics are published under
+            flush_interval: Seconds between background flushes
+            max_series: Pending series that trigger an early flush
+            on_flush: Called after each flush (used to evaluate thresholds)
+        """
+        self.sink = sink
+        self.namespace = namespace
+        self.flush_interval = flush_interval
+        self.max_series = max_series
+        self.on_flush = on_flush
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._statistics: Dict[SeriesKey, Dict[str, float]] = {}
+        self._histograms: Dict[SeriesKey, Dict[float, int]] = {}
+        self._window_start = datetime.now(timezone.utc)
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(metric: str, unit: str, dimensions: Dict[str, str]) -> SeriesKey:
+        """Identify a series by metric name, unit and dimensions."""
+        return metric, unit, tuple(sorted(dimensions.items()))
+
+    def add(
+        self,
+        metric: str,
+        value: float,
+        dimensions: Dict[str, str],
+        unit: str = "None",
+    ) -> None:
+        """Fold a sample into the series' statistic set."""
+        key = self._key(metric, unit, dimensions)
+        with self._lock:
+            stats = self._statistics.get(key)
+            if stats is None:
+                self._statistics[key] = {
+                    "SampleCount": 1.0,
+                    "Sum": value,
+                    "Minimum": value,
+                    "Maximum": value,
+                }
+            else:
+                stats["SampleCount"] += 1
+                stats["Sum"] += value
+                stats["Minimum"] = min(stats["Minimum"], value)
+                stats["Maximum"] = max(stats["Maximum"], value)
+            pending = len(self._statistics) + len(self._histograms)
+        if pending >= self.max_series:
+            self._wake.set()
+
+    def observe(
+        self,
+        metric: str,
+        value: float,
+        dimensions: Dict[str, str],
+        unit: str = "Seconds",
+    ) -> None:
+        """Fold a sample into the series' histogram."""
+        key = self._key(metric, unit, dimensions)
+        bucket = histogram_bucket(value)
+        with self._lock:
+            counts = self._histograms.setdefault(key, {})
+            counts[bucket] = counts.get(bucket, 0) + 1
+            pending = len(self._statistics) + len(self._histograms)
+        if pending >= self.max_series:
+            self._wake.set()
+
+    def pending_series(self) -> int:
+        """Number of series waiting to be published."""
+        with self._lock:
+            return len(self._statistics) + len(self._histograms)
+
+    def flush(self) -> int:
+        """Publish everything accumulated so far; return the datums sent."""
+        with self._flush_lock:
+            with self._lock:
+                statistics, self._statistics = self._statistics, {}
+                histograms, self._histograms = self._histograms, {}
+                timestamp = self._window_start
+                self._window_start = datetime.now(timezone.utc)
+
+            datums: List[Dict[str, Any]] = []
+            for (metric, unit, dimensions), stats in statistics.items():
+                datums.append(
+                    {
+                        **self._datum(metric, unit, dimensions, timestamp),
+                        "StatisticValues": stats,
+                    }
+                )
+            for (metric, unit, dimensions), counts in histograms.items():
+                buckets = sorted(counts)
+                datums.append(
+                    {
+                        **self._datum(metric, unit, dimensions, timestamp),
+                        "Values": buckets,
+                        "Counts": [float(counts[b]) for b in buckets],
+                    }
+                )
+
+            for start in range(0, len(datums), MAX_DATUMS_PER_REQUEST):
+                try:
+                    self.sink.put_metric_data(
+                        Namespace=self.namespace,
+                        MetricData=datums[start : start + MAX_DATUMS_PER_REQUEST],
+                    )
+                except (BotoCoreError, ClientError) as e:
+                    logger.error(f"Failed to send CloudWatch metrics: {e}")
+
+        if self.on_flush is not None:
+            self.on_flush()
+        return len(datums)
+
+    @staticmethod
+    def _datum(
+        metric: str,
+        unit: str,
+        dimensions: Tuple[Tuple[str, str], ...],
+        timestamp: datetime,
+    ) -> Dict[str, Any]:
+        """Common fields of a metric datum."""
+        return {
+            "MetricName": metric,
+            "Unit": unit,
+            "Timestamp": timestamp,
+            "Dimensions": [
+                {"Name": name, "Value": value} for name, value in dimensions
+            ],
+        }
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="bedrock-usage-metrics", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        """Flush on the interval, or early when woken by a size trigger."""
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopping:
+                break
+            try:
+                self.flush()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Keep the flusher alive; the next interval retries
+                logger.error(f"Usage metrics flush failed: {e}")
+
+    def close(self) -> None:
+        """Stop the background thread and publish what is left."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping = True
+            self._wake.set()
+            thread.join(timeout=self.flush_interval)
+            atexit.unregister(self.close)
+        self.flush()
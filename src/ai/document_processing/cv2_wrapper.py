@@ -183,6 +183,7 @@ class CV2Constants:
     CV_8U = 0 if not HAS_CV2 else cv2.CV_8U
     INTER_LINEAR = 1 if not HAS_CV2 else cv2.INTER_LINEAR
     INTER_CUBIC = 2 if not HAS_CV2 else cv2.INTER_CUBIC
+    INTER_AREA = 3 if not HAS_CV2 else cv2.INTER_AREA
     BORDER_CONSTANT = 0 if not HAS_CV2 else cv2.BORDER_CONSTANT
     NORM_MINMAX = 32 if not HAS_CV2 else cv2.NORM_MINMAX
     IMWRITE_PNG_COMPRESSION = 16 if not HAS_CV2 else cv2.IMWRITE_PNG_COMPRESSION
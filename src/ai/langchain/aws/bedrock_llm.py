@@ -40,6 +40,9 @@ class BedrockLLM(LLM):
     medical_mode: bool = Field(default=True)
     include_reasoning: bool = Field(default=True)
 
+    # LLM response cache policy for deterministic calls
+    cache_use_case: Optional[str] = None
+
     # Service instance
     _bedrock_service: BedrockService
 
@@ -115,6 +118,7 @@ Consider cultural sensitivity and language barriers in your responses.
                 temperature=self.temperature,
                 top_p=self.top_p,
                 stop_sequences=all_stop_sequences if all_stop_sequences else None,
+                use_case=self.cache_use_case,
             )
 
             # Log token usage if available
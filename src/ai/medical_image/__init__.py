@@ -1,9 +1,10 @@
 """Medical Image Analysis Module for Haven Health Passport."""
 
 from .anomaly_detection import AnomalyDetector
-from .dicom_handler import DICOMHandler
+from .dicom_handler import DICOMFrameReader, DICOMHandler
 from .duplicate_detection import DuplicateDetector
 from .format_conversion import FormatConverter
+from .hash_index import BKTree
 from .image_classification import MedicalImageClassifier
 from .image_compression import ImageCompressor
 from .image_enhancement import ImageEnhancer
@@ -14,10 +15,14 @@ from .preprocessing import ImagePreprocessor
 from .privacy_masking import PrivacyMasker
 from .quality_assessment import QualityAssessor
 from .similarity_search import SimilaritySearchEngine
+from .study_indexer import DICOMCatalog, DICOMStudyIndexer
 
 __all__ = [
     "ImagePreprocessor",
     "DICOMHandler",
+    "DICOMFrameReader",
+    "DICOMStudyIndexer",
+    "DICOMCatalog",
     "ImageEnhancer",
     "AnomalyDetector",
     "MedicalImageClassifier",
@@ -28,6 +33,7 @@ __all__ = [
     "QualityAssessor",
     "ImageValidator",
     "DuplicateDetector",
+    "BKTree",
     "ImageIndexer",
     "SimilaritySearchEngine",
 ]
@@ -7,13 +7,16 @@ through role-based permissions.
 """
 
 import logging
-from typing import Any, Dict, List, Tuple
+import shutil
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 
 try:
     import pydicom
     from pydicom.dataset import FileMetaDataset
+    from pydicom.filereader import data_element_generator, read_preamble
     from pydicom.pixel_data_handlers import apply_modality_lut, apply_voi_lut
     from pydicom.uid import UID
 
@@ -23,9 +26,300 @@ except ImportError:
     apply_modality_lut = None
     apply_voi_lut = None
     FileMetaDataset = None  # type: ignore
+    data_element_generator = None
+    read_preamble = None
 
 logger = logging.getLogger(__name__)
 
+PIXEL_DATA_TAG = 0x7FE00010
+FLOAT_PIXEL_DATA_TAG = 0x7FE00008
+DOUBLE_FLOAT_PIXEL_DATA_TAG = 0x7FE00009
+PIXEL_DATA_TAGS = {PIXEL_DATA_TAG, FLOAT_PIXEL_DATA_TAG, DOUBLE_FLOAT_PIXEL_DATA_TAG}
+
+# Native (uncompressed, non-deflated) transfer syntaxes whose pixel data can
+# be memory-mapped in place
+IMPLICIT_VR_LITTLE_ENDIAN = "1.2.840.10008.1.2"
+EXPLICIT_VR_LITTLE_ENDIAN = "1.2.840.10008.1.2.1"
+EXPLICIT_VR_BIG_ENDIAN = "1.2.840.10008.1.2.2"
+DEFLATED_TRANSFER_SYNTAX = "1.2.840.10008.1.2.1.99"
+NATIVE_TRANSFER_SYNTAXES = {
+    IMPLICIT_VR_LITTLE_ENDIAN,
+    EXPLICIT_VR_LITTLE_ENDIAN,
+    EXPLICIT_VR_BIG_ENDIAN,
+}
+
+# Explicit VRs with a 4-byte length after two reserved bytes
+_LONG_LENGTH_VRS = {b"OB", b"OD", b"OF", b"OL", b"OV", b"OW", b"SQ", b"UC", b"UN"}
+_LONG_LENGTH_VRS |= {b"UR", b"UT", b"SV", b"UV"}
+
+UNDEFINED_LENGTH = 0xFFFFFFFF
+
+# Bytes per read when copying pixel data between files
+COPY_CHUNK_SIZE = 1 << 20
+
+# Non-pixel elements larger than this are left unread by header scans
+HEADER_DEFER_SIZE = "64 KB"
+
+# Tags removed or replaced by anonymization
+TAGS_TO_ANONYMIZE = [
+    "PatientName",
+    "PatientID",
+    "PatientBirthDate",
+    "PatientSex",
+    "PatientAge",
+    "PatientAddress",
+    "PatientTelephoneNumbers",
+    "ReferringPhysicianName",
+    "PerformingPhysicianName",
+    "InstitutionName",
+    "InstitutionAddress",
+    "StationName",
+]
+
+# Elements processed per block when normalizing large pixel arrays
+NORMALIZE_BLOCK_ELEMENTS = 1 << 22
+
+
+def _transfer_syntax(ds: Any) -> str:
+    """Transfer syntax UID of a dataset read from file."""
+    file_meta = getattr(ds, "file_meta", None)
+    return str(getattr(file_meta, "TransferSyntaxUID", IMPLICIT_VR_LITTLE_ENDIAN))
+
+
+def read_header(fp: BinaryIO) -> Tuple[Any, Optional[int]]:
+    """Read a dataset up to its pixel data.
+
+    Returns:
+        Tuple of (dataset without pixel data, file offset of the pixel data
+        element or None if the file has none or is deflated)
+
+    Raises:
+        ValueError: If the pixel data element cannot be located
+    """
+    ds = pydicom.dcmread(fp, stop_before_pixels=True)
+    if _transfer_syntax(ds) == DEFLATED_TRANSFER_SYNTAX:
+        # Deflated datasets are parsed from a decompressed copy
+        return ds, None
+    return ds, find_pixel_element(fp, ds)
+
+
+def find_pixel_element(fp: BinaryIO, ds: Any) -> Optional[int]:
+    """Find the pixel data element by walking the top-level elements.
+
+    Matches Pixel Data as well as Float and Double Float Pixel Data. Values
+    are skipped rather than read, so the walk costs about as much as a
+    header read.
+
+    Returns:
+        File offset of the pixel data element, or None if the file has none
+
+    Raises:
+        ValueError: If the walk stops on anything but a pixel data element,
+            or an image dataset has no pixel data
+    """
+    transfer_syntax = _transfer_syntax(ds)
+    little_endian = transfer_syntax != EXPLICIT_VR_BIG_ENDIAN
+
+    fp.seek(0)
+    read_preamble(fp, True)
+    # File meta elements (group 0002) are always explicit VR little endian
+    for _ in data_element_generator(
+        fp, False, True, stop_when=lambda tag, vr, length: tag >> 16 != 0x0002
+    ):
+        pass
+    for _ in data_element_generator(
+        fp,
+        transfer_syntax == IMPLICIT_VR_LITTLE_ENDIAN,
+        little_endian,
+        stop_when=lambda tag, vr, length: tag in PIXEL_DATA_TAGS,
+        defer_size=HEADER_DEFER_SIZE,
+    ):
+        pass
+
+    offset = fp.tell()
+    tag = read_tag(fp, little_endian)
+    if tag in PIXEL_DATA_TAGS:
+        return offset
+    if tag is None and "Rows" not in ds:
+        return None
+    if tag is None:
+        raise ValueError("Image dataset has no pixel data element")
+    raise ValueError(f"Expected pixel data at offset {offset}, found tag {tag:08X}")
+
+
+def read_tag(fp: BinaryIO, little_endian: bool) -> Optional[int]:
+    """Read a data element tag at the current position, None at end of file."""
+    header = fp.read(4)
+    if len(header) < 4:
+        return None
+    group, element = struct.unpack("<HH" if little_endian else ">HH", header)
+    return (group << 16) | element
+
+
+def locate_pixel_value(fp: BinaryIO, ds: Any, element_offset: int) -> Tuple[int, int]:
+    """Find the value offset and length of the pixel data element.
+
+    Returns:
+        Tuple of (value offset, value length); the length is
+        UNDEFINED_LENGTH for encapsulated (compressed) pixel data
+    """
+    transfer_syntax = _transfer_syntax(ds)
+    endian = ">" if transfer_syntax == EXPLICIT_VR_BIG_ENDIAN else "<"
+    fp.seek(element_offset + 4)
+    if transfer_syntax == IMPLICIT_VR_LITTLE_ENDIAN:
+        (length,) = struct.unpack(endian + "I", fp.read(4))
+        return element_offset + 8, length
+
+    vr = fp.read(2)
+    if vr in _LONG_LENGTH_VRS:
+        fp.seek(2, 1)
+        (length,) = struct.unpack(endian + "I", fp.read(4))
+        return element_offset + 12, length
+    (length,) = struct.unpack(endian + "H", fp.read(2))
+    return element_offset + 8, length
+
+
+class DICOMFrameReader:
+    """Lazy, frame-level access to DICOM pixel data.
+
+    For native transfer syntaxes the pixel data is memory-mapped and each
+    frame is a read-only view, so only the frames touched are paged in.
+    Encapsulated (compressed) pixel data is decoded in full on first access.
+    """
+
+    def __init__(self, file_path: str):
+        """Open a DICOM file and read its header."""
+        self.file_path = file_path
+        with open(file_path, "rb") as fp:
+            self.dataset, element_offset = read_header(fp)
+            self.pixel_tag: Optional[int] = None
+            value = None
+            if element_offset is not None:
+                fp.seek(element_offset)
+                self.pixel_tag = read_tag(
+                    fp, _transfer_syntax(self.dataset) != EXPLICIT_VR_BIG_ENDIAN
+                )
+                value = locate_pixel_value(fp, self.dataset, element_offset)
+
+        ds = self.dataset
+        self.number_of_frames = int(getattr(ds, "NumberOfFrames", 1) or 1)
+        self.rows = int(getattr(ds, "Rows", 0))
+        self.columns = int(getattr(ds, "Columns", 0))
+        self.samples_per_pixel = int(getattr(ds, "SamplesPerPixel", 1))
+        self.transfer_syntax = _transfer_syntax(ds)
+        self._pixels: Optional[np.ndarray] = None
+        self._decoded: Optional[np.ndarray] = None
+
+        if value is not None:
+            self._pixels = self._map_pixels(*value)
+        self.memory_mapped = self._pixels is not None
+
+    def __enter__(self) -> "DICOMFrameReader":
+        """Enter context."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Release the memory map."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of frames."""
+        return self.number_of_frames
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Iterate frames lazily."""
+        for index in range(self.number_of_frames):
+            yield self.frame(index)
+
+    def frame(self, index: int) -> np.ndarray:
+        """Stored pixel values of one frame (read-only when memory-mapped)."""
+        if not 0 <= index < self.number_of_frames:
+            raise IndexError(f"Frame {index} out of range")
+        if self._pixels is not None:
+            return self._pixels[index]
+        return self._decode_all()[index]
+
+    def modality_frame(self, index: int) -> np.ndarray:
+        """One frame with the modality LUT (rescale) applied."""
+        frame = self.frame(index)
+        if hasattr(self.dataset, "RescaleSlope") and hasattr(
+            self.dataset, "RescaleIntercept"
+        ):
+            return np.asarray(apply_modality_lut(frame, self.dataset))
+        return frame
+
+    def close(self) -> None:
+        """Drop the memory map and any decoded pixels.
+
+        The mapping is unmapped once frames handed out are released too.
+        """
+        self._pixels = None
+        self._decoded = None
+
+    def _map_pixels(self, offset: int, length: int) -> Optional[np.ndarray]:
+        """Memory-map native pixel data as (frames, rows, columns[, samples])."""
+        ds = self.dataset
+        bits_allocated = int(getattr(ds, "BitsAllocated", 0))
+        if (
+            length == UNDEFINED_LENGTH
+            or self.transfer_syntax not in NATIVE_TRANSFER_SYNTAXES
+            or bits_allocated not in (8, 16, 32, 64)
+        ):
+            return None
+
+        if self.pixel_tag == FLOAT_PIXEL_DATA_TAG:
+            dtype = np.dtype("f4")
+        elif self.pixel_tag == DOUBLE_FLOAT_PIXEL_DATA_TAG:
+            dtype = np.dtype("f8")
+        elif bits_allocated == 64:
+            return None
+        else:
+            signed = int(getattr(ds, "PixelRepresentation", 0)) == 1
+            dtype = np.dtype(f"{'i' if signed else 'u'}{bits_allocated // 8}")
+        if self.transfer_syntax == EXPLICIT_VR_BIG_ENDIAN:
+            dtype = dtype.newbyteorder(">")
+
+        planar = int(getattr(ds, "PlanarConfiguration", 0)) == 1
+        if self.samples_per_pixel == 1:
+            shape: Tuple[int, ...] = (self.number_of_frames, self.rows, self.columns)
+        elif planar:
+            shape = (
+                self.number_of_frames,
+                self.samples_per_pixel,
+                self.rows,
+                self.columns,
+            )
+        else:
+            shape = (
+                self.number_of_frames,
+                self.rows,
+                self.columns,
+                self.samples_per_pixel,
+            )
+
+        if int(np.prod(shape)) * dtype.itemsize > length:
+            logger.warning(
+                "Pixel data shorter than header geometry in %s", self.file_path
+            )
+            return None
+
+        pixels = np.memmap(
+            self.file_path, dtype=dtype, mode="r", offset=offset, shape=shape
+        )
+        if planar and self.samples_per_pixel > 1:
+            # Present colour-by-plane data as colour-by-pixel (a view)
+            return np.moveaxis(pixels, 1, -1)
+        return pixels
+
+    def _decode_all(self) -> np.ndarray:
+        """Decode compressed pixel data once, as (frames, ...)."""
+        if self._decoded is None:
+            pixel_array = pydicom.dcmread(self.file_path).pixel_array
+            if self.number_of_frames == 1:
+                pixel_array = pixel_array[np.newaxis]
+            self._decoded = pixel_array
+        return self._decoded
+
 
 class DICOMHandler:
     """Handle DICOM medical image files."""
@@ -72,6 +366,17 @@ class DICOMHandler:
             logger.error("Error loading DICOM file %s: %s", file_path, str(e))
             raise
 
+    def read_metadata(self, file_path: str) -> Dict[str, Any]:
+        """Extract metadata without reading or decoding pixel data."""
+        ds = pydicom.dcmread(
+            file_path, stop_before_pixels=True, defer_size=HEADER_DEFER_SIZE
+        )
+        return self._extract_metadata(ds)
+
+    def open_frames(self, file_path: str) -> DICOMFrameReader:
+        """Open a DICOM file for lazy, per-frame pixel access."""
+        return DICOMFrameReader(file_path)
+
     def _extract_metadata(self, ds: pydicom.Dataset) -> Dict[str, Any]:
         """Extract relevant metadata from DICOM dataset."""
         metadata: Dict[str, Any] = {}
@@ -113,6 +418,7 @@ class DICOMHandler:
                 getattr(ds, "PhotometricInterpretation", "")
             ),
             "instance_number": str(getattr(ds, "InstanceNumber", 0)),
+            "number_of_frames": str(getattr(ds, "NumberOfFrames", 1)),
         }
 
         # Window/Level if present
@@ -136,72 +442,89 @@ class DICOMHandler:
         return metadata
 
     def anonymize_dicom(self, file_path: str, output_path: str) -> None:
-        """Anonymize DICOM file by removing patient information."""
+        """Anonymize DICOM file by removing patient information.
+
+        Only the header is parsed and re-written; the pixel data element and
+        anything after it are copied to the output in chunks.
+        """
         try:
-            ds = pydicom.dcmread(file_path)
+            with open(file_path, "rb") as source:
+                ds, pixel_offset = read_header(source)
+
+                if _transfer_syntax(ds) == DEFLATED_TRANSFER_SYNTAX:
+                    # A deflated dataset cannot be split at its pixel data
+                    ds = pydicom.dcmread(file_path)
+                    self._anonymize_dataset(ds)
+                    ds.save_as(output_path)
+                else:
+                    self._anonymize_dataset(ds)
+                    with open(output_path, "wb") as target:
+                        ds.save_as(target)
+                        if pixel_offset is not None:
+                            source.seek(pixel_offset)
+                            shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
 
-            # List of tags to anonymize
-            tags_to_anonymize = [
-                "PatientName",
-                "PatientID",
-                "PatientBirthDate",
-                "PatientSex",
-                "PatientAge",
-                "PatientAddress",
-                "PatientTelephoneNumbers",
-                "ReferringPhysicianName",
-                "PerformingPhysicianName",
-                "InstitutionName",
-                "InstitutionAddress",
-                "StationName",
-            ]
-
-            # Anonymize tags
-            for tag in tags_to_anonymize:
-                if hasattr(ds, tag):
-                    if tag == "PatientName":
-                        ds.PatientName = "Anonymous"
-                    elif tag == "PatientID":
-                        ds.PatientID = "ANON" + str(hash(ds.PatientID))[:8]
-                    else:
-                        delattr(ds, tag)
-
-            # Save anonymized file
-            ds.save_as(output_path)
             logger.info("Anonymized DICOM saved to: %s", output_path)
 
         except Exception as e:
             logger.error("Error anonymizing DICOM file: %s", str(e))
             raise
 
+    def _anonymize_dataset(self, ds: pydicom.Dataset) -> None:
+        """Remove or replace patient-identifying tags in place."""
+        for tag in TAGS_TO_ANONYMIZE:
+            if hasattr(ds, tag):
+                if tag == "PatientName":
+                    ds.PatientName = "Anonymous"
+                elif tag == "PatientID":
+                    ds.PatientID = "ANON" + str(hash(ds.PatientID))[:8]
+                else:
+                    delattr(ds, tag)
+
     def convert_to_standard_format(
         self, pixel_array: np.ndarray, metadata: Dict[str, Any]
     ) -> np.ndarray:
-        """Convert DICOM pixel data to standard format for processing."""
+        """Convert DICOM pixel data to standard format for processing.
+
+        Works block by block, so memory-mapped multi-frame studies are
+        never copied to float in full.
+        """
         # Handle different photometric interpretations
         photometric = metadata.get("image", {}).get("photometric_interpretation", "")
+        invert = photometric == "MONOCHROME1"
 
-        if photometric == "MONOCHROME1":
-            # Invert the image (white becomes black)
-            pixel_array = np.max(pixel_array) - pixel_array
+        if pixel_array.dtype == np.uint8:
+            if invert:
+                # Invert the image (white becomes black)
+                return np.max(pixel_array) - pixel_array
+            return pixel_array
 
-        # Ensure proper data type
-        if pixel_array.dtype != np.uint8:
-            # Normalize to 0-255 range
-            pixel_array = self._normalize_to_uint8(pixel_array)
+        # Normalize to 0-255 range
+        return self._normalize_to_uint8(pixel_array, invert=invert)
 
-        return pixel_array
-
-    def _normalize_to_uint8(self, array: np.ndarray) -> np.ndarray:
-        """Normalize array to uint8 range."""
+    def _normalize_to_uint8(
+        self, array: np.ndarray, invert: bool = False
+    ) -> np.ndarray:
+        """Normalize array to uint8 range, optionally inverted."""
         array_min = np.min(array)
         array_max = np.max(array)
-
-        if array_max > array_min:
-            normalized = (array - array_min) / (array_max - array_min) * 255
-            return np.array(normalized.astype(np.uint8))
-        else:
-            return np.zeros_like(array, dtype=np.uint8)
+        output = np.zeros(array.shape, dtype=np.uint8)
+        if array_max <= array_min:
+            return output
+
+        # Normalize a block of frames (or rows) at a time so only the block
+        # is ever held as float
+        value_range = float(array_max) - float(array_min)
+        per_index = max(1, array[0].size if array.ndim > 1 else 1)
+        step = max(1, NORMALIZE_BLOCK_ELEMENTS // per_index)
+        for start in range(0, array.shape[0], step):
+            block = np.asarray(array[start : start + step], dtype=np.float64)
+            if invert:
+                block = float(array_max) - block
+            else:
+                block = block - float(array_min)
+            output[start : start + step] = (block / value_range * 255).astype(np.uint8)
+        return output
 
     def save_as_dicom(
         self, pixel_array: np.ndarray, metadata: Dict[str, Any], output_path: str
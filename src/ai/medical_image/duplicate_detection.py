@@ -1,66 +1,115 @@
 """Duplicate detection module for medical images."""
 
-import hashlib
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
-from ..document_processing.cv2_wrapper import (
-    HAS_CV2,
-    CV2Constants,
-    CV2Extra,
-)
-from ..document_processing.cv2_wrapper import CV2Operations as cv2
+from .hash_index import BKTree
+from .perceptual_hash import HASH_METHODS, compute_hash
 
 logger = logging.getLogger(__name__)
 
 
 class DuplicateDetector:
-    """Detect duplicate medical images."""
-
-    def __init__(self) -> None:
-        """Initialize duplicate detector."""
-        self.hash_cache: Dict[str, str] = {}
+    """Detect duplicate and near-duplicate medical images.
+
+    Images are fingerprinted with a perceptual hash and indexed in a
+    BK-tree, so re-scans, re-compressions and light crops of an image are
+    found by Hamming radius rather than only bit-identical copies.
+    """
+
+    def __init__(
+        self,
+        method: str = "phash",
+        hash_size: int = 8,
+        max_distance: Optional[int] = None,
+    ) -> None:
+        """Initialize duplicate detector.
+
+        Args:
+            method: Perceptual hash, "phash" or "dhash"
+            hash_size: Bits per side; 8 gives 64-bit, 16 gives 256-bit hashes
+            max_distance: Largest Hamming distance treated as a duplicate
+                (defaults to about 10% of the hash bits)
+        """
+        if method not in HASH_METHODS:
+            raise ValueError(f"Unknown hash method: {method}")
+        self.method = method
+        self.hash_size = hash_size
+        self.max_distance = (
+            max_distance if max_distance is not None else hash_size * hash_size // 10
+        )
+        self.hash_index = BKTree()
+
+    @property
+    def hash_cache(self) -> Dict[str, int]:
+        """Packed hash of every indexed image."""
+        return dict(self.hash_index.items())
+
+    def add_image(self, image_id: str, image: np.ndarray) -> int:
+        """Hash and index an image; returns its hash."""
+        img_hash = self._calculate_hash(image)
+        self.hash_index.add(image_id, img_hash)
+        return img_hash
+
+    def add_hash(self, image_id: str, img_hash: int) -> None:
+        """Index a precomputed hash."""
+        self.hash_index.add(image_id, img_hash)
+
+    def remove_image(self, image_id: str) -> bool:
+        """Remove an image from the index."""
+        return self.hash_index.remove(image_id)
+
+    def clear(self) -> None:
+        """Remove every indexed image."""
+        self.hash_index.clear()
+
+    def find_near_duplicates(
+        self, image: np.ndarray, max_distance: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """Find indexed images near-identical to an image.
+
+        Returns:
+            (image_id, hamming_distance) pairs, nearest first
+        """
+        radius = self.max_distance if max_distance is None else max_distance
+        return self.hash_index.search(self._calculate_hash(image), radius)
 
     def find_duplicates(self, images: List[Tuple[str, np.ndarray]]) -> List[List[str]]:
-        """Find duplicate images in a collection."""
-        duplicates: Dict[str, List[str]] = {}
+        """Find groups of duplicate images in a collection.
 
+        Images within max_distance of each other are grouped transitively.
+        """
+        index = BKTree()
+        hashes: List[Tuple[str, int]] = []
         for image_id, image in images:
-            # Calculate image hash
             img_hash = self._calculate_hash(image)
+            index.add(image_id, img_hash)
+            hashes.append((image_id, img_hash))
 
-            if img_hash in duplicates:
-                duplicates[img_hash].append(image_id)
-            else:
-                duplicates[img_hash] = [image_id]
-
-        # Return groups of duplicates
-        return [group for group in duplicates.values() if len(group) > 1]
+        # Union-find over every pair within the radius
+        parent = {image_id: image_id for image_id, _ in hashes}
 
-    def _calculate_hash(self, image: np.ndarray) -> str:
-        """Calculate perceptual hash of image."""
-        # Check if cv2 is available
-        if not HAS_CV2:
-            # Simple hash without cv2
-            # Downsample by taking every nth pixel
-            step = max(image.shape[0] // 64, image.shape[1] // 64, 1)
-            downsampled = image[::step, ::step]
-            return hashlib.md5(downsampled.tobytes(), usedforsecurity=False).hexdigest()
+        def find(image_id: str) -> str:
+            while parent[image_id] != image_id:
+                parent[image_id] = parent[parent[image_id]]
+                image_id = parent[image_id]
+            return image_id
 
-        # Resize to standard size
-        resized = CV2Extra.resize(image, (64, 64))
+        for image_id, img_hash in hashes:
+            for match_id, _ in index.search(img_hash, self.max_distance):
+                root, match_root = find(image_id), find(match_id)
+                if root != match_root:
+                    parent[match_root] = root
 
-        # Convert to grayscale if needed
-        if len(resized.shape) == 3:
-            resized = cv2.cvtColor(resized, CV2Constants.COLOR_BGR2GRAY)
+        groups: Dict[str, List[str]] = {}
+        for image_id, _ in hashes:
+            groups.setdefault(find(image_id), []).append(image_id)
 
-        # Calculate average
-        avg = np.mean(resized)
-
-        # Create binary hash
-        binary = (resized > avg).astype(np.uint8)
+        # Return groups of duplicates
+        return [group for group in groups.values() if len(group) > 1]
 
-        # Convert to hex string
-        return hashlib.md5(binary.tobytes(), usedforsecurity=False).hexdigest()
+    def _calculate_hash(self, image: np.ndarray) -> int:
+        """Calculate perceptual hash of image."""
+        return compute_hash(image, self.method, self.hash_size)
@@ -0,0 +1,124 @@
+"""Hamming-distance index for perceptual image hashes."""
+
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .perceptual_hash import hamming_distance
+
+logger = logging.getLogger(__name__)
+
+
+class _BKNode:
+    """BK-tree node holding every item with one exact hash."""
+
+    __slots__ = ("hash_value", "item_ids", "children")
+
+    def __init__(self, hash_value: int, item_id: str):
+        """Initialize node."""
+        self.hash_value = hash_value
+        self.item_ids = [item_id]
+        self.children: Dict[int, "_BKNode"] = {}
+
+
+class BKTree:
+    """BK-tree over packed hashes for Hamming radius queries.
+
+    Children are keyed by their distance to the parent, so the triangle
+    inequality prunes every subtree outside [d - radius, d + radius] and a
+    small-radius query visits a small fraction of the tree.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty tree."""
+        self.root: Optional[_BKNode] = None
+        self._hashes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Number of indexed items."""
+        return len(self._hashes)
+
+    def __contains__(self, item_id: object) -> bool:
+        """Whether an item is indexed."""
+        return item_id in self._hashes
+
+    def add(self, item_id: str, hash_value: int) -> None:
+        """Index an item's hash (re-adding an item replaces its hash)."""
+        if item_id in self._hashes:
+            self.remove(item_id)
+        self._hashes[item_id] = hash_value
+
+        if self.root is None:
+            self.root = _BKNode(hash_value, item_id)
+            return
+
+        node = self.root
+        while True:
+            distance = hamming_distance(hash_value, node.hash_value)
+            if distance == 0:
+                node.item_ids.append(item_id)
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _BKNode(hash_value, item_id)
+                return
+            node = child
+
+    def remove(self, item_id: str) -> bool:
+        """Remove an item; its node stays as a routing point."""
+        hash_value = self._hashes.pop(item_id, None)
+        if hash_value is None:
+            return False
+        node = self._find_node(hash_value)
+        if node is not None and item_id in node.item_ids:
+            node.item_ids.remove(item_id)
+        return True
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self.root = None
+        self._hashes = {}
+
+    def get_hash(self, item_id: str) -> Optional[int]:
+        """Hash of an indexed item."""
+        return self._hashes.get(item_id)
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        """Indexed (item_id, hash) pairs."""
+        return iter(self._hashes.items())
+
+    def search(self, hash_value: int, radius: int) -> List[Tuple[str, int]]:
+        """Find items within a Hamming radius.
+
+        Returns:
+            (item_id, distance) pairs, nearest first
+        """
+        results: List[Tuple[str, int]] = []
+        if self.root is None:
+            return results
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node.hash_value)
+            if distance <= radius:
+                results.extend((item_id, distance) for item_id in node.item_ids)
+            low, high = distance - radius, distance + radius
+            for edge, child in node.children.items():
+                if low <= edge <= high:
+                    stack.append(child)
+
+        results.sort(key=lambda result: result[1])
+        return results
+
+    def _find_node(self, hash_value: int) -> Optional[_BKNode]:
+        """Node holding an exact hash."""
+        node = self.root
+        while node is not None:
+            distance = hamming_distance(hash_value, node.hash_value)
+            if distance == 0:
+                return node
+            node = node.children.get(distance)
+        return None
+
+
+__all__ = ["BKTree"]
@@ -1,8 +1,10 @@
 """Image indexing module for medical images."""
 
+import json
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -10,6 +12,7 @@ from ..document_processing.cv2_wrapper import (
     HAS_CV2,
     CV2Extra,
 )
+from .duplicate_detection import DuplicateDetector
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +26,28 @@ class ImageIndex:
     body_part: str
     features: np.ndarray
     metadata: Dict[str, Any]
+    perceptual_hash: Optional[int] = None
 
 
 class ImageIndexer:
-    """Index medical images for efficient search and retrieval."""
+    """Index medical images for efficient search and retrieval.
 
-    def __init__(self) -> None:
+    Alongside the entries, the indexer keeps an L2-normalized feature
+    matrix (one row per image) for vectorized similarity search, and a
+    perceptual hash index for near-duplicate lookups. Both are persisted
+    by save() and restored by load().
+    """
+
+    def __init__(self, duplicate_detector: Optional[DuplicateDetector] = None) -> None:
         """Initialize image indexer."""
         self.index: Dict[str, Any] = {}
         self.feature_extractor = None
+        self.duplicate_detector = duplicate_detector or DuplicateDetector()
+
+        # Row-per-image feature matrix; capacity grows geometrically
+        self._row_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
 
     def add_image(
         self, image_id: str, image: np.ndarray, metadata: Dict[str, Any]
@@ -47,11 +63,118 @@ class ImageIndexer:
             body_part=metadata.get("body_part", "unknown"),
             features=features,
             metadata=metadata,
+            perceptual_hash=self.duplicate_detector.add_image(image_id, image),
         )
 
         self.index[image_id] = entry
+        self._set_row(image_id, features)
         logger.info("Added image %s to index", image_id)
 
+    def remove_image(self, image_id: str) -> bool:
+        """Remove image from index."""
+        if self.index.pop(image_id, None) is None:
+            return False
+        self.duplicate_detector.remove_image(image_id)
+
+        # Move the last row into the freed slot
+        row = self._rows.pop(image_id)
+        last_id = self._row_ids.pop()
+        if last_id != image_id and self._matrix is not None:
+            self._matrix[row] = self._matrix[len(self._row_ids)]
+            self._row_ids[row] = last_id
+            self._rows[last_id] = row
+        return True
+
+    def find_near_duplicates(
+        self, image: np.ndarray, max_distance: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """Find indexed images that are near-duplicates of an image."""
+        return self.duplicate_detector.find_near_duplicates(image, max_distance)
+
+    def feature_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Image ids and their L2-normalized feature rows."""
+        if self._matrix is None:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        return list(self._row_ids), self._matrix[: len(self._row_ids)]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persist entries, feature matrix and hashes to an .npz file."""
+        ids, matrix = self.feature_matrix()
+        entries = [self.index[image_id] for image_id in ids]
+        np.savez_compressed(
+            path,
+            ids=np.array(ids, dtype=str),
+            matrix=matrix,
+            features=np.array([entry.features for entry in entries]),
+            # Hashes may exceed 64 bits, so they are stored as hex strings
+            hashes=np.array(
+                [format(entry.perceptual_hash or 0, "x") for entry in entries],
+                dtype=str,
+            ),
+            entries=np.array(
+                json.dumps(
+                    [
+                        {
+                            "modality": entry.modality,
+                            "body_part": entry.body_part,
+                            "metadata": entry.metadata,
+                        }
+                        for entry in entries
+                    ],
+                    default=str,
+                )
+            ),
+        )
+        logger.info("Saved %d indexed images to %s", len(ids), path)
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Restore an index written by save(), replacing current entries."""
+        with np.load(path, allow_pickle=False) as data:
+            ids = [str(image_id) for image_id in data["ids"]]
+            matrix = data["matrix"].astype(np.float32)
+            features = data["features"]
+            hashes = [int(str(value), 16) for value in data["hashes"]]
+            entries = json.loads(str(data["entries"]))
+
+        self.index = {}
+        self.duplicate_detector.clear()
+        for row, image_id in enumerate(ids):
+            self.index[image_id] = ImageIndex(
+                image_id=image_id,
+                modality=entries[row]["modality"],
+                body_part=entries[row]["body_part"],
+                features=features[row],
+                metadata=entries[row]["metadata"],
+                perceptual_hash=hashes[row],
+            )
+            self.duplicate_detector.add_hash(image_id, hashes[row])
+
+        self._row_ids = ids
+        self._rows = {image_id: row for row, image_id in enumerate(ids)}
+        self._matrix = matrix if len(ids) else None
+        logger.info("Loaded %d indexed images from %s", len(ids), path)
+
+    def _set_row(self, image_id: str, features: np.ndarray) -> None:
+        """Store an image's normalized features in the matrix."""
+        vector = np.asarray(features, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+
+        if self._matrix is None:
+            self._matrix = np.zeros((16, vector.size), dtype=np.float32)
+
+        row = self._rows.get(image_id)
+        if row is None:
+            row = len(self._row_ids)
+            if row == self._matrix.shape[0]:
+                grown = np.zeros((row * 2, self._matrix.shape[1]), dtype=np.float32)
+                grown[:row] = self._matrix
+                self._matrix = grown
+            self._row_ids.append(image_id)
+            self._rows[image_id] = row
+        self._matrix[row] = vector
+
     def _extract_features(self, image: np.ndarray) -> np.ndarray:
         """Extract features for indexing."""
         # Simple feature extraction - histogram
@@ -0,0 +1,122 @@
+"""Perceptual hashing module for medical images.
+
+Perceptual hashes stay close when an image is re-scanned, re-compressed,
+resized or lightly cropped, so near-duplicates can be found by Hamming
+distance. Hashes are packed into Python integers: hash_size=8 gives 64-bit
+hashes, hash_size=16 gives 256-bit hashes.
+"""
+
+import logging
+from functools import lru_cache
+
+import numpy as np
+
+from ..document_processing.cv2_wrapper import HAS_CV2, CV2Constants, CV2Extra
+from ..document_processing.cv2_wrapper import CV2Operations as cv2
+
+logger = logging.getLogger(__name__)
+
+HASH_METHODS = ("phash", "dhash")
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """Convert an image to a float grayscale array."""
+    if image.ndim == 3:
+        if HAS_CV2:
+            image = cv2.cvtColor(image, CV2Constants.COLOR_BGR2GRAY)
+        else:
+            # BGR channel order, as loaded by OpenCV
+            image = image[..., :3] @ np.array([0.114, 0.587, 0.299])
+    return image.astype(np.float64)
+
+
+def _area_resize(gray: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Resize by averaging pixel blocks (nearest pixel when upsampling)."""
+    rows, cols = gray.shape
+    if rows >= height and cols >= width:
+        row_edges = np.linspace(0, rows, height + 1).astype(int)[:-1]
+        col_edges = np.linspace(0, cols, width + 1).astype(int)[:-1]
+        sums = np.add.reduceat(np.add.reduceat(gray, row_edges, axis=0), col_edges, 1)
+        counts = np.outer(
+            np.diff(np.append(row_edges, rows)), np.diff(np.append(col_edges, cols))
+        )
+        return sums / counts
+
+    row_index = (np.arange(height) * rows // height).astype(int)
+    col_index = (np.arange(width) * cols // width).astype(int)
+    return gray[np.ix_(row_index, col_index)]
+
+
+def _resize(image: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Downscale an image to grayscale width x height."""
+    if HAS_CV2:
+        resized = CV2Extra.resize(
+            image, (width, height), interpolation=CV2Constants.INTER_AREA
+        )
+        return _to_gray(resized)
+    return _area_resize(_to_gray(image), width, height)
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis matrix."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    basis = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    basis[0] /= np.sqrt(2)
+    return basis
+
+
+def pack_bits(bits: np.ndarray) -> int:
+    """Pack a boolean array into an integer, first bit most significant."""
+    return int.from_bytes(np.packbits(bits.flatten()).tobytes(), "big")
+
+
+def hamming_distance(hash1: int, hash2: int) -> int:
+    """Number of differing bits between two packed hashes."""
+    return (hash1 ^ hash2).bit_count()
+
+
+def dhash(image: np.ndarray, hash_size: int = 8) -> int:
+    """Difference hash: sign of the horizontal gradient.
+
+    Args:
+        image: Grayscale or BGR image
+        hash_size: Bits per side (8 gives a 64-bit hash)
+    """
+    resized = _resize(image, hash_size + 1, hash_size)
+    return pack_bits(resized[:, 1:] > resized[:, :-1])
+
+
+def phash(image: np.ndarray, hash_size: int = 8, highfreq_factor: int = 4) -> int:
+    """DCT hash: low-frequency DCT coefficients against their median.
+
+    Args:
+        image: Grayscale or BGR image
+        hash_size: Bits per side (8 gives a 64-bit hash)
+        highfreq_factor: Downscale size as a multiple of hash_size
+    """
+    size = hash_size * highfreq_factor
+    resized = _resize(image, size, size)
+    basis = _dct_matrix(size)
+    low_freq = (basis @ resized @ basis.T)[:hash_size, :hash_size]
+    return pack_bits(low_freq > np.median(low_freq))
+
+
+def compute_hash(image: np.ndarray, method: str = "phash", hash_size: int = 8) -> int:
+    """Compute a perceptual hash by method name."""
+    if method == "phash":
+        return phash(image, hash_size)
+    if method == "dhash":
+        return dhash(image, hash_size)
+    raise ValueError(f"Unknown hash method: {method}")
+
+
+__all__ = [
+    "HASH_METHODS",
+    "compute_hash",
+    "dhash",
+    "hamming_distance",
+    "pack_bits",
+    "phash",
+]
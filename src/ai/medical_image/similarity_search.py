@@ -2,10 +2,11 @@
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
-from scipy.spatial.distance import cosine
+
+from .image_indexing import ImageIndexer
 
 logger = logging.getLogger(__name__)
 
@@ -20,37 +21,90 @@ class SimilarityResult:
 
 
 class SimilaritySearchEngine:
-    """Search for similar medical images."""
+    """Search for similar medical images.
+
+    Cosine similarity against every indexed image is one matrix-vector
+    product over the indexer's normalized feature matrix, and the top k
+    are selected with a partial sort.
+    """
+
+    def __init__(self, index: Union[ImageIndexer, Dict[str, Any]]):
+        """Initialize similarity search engine.
+
+        Args:
+            index: An ImageIndexer, or a mapping of image ids to index entries
+        """
+        if isinstance(index, ImageIndexer):
+            self.indexer: Optional[ImageIndexer] = index
+            self._entries: Dict[str, Any] = {}
+        else:
+            self.indexer = None
+            self._entries = index
+        self._cached_ids: List[str] = []
+        self._cached_features: List[Any] = []
+        self._cached_matrix = np.zeros((0, 0), dtype=np.float32)
 
-    def __init__(self, index: Dict[str, Any]):
-        """Initialize similarity search engine."""
-        self.index = index
+    @property
+    def index(self) -> Dict[str, Any]:
+        """Entries being searched, read from the indexer on every use."""
+        # ImageIndexer.load() rebinds its dict, so it is never held here
+        if self.indexer is not None:
+            return self.indexer.index
+        return self._entries
 
     def search_similar(
         self, query_features: np.ndarray, top_k: int = 10
     ) -> List[SimilarityResult]:
         """Search for similar images based on features."""
-        results = []
+        ids, matrix = self._feature_matrix()
+        if not ids or top_k <= 0:
+            return []
 
-        for image_id, entry in self.index.items():
-            # Calculate similarity
-            similarity = self._calculate_similarity(query_features, entry.features)
+        query = np.asarray(query_features, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(query))
+        if norm == 0:
+            return []
+        similarities = matrix @ (query / norm)
 
-            results.append(
-                SimilarityResult(
-                    image_id=image_id,
-                    similarity_score=similarity,
-                    metadata=entry.metadata,
-                )
+        # Top k without sorting the whole index
+        k = min(top_k, len(ids))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+
+        return [
+            SimilarityResult(
+                image_id=ids[row],
+                similarity_score=float(similarities[row]),
+                metadata=self.index[ids[row]].metadata,
             )
+            for row in top
+        ]
 
-        # Sort by similarity and return top k
-        results.sort(key=lambda x: x.similarity_score, reverse=True)
-        return results[:top_k]
+    def _feature_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Normalized feature rows for the indexed images."""
+        if self.indexer is not None:
+            return self.indexer.feature_matrix()
 
-    def _calculate_similarity(
-        self, features1: np.ndarray, features2: np.ndarray
-    ) -> float:
-        """Calculate similarity between two feature vectors."""
-        # Use cosine similarity
-        return float(1 - cosine(features1, features2))
+        # Plain mappings are stacked once and restacked when an id is added
+        # or removed, or an id's features are replaced
+        index = self.index
+        if len(self._cached_ids) != len(index) or any(
+            image_id not in index or index[image_id].features is not features
+            for image_id, features in zip(self._cached_ids, self._cached_features)
+        ):
+            self._cached_ids = list(index)
+            self._cached_features = [
+                index[image_id].features for image_id in self._cached_ids
+            ]
+            if self._cached_ids:
+                matrix = np.vstack(
+                    [
+                        np.asarray(features, dtype=np.float32).ravel()
+                        for features in self._cached_features
+                    ]
+                )
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                self._cached_matrix = matrix / np.where(norms == 0, 1, norms)
+            else:
+                self._cached_matrix = np.zeros((0, 0), dtype=np.float32)
+        return self._cached_ids, self._cached_matrix
@@ -0,0 +1,202 @@
+"""DICOM study indexer module for medical image archives.
+
+Builds a metadata catalog for large DICOM archives by reading only the
+header of each file; pixel data is never read or decoded. Files are parsed
+in parallel worker processes, in chunks so per-file dispatch overhead stays
+small across thousands of files.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import pydicom
+
+    PYDICOM_AVAILABLE = True
+except ImportError:
+    PYDICOM_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Header elements read for each catalog entry
+CATALOG_KEYWORDS = [
+    "SOPInstanceUID",
+    "StudyInstanceUID",
+    "SeriesInstanceUID",
+    "PatientID",
+    "StudyDate",
+    "StudyDescription",
+    "SeriesNumber",
+    "SeriesDescription",
+    "Modality",
+    "InstanceNumber",
+    "Rows",
+    "Columns",
+    "NumberOfFrames",
+    "BitsAllocated",
+]
+
+DICOM_EXTENSIONS = {".dcm", ".dicom", ".dic"}
+DICOM_MAGIC_OFFSET = 128
+DICOM_MAGIC = b"DICM"
+
+
+def read_catalog_entry(file_path: str) -> Dict[str, Any]:
+    """Read the catalog fields of one DICOM file, stopping before pixels."""
+    ds = pydicom.dcmread(
+        file_path, stop_before_pixels=True, specific_tags=CATALOG_KEYWORDS
+    )
+    file_meta = getattr(ds, "file_meta", None)
+    return {
+        "path": file_path,
+        "file_size": os.path.getsize(file_path),
+        "transfer_syntax": str(getattr(file_meta, "TransferSyntaxUID", "")),
+        "sop_instance_uid": str(getattr(ds, "SOPInstanceUID", "")),
+        "study_instance_uid": str(getattr(ds, "StudyInstanceUID", "")),
+        "series_instance_uid": str(getattr(ds, "SeriesInstanceUID", "")),
+        "patient_id": str(getattr(ds, "PatientID", "")),
+        "study_date": str(getattr(ds, "StudyDate", "")),
+        "study_description": str(getattr(ds, "StudyDescription", "")),
+        "series_number": str(getattr(ds, "SeriesNumber", "")),
+        "series_description": str(getattr(ds, "SeriesDescription", "")),
+        "modality": str(getattr(ds, "Modality", "")),
+        "instance_number": str(getattr(ds, "InstanceNumber", "")),
+        "rows": int(getattr(ds, "Rows", 0) or 0),
+        "columns": int(getattr(ds, "Columns", 0) or 0),
+        "number_of_frames": int(getattr(ds, "NumberOfFrames", 1) or 1),
+        "bits_allocated": int(getattr(ds, "BitsAllocated", 0) or 0),
+    }
+
+
+def _read_entry_safe(file_path: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Read a catalog entry, returning the error instead of raising."""
+    try:
+        return read_catalog_entry(file_path), ""
+    except Exception as e:  # pylint: disable=broad-except
+        return None, f"{type(e).__name__}: {e}"
+
+
+def is_dicom_file(path: Union[str, Path]) -> bool:
+    """Check for a DICOM extension or the DICM preamble marker."""
+    if Path(path).suffix.lower() in DICOM_EXTENSIONS:
+        return True
+    try:
+        with open(path, "rb") as fp:
+            fp.seek(DICOM_MAGIC_OFFSET)
+            return fp.read(len(DICOM_MAGIC)) == DICOM_MAGIC
+    except OSError:
+        return False
+
+
+def iter_dicom_files(root: Union[str, Path]) -> Iterator[str]:
+    """Walk a directory tree lazily, yielding DICOM file paths."""
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file() and is_dicom_file(entry.path):
+                        yield entry.path
+        except OSError as e:
+            logger.warning("Cannot scan directory %s: %s", directory, e)
+
+
+@dataclass
+class DICOMCatalog:
+    """Header metadata for a set of DICOM files."""
+
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+    def studies(self) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """Group entries by study and series instance UID."""
+        grouped: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for entry in self.entries:
+            series = grouped.setdefault(entry["study_instance_uid"], {})
+            series.setdefault(entry["series_instance_uid"], []).append(entry)
+        return grouped
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the catalog as JSON lines, one entry per line."""
+        with open(path, "w", encoding="utf-8") as fp:
+            for entry in self.entries:
+                fp.write(json.dumps(entry) + "\n")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "DICOMCatalog":
+        """Read a catalog written by save()."""
+        with open(path, encoding="utf-8") as fp:
+            return cls(entries=[json.loads(line) for line in fp if line.strip()])
+
+
+class DICOMStudyIndexer:
+    """Build header-only metadata catalogs for DICOM archives."""
+
+    def __init__(self, max_workers: Optional[int] = None, chunksize: int = 64):
+        """Initialize study indexer.
+
+        Args:
+            max_workers: Worker processes; 1 parses in this process
+            chunksize: Files sent to a worker per task
+        """
+        if not PYDICOM_AVAILABLE:
+            raise ImportError("pydicom is required for DICOM study indexing")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+
+    def index_directory(self, root: Union[str, Path]) -> DICOMCatalog:
+        """Catalog every DICOM file under a directory."""
+        return self.index_files(iter_dicom_files(root))
+
+    def index_files(self, file_paths: Iterable[str]) -> DICOMCatalog:
+        """Catalog DICOM files by header; unreadable files are recorded."""
+        paths = [str(path) for path in file_paths]
+        catalog = DICOMCatalog()
+
+        if self.max_workers <= 1 or len(paths) <= self.chunksize:
+            results: Iterable[Tuple[Optional[Dict[str, Any]], str]] = map(
+                _read_entry_safe, paths
+            )
+            self._collect(paths, results, catalog)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(
+                    _read_entry_safe, paths, chunksize=self.chunksize
+                )
+                self._collect(paths, results, catalog)
+
+        logger.info(
+            "Indexed %d DICOM files (%d unreadable)",
+            len(catalog.entries),
+            len(catalog.errors),
+        )
+        return catalog
+
+    def _collect(
+        self,
+        paths: List[str],
+        results: Iterable[Tuple[Optional[Dict[str, Any]], str]],
+        catalog: DICOMCatalog,
+    ) -> None:
+        """Add results to the catalog in input order."""
+        for path, (entry, error) in zip(paths, results):
+            if entry is None:
+                catalog.errors.append((path, error))
+            else:
+                catalog.entries.append(entry)
+
+
+__all__ = [
+    "DICOMCatalog",
+    "DICOMStudyIndexer",
+    "iter_dicom_files",
+    "read_catalog_entry",
+]
@@ -11,6 +11,7 @@ from .medical_abbreviations import (
 )
 from .negation import is_negated
 from .negation_detector import MedicalNegationDetector
+from .pipeline import AnnotatedDocument, ClinicalNLPPipeline, build_default_pipeline
 from .temporal import find_medical_temporal_patterns
 from .temporal_reasoning import MedicalTemporalReasoner
 
@@ -22,4 +23,7 @@ __all__ = [
     "is_negated",
     "MedicalTemporalReasoner",
     "find_medical_temporal_patterns",
+    "ClinicalNLPPipeline",
+    "AnnotatedDocument",
+    "build_default_pipeline",
 ]
@@ -307,10 +307,24 @@ class MedicalAbbreviationHandler:
             r"\b([A-Z]{2,}|[A-Z]/[A-Z]|[A-Z]\.[A-Z]\.?|[A-Z][a-z]{0,2})\b"
         )
 
-        # Compile specialty patterns
+        # Compile specialty patterns: one alternation per specialty, plus a
+        # single automaton over every indicator term used when resolving
         for specialty, terms in self.context_indicators.items():
-            patterns = [re.compile(rf"\b{term}\b", re.IGNORECASE) for term in terms]
-            self.context_patterns[specialty] = patterns
+            self.context_patterns[specialty] = [
+                re.compile(
+                    r"\b(?:" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE
+                )
+            ]
+
+        all_terms = {
+            term.lower() for terms in self.context_indicators.values() for term in terms
+        }
+        self.context_pattern = re.compile(
+            r"\b(?:"
+            + "|".join(map(re.escape, sorted(all_terms, key=len, reverse=True)))
+            + r")\b",
+            re.IGNORECASE,
+        )
 
     def detect_abbreviations(self, text: str) -> List[AbbreviationMatch]:
         """
@@ -356,72 +370,63 @@ class MedicalAbbreviationHandler:
         self, text: str, match: AbbreviationMatch, entry: AbbreviationEntry
     ) -> None:
         """Resolve ambiguous abbreviations based on context."""
-        # Extract context window
-        context_pattern = (
-            rf"(?:^|\s)(.{{0,50}})\b{re.escape(match.text)}\b(.{{0,50}})(?:\s|$)"
-        )
-        context_match = re.search(context_pattern, text, re.IGNORECASE)
-
-        if context_match:
-            before_context = (
-                context_match.group(1).lower() if context_match.group(1) else ""
-            )
-            after_context = (
-                context_match.group(2).lower() if context_match.group(2) else ""
-            )
-            full_context = f"{before_context} {after_context}"
-
-            # Check for specific contexts
-            context_scores: Dict[str, float] = {}
-
-            # Check predefined contexts
-            for context_key, expansion in entry.contexts.items():
-                if context_key in full_context:
-                    context_scores[expansion] = context_scores.get(expansion, 0) + 2.0
-
-            # Check specialty contexts
-            for specialty, patterns in self.context_patterns.items():
-                for pattern in patterns:
-                    if pattern.search(full_context):
-                        # Find expansions related to this specialty
-                        for expansion in entry.expansions:
-                            if specialty in expansion.lower() or any(
-                                term in expansion.lower()
-                                for term in self.context_indicators[specialty]
-                            ):
-                                context_scores[expansion] = (
-                                    context_scores.get(expansion, 0) + 1.0
-                                )
-                        match.context_clues.append(specialty)
-
-            # Check for direct term matches
-            for expansion in entry.expansions:
-                expansion_terms = expansion.lower().split()
-                for term in expansion_terms:
-                    if len(term) > 3 and term in full_context:
-                        context_scores[expansion] = (
-                            context_scores.get(expansion, 0) + 0.5
-                        )
-
-            # Select best expansion
-            if context_scores:
-                best_expansion = max(context_scores.items(), key=lambda x: x[1])
+        # Extract the context window around this occurrence: up to 50
+        # characters either side, within the same line
+        before_context = text[max(0, match.start - 50) : match.start]
+        before_context = before_context.rsplit("\n", 1)[-1].lower()
+        after_context = text[match.end : match.end + 50].split("\n", 1)[0].lower()
+        full_context = f"{before_context} {after_context}"
+
+        # Check for specific contexts
+        context_scores: Dict[str, float] = {}
+
+        # Check predefined contexts
+        for context_key, expansion in entry.contexts.items():
+            if context_key in full_context:
+                context_scores[expansion] = context_scores.get(expansion, 0) + 2.0
+
+        # Check specialty contexts: a single scan finds every indicator
+        # term present, then each matched term scores once
+        matched_terms = {
+            term_match.group(0).lower()
+            for term_match in self.context_pattern.finditer(full_context)
+        }
+        for specialty, terms in self.context_indicators.items():
+            for term in terms:
+                if term.lower() in matched_terms:
+                    # Find expansions related to this specialty
+                    for expansion in entry.expansions:
+                        if specialty in expansion.lower() or any(
+                            indicator in expansion.lower()
+                            for indicator in self.context_indicators[specialty]
+                        ):
+                            context_scores[expansion] = (
+                                context_scores.get(expansion, 0) + 1.0
+                            )
+                    match.context_clues.append(specialty)
+
+        # Check for direct term matches
+        for expansion in entry.expansions:
+            expansion_terms = expansion.lower().split()
+            for term in expansion_terms:
+                if len(term) > 3 and term in full_context:
+                    context_scores[expansion] = context_scores.get(expansion, 0) + 0.5
+
+        # Select best expansion
+        if context_scores:
+            best_expansion = max(context_scores.items(), key=lambda x: x[1])
+            match.selected_expansion = best_expansion[0]
+            match.confidence = min(1.0, best_expansion[1] / 3.0)  # Normalize confidence
+        else:
+            # Use frequency-based selection
+            if entry.usage_frequency:
+                best_expansion = max(entry.usage_frequency.items(), key=lambda x: x[1])
                 match.selected_expansion = best_expansion[0]
-                match.confidence = min(
-                    1.0, best_expansion[1] / 3.0
-                )  # Normalize confidence
+                match.confidence = best_expansion[1]
             else:
-                # Use frequency-based selection
-                if entry.usage_frequency:
-                    best_expansion = max(
-                        entry.usage_frequency.items(), key=lambda x: x[1]
-                    )
-                    match.selected_expansion = best_expansion[0]
-                    match.confidence = best_expansion[1]
-                else:
-                    # Default to first expansion
-                    match.selected_expansion = entry.expansions[0]
-                    match.confidence = 0.5
+                # Default to first expansion
+                match.selected_expansion = entry.expansions[0]
+                match.confidence = 0.5
 
     def expand_abbreviations(
         self,
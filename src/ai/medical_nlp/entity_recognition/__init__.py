@@ -7,7 +7,7 @@ Entity recognition for medical texts with encrypted PHI and access control valid
 
 from typing import List
 
-from .base import MedicalEntityRecognizer
+from .base import MedicalEntityRecognizer, shared_document
 from .disease import DiseaseExtractor
 from .medication import MedicationExtractor
 from .procedure import ProcedureExtractor
@@ -19,6 +19,7 @@ __all__ = [
     "MedicationExtractor",
     "ProcedureExtractor",
     "SymptomDetector",
+    "shared_document",
 ]
 
 
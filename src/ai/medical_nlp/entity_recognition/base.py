@@ -6,14 +6,30 @@ Base class for medical entity recognition.
 
 import logging
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 try:
     import spacy
 except ImportError:
     spacy = None
 
+# Parsed document shared by every recognizer while a pipeline processes a
+# note, so each note is parsed once rather than once per recognizer
+_shared_doc: ContextVar[Optional[Any]] = ContextVar("shared_doc", default=None)
+
+
+@contextmanager
+def shared_document(doc: Any) -> Iterator[Any]:
+    """Make recognizers reuse an existing parse of the same text."""
+    token = _shared_doc.set(doc)
+    try:
+        yield doc
+    finally:
+        _shared_doc.reset(token)
+
 
 @dataclass
 class MedicalEntity:
@@ -97,7 +113,10 @@ class MedicalEntityRecognizer(ABC):
         """
 
     def process_text(self, text: str) -> Any:
-        """Process text with spaCy pipeline."""
+        """Process text with spaCy pipeline, reusing a shared parse."""
+        doc = _shared_doc.get()
+        if doc is not None and doc.text == text:
+            return doc
         return self.nlp(text)
 
     def _create_entity(
@@ -161,8 +180,9 @@ class MedicalEntityRecognizer(ABC):
 
         # Process in batches
         for doc in self.nlp.pipe(texts, batch_size=batch_size):
-            # Extract entities for this document
-            entities = self.extract_entities(doc.text)
+            # Extract entities for this document without parsing it again
+            with shared_document(doc):
+                entities = self.extract_entities(doc.text)
             results.append(entities)
 
         return results
@@ -5,7 +5,8 @@ Main class for detecting negated medical concepts in clinical text.
 
 import logging
 import re
-from typing import Any, List, Optional, Tuple
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 try:
     import spacy
@@ -127,25 +128,56 @@ class MedicalNegationDetector:
             r"\b(" + "|".join(trigger_patterns) + r")\b", re.IGNORECASE
         )
 
+        # Trigger lookup by matched text (first definition wins)
+        self.triggers_by_text: Dict[str, NegationTrigger] = {}
+        for trigger in self.negation_triggers:
+            self.triggers_by_text.setdefault(trigger.text.lower(), trigger)
+
         # Compile pseudo-negation patterns
         self.pseudo_patterns = [
             (re.compile(pattern, re.IGNORECASE), reason)
             for pattern, reason in self.pseudo_negation_patterns
         ]
 
+        # All pseudo-negation patterns merged into one automaton; the
+        # matching alternative's group name maps back to its reason
+        self.pseudo_reasons = {
+            f"p{index}": reason
+            for index, (_, reason) in enumerate(self.pseudo_negation_patterns)
+        }
+        self.pseudo_pattern = re.compile(
+            "|".join(
+                f"(?P<p{index}>{pattern})"
+                for index, (pattern, _) in enumerate(self.pseudo_negation_patterns)
+            ),
+            re.IGNORECASE,
+        )
+
         # Medical concept pattern (simplified)
         self.concept_pattern = re.compile(
             r"\b(\w+(?:\s+\w+){0,3})\b"  # 1-4 word concepts
         )
 
+        # Substring automaton over every medical concept indicator
+        self.indicator_pattern = re.compile(
+            "|".join(re.escape(indicator) for indicator in MEDICAL_CONCEPT_INDICATORS)
+        )
+
     def detect_negations(
-        self, text: str, concepts: Optional[List[str]] = None
+        self,
+        text: str,
+        concepts: Optional[List[str]] = None,
+        doc: Optional[Any] = None,
+        tokens: Optional[Sequence[Tuple[int, int]]] = None,
     ) -> List[NegatedConcept]:
         """Detect negated concepts in text.
 
         Args:
             text: Medical text to analyze
             concepts: Optional list of specific concepts to check
+            doc: Optional spaCy parse of text, reused instead of parsing again
+            tokens: Optional whitespace token offsets of text, reused for
+                negation scopes instead of re-splitting the text per trigger
 
         Returns:
             List of negated concepts found
@@ -153,16 +185,17 @@ class MedicalNegationDetector:
         negated_concepts = []
 
         # Use spaCy if available and loaded
-        if self.nlp is not None:
+        if doc is not None or self.nlp is not None:
             try:
-                doc = self.nlp(text)
+                if doc is None:
+                    doc = self.nlp(text)  # type: ignore[misc]
                 negated_concepts.extend(self._spacy_negation_detection(doc, concepts))
             except (RuntimeError, ValueError, AttributeError) as e:
                 logger.warning("SpaCy processing failed: %s", e)
                 # Fall through to rule-based detection
 
         # Always run rule-based detection
-        negated_concepts.extend(self._rule_based_detection(text, concepts))
+        negated_concepts.extend(self._rule_based_detection(text, concepts, tokens))
 
         # Remove duplicates and merge results
         negated_concepts = self._merge_results(negated_concepts)
@@ -173,10 +206,14 @@ class MedicalNegationDetector:
         return negated_concepts
 
     def _rule_based_detection(
-        self, text: str, concepts: Optional[List[str]] = None
+        self,
+        text: str,
+        concepts: Optional[List[str]] = None,
+        tokens: Optional[Sequence[Tuple[int, int]]] = None,
     ) -> List[NegatedConcept]:
         """Rule-based negation detection."""
         negated = []
+        token_starts = [start for start, _ in tokens] if tokens is not None else None
 
         # Find all negation triggers
         for match in self.trigger_pattern.finditer(text):
@@ -185,11 +222,7 @@ class MedicalNegationDetector:
             trigger_end = match.end()
 
             # Find matching trigger object
-            trigger = next(
-                t
-                for t in self.negation_triggers
-                if t.text.lower() == trigger_text.lower()
-            )
+            trigger = self.triggers_by_text[trigger_text.lower()]
 
             # Determine scope based on trigger type
             if trigger.scope_type in [
@@ -198,15 +231,25 @@ class MedicalNegationDetector:
                 NegationScope.UNCERTAIN,
             ]:
                 # Look forward for concepts
-                scope_text = self._get_forward_scope(
-                    text, trigger_end, trigger.max_scope
-                )
+                if tokens is not None and token_starts is not None:
+                    scope_text = self._forward_scope_from_tokens(
+                        text, tokens, token_starts, trigger_end, trigger.max_scope
+                    )
+                else:
+                    scope_text = self._get_forward_scope(
+                        text, trigger_end, trigger.max_scope
+                    )
                 scope_start = trigger_end
             else:
                 # Look backward for concepts
-                scope_text = self._get_backward_scope(
-                    text, trigger_start, trigger.max_scope
-                )
+                if tokens is not None and token_starts is not None:
+                    scope_text = self._backward_scope_from_tokens(
+                        text, tokens, token_starts, trigger_start, trigger.max_scope
+                    )
+                else:
+                    scope_text = self._get_backward_scope(
+                        text, trigger_start, trigger.max_scope
+                    )
                 scope_start = max(0, trigger_start - len(scope_text))
 
             # Find concepts in scope
@@ -320,6 +363,54 @@ class MedicalNegationDetector:
 
         return " ".join(scope_tokens)
 
+    def _forward_scope_from_tokens(
+        self,
+        text: str,
+        tokens: Sequence[Tuple[int, int]],
+        token_starts: List[int],
+        start_pos: int,
+        max_tokens: int,
+    ) -> str:
+        """Forward scope from precomputed token offsets.
+
+        Equivalent to _get_forward_scope without re-splitting the text.
+        """
+        index = bisect_left(token_starts, start_pos)
+        scope_tokens = []
+        # A token straddling start_pos contributes its remainder
+        if index > 0 and tokens[index - 1][1] > start_pos:
+            index -= 1
+        for start, end in tokens[index : index + max_tokens]:
+            token = text[max(start, start_pos) : end]
+            if token.lower() in self.scope_terminators:
+                break
+            scope_tokens.append(token)
+
+        return " ".join(scope_tokens)
+
+    def _backward_scope_from_tokens(
+        self,
+        text: str,
+        tokens: Sequence[Tuple[int, int]],
+        token_starts: List[int],
+        end_pos: int,
+        max_tokens: int,
+    ) -> str:
+        """Backward scope from precomputed token offsets.
+
+        Equivalent to _get_backward_scope without re-splitting the text.
+        """
+        index = bisect_left(token_starts, end_pos)
+        scope_tokens: List[str] = []
+        for start, end in reversed(tokens[max(0, index - max_tokens) : index]):
+            # A token straddling end_pos contributes its prefix
+            token = text[start : min(end, end_pos)]
+            if token.lower() in self.scope_terminators:
+                break
+            scope_tokens.insert(0, token)
+
+        return " ".join(scope_tokens)
+
     def _spacy_negation_detection(
         self, doc: Any, concepts: Optional[List[str]] = None
     ) -> List[NegatedConcept]:
@@ -358,8 +449,7 @@ class MedicalNegationDetector:
 
     def _is_medical_concept(self, text: str) -> bool:
         """Check if text is likely a medical concept."""
-        text_lower = text.lower()
-        return any(indicator in text_lower for indicator in MEDICAL_CONCEPT_INDICATORS)
+        return self.indicator_pattern.search(text.lower()) is not None
 
     def _merge_results(
         self, negated_concepts: List[NegatedConcept]
@@ -393,12 +483,14 @@ class MedicalNegationDetector:
                 max(0, concept.trigger_start - 10) : min(len(text), concept.end + 10)
             ]
 
-            for pattern, reason in self.pseudo_patterns:
-                if pattern.search(context):
-                    concept.is_pseudo_negation = True
-                    concept.confidence *= 0.3  # Reduce confidence
-                    logger.debug("Pseudo-negation detected: %s", reason)
-                    break
+            pseudo_match = self.pseudo_pattern.search(context)
+            if pseudo_match:
+                concept.is_pseudo_negation = True
+                concept.confidence *= 0.3  # Reduce confidence
+                logger.debug(
+                    "Pseudo-negation detected: %s",
+                    self.pseudo_reasons[str(pseudo_match.lastgroup)],
+                )
 
             # Special cases
             if (
@@ -0,0 +1,285 @@
+"""Single-Pass Clinical NLP Pipeline.
+
+Parses each note once into a shared annotated document and runs every
+component as a stage over it. Stages reuse the document's token offsets and
+spaCy parse instead of re-tokenizing or re-parsing the note, and the
+abbreviation and temporal components scan with their combined automata.
+
+Corpora are processed in batches with pipe(); n_process > 1 spreads batches
+over worker processes, each holding its own copy of the pipeline.
+"""
+
+import logging
+import re
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+from .abbreviations import AbbreviationMatch, MedicalAbbreviationHandler
+from .entity_recognition.base import (
+    MedicalEntity,
+    MedicalEntityRecognizer,
+    shared_document,
+)
+from .negation_detector import MedicalNegationDetector
+from .negation_types import NegatedConcept
+from .temporal import MedicalTemporalReasoner, TemporalExpression
+
+logger = logging.getLogger(__name__)
+
+# Whitespace tokens, matching str.split() so stage results are unchanged
+TOKEN_PATTERN = re.compile(r"\S+")
+
+
+@dataclass
+class AnnotatedDocument:
+    """A clinical note with the annotations added by each stage."""
+
+    text: str
+    tokens: List[Tuple[int, int]]  # Character offsets of whitespace tokens
+    spacy_doc: Optional[Any] = None
+    abbreviations: List[AbbreviationMatch] = field(default_factory=list)
+    temporal_expressions: List[TemporalExpression] = field(default_factory=list)
+    entities: List[MedicalEntity] = field(default_factory=list)
+    negations: List[NegatedConcept] = field(default_factory=list)
+
+    @classmethod
+    def from_text(
+        cls, text: str, spacy_doc: Optional[Any] = None
+    ) -> "AnnotatedDocument":
+        """Tokenize a note once."""
+        tokens = [match.span() for match in TOKEN_PATTERN.finditer(text)]
+        return cls(text=text, tokens=tokens, spacy_doc=spacy_doc)
+
+
+class PipelineStage(ABC):
+    """A component run over a shared annotated document."""
+
+    name = "stage"
+
+    @abstractmethod
+    def __call__(self, doc: AnnotatedDocument) -> None:
+        """Add this stage's annotations to the document."""
+
+
+class AbbreviationStage(PipelineStage):
+    """Detect and resolve medical abbreviations."""
+
+    name = "abbreviations"
+
+    def __init__(self, handler: Optional[MedicalAbbreviationHandler] = None):
+        """Initialize abbreviation stage."""
+        self.handler = handler or MedicalAbbreviationHandler()
+
+    def __call__(self, doc: AnnotatedDocument) -> None:
+        """Annotate abbreviations."""
+        doc.abbreviations = self.handler.detect_abbreviations(doc.text)
+
+
+class TemporalStage(PipelineStage):
+    """Extract temporal expressions with the combined temporal automaton."""
+
+    name = "temporal"
+
+    def __init__(self, reasoner: Optional[MedicalTemporalReasoner] = None):
+        """Initialize temporal stage."""
+        self.reasoner = reasoner or MedicalTemporalReasoner()
+
+    def __call__(self, doc: AnnotatedDocument) -> None:
+        """Annotate temporal expressions."""
+        doc.temporal_expressions = self.reasoner.scan_temporal_expressions(doc.text)
+
+
+class EntityStage(PipelineStage):
+    """Run entity recognizers over the document's shared parse."""
+
+    name = "entities"
+
+    def __init__(self, recognizers: List[MedicalEntityRecognizer]):
+        """Initialize entity stage."""
+        self.recognizers = recognizers
+
+    def __call__(self, doc: AnnotatedDocument) -> None:
+        """Annotate medical entities."""
+        entities: List[MedicalEntity] = []
+        if doc.spacy_doc is not None:
+            with shared_document(doc.spacy_doc):
+                for recognizer in self.recognizers:
+                    entities.extend(recognizer.extract_entities(doc.text))
+        else:
+            for recognizer in self.recognizers:
+                entities.extend(recognizer.extract_entities(doc.text))
+        doc.entities = sorted(entities, key=lambda entity: entity.start)
+
+
+class NegationStage(PipelineStage):
+    """Detect negations, checking recognized entities when there are any."""
+
+    name = "negation"
+
+    def __init__(self, detector: Optional[MedicalNegationDetector] = None):
+        """Initialize negation stage."""
+        self.detector = detector or MedicalNegationDetector(use_spacy=False)
+
+    def __call__(self, doc: AnnotatedDocument) -> None:
+        """Annotate negated concepts."""
+        concepts = list(dict.fromkeys(entity.text for entity in doc.entities))
+        doc.negations = self.detector.detect_negations(
+            doc.text,
+            concepts or None,
+            doc=doc.spacy_doc,
+            tokens=doc.tokens,
+        )
+
+
+class ClinicalNLPPipeline:
+    """Run clinical NLP stages over notes parsed once each."""
+
+    def __init__(
+        self,
+        stages: Optional[List[PipelineStage]] = None,
+        nlp: Optional[Any] = None,
+    ):
+        """Initialize pipeline.
+
+        Args:
+            stages: Stages in run order (defaults to abbreviations, temporal
+                and rule-based negation)
+            nlp: Optional spaCy pipeline; when set, each note is parsed once
+                and the parse is shared by every stage
+        """
+        self.stages = (
+            stages
+            if stages is not None
+            else [AbbreviationStage(), TemporalStage(), NegationStage()]
+        )
+        self.nlp = nlp
+
+    @property
+    def stage_names(self) -> List[str]:
+        """Names of the stages in run order."""
+        return [stage.name for stage in self.stages]
+
+    def __call__(self, text: str) -> AnnotatedDocument:
+        """Process one note."""
+        spacy_doc = self.nlp(text) if self.nlp is not None else None
+        return self._annotate(text, spacy_doc)
+
+    def pipe(
+        self,
+        texts: Iterable[str],
+        batch_size: int = 64,
+        n_process: int = 1,
+        factory: Optional[Callable[[], "ClinicalNLPPipeline"]] = None,
+    ) -> Iterator[AnnotatedDocument]:
+        """Process a corpus of notes in batches.
+
+        Args:
+            texts: Notes to process
+            batch_size: Notes per batch (and per spaCy pipe batch)
+            n_process: Worker processes; 1 processes in this process
+            factory: Picklable callable building the pipeline in each worker;
+                defaults to sending this pipeline to the workers
+
+        Yields:
+            Annotated documents in input order. Documents produced by worker
+            processes do not carry the spaCy parse.
+        """
+        batches = _batched(texts, max(1, batch_size))
+        if n_process <= 1:
+            for batch in batches:
+                yield from self._process_batch(batch)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=n_process,
+            initializer=_init_worker,
+            initargs=(factory or self,),
+        ) as executor:
+            # Keep a bounded window of batches in flight so large corpora
+            # are not read into memory up front
+            pending: Deque[Future] = deque()
+            for batch in batches:
+                pending.append(executor.submit(_process_in_worker, batch))
+                if len(pending) >= n_process * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _process_batch(self, texts: List[str]) -> List[AnnotatedDocument]:
+        """Parse a batch together and run the stages over each note."""
+        if self.nlp is not None:
+            spacy_docs: Iterable[Any] = self.nlp.pipe(texts, batch_size=len(texts))
+        else:
+            spacy_docs = [None] * len(texts)
+        return [
+            self._annotate(text, spacy_doc)
+            for text, spacy_doc in zip(texts, spacy_docs)
+        ]
+
+    def _annotate(self, text: str, spacy_doc: Optional[Any]) -> AnnotatedDocument:
+        """Run every stage over one document."""
+        doc = AnnotatedDocument.from_text(text, spacy_doc)
+        for stage in self.stages:
+            try:
+                stage(doc)
+            except (RuntimeError, ValueError, KeyError, AttributeError) as e:
+                logger.warning("Pipeline stage %s failed: %s", stage.name, e)
+        return doc
+
+
+def build_default_pipeline(use_spacy: bool = False) -> ClinicalNLPPipeline:
+    """Build the default pipeline.
+
+    With use_spacy, the negation detector's spaCy model is also the
+    pipeline's shared parser.
+    """
+    detector = MedicalNegationDetector(use_spacy=use_spacy)
+    return ClinicalNLPPipeline(
+        stages=[AbbreviationStage(), TemporalStage(), NegationStage(detector)],
+        nlp=detector.nlp,
+    )
+
+
+def _batched(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Split an iterable of notes into lists of at most size notes."""
+    iterator = iter(texts)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# Pipeline held by each worker process
+_worker_pipeline: Optional[ClinicalNLPPipeline] = None
+
+
+def _init_worker(
+    source: "ClinicalNLPPipeline | Callable[[], ClinicalNLPPipeline]",
+) -> None:
+    """Build or receive the pipeline for this worker process."""
+    global _worker_pipeline  # pylint: disable=global-statement
+    _worker_pipeline = source if isinstance(source, ClinicalNLPPipeline) else source()
+
+
+def _process_in_worker(texts: List[str]) -> List[AnnotatedDocument]:
+    """Process a batch in a worker; parses are dropped before pickling."""
+    if _worker_pipeline is None:
+        raise RuntimeError("Pipeline worker was not initialized")
+    docs = _worker_pipeline._process_batch(texts)  # pylint: disable=protected-access
+    for doc in docs:
+        doc.spacy_doc = None
+    return docs
+
+
+__all__ = [
+    "AnnotatedDocument",
+    "PipelineStage",
+    "AbbreviationStage",
+    "TemporalStage",
+    "EntityStage",
+    "NegationStage",
+    "ClinicalNLPPipeline",
+    "build_default_pipeline",
+]
@@ -11,7 +11,7 @@ import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 class TemporalType(Enum):
@@ -66,6 +66,28 @@ class MedicalTemporalReasoner:
             ],
         }
 
+        # All patterns merged into one automaton. Each alternative gets a
+        # named group so a match maps back to its type; longer (more
+        # specific) patterns come first so "3 days ago" wins over "3 days".
+        self._alternatives: Dict[str, Tuple[TemporalType, str]] = {}
+        branches = []
+        ordered = sorted(
+            (
+                (pattern, temp_type, pattern_name)
+                for temp_type, patterns in self.patterns.items()
+                for pattern, pattern_name in patterns
+            ),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        for index, (pattern, temp_type, pattern_name) in enumerate(ordered):
+            group = f"p{index}"
+            self._alternatives[group] = (temp_type, pattern_name)
+            # Inner groups become non-capturing so group names stay unique
+            inner = re.sub(r"\((?!\?)", "(?:", pattern)
+            branches.append(f"(?P<{group}>{inner})")
+        self.combined_pattern = re.compile("|".join(branches), re.IGNORECASE)
+
     def extract_temporal_expressions(self, text: str) -> List[TemporalExpression]:
         """Extract all temporal expressions from text."""
         expressions = []
@@ -87,6 +109,25 @@ class MedicalTemporalReasoner:
         expressions.sort(key=lambda x: x.start_pos)
         return expressions
 
+    def scan_temporal_expressions(self, text: str) -> List[TemporalExpression]:
+        """Extract temporal expressions in a single pass over the text.
+
+        Uses the combined automaton, so overlapping matches resolve to the
+        most specific pattern instead of being reported once per pattern.
+        """
+        expressions = []
+        for match in self.combined_pattern.finditer(text):
+            temp_type, pattern_name = self._alternatives[str(match.lastgroup)]
+            expr = TemporalExpression(
+                text=match.group(0),
+                start_pos=match.start(),
+                end_pos=match.end(),
+                temporal_type=temp_type,
+            )
+            self._normalize(expr, pattern_name)
+            expressions.append(expr)
+        return expressions
+
     def _normalize(self, expr: TemporalExpression, pattern_name: str) -> None:
         """Normalize temporal expression."""
         text = expr.text.lower()
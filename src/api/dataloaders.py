@@ -0,0 +1,405 @@
+"""Request-scoped batching loaders for GraphQL resolvers.
+
+Resolvers ask a loader for one key at a time. Strawberry's async resolvers
+call ``await loader.load(key)``; every key requested in the same event-loop
+tick is fetched with a single ``IN (...)`` query. Graphene's synchronous
+resolvers call ``load_sync``/``load_many_sync``, and list resolvers prime
+the loaders with rows they already fetched, so field resolvers further
+down the tree are answered from the per-request cache instead of issuing
+one SELECT per row.
+
+A fresh ``RequestLoaders`` is created for every GraphQL request (see
+``get_loaders``). Cached rows are never shared between requests or users.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from src.models.health_record import HealthRecord as HealthRecordModel
+from src.models.organization import Organization
+from src.models.patient import Patient as PatientModel
+from src.models.record_access_grant import RecordAccessGrant
+from src.models.verification import Verification as VerificationModel
+from src.models.verification import VerificationStatus
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Keys per IN (...) query; larger batches are split
+DEFAULT_MAX_BATCH_SIZE = 500
+
+
+class DataLoader(Generic[K, V]):
+    """Batch and cache lookups by key for the lifetime of one request."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Dict[K, V]],
+        default_factory: Optional[Callable[[], V]] = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        name: str = "",
+    ):
+        """Initialize the loader.
+
+        Args:
+            batch_fn: Fetches many keys at once, returning found values by key
+            default_factory: Builds the value cached for keys with no row
+                (None if not given)
+            max_batch_size: Maximum keys passed to one batch_fn call
+            name: Label used in log messages
+        """
+        self.batch_fn = batch_fn
+        self.default_factory = default_factory
+        self.max_batch_size = max_batch_size
+        self.name = name or getattr(batch_fn, "__name__", "loader")
+        self.batch_count = 0
+        self._cache: Dict[K, V] = {}
+        self._pending: Dict[K, "asyncio.Future[V]"] = {}
+        self._pending_seen = 0
+
+    def _default(self) -> V:
+        """Value cached for a key with no matching row."""
+        if self.default_factory is None:
+            return None  # type: ignore[return-value]
+        return self.default_factory()
+
+    def _fetch(self, keys: List[K]) -> None:
+        """Run batch_fn over keys missing from the cache."""
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = keys[start : start + self.max_batch_size]
+            results = self.batch_fn(chunk)
+            self.batch_count += 1
+            for key in chunk:
+                self._cache[key] = results[key] if key in results else self._default()
+
+    def prime(self, key: K, value: V) -> None:
+        """Cache a value fetched elsewhere, keeping any value already cached."""
+        self._cache.setdefault(key, value)
+
+    def prime_many(self, values: Dict[K, V]) -> None:
+        """Cache several values fetched elsewhere."""
+        for key, value in values.items():
+            self.prime(key, value)
+
+    def clear(self, key: Optional[K] = None) -> None:
+        """Forget one cached key, or all of them, e.g. after a mutation."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def load_many_sync(self, keys: Iterable[K]) -> List[V]:
+        """Load keys from the cache, fetching all misses in one batch."""
+        keys = list(keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in self._cache]
+        if missing:
+            self._fetch(missing)
+        return [self._cache[key] for key in keys]
+
+    def load_sync(self, key: K) -> V:
+        """Load one key, for synchronous resolvers."""
+        return self.load_many_sync([key])[0]
+
+    async def load(self, key: K) -> V:
+        """Load one key, batched with other loads in the same loop tick."""
+        if key in self._cache:
+            return self._cache[key]
+
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            if not self._pending:
+                # Dispatch after the other resolvers have queued their keys
+                self._pending_seen = 0
+                loop.call_soon(self._dispatch)
+            self._pending[key] = future
+        return await future
+
+    async def load_many(self, keys: Iterable[K]) -> List[V]:
+        """Load several keys, batched with other pending loads."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        """Fetch every pending key and resolve the waiting futures."""
+        if len(self._pending) != self._pending_seen:
+            # Keys arrived during the last tick; give sibling tasks (e.g.
+            # from load_many or nested gathers) one more tick to queue theirs
+            self._pending_seen = len(self._pending)
+            asyncio.get_running_loop().call_soon(self._dispatch)
+            return
+
+        pending, self._pending = self._pending, {}
+        try:
+            self._fetch([key for key in pending if key not in self._cache])
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f"Error loading batch for {self.name}: {e}")
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(self._cache[key])
+
+
+def is_active_verification(
+    verification: VerificationModel, now: Optional[datetime] = None
+) -> bool:
+    """Match Verification.get_active_verifications for an already loaded row."""
+    if verification.status != VerificationStatus.COMPLETED or verification.revoked:
+        return False
+    expires_at = verification.expires_at
+    if expires_at is None:
+        return True
+    if now is None:
+        now = datetime.now(timezone.utc) if expires_at.tzinfo else datetime.utcnow()
+    return bool(expires_at > now)
+
+
+def filter_verifications(
+    verifications: List[VerificationModel],
+    verification_type: Optional[str] = None,
+    active_only: bool = True,
+) -> List[VerificationModel]:
+    """Filter a patient's loaded verifications like get_patient_verifications."""
+    return [
+        verification
+        for verification in verifications
+        if (
+            verification_type is None
+            or verification.verification_type == verification_type
+        )
+        and (not active_only or is_active_verification(verification))
+    ]
+
+
+def verification_record_ids(verification: VerificationModel) -> List[str]:
+    """Health record IDs referenced by a verification's evidence."""
+    evidence_list = verification.evidence_provided
+    if not isinstance(evidence_list, list):
+        return []
+    return [
+        str(evidence["data"]["record_id"])
+        for evidence in evidence_list
+        if isinstance(evidence, dict)
+        and isinstance(evidence.get("data"), dict)
+        and evidence["data"].get("record_id")
+    ]
+
+
+class RequestLoaders:
+    """The loaders available to resolvers during one GraphQL request."""
+
+    def __init__(self, db: Optional[Session]):
+        """Initialize loaders reading through the request's session.
+
+        Args:
+            db: Session used for batch queries; graphene resolvers rebind
+                it to their own session through get_loaders()
+        """
+        self.db = db
+        self.patients: DataLoader[UUID, Optional[PatientModel]] = DataLoader(
+            self._load_patients, name="patients"
+        )
+        self.health_records: DataLoader[UUID, Optional[HealthRecordModel]] = DataLoader(
+            self._load_health_records, name="health_records"
+        )
+        # All verifications of a patient, newest first
+        self.verifications: DataLoader[UUID, List[VerificationModel]] = DataLoader(
+            self._load_verifications, default_factory=list, name="verifications"
+        )
+        self.organizations: DataLoader[str, Optional[Organization]] = DataLoader(
+            self._load_organizations, name="organizations"
+        )
+        # Completed verifications per verifier organization name
+        self.verifier_counts: DataLoader[str, int] = DataLoader(
+            self._load_verifier_counts, default_factory=int, name="verifier_counts"
+        )
+        # Whether a viewer holds an active grant on a record, by
+        # (viewer_id, record_id)
+        self.record_grants: DataLoader[Tuple[str, UUID], bool] = DataLoader(
+            self._load_record_grants, default_factory=bool, name="record_grants"
+        )
+        # Whether a viewer holds an active grant on any of a patient's
+        # records, by (viewer_id, patient_id)
+        self.patient_grants: DataLoader[Tuple[str, UUID], bool] = DataLoader(
+            self._load_patient_grants, default_factory=bool, name="patient_grants"
+        )
+
+    def _session(self) -> Session:
+        """Session for batch queries."""
+        if self.db is None:
+            raise ValueError("Database connection not available")
+        return self.db
+
+    def _load_patients(self, ids: List[UUID]) -> Dict[UUID, PatientModel]:
+        """Fetch non-deleted patients by ID."""
+        rows = (
+            self._session()
+            .query(PatientModel)
+            .filter(PatientModel.id.in_(ids), PatientModel.deleted_at.is_(None))
+            .all()
+        )
+        return {row.id: row for row in rows}
+
+    def _load_health_records(self, ids: List[UUID]) -> Dict[UUID, HealthRecordModel]:
+        """Fetch non-deleted health records by ID."""
+        rows = (
+            self._session()
+            .query(HealthRecordModel)
+            .filter(
+                HealthRecordModel.id.in_(ids),
+                HealthRecordModel.deleted_at.is_(None),
+            )
+            .all()
+        )
+        return {row.id: row for row in rows}
+
+    def _load_verifications(
+        self, patient_ids: List[UUID]
+    ) -> Dict[UUID, List[VerificationModel]]:
+        """Fetch every verification of the given patients."""
+        rows = (
+            self._session()
+            .query(VerificationModel)
+            .filter(VerificationModel.patient_id.in_(patient_ids))
+            .order_by(VerificationModel.completed_at.desc())
+            .all()
+        )
+        by_patient: Dict[UUID, List[VerificationModel]] = defaultdict(list)
+        for row in rows:
+            by_patient[row.patient_id].append(row)
+        return by_patient
+
+    def _load_organizations(self, names: List[str]) -> Dict[str, Organization]:
+        """Fetch organizations by name."""
+        rows = (
+            self._session()
+            .query(Organization)
+            .filter(Organization.name.in_(names))
+            .all()
+        )
+        return {row.name: row for row in rows}
+
+    def _load_verifier_counts(self, names: List[str]) -> Dict[str, int]:
+        """Count completed verifications per verifier organization."""
+        rows = (
+            self._session()
+            .query(
+                VerificationModel.verifier_organization,
+                func.count(VerificationModel.id),
+            )
+            .filter(
+                VerificationModel.verifier_organization.in_(names),
+                VerificationModel.status == VerificationStatus.COMPLETED,
+            )
+            .group_by(VerificationModel.verifier_organization)
+            .all()
+        )
+        return {name: count for name, count in rows}
+
+    def _load_record_grants(
+        self, keys: List[Tuple[str, UUID]]
+    ) -> Dict[Tuple[str, UUID], bool]:
+        """Find which viewers hold active grants on which records."""
+        return self._active_grants(RecordAccessGrant.record_id, keys)
+
+    def _load_patient_grants(
+        self, keys: List[Tuple[str, UUID]]
+    ) -> Dict[Tuple[str, UUID], bool]:
+        """Find which viewers hold active grants on which patients' records."""
+        return self._active_grants(RecordAccessGrant.patient_id, keys)
+
+    def _active_grants(
+        self, column: Any, keys: List[Tuple[str, UUID]]
+    ) -> Dict[Tuple[str, UUID], bool]:
+        """Match (viewer_id, column value) keys to grants in effect now.
+
+        A grant is in effect from granted_at until expires_at, which is
+        open-ended when NULL.
+        """
+        now = datetime.utcnow()
+        rows = (
+            self._session()
+            .query(RecordAccessGrant.viewer_id, column)
+            .filter(
+                RecordAccessGrant.viewer_id.in_({viewer for viewer, _ in keys}),
+                column.in_({target for _, target in keys}),
+                RecordAccessGrant.granted_at <= now,
+                or_(
+                    RecordAccessGrant.expires_at.is_(None),
+                    RecordAccessGrant.expires_at > now,
+                ),
+            )
+            .distinct()
+            .all()
+        )
+        granted = {(viewer, target) for viewer, target in rows}
+        return {key: True for key in keys if key in granted}
+
+    def prime_health_records(self, records: Iterable[HealthRecordModel]) -> None:
+        """Cache records fetched by a list resolver."""
+        self.health_records.prime_many({record.id: record for record in records})
+
+    def prime_patients(self, patients: Iterable[PatientModel]) -> None:
+        """Cache patients fetched by a list resolver.
+
+        Soft-deleted rows are skipped, as _load_patients would not return
+        them.
+        """
+        self.patients.prime_many(
+            {patient.id: patient for patient in patients if patient.deleted_at is None}
+        )
+
+
+def get_loaders(info: Any, db: Optional[Session] = None) -> RequestLoaders:
+    """Get the request's loaders from the GraphQL context, creating them once.
+
+    Args:
+        info: Resolver info whose context is the per-request dict
+        db: Session the caller is working in; graphene resolvers open their
+            own session, and batch queries follow it
+
+    Returns:
+        The loaders shared by every resolver in the request
+    """
+    context = info.context
+    loaders: Optional[RequestLoaders] = context.get("loaders")
+    if loaders is None:
+        loaders = RequestLoaders(db if db is not None else context.get("db"))
+        context["loaders"] = loaders
+    elif db is not None:
+        loaders.db = db
+    return loaders
+
+
+__all__ = [
+    "DataLoader",
+    "RequestLoaders",
+    "filter_verifications",
+    "get_loaders",
+    "is_active_verification",
+    "verification_record_ids",
+]
@@ -6,11 +6,12 @@ including type system setup, extensions, and directives.
 This module implements PHI encryption and access control to ensure HIPAA compliance.
 """
 
+import inspect
 import logging
 import time
 import uuid
 from datetime import date, datetime
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 from uuid import UUID
 
 try:
@@ -26,6 +27,7 @@ except ImportError as e:
     raise
 
 # Import GraphQL components
+from src.api.dataloaders import RequestLoaders
 from src.api.graphql_audit import AuditExtension
 from src.api.graphql_versioning import VersioningExtension
 from src.api.mutations import Mutation
@@ -37,6 +39,7 @@ from src.config import get_settings
 from src.security.access_control import AccessPermission
 from src.security.audit import audit_phi_access
 from src.security.encryption import EncryptionService
+from src.services.query_monitoring import current_request_profile, query_scope
 
 logger = logging.getLogger(__name__)
 
@@ -141,6 +144,43 @@ class PerformanceExtension(Extension):
             )
 
 
+class QueryProfilingExtension(Extension):
+    """Extension attributing database statements to GraphQL resolvers.
+
+    Inside a profiled request, statements are labelled with the resolver
+    (e.g. "Patient.healthRecords") that issued them, so N+1 reports name
+    the resolver rather than just the /graphql endpoint.
+    """
+
+    def on_execute_start(self) -> None:
+        """Report the request under its operation name."""
+        profile = current_request_profile()
+        if profile is not None:
+            profile.operation = self.execution_context.operation_name or "anonymous"
+
+    def resolve(
+        self, _next: Callable, root: Any, info: Info, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Run the resolver inside a query scope named after its field."""
+        profile = current_request_profile()
+        if profile is None or not profile.sampled:
+            return _next(root, info, *args, **kwargs)
+
+        label = f"{info.parent_type.name}.{info.field_name}"
+        with query_scope(label):
+            result = _next(root, info, *args, **kwargs)
+        if inspect.isawaitable(result):
+            # Async resolvers run their queries when awaited
+            return self._await_in_scope(label, result)
+        return result
+
+    @staticmethod
+    async def _await_in_scope(label: str, result: Awaitable) -> Any:
+        """Await a resolver result with its query scope active."""
+        with query_scope(label):
+            return await result
+
+
 class PHIEncryptionExtension(Extension):
     """Extension for encrypting PHI in GraphQL responses."""
 
@@ -267,6 +307,7 @@ def create_graphql_schema() -> strawberry.Schema:
         extensions=[
             LoggingExtension,
             PerformanceExtension,
+            QueryProfilingExtension,  # Attribute queries to resolvers
             PHIEncryptionExtension,  # Add PHI encryption
             VersioningExtension,  # Add versioning support
             AuditExtension,  # Add audit logging
@@ -306,12 +347,18 @@ def create_graphql_router(schema: strawberry.Schema) -> GraphQLRouter:
 
 
 async def get_context(request: Any) -> Dict[str, Any]:
-    """Get context for GraphQL execution."""
+    """Get context for GraphQL execution.
+
+    Each request gets its own batching loaders, so cached rows never leak
+    between requests or users.
+    """
+    db = getattr(request.app.state, "db", None)
     return {
         "request": request,
         "user": getattr(request, "user", None),
-        "db": getattr(request.app.state, "db", None),
+        "db": db,
         "redis": getattr(request.app.state, "redis", None),
+        "loaders": RequestLoaders(db),
     }
 
 
@@ -8,14 +8,16 @@ It includes FHIR Resource typing and validation for healthcare data.
 """
 
 from datetime import date, datetime
-from typing import List, Optional, cast  # Any - Available if needed for future use
+from typing import Any, List, Optional, Tuple, cast
 from uuid import UUID, uuid4
 
 import strawberry
-from sqlalchemy import func, or_
+from graphql import GraphQLError
+from sqlalchemy import or_
 from sqlalchemy.orm import Query, Session
 from strawberry.types import Info
 
+from src.api.dataloaders import RequestLoaders
 from src.api.graphql_audit import AuditUtility
 from src.api.graphql_types import Gender as GraphQLGender
 from src.api.graphql_types import Patient
@@ -24,6 +26,7 @@ from src.api.graphql_types import RefugeeStatus as GraphQLRefugeeStatus
 # Security imports for HIPAA compliance - required by policy
 from src.healthcare.fhir.validators import FHIRValidator  # noqa: F401
 from src.models.patient import Patient as PatientModel
+from src.models.patient_search_key import name_token_matches
 from src.security.access_control import (  # noqa: F401
     AccessPermission,
     require_permission,
@@ -31,6 +34,12 @@ from src.security.access_control import (  # noqa: F401
 from src.security.audit import audit_log  # noqa: F401
 from src.security.encryption import EncryptionService  # noqa: F401
 from src.utils.logging import get_logger
+from src.utils.pagination import (
+    InvalidCursorError,
+    apply_keyset,
+    estimate_query_count,
+    keyset_cursor,
+)
 
 # FHIR Resource imports for healthcare data typing - required for compliance
 # Resources are imported by modules that use the resolvers
@@ -93,33 +102,43 @@ class PatientQueryResult:
     total_pages: int
     has_next_page: bool
     has_previous_page: bool
+    next_cursor: Optional[str] = None
+    total_count_is_estimate: bool = False
 
 
 class PatientResolver:
     """Enhanced patient query resolver with comprehensive features."""
 
-    def __init__(self, db: Session):
-        """Initialize patient resolver with database session."""
+    def __init__(self, db: Session, loaders: Optional[RequestLoaders] = None):
+        """Initialize patient resolver with database session.
+
+        Args:
+            db: Database session
+            loaders: Request-scoped loaders; patients and access grants are
+                cached across resolvers of the request when given
+        """
         self.db = db
+        self.loaders = loaders or RequestLoaders(db)
 
     async def get_patient_by_id(
         self, info: Info, patient_id: UUID, include_archived: bool = False
     ) -> Optional[Patient]:
         """Get a single patient by ID with access control."""
         try:
-            # Build query
-            query = self.db.query(PatientModel).filter(PatientModel.id == patient_id)
-
-            # Exclude archived unless requested
-            if not include_archived:
-                query = query.filter(PatientModel.deleted_at.is_(None))
-
-            patient = query.first()
+            if include_archived:
+                patient = (
+                    self.db.query(PatientModel)
+                    .filter(PatientModel.id == patient_id)
+                    .first()
+                )
+            else:
+                # Batched with other patient lookups in this request
+                patient = await self.loaders.patients.load(patient_id)
             if not patient:
                 return None
 
             # Check access permissions
-            if not self._check_patient_access(info, patient):
+            if not await self._check_patient_access(info, patient):
                 raise ValueError("Access denied to patient record")
 
             # Log access
@@ -145,8 +164,15 @@ class PatientResolver:
         sort: Optional[PatientSortInput] = None,
         page: int = 1,
         page_size: int = 20,
+        cursor: Optional[str] = None,
+        estimate_count: bool = False,
     ) -> PatientQueryResult:
-        """Search patients with advanced filtering and sorting."""
+        """Search patients with advanced filtering and sorting.
+
+        Pass the previous result's ``next_cursor`` as ``cursor`` for keyset
+        pagination (``page`` is then ignored). ``estimate_count`` returns the
+        planner's row estimate instead of an exact COUNT(*).
+        """
         try:
             # Base query
             query = self.db.query(PatientModel).filter(
@@ -161,17 +187,28 @@ class PatientResolver:
             query = self._apply_access_control(info, query)
 
             # Get total count before pagination
-            total_count = query.count()
-            # Apply sorting
-            if sort:
-                query = self._apply_sorting(query, sort)
+            if estimate_count:
+                total_count = estimate_query_count(query)
             else:
-                # Default sort by created_at desc
-                query = query.order_by(PatientModel.created_at.desc())
+                total_count = query.count()
+
+            # Apply sorting; the id tie-breaker makes the keyset order total
+            sort_column, descending = self._sort_column(sort)
+            query = apply_keyset(
+                query, [sort_column, PatientModel.id], cursor, descending=descending
+            )
 
-            # Apply pagination
-            offset = (page - 1) * page_size
-            patients = query.limit(page_size).offset(offset).all()
+            # Apply pagination, fetching one extra row to detect a next page
+            if not cursor:
+                query = query.offset((page - 1) * page_size)
+            rows = query.limit(page_size + 1).all()
+            patients = rows[:page_size]
+            self.loaders.prime_patients(patients)
+            next_cursor = (
+                keyset_cursor(patients[-1], [sort_column.key, "id"])
+                if len(rows) > page_size
+                else None
+            )
 
             # Calculate pagination info
             total_pages = (total_count + page_size - 1) // page_size
@@ -194,10 +231,14 @@ class PatientResolver:
                 page=page,
                 page_size=page_size,
                 total_pages=total_pages,
-                has_next_page=page < total_pages,
-                has_previous_page=page > 1,
+                has_next_page=next_cursor is not None,
+                has_previous_page=page > 1 or cursor is not None,
+                next_cursor=next_cursor,
+                total_count_is_estimate=estimate_count,
             )
 
+        except InvalidCursorError as e:
+            raise GraphQLError(str(e), extensions={"code": "BAD_USER_INPUT"}) from e
         except Exception as e:
             logger.error(f"Error searching patients: {e}")
             raise
@@ -206,15 +247,10 @@ class PatientResolver:
         self, query: Query[PatientModel], filter_input: AdvancedPatientFilterInput
     ) -> Query[PatientModel]:
         """Apply advanced filters to patient query."""
-        # Name filter (search in all name fields)
+        # Name filter (phonetic, transliteration-aware search key index)
         if filter_input.name:
-            name_pattern = f"%{filter_input.name}%"
-            query = query.filter(
-                or_(
-                    func.lower(PatientModel.name).like(func.lower(name_pattern)),
-                    # Could also search in JSON name fields if stored that way
-                )
-            )
+            for token_match in name_token_matches(filter_input.name):
+                query = query.filter(PatientModel.id.in_(token_match))
 
         # Identifier filter
         if filter_input.identifier:
@@ -281,23 +317,20 @@ class PatientResolver:
 
         return query
 
-    def _apply_sorting(
-        self, query: Query[PatientModel], sort: PatientSortInput
-    ) -> Query[PatientModel]:
-        """Apply sorting to patient query."""
+    def _sort_column(self, sort: Optional[PatientSortInput]) -> Tuple[Any, bool]:
+        """Resolve the sort column and direction (default created_at desc)."""
         sort_field_mapping = {
-            "name": PatientModel.name,
-            "birth_date": PatientModel.birth_date,
+            "name": PatientModel.family_name,
+            "birth_date": PatientModel.date_of_birth,
             "created_at": PatientModel.created_at,
             "updated_at": PatientModel.updated_at,
         }
 
-        field = sort_field_mapping.get(sort.field, PatientModel.created_at)
+        if not sort:
+            return PatientModel.created_at, True
 
-        if sort.direction.lower() == "asc":
-            return query.order_by(field.asc())
-        else:
-            return query.order_by(field.desc())
+        field = sort_field_mapping.get(sort.field, PatientModel.created_at)
+        return field, sort.direction.lower() != "asc"
 
     def _apply_access_control(
         self, info: Info, query: Query[PatientModel]
@@ -323,11 +356,7 @@ class PatientResolver:
             user_patient_id = user.get("patient_id")
             if user_patient_id:
                 # Get family group
-                user_patient = (
-                    self.db.query(PatientModel)
-                    .filter(PatientModel.id == UUID(user_patient_id))
-                    .first()
-                )
+                user_patient = self.loaders.patients.load_sync(UUID(user_patient_id))
 
                 if user_patient and user_patient.family_group_id:
                     # Can see family members
@@ -344,8 +373,12 @@ class PatientResolver:
 
         return query
 
-    def _check_patient_access(self, info: Info, patient: PatientModel) -> bool:
-        """Check if user has access to a specific patient."""
+    async def _check_patient_access(self, info: Info, patient: PatientModel) -> bool:
+        """Check if user has access to a specific patient.
+
+        Family and grant lookups go through the request's loaders, so the
+        checks of sibling resolvers share one query each.
+        """
         user = info.context.get("user")
         if not user:
             return False
@@ -361,17 +394,19 @@ class PatientResolver:
         if user_patient_id and str(patient.id) == user_patient_id:
             return True
 
-        # Check if user is a family member
+        # Check if user is a family member; the user's own patient row is
+        # loaded once per request, not once per patient checked
         if user_patient_id and patient.family_group_id:
-            user_patient = (
-                self.db.query(PatientModel)
-                .filter(PatientModel.id == UUID(user_patient_id))
-                .first()
-            )
+            user_patient = await self.loaders.patients.load(UUID(user_patient_id))
 
             if user_patient and user_patient.family_group_id == patient.family_group_id:
                 return True
 
+        # Check for an active grant on any of the patient's records
+        user_id = user.get("id")
+        if user_id:
+            return await self.loaders.patient_grants.load((str(user_id), patient.id))
+
         return False
 
     def _convert_to_graphql_type(self, patient: PatientModel) -> Patient:
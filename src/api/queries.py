@@ -26,13 +26,13 @@ except ImportError:
 from sqlalchemy import distinct
 
 from src.core.database import get_db
-from src.models.access_log import AccessContext
+from src.models.access_log import AccessContext, AccessType
 from src.models.verification import Verification as VerificationModel
 from src.models.verification import VerificationStatus
 
 # Import services
 from src.services.family_service import FamilyService
-from src.services.health_record_service import HealthRecordService
+from src.services.health_record_service import HealthRecordService, record_viewer_id
 from src.services.patient_service import PatientService
 from src.services.translation_service import TranslationService
 from src.services.verification_service import VerificationService
@@ -45,7 +45,13 @@ from src.translation.measurement_converter import (
     get_measurement_converter,
 )
 from src.utils.logging import get_logger
+from src.utils.pagination import InvalidCursorError
 
+from .dataloaders import (
+    filter_verifications,
+    get_loaders,
+    verification_record_ids,
+)
 from .inputs import (
     DateRangeFilter,
     FilterOptions,
@@ -129,12 +135,19 @@ class PatientQueries:
                 patient_service.set_user_context(user.id, user.role)
                 patient_service.access_context = AccessContext.API
 
-                # Get patient
-                patient_model = patient_service.get_by_id(patient_id)
+                # Get patient, shared with other fields of this request
+                patient_model = get_loaders(info, db).patients.load_sync(patient_id)
 
                 if not patient_model:
                     return None
 
+                patient_service.log_access(
+                    resource_id=patient_id,
+                    access_type=AccessType.VIEW,
+                    purpose="View record details",
+                    patient_id=patient_id,
+                )
+
                 # Convert to GraphQL type
                 patient_data = {
                     "id": patient_model.id,
@@ -217,12 +230,16 @@ class PatientQueries:
                 )
 
                 # Perform search
-                patients, total_count = patient_service.search_patients(
+                search_page = patient_service.search_patients_page(
                     query=search_params.get("query"),
                     filters=search_params.get("filters"),
                     limit=search_params.get("limit", 100),
                     offset=search_params.get("offset", 0),
+                    cursor=search_params.get("cursor"),
                 )
+                patients = search_page["patients"]
+                total_count = search_page["total"]
+                get_loaders(info, db).prime_patients(patients)
 
                 # Convert to GraphQL types
                 edges = []
@@ -243,10 +260,11 @@ class PatientQueries:
                     )
 
                 # Determine pagination info
-                has_next = (
-                    search_params.get("offset", 0) + len(patients)
-                ) < total_count
-                has_prev = search_params.get("offset", 0) > 0
+                has_next = search_page["next_cursor"] is not None
+                has_prev = (
+                    search_params.get("offset", 0) > 0
+                    or search_params.get("cursor") is not None
+                )
 
                 return PatientConnection(
                     edges=edges,
@@ -254,11 +272,13 @@ class PatientQueries:
                         "has_next_page": has_next,
                         "has_previous_page": has_prev,
                         "start_cursor": edges[0]["cursor"] if edges else None,
-                        "end_cursor": edges[-1]["cursor"] if edges else None,
+                        "end_cursor": search_page["next_cursor"],
                     },
                     total_count=total_count,
                 )
 
+        except InvalidCursorError as e:
+            raise GraphQLError(str(e)) from e
         except Exception as e:
             logger.error(f"Error searching patients: {e}")
             raise ValueError(f"Error searching patients: {str(e)}") from e
@@ -301,7 +321,10 @@ class PatientQueries:
                         else None
                     ),
                     include_content=True,
+                    viewer_id=record_viewer_id(user, patient_id),
+                    viewer_role=user.role,
                 )
+                get_loaders(info, db).prime_health_records(records)
 
                 # Convert to GraphQL types
                 health_records = []
@@ -498,15 +521,26 @@ class HealthRecordQueries:
                 health_record_service.set_user_context(user.id, user.role)
                 health_record_service.access_context = AccessContext.API
 
-                # Get health record
-                record = health_record_service.get_by_id(record_id)
+                # Get health record, shared with other fields of this request
+                loaders = get_loaders(info, db)
+                record = loaders.health_records.load_sync(record_id)
 
                 if not record:
                     return None
 
-                # Check patient access
+                health_record_service.log_access(
+                    resource_id=record_id,
+                    access_type=AccessType.VIEW,
+                    purpose="View record details",
+                    patient_id=record.patient_id,
+                )
+
+                # Check patient access, or a grant on this record
                 patient_id = uuid.UUID(str(record.patient_id))
-                if not self.can_access_patient(user, patient_id):
+                if not (
+                    self.can_access_patient(user, patient_id)
+                    or loaders.record_grants.load_sync((str(user.id), record.id))
+                ):
                     raise ValueError("Access denied to patient records")
 
                 # Convert to GraphQL type
@@ -604,8 +638,12 @@ class HealthRecordQueries:
                         end_date=end_date,
                         limit=limit,
                         offset=offset,
+                        viewer_id=record_viewer_id(user, patient_id),
+                        viewer_role=user.role,
                     )
                 else:
+                    # Without cross-patient access, only match granted records
+                    restricted = not user.has_permission("provider:read_all_patients")
                     records, total_count = health_record_service.search_records(
                         search_query=(
                             kwargs.get("search", {}).get("query")
@@ -615,7 +653,10 @@ class HealthRecordQueries:
                         filters=filters,
                         limit=limit,
                         offset=offset,
+                        viewer_id=user.id if restricted else None,
+                        viewer_role=user.role,
                     )
+                get_loaders(info, db).prime_health_records(records)
 
                 # Convert to GraphQL types
                 edges = []
@@ -725,6 +766,59 @@ class VerificationQueries:
         Verifier, description="Get list of authorized verifiers"
     )
 
+    def _record_verifications(
+        self, info: Any, db: Any, user: Any, record_id: uuid.UUID, active_only: bool
+    ) -> Optional[List[VerificationModel]]:
+        """Load the health-record verifications that reference a record.
+
+        The record and its patient's verifications come from the request's
+        loaders, so several status/history fields for records of the same
+        patient share one query each. Returns None if the record is missing.
+        """
+        loaders = get_loaders(info, db)
+
+        # First get the health record to find patient ID
+        health_record_service = HealthRecordService(db)
+        health_record_service.set_user_context(user.id, user.role)
+        record = loaders.health_records.load_sync(record_id)
+
+        if not record:
+            return None
+
+        health_record_service.log_access(
+            resource_id=record_id,
+            access_type=AccessType.VIEW,
+            purpose="View record details",
+            patient_id=record.patient_id,
+        )
+
+        # Create verification service
+        verification_service = VerificationService(db)
+        verification_service.set_user_context(user.id, user.role)
+        verification_service.access_context = AccessContext.API
+
+        # Get the patient's verifications (including expired/revoked if asked)
+        patient_id = uuid.UUID(str(record.patient_id))
+        verifications = filter_verifications(
+            loaders.verifications.load_sync(patient_id),
+            verification_type="health_record",
+            active_only=active_only,
+        )
+        verification_service.log_access(
+            resource_id=patient_id,
+            access_type=AccessType.VIEW,
+            purpose="View patient verifications",
+            patient_id=patient_id,
+            data_returned={"count": len(verifications), "type": "health_record"},
+        )
+
+        # Keep verifications related to this record
+        return [
+            verification
+            for verification in verifications
+            if str(record_id) in verification_record_ids(verification)
+        ]
+
     def resolve_get_verification_status(
         self, info: Any, record_id: uuid.UUID
     ) -> Optional[Verification]:
@@ -736,59 +830,32 @@ class VerificationQueries:
 
         try:
             with get_db() as db:
-                # First get the health record to find patient ID
-                health_record_service = HealthRecordService(db)
-                health_record_service.set_user_context(user.id, user.role)
-                record = health_record_service.get_by_id(record_id)
+                verifications = self._record_verifications(
+                    info, db, user, record_id, active_only=True
+                )
 
-                if not record:
+                if not verifications:
                     return None
 
-                # Create verification service
-                verification_service = VerificationService(db)
-                verification_service.set_user_context(user.id, user.role)
-                verification_service.access_context = AccessContext.API
-
-                # Get active verifications for the patient
-                patient_id = uuid.UUID(str(record.patient_id))
-                verifications = verification_service.get_patient_verifications(
-                    patient_id=patient_id,
-                    verification_type="health_record",
-                    active_only=True,
-                )
-
-                # Find verification for this specific record
-                for verification in verifications:
-                    evidence_list: list[Any] = (
-                        verification.evidence_provided
-                        if isinstance(verification.evidence_provided, list)  # type: ignore[unreachable]
-                        else []
-                    )
-                    if evidence_list:
-                        for evidence in evidence_list:
-                            if evidence.get("data", {}).get("record_id") == str(
-                                record_id
-                            ):
-                                # Convert to GraphQL type
-                                verification_data = {
-                                    "id": verification.id,
-                                    "patient_id": verification.patient_id,
-                                    "type": verification.verification_type,
-                                    "method": verification.verification_method.value,
-                                    "status": verification.status.value,
-                                    "level": verification.verification_level.value,
-                                    "verifier": {
-                                        "id": verification.verifier_id,
-                                        "name": verification.verifier_name,
-                                        "organization": verification.verifier_organization,
-                                    },
-                                    "verified_at": verification.completed_at,
-                                    "expires_at": verification.expires_at,
-                                    "blockchain_hash": verification.blockchain_hash,
-                                }
-                                return Verification(**verification_data)
-
-                return None
+                # Convert to GraphQL type
+                verification = verifications[0]
+                verification_data = {
+                    "id": verification.id,
+                    "patient_id": verification.patient_id,
+                    "type": verification.verification_type,
+                    "method": verification.verification_method.value,
+                    "status": verification.status.value,
+                    "level": verification.verification_level.value,
+                    "verifier": {
+                        "id": verification.verifier_id,
+                        "name": verification.verifier_name,
+                        "organization": verification.verifier_organization,
+                    },
+                    "verified_at": verification.completed_at,
+                    "expires_at": verification.expires_at,
+                    "blockchain_hash": verification.blockchain_hash,
+                }
+                return Verification(**verification_data)
 
         except Exception as e:
             logger.error(f"Error getting verification status: {e}")
@@ -805,63 +872,32 @@ class VerificationQueries:
 
         try:
             with get_db() as db:
-                # First get the health record to find patient ID
-                health_record_service = HealthRecordService(db)
-                health_record_service.set_user_context(user.id, user.role)
-                record = health_record_service.get_by_id(record_id)
-
-                if not record:
-                    return []
-
-                # Create verification service
-                verification_service = VerificationService(db)
-                verification_service.set_user_context(user.id, user.role)
-                verification_service.access_context = AccessContext.API
-
-                # Get all verifications for the patient (including expired/revoked)
-                patient_id = uuid.UUID(str(record.patient_id))
-                verifications = verification_service.get_patient_verifications(
-                    patient_id=patient_id,
-                    verification_type="health_record",
-                    active_only=False,
+                verifications = self._record_verifications(
+                    info, db, user, record_id, active_only=False
                 )
 
-                # Filter verifications related to this record
+                # Convert to GraphQL types
                 record_verifications: List[Verification] = []
-                for verification in verifications:
-                    evidence_list: list[Any] = (
-                        verification.evidence_provided
-                        if isinstance(verification.evidence_provided, list)  # type: ignore[unreachable]
-                        else []
-                    )
-                    if evidence_list:
-                        for evidence in evidence_list:
-                            if evidence.get("data", {}).get("record_id") == str(
-                                record_id
-                            ):
-                                # Convert to GraphQL type
-                                verification_data = {
-                                    "id": verification.id,
-                                    "patient_id": verification.patient_id,
-                                    "type": verification.verification_type,
-                                    "method": verification.verification_method.value,
-                                    "status": verification.status.value,
-                                    "level": verification.verification_level.value,
-                                    "verifier": {
-                                        "id": verification.verifier_id,
-                                        "name": verification.verifier_name,
-                                        "organization": verification.verifier_organization,
-                                    },
-                                    "verified_at": verification.completed_at,
-                                    "expires_at": verification.expires_at,
-                                    "revoked": verification.revoked,
-                                    "revoked_at": verification.revoked_at,
-                                    "blockchain_hash": verification.blockchain_hash,
-                                }
-                                record_verifications.append(
-                                    Verification(**verification_data)
-                                )
-                                break
+                for verification in verifications or []:
+                    verification_data = {
+                        "id": verification.id,
+                        "patient_id": verification.patient_id,
+                        "type": verification.verification_type,
+                        "method": verification.verification_method.value,
+                        "status": verification.status.value,
+                        "level": verification.verification_level.value,
+                        "verifier": {
+                            "id": verification.verifier_id,
+                            "name": verification.verifier_name,
+                            "organization": verification.verifier_organization,
+                        },
+                        "verified_at": verification.completed_at,
+                        "expires_at": verification.expires_at,
+                        "revoked": verification.revoked,
+                        "revoked_at": verification.revoked_at,
+                        "blockchain_hash": verification.blockchain_hash,
+                    }
+                    record_verifications.append(Verification(**verification_data))
 
                 return record_verifications
 
@@ -912,10 +948,11 @@ class VerificationQueries:
 
     def resolve_get_verifiers(self, info: graphene.ResolveInfo) -> List[Verifier]:
         """Resolve list of authorized verifiers."""
-        _ = info  # Mark as intentionally unused - public query
         # Public query - returns public verifier information
         try:
             with get_db() as db:
+                loaders = get_loaders(info, db)
+
                 # Get unique verifiers from recent verifications
                 # Query for distinct verifier organizations
                 verifier_orgs = (
@@ -931,10 +968,20 @@ class VerificationQueries:
                     .all()
                 )
 
+                # Organization records and verification counts, one query each
+                org_names = [org for org, _ in verifier_orgs if org]
+                organizations = dict(
+                    zip(org_names, loaders.organizations.load_many_sync(org_names))
+                )
+                verified_counts = dict(
+                    zip(org_names, loaders.verifier_counts.load_many_sync(org_names))
+                )
+
                 # Convert to GraphQL types
                 verifiers = []
                 for org, name in verifier_orgs:
                     if org:  # Skip if org is None
+                        organization = organizations[org]
                         verifier_data = {
                             "id": str(
                                 uuid.uuid5(uuid.NAMESPACE_DNS, org)
@@ -942,8 +989,10 @@ class VerificationQueries:
                             "name": name or org,
                             "organization": org,
                             "type": "healthcare_provider",  # Default type
-                            "is_active": True,
-                            "verified_count": 0,  # Would need aggregate query for real count
+                            "is_active": (
+                                bool(organization.active) if organization else True
+                            ),
+                            "verified_count": verified_counts[org],
                         }
                         verifiers.append(Verifier(**verifier_data))
 
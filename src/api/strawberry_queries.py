@@ -28,6 +28,7 @@ else:
         strawberry = None
         Info = None
 
+from src.api.dataloaders import RequestLoaders, get_loaders
 from src.api.graphql_audit import AuditQuery
 from src.api.graphql_types import Gender as GraphQLGender
 from src.api.graphql_types import (
@@ -49,10 +50,12 @@ from src.api.workflow_operations import WorkflowQuery
 
 # FHIRValidator available if needed for FHIR compliance
 # from src.healthcare.fhir_validator import FHIRValidator
+from src.models.access_log import AccessContext, AccessType
+from src.models.health_record import EMERGENCY_ACCESS_ROLES
 from src.models.health_record import HealthRecord as HealthRecordModel
 from src.models.health_record import RecordType as RecordTypeModel
 from src.models.verification import VerificationLevel
-from src.services.health_record_service import HealthRecordService
+from src.services.health_record_service import HealthRecordService, record_viewer_id
 from src.services.patient_service import PatientService
 from src.services.verification_service import (
     VerificationService as VerificationServiceModel,
@@ -61,6 +64,40 @@ from src.services.verification_service import (
 logger = logging.getLogger(__name__)
 
 
+async def can_view_record(
+    loaders: RequestLoaders, user: Any, record: HealthRecordModel
+) -> bool:
+    """Check a user may read a health record.
+
+    Applies HealthRecord.check_access for users limited to granted records,
+    looking grants up through the request's loader.
+    """
+    viewer_id = record_viewer_id(user, record.patient_id)
+    if viewer_id is None:
+        return True
+    if (
+        record.emergency_accessible
+        and getattr(user, "role", None) in EMERGENCY_ACCESS_ROLES
+    ):
+        return True
+    if str(record.provider_id) == str(viewer_id):
+        return True
+    return await loaders.record_grants.load((str(viewer_id), record.id))
+
+
+def log_record_view(db: Any, user: Any, record: HealthRecordModel) -> None:
+    """Write the VIEW audit entry for a health record read."""
+    health_record_service = HealthRecordService(db)
+    health_record_service.set_user_context(user.id, getattr(user, "role", None))
+    health_record_service.access_context = AccessContext.API
+    health_record_service.log_access(
+        resource_id=record.id,
+        access_type=AccessType.VIEW,
+        purpose="View record details",
+        patient_id=record.patient_id,
+    )
+
+
 # Define GraphQL types only when strawberry is available
 if strawberry:
     # Input Types for Queries
@@ -146,7 +183,7 @@ if strawberry:
             if not db:
                 raise ValueError("Database connection not available")
 
-            resolver = PatientResolver(db)
+            resolver = PatientResolver(db, get_loaders(info))
             return await resolver.get_patient_by_id(info, patient_id, include_archived)
 
     @strawberry.field
@@ -160,19 +197,23 @@ if strawberry:
         sort: Optional[PatientSortInput] = None,
         page: int = 1,
         page_size: int = 20,
+        cursor: Optional[str] = None,
+        estimate_count: bool = False,
     ) -> PatientQueryResult:
         """Search patients with advanced filtering, sorting, and pagination."""
         db = info.context.get("db")
         if not db:
             raise ValueError("Database connection not available")
 
-        resolver = PatientResolver(db)
+        resolver = PatientResolver(db, get_loaders(info))
         return await resolver.search_patients(
             info=info,
             filter_input=filter_input,
             sort=sort,
             page=page,
             page_size=page_size,
+            cursor=cursor,
+            estimate_count=estimate_count,
         )
 
     @strawberry.field
@@ -187,11 +228,21 @@ if strawberry:
             if not db:
                 raise ValueError("Database connection not available")
 
-            service = HealthRecordService(session=db)
-            record = service.get_by_id(record_id)
+            user = info.context.get("user")
+            if not user:
+                raise ValueError("Unauthorized access to health records")
+
+            # Batched with other record lookups in this request
+            loaders = get_loaders(info)
+            record = await loaders.health_records.load(record_id)
             if not record:
                 return None
 
+            if not await can_view_record(loaders, user, record):
+                raise ValueError("Access denied to health record")
+
+            log_record_view(db, user, record)
+
             # Convert model to dict for GraphQL type
             record_data = {
                 "id": str(record.id),
@@ -277,6 +328,7 @@ if strawberry:
                     total_pages=0,
                 )
 
+            user = info.context.get("user")
             records, total = service.get_patient_records(
                 patient_id=UUID(patient_id_filter),
                 record_types=(
@@ -286,7 +338,12 @@ if strawberry:
                 end_date=criteria.get("end_date"),  # Already converted to datetime
                 limit=pagination.page_size,
                 offset=(pagination.page - 1) * pagination.page_size,
+                viewer_id=(
+                    record_viewer_id(user, UUID(patient_id_filter)) if user else None
+                ),
+                viewer_role=getattr(user, "role", None),
             )
+            get_loaders(info).prime_health_records(records)
 
             # Result format would be constructed here if needed
             # This demonstrates the shape of the data being returned
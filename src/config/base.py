@@ -56,6 +56,8 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379"
     redis_pool_size: int = 10
+    near_cache_max_entries: int = 10000  # In-process cache in front of Redis
+    near_cache_ttl: int = 30  # Seconds; bounds staleness if invalidations are missed
 
     # AWS
     aws_region: str = "us-east-1"
@@ -279,6 +281,10 @@ class Settings(BaseSettings):
     # AI/ML
     bedrock_model_id: str = "anthropic.claude-v2"
     translation_cache_ttl: int = 3600
+    llm_cache_enabled: bool = True  # Reuse deterministic Bedrock responses
+    llm_cache_memory_entries: int = 5000
+    llm_cache_disk_dir: Optional[str] = None  # Disk tier is off unless set
+    llm_cache_disk_max_mb: int = 512
 
     # NORMRX API Configuration
     normrx_api_key: Optional[str] = Field(
@@ -3,19 +3,31 @@
 This module implements role-based access control (RBAC) and fine-grained
 authorization for FHIR resources in the Haven Health Passport system.
 Includes encrypted access tokens and permission validation.
+
+Role scopes and custom policies are compiled into an index keyed by resource
+type, action and role, and decisions are cached per subject, resource type,
+patient, consent version and rule generation, so checking every resource of a
+search bundle only evaluates rules once per distinct decision.
 """
 
+import threading
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, ClassVar, Dict, Iterable, List, Literal, Optional, Set, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from src.healthcare.fhir_validator import FHIRValidator
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Decision cache bounds; entries also expire at consent period boundaries
+DECISION_CACHE_SIZE = 10000
+DECISION_CACHE_TTL_SECONDS = 300
+
 
 class FHIRAuthorizationResource(BaseModel):
     """FHIR Authorization resource type."""
@@ -50,7 +62,24 @@ class ResourcePermission(str, Enum):
     VREAD = "vread"  # Version read
 
 
-class ResourceScope(BaseModel):
+class RuleModel(BaseModel):
+    """Base for role and policy models, tracking edits made in place.
+
+    Assigning a field bumps ``RuleModel.generation``; compiled policies and
+    cached decisions are keyed by it. List fields must be reassigned, not
+    mutated, for a change to be seen.
+    """
+
+    generation: ClassVar[int] = 0
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set a field and bump the rule generation."""
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            RuleModel.generation += 1
+
+
+class ResourceScope(RuleModel):
     """Defines scope of resource access."""
 
     resource_type: str
@@ -63,7 +92,7 @@ class ResourceScope(BaseModel):
         use_enum_values = True
 
 
-class RoleDefinition(BaseModel):
+class RoleDefinition(RuleModel):
     """Defines a role with its permissions."""
 
     role: FHIRRole
@@ -287,7 +316,7 @@ class ResourceFilter(BaseModel):
     value: Any
 
 
-class AuthorizationPolicy(BaseModel):
+class AuthorizationPolicy(RuleModel):
     """Custom authorization policy."""
 
     id: str
@@ -307,7 +336,11 @@ class AuthorizationPolicy(BaseModel):
 
 
 class ConsentRecord(BaseModel):
-    """Patient consent record."""
+    """Patient consent record.
+
+    Assigning a field bumps the record's version, which cached decisions for
+    the patient are keyed by; reassign list fields rather than mutating them.
+    """
 
     patient_id: str
     consented_actors: List[str] = Field(default_factory=list)
@@ -317,6 +350,113 @@ class ConsentRecord(BaseModel):
     time_period_end: Optional[datetime] = None
     active: bool = True
 
+    _version: int = PrivateAttr(default=0)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set a field and bump the record's version."""
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Number of field assignments since the record was created."""
+        return self._version
+
+
+class CompiledPolicies:
+    """Role scopes and custom policies indexed by the requests they apply to.
+
+    Each rule is filed under every (role, resource type, action) or
+    (resource type, action) it can match, in evaluation order. Wildcard rules
+    are filed under each resource type named anywhere and under "*", which
+    serves resource types no rule names explicitly.
+    """
+
+    def __init__(
+        self,
+        roles: Dict[FHIRRole, RoleDefinition],
+        policies: List[AuthorizationPolicy],
+    ) -> None:
+        """Build the index from role definitions and priority-sorted policies."""
+        self.generation = RuleModel.generation
+        self.resource_types: Set[str] = {"*"}
+        for role_def in roles.values():
+            self.resource_types.update(
+                scope.resource_type for scope in role_def.resource_scopes
+            )
+        for policy in policies:
+            self.resource_types.update(policy.resource_types)
+
+        self.scopes: Dict[Tuple[str, str, str], List[ResourceScope]] = defaultdict(list)
+        self.deny: Dict[Tuple[str, str], List[AuthorizationPolicy]] = defaultdict(list)
+        self.allow: Dict[Tuple[str, str], List[AuthorizationPolicy]] = defaultdict(list)
+        fields: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+
+        for role, role_def in roles.items():
+            for scope in role_def.resource_scopes:
+                for resource_type in self._targets([scope.resource_type]):
+                    for action in scope.permissions:
+                        self.scopes[(role, resource_type, action)].append(scope)
+                        fields[(resource_type, action)].update(
+                            self._data_fields(scope.conditions)
+                        )
+
+        for policy in policies:
+            if policy.effect not in ("allow", "deny"):
+                continue
+            index = self.deny if policy.effect == "deny" else self.allow
+            for resource_type in self._targets(policy.resource_types):
+                for action in policy.actions:
+                    index[(resource_type, action)].append(policy)
+                    fields[(resource_type, action)].update(
+                        self._data_fields(policy.conditions)
+                    )
+
+        self.condition_fields: Dict[Tuple[str, str], Tuple[str, ...]] = {
+            key: tuple(sorted(names)) for key, names in fields.items()
+        }
+
+    def _targets(self, resource_types: List[str]) -> Set[str]:
+        """Resource type buckets a rule naming `resource_types` belongs in."""
+        if "*" in resource_types:
+            return self.resource_types
+        return set(resource_types)
+
+    @staticmethod
+    def _data_fields(conditions: Optional[Dict[str, Any]]) -> Iterable[str]:
+        """Resource fields a condition set compares against."""
+        for key, value in (conditions or {}).items():
+            if not (key in ("owner", "patient") and value == "self"):
+                yield key
+
+    def _type_key(self, resource_type: str) -> str:
+        if resource_type in self.resource_types:
+            return resource_type
+        return "*"
+
+    def scopes_for(
+        self, role: str, resource_type: str, action: str
+    ) -> List[ResourceScope]:
+        """Scopes of `role` that grant `action` on `resource_type`."""
+        return self.scopes.get((role, self._type_key(resource_type), action), [])
+
+    def deny_policies(
+        self, resource_type: str, action: str
+    ) -> List[AuthorizationPolicy]:
+        """Deny policies for a resource type and action, by priority."""
+        return self.deny.get((self._type_key(resource_type), action), [])
+
+    def allow_policies(
+        self, resource_type: str, action: str
+    ) -> List[AuthorizationPolicy]:
+        """Allow policies for a resource type and action, by priority."""
+        return self.allow.get((self._type_key(resource_type), action), [])
+
+    def fields_for(self, resource_type: str, action: str) -> Tuple[str, ...]:
+        """Resource fields any applicable rule's conditions read."""
+        return self.condition_fields.get((self._type_key(resource_type), action), ())
+
 
 class FHIRAuthorizationHandler:
     """Main authorization handler for FHIR resources.
@@ -331,27 +471,79 @@ class FHIRAuthorizationHandler:
         self.consent_records: Dict[str, ConsentRecord] = {}
         self._audit_enabled = True
         self.fhir_validator = FHIRValidator()
+        self._compiled: Optional[CompiledPolicies] = None
+        self._consent_versions: Dict[str, int] = {}
+        # LRU of decision key -> (monotonic expiry, decision)
+        self._decision_cache: OrderedDict[
+            Tuple[Any, ...], Tuple[float, AuthorizationDecision]
+        ] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     def add_role(self, role_definition: RoleDefinition) -> None:
         """Add or update a role definition."""
         self.roles[role_definition.role] = role_definition
+        self._invalidate_policies()
         logger.info(f"Added/updated role: {role_definition.role}")
 
     def add_policy(self, policy: AuthorizationPolicy) -> None:
         """Add a custom authorization policy."""
         self.custom_policies.append(policy)
         self.custom_policies.sort(key=lambda p: p.priority, reverse=True)
+        self._invalidate_policies()
         logger.info(f"Added policy: {policy.name}")
 
     def add_consent(self, consent: ConsentRecord) -> None:
         """Add or update patient consent."""
         self.consent_records[consent.patient_id] = consent
+        # Cached decisions for this patient carry the old version in their key
+        with self._cache_lock:
+            self._consent_versions[consent.patient_id] = (
+                self._consent_versions.get(consent.patient_id, 0) + 1
+            )
         logger.info(f"Updated consent for patient: {consent.patient_id}")
 
     def set_audit_enabled(self, enabled: bool) -> None:
         """Enable or disable audit logging."""
         self._audit_enabled = enabled
 
+    def clear_decision_cache(self) -> None:
+        """Drop all cached authorization decisions."""
+        with self._cache_lock:
+            self._decision_cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get decision cache size and hit counts."""
+        with self._cache_lock:
+            return {
+                "size": len(self._decision_cache),
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+            }
+
+    def _invalidate_policies(self) -> None:
+        """Recompile rules on next use and forget decisions made under them."""
+        self._compiled = None
+        self.clear_decision_cache()
+
+    def _compiled_policies(self) -> CompiledPolicies:
+        compiled = self._compiled
+        if compiled is None or compiled.generation != RuleModel.generation:
+            compiled = CompiledPolicies(self.roles, self.custom_policies)
+            self._compiled = compiled
+        return compiled
+
+    def _consent_version(self, patient_id: Optional[str]) -> Tuple[int, int]:
+        """Replacements and in-place edits of a patient's consent record."""
+        if not patient_id:
+            return 0, 0
+        consent = self.consent_records.get(patient_id)
+        return (
+            self._consent_versions.get(patient_id, 0),
+            consent.version if consent is not None else 0,
+        )
+
     def check_authorization(
         self, request: AuthorizationRequest
     ) -> AuthorizationDecision:
@@ -359,6 +551,159 @@ class FHIRAuthorizationHandler:
 
         Evaluates roles, policies, and consent to make authorization decision.
         """
+        decision = self._decide(request)
+
+        # Audit the decision
+        if self._audit_enabled:
+            self._audit_decision(request, decision)
+
+        return decision
+
+    def authorize_many(
+        self,
+        context: AuthorizationContext,
+        action: ResourcePermission,
+        resources: Iterable[Dict[str, Any]],
+        resource_type: Optional[str] = None,
+    ) -> List[AuthorizationDecision]:
+        """Decide access to every resource of a result set in one pass.
+
+        Resources whose decision inputs match (same type, patient and
+        condition fields) share one evaluation and one decision object, and
+        the batch is audited as a single entry listing allowed and denied IDs.
+
+        Args:
+            context: Caller's authorization context
+            action: Action requested on each resource
+            resources: FHIR resources, e.g. the entries of a search bundle
+            resource_type: Type of all resources; read from each resource's
+                resourceType when omitted
+
+        Returns:
+            One decision per resource, in input order
+        """
+        requests = [
+            # Skip per-resource validation; context and action are shared
+            AuthorizationRequest.model_construct(
+                context=context,
+                resource_type=resource_type or resource.get("resourceType", ""),
+                action=action,
+                resource_id=resource.get("id"),
+                resource_data=resource,
+                compartment=None,
+            )
+            for resource in resources
+        ]
+
+        decided: Dict[Tuple[Any, ...], AuthorizationDecision] = {}
+        decisions = []
+        for request in requests:
+            key = self._decision_key(request)
+            decision = decided.get(key)
+            if decision is None:
+                decision = self._decide(request, key)
+                decided[key] = decision
+            decisions.append(decision)
+
+        if self._audit_enabled and requests:
+            self._audit_batch(context, action, requests, decisions)
+
+        return decisions
+
+    def filter_authorized(
+        self,
+        context: AuthorizationContext,
+        action: ResourcePermission,
+        resources: Iterable[Dict[str, Any]],
+        resource_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Keep only the resources `context` may perform `action` on."""
+        resources = list(resources)
+        decisions = self.authorize_many(context, action, resources, resource_type)
+        return [
+            resource
+            for resource, decision in zip(resources, decisions)
+            if decision.allowed
+        ]
+
+    def _decision_key(self, request: AuthorizationRequest) -> Tuple[Any, ...]:
+        """Everything the evaluation of `request` depends on."""
+        context = request.context
+        data = request.resource_data
+        patient_id = self._extract_patient_id(request)
+        compiled = self._compiled_policies()
+        if data:
+            fields = compiled.fields_for(request.resource_type, request.action)
+            resource_key: Optional[Tuple[Any, ...]] = (
+                self._referenced_patient_id(data),
+                tuple(repr(data.get(name)) for name in fields),
+            )
+        else:
+            resource_key = None
+
+        return (
+            context.user_id,
+            tuple(context.roles),
+            context.organization_id,
+            context.emergency_access,
+            request.resource_type,
+            request.action,
+            patient_id,
+            self._consent_version(patient_id),
+            compiled.generation,
+            resource_key,
+        )
+
+    def _decide(
+        self,
+        request: AuthorizationRequest,
+        key: Optional[Tuple[Any, ...]] = None,
+    ) -> AuthorizationDecision:
+        """Evaluate `request`, reusing a cached decision for identical inputs."""
+        if key is None:
+            key = self._decision_key(request)
+
+        with self._cache_lock:
+            entry = self._decision_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._decision_cache.move_to_end(key)
+                self._cache_hits += 1
+                return entry[1].model_copy(
+                    deep=True, update={"timestamp": datetime.utcnow()}
+                )
+            self._cache_misses += 1
+
+        decision, cacheable = self._evaluate(request)
+        if cacheable:
+            expires = time.monotonic() + self._decision_ttl(request)
+            with self._cache_lock:
+                self._decision_cache[key] = (expires, decision.model_copy(deep=True))
+                self._decision_cache.move_to_end(key)
+                while len(self._decision_cache) > DECISION_CACHE_SIZE:
+                    self._decision_cache.popitem(last=False)
+
+        return decision
+
+    def _decision_ttl(self, request: AuthorizationRequest) -> float:
+        """Seconds a decision stays valid, up to the next consent boundary."""
+        ttl = float(DECISION_CACHE_TTL_SECONDS)
+        patient_id = self._extract_patient_id(request)
+        consent = self.consent_records.get(patient_id) if patient_id else None
+        if consent is not None:
+            now = datetime.utcnow()
+            for boundary in (consent.time_period_start, consent.time_period_end):
+                if boundary is not None and boundary > now:
+                    ttl = min(ttl, (boundary - now).total_seconds())
+        return ttl
+
+    def _evaluate(
+        self, request: AuthorizationRequest
+    ) -> Tuple[AuthorizationDecision, bool]:
+        """Evaluate roles, policies, and consent without auditing.
+
+        Returns:
+            The decision, and whether it may be cached (errors are not)
+        """
         decision = AuthorizationDecision(
             allowed=False, reasons=[], applicable_roles=[], conditions_applied=[]
         )
@@ -367,7 +712,7 @@ class FHIRAuthorizationHandler:
             # Check custom deny policies first
             deny_decision = self._check_deny_policies(request)
             if deny_decision:
-                return deny_decision
+                return deny_decision, True
 
             # Check role-based permissions
             role_decision = self._check_role_permissions(request)
@@ -393,12 +738,9 @@ class FHIRAuthorizationHandler:
             logger.error(f"Authorization check failed: {str(e)}")
             decision.allowed = False
             decision.reasons = decision.reasons + [f"Authorization error: {str(e)}"]
+            return decision, False
 
-        # Audit the decision
-        if self._audit_enabled:
-            self._audit_decision(request, decision)
-
-        return decision
+        return decision, True
 
     def _check_role_permissions(
         self, request: AuthorizationRequest
@@ -407,6 +749,7 @@ class FHIRAuthorizationHandler:
         decision = AuthorizationDecision(
             allowed=False, reasons=[], applicable_roles=[], conditions_applied=[]
         )
+        compiled = self._compiled_policies()
 
         for role in request.context.roles:
             if role not in self.roles:
@@ -415,27 +758,19 @@ class FHIRAuthorizationHandler:
             role_def = self.roles[role]
             decision.applicable_roles = decision.applicable_roles + [role]
 
-            for scope in role_def.resource_scopes:
-                if self._matches_resource_scope(request, scope):
-                    if request.action in scope.permissions:
-                        if self._check_conditions(request, scope.conditions):
-                            decision.allowed = True
-                            decision.reasons = decision.reasons + [
-                                f"Allowed by role '{role_def.name}' for {request.resource_type}"
-                            ]
-                            return decision
+            for scope in compiled.scopes_for(
+                role, request.resource_type, request.action
+            ):
+                if self._check_conditions(request, scope.conditions):
+                    decision.allowed = True
+                    decision.reasons = decision.reasons + [
+                        f"Allowed by role '{role_def.name}' for {request.resource_type}"
+                    ]
+                    return decision
 
         decision.reasons = decision.reasons + ["No matching role permissions found"]
         return decision
 
-    def _matches_resource_scope(
-        self, request: AuthorizationRequest, scope: ResourceScope
-    ) -> bool:
-        """Check if request matches resource scope."""
-        if scope.resource_type == "*":
-            return True
-        return request.resource_type == scope.resource_type
-
     def _check_conditions(
         self, request: AuthorizationRequest, conditions: Optional[Dict[str, Any]]
     ) -> bool:
@@ -477,24 +812,27 @@ class FHIRAuthorizationHandler:
         if not request.resource_data:
             return False
 
-        # Check patient reference in resource
-        patient_ref = request.resource_data.get("patient", {})
-        if isinstance(patient_ref, dict):
-            patient_id = patient_ref.get("reference", "").rsplit("/", maxsplit=1)[-1]
-        else:
-            patient_id = str(patient_ref).rsplit("/", maxsplit=1)[-1]
-
+        patient_id = self._referenced_patient_id(request.resource_data)
         return bool(patient_id == request.context.user_id)
 
+    @staticmethod
+    def _referenced_patient_id(resource_data: Dict[str, Any]) -> str:
+        """Patient ID from a resource's patient reference."""
+        patient_ref = resource_data.get("patient", {})
+        if isinstance(patient_ref, dict):
+            return str(patient_ref.get("reference", "")).rsplit("/", maxsplit=1)[-1]
+        return str(patient_ref).rsplit("/", maxsplit=1)[-1]
+
     def _check_deny_policies(
         self, request: AuthorizationRequest
     ) -> Optional[AuthorizationDecision]:
         """Check custom deny policies."""
-        for policy in self.custom_policies:
-            if not policy.enabled or policy.effect != "deny":
+        compiled = self._compiled_policies()
+        for policy in compiled.deny_policies(request.resource_type, request.action):
+            if not policy.enabled:
                 continue
 
-            if self._matches_policy(request, policy):
+            if self._check_conditions(request, policy.conditions):
                 decision = AuthorizationDecision(
                     allowed=False, reasons=[f"Denied by policy: {policy.name}"]
                 )
@@ -509,36 +847,19 @@ class FHIRAuthorizationHandler:
         decision = AuthorizationDecision(
             allowed=False, reasons=[], applicable_roles=[], conditions_applied=[]
         )
+        compiled = self._compiled_policies()
 
-        for policy in self.custom_policies:
-            if not policy.enabled or policy.effect != "allow":
+        for policy in compiled.allow_policies(request.resource_type, request.action):
+            if not policy.enabled:
                 continue
 
-            if self._matches_policy(request, policy):
+            if self._check_conditions(request, policy.conditions):
                 decision.allowed = True
                 decision.reasons.append(f"Allowed by policy: {policy.name}")
                 return decision
 
         return decision
 
-    def _matches_policy(
-        self, request: AuthorizationRequest, policy: AuthorizationPolicy
-    ) -> bool:
-        """Check if request matches policy conditions."""
-        # Check resource type
-        if (
-            request.resource_type not in policy.resource_types
-            and "*" not in policy.resource_types
-        ):
-            return False
-
-        # Check action
-        if request.action not in policy.actions:
-            return False
-
-        # Check additional conditions
-        return self._check_conditions(request, policy.conditions)
-
     def _is_patient_data(self, request: AuthorizationRequest) -> bool:
         """Check if resource contains patient data."""
         patient_resources = [
@@ -689,6 +1010,34 @@ class FHIRAuthorizationHandler:
         decision.audit_info = audit_entry
         logger.info(f"Authorization audit: {audit_entry}")
 
+    def _audit_batch(
+        self,
+        context: AuthorizationContext,
+        action: ResourcePermission,
+        requests: List[AuthorizationRequest],
+        decisions: List[AuthorizationDecision],
+    ) -> None:
+        """Audit a bulk authorization as one entry."""
+        allowed = [r.resource_id for r, d in zip(requests, decisions) if d.allowed]
+        denied = [r.resource_id for r, d in zip(requests, decisions) if not d.allowed]
+        audit_entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "user_id": context.user_id,
+            "roles": context.roles,
+            "resource_types": sorted({r.resource_type for r in requests}),
+            "action": action,
+            "resources": len(requests),
+            "allowed_ids": allowed,
+            "denied_ids": denied,
+            "session_id": context.session_id,
+            "ip_address": context.ip_address,
+            "emergency_access": context.emergency_access,
+        }
+
+        for decision in decisions:
+            decision.audit_info = audit_entry
+        logger.info(f"Authorization audit: {audit_entry}")
+
     def get_resource_filters(
         self, context: AuthorizationContext, resource_type: str
     ) -> List[ResourceFilter]:
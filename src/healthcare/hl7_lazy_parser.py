@@ -0,0 +1,357 @@
+"""Lazy HL7 v2 parsing for high-volume feeds.
+
+Parsing a message only records where each segment starts and ends. A
+segment is split into fields the first time it is read, and components,
+repetitions, subcomponents and escape sequences are decoded only for the
+values actually requested, so pulling MSH/PID/OBX out of a message costs
+far less than building a full object tree.
+
+Batch files (FHS/BHS envelopes) and multi-gigabyte message dumps are read
+incrementally with iter_hl7_messages(), one message at a time.
+"""
+
+import re
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# FHIR resource type for this module
+__fhir_resource__ = "Bundle"
+
+DEFAULT_ENCODING_CHARACTERS = "^~\\&"
+
+# Batch and file envelope segments, which are not part of any message
+ENVELOPE_SEGMENTS = {"FHS", "FTS", "BHS", "BTS"}
+
+# Segment terminators, plus MLLP framing bytes left in captured dumps
+SEGMENT_BOUNDARY = re.compile(r"[\r\n\x0b\x1c]+")
+
+READ_CHUNK_SIZE = 1 << 20
+
+PATH_PATTERN = re.compile(
+    r"^(?P<segment>[A-Z][A-Z0-9]{2})(?:\[(?P<occurrence>\d+)\])?"
+    r"(?:\.(?P<field>\d+)(?:\[(?P<repetition>\d+)\])?"
+    r"(?:\.(?P<component>\d+)(?:\.(?P<subcomponent>\d+))?)?)?$"
+)
+
+
+class HL7Delimiters:
+    """Delimiters declared in MSH-1 and MSH-2."""
+
+    __slots__ = ("field", "component", "repetition", "escape", "subcomponent")
+
+    def __init__(self, field: str = "|", encoding: str = DEFAULT_ENCODING_CHARACTERS):
+        """Initialize delimiters from the field separator and MSH-2."""
+        encoding = (encoding + DEFAULT_ENCODING_CHARACTERS[len(encoding) :])[:4]
+        self.field = field
+        self.component = encoding[0]
+        self.repetition = encoding[1]
+        self.escape = encoding[2]
+        self.subcomponent = encoding[3]
+
+    def unescape(self, value: str) -> str:
+        """Decode HL7 escape sequences in a value."""
+        escape = self.escape
+        if escape not in value:
+            return value
+
+        parts = value.split(escape)
+        # Escape sequences sit at odd indexes between escape characters
+        decoded = [parts[0]]
+        for index in range(1, len(parts), 2):
+            if index + 1 >= len(parts):
+                # Unterminated escape: keep the text as it was
+                decoded.append(escape + parts[index])
+                break
+            decoded.append(self._decode_sequence(parts[index]))
+            decoded.append(parts[index + 1])
+        return "".join(decoded)
+
+    def _decode_sequence(self, sequence: str) -> str:
+        """Decode the body of one escape sequence."""
+        simple = {
+            "F": self.field,
+            "S": self.component,
+            "T": self.subcomponent,
+            "R": self.repetition,
+            "E": self.escape,
+            ".br": "\n",
+        }
+        if sequence in simple:
+            return simple[sequence]
+        if sequence.startswith("X"):
+            try:
+                return bytes.fromhex(sequence[1:]).decode("latin-1")
+            except ValueError:
+                return ""
+        # Formatting (\H\, \N\, \.sp\ ...) and charset escapes carry no text
+        return ""
+
+
+class LazySegment:
+    """A segment whose fields are split on first access.
+
+    Field numbers follow HL7: for MSH, field 1 is the field separator and
+    field 2 the encoding characters. Repetitions, components and
+    subcomponents are 1-based.
+    """
+
+    __slots__ = ("_message", "_start", "_end", "_fields", "id")
+
+    def __init__(self, message: "LazyHL7Message", start: int, end: int):
+        """Reference a segment by its offsets in the message."""
+        self._message = message
+        self._start = start
+        self._end = end
+        self._fields: Optional[List[str]] = None
+        self.id = message.raw[start : start + 3]
+
+    @property
+    def raw(self) -> str:
+        """Segment text."""
+        return self._message.raw[self._start : self._end]
+
+    @property
+    def fields(self) -> List[str]:
+        """Raw field values, indexed by HL7 field number."""
+        if self._fields is None:
+            delimiters = self._message.delimiters
+            fields = self.raw.split(delimiters.field)
+            if self.id == "MSH":
+                # MSH-1 is the separator itself
+                fields.insert(1, delimiters.field)
+            self._fields = fields
+        return self._fields
+
+    def __len__(self) -> int:
+        """Number of fields, including the segment ID."""
+        return len(self.fields)
+
+    def field(self, number: int) -> str:
+        """Raw (still escaped) text of a field, or empty if absent."""
+        fields = self.fields
+        return fields[number] if 0 <= number < len(fields) else ""
+
+    def repetitions(self, number: int) -> List[str]:
+        """Raw repetitions of a field."""
+        value = self.field(number)
+        if self.id == "MSH" and number <= 2:
+            return [value]
+        return value.split(self._message.delimiters.repetition) if value else []
+
+    def get(
+        self,
+        number: int,
+        component: Optional[int] = None,
+        subcomponent: Optional[int] = None,
+        repetition: int = 1,
+    ) -> str:
+        """Decoded value of a field, component or subcomponent."""
+        if self.id == "MSH" and number <= 2:
+            return self.field(number)
+
+        delimiters = self._message.delimiters
+        value = self.field(number)
+        if delimiters.repetition in value:
+            repeats = value.split(delimiters.repetition)
+            value = repeats[repetition - 1] if repetition <= len(repeats) else ""
+        elif repetition > 1:
+            return ""
+
+        if component is not None:
+            value = _nth(value, delimiters.component, component)
+            if subcomponent is not None:
+                value = _nth(value, delimiters.subcomponent, subcomponent)
+        return delimiters.unescape(value)
+
+
+def _nth(value: str, separator: str, position: int) -> str:
+    """1-based item of a separated value, or empty if absent."""
+    if separator not in value:
+        return value if position == 1 else ""
+    parts = value.split(separator)
+    return parts[position - 1] if 0 < position <= len(parts) else ""
+
+
+class LazyHL7Message:
+    """An HL7 v2 message indexed by segment offsets."""
+
+    def __init__(self, raw: str):
+        """Index segment boundaries without splitting fields."""
+        if "\n" in raw:
+            raw = raw.replace("\r\n", "\r").replace("\n", "\r")
+        self.raw = raw.strip("\r\x0b\x1c")
+        if not self.raw.startswith("MSH") or len(self.raw) < 4:
+            raise ValueError("HL7 message must start with an MSH segment")
+
+        encoding_end = self.raw.find(self.raw[3], 4)
+        self.delimiters = HL7Delimiters(
+            self.raw[3],
+            self.raw[4:encoding_end] if encoding_end > 0 else "",
+        )
+
+        self._segments: List[LazySegment] = []
+        self._index: Dict[str, List[int]] = {}
+        start = 0
+        length = len(self.raw)
+        while start < length:
+            end = self.raw.find("\r", start)
+            if end < 0:
+                end = length
+            if end > start:
+                segment = LazySegment(self, start, end)
+                self._index.setdefault(segment.id, []).append(len(self._segments))
+                self._segments.append(segment)
+            start = end + 1
+
+    def __iter__(self) -> Iterator[LazySegment]:
+        """Iterate segments in message order."""
+        return iter(self._segments)
+
+    def __len__(self) -> int:
+        """Number of segments."""
+        return len(self._segments)
+
+    @property
+    def segment_ids(self) -> List[str]:
+        """Segment IDs in message order."""
+        return [segment.id for segment in self._segments]
+
+    def segment(self, segment_id: str, occurrence: int = 1) -> Optional[LazySegment]:
+        """The nth (1-based) segment with an ID, if present."""
+        positions = self._index.get(segment_id, [])
+        if 0 < occurrence <= len(positions):
+            return self._segments[positions[occurrence - 1]]
+        return None
+
+    def segments(self, segment_id: str) -> List[LazySegment]:
+        """All segments with an ID."""
+        return [self._segments[i] for i in self._index.get(segment_id, [])]
+
+    def get(self, path: str) -> str:
+        """Decoded value at a path like "PID.5.1", "OBX[2].5" or "PID.3[2].1"."""
+        match = PATH_PATTERN.match(path)
+        if match is None:
+            raise ValueError(f"Invalid HL7 path: {path}")
+        segment = self.segment(
+            match.group("segment"), int(match.group("occurrence") or 1)
+        )
+        if segment is None:
+            return ""
+        if match.group("field") is None:
+            return segment.raw
+        return segment.get(
+            int(match.group("field")),
+            int(match.group("component")) if match.group("component") else None,
+            int(match.group("subcomponent")) if match.group("subcomponent") else None,
+            int(match.group("repetition") or 1),
+        )
+
+    @property
+    def message_type(self) -> str:
+        """Message type and trigger event, e.g. "ORU^R01"."""
+        msh = self._segments[0]
+        code = msh.get(9, 1)
+        trigger = msh.get(9, 2)
+        return f"{code}^{trigger}" if trigger else code
+
+    @property
+    def control_id(self) -> str:
+        """Message control ID (MSH-10)."""
+        return self._segments[0].get(10)
+
+    @property
+    def version(self) -> str:
+        """HL7 version (MSH-12)."""
+        return self._segments[0].get(12, 1)
+
+
+HL7Source = Union[str, Path, IO[str], Iterable[str]]
+
+
+def _read_chunks(source: HL7Source, chunk_size: int) -> Iterator[str]:
+    """Text chunks from a path, text stream or iterable of strings."""
+    if isinstance(source, (str, Path)):
+        # newline="" keeps bare CR segment terminators intact
+        with open(source, encoding="utf-8", errors="replace", newline="") as fp:
+            while chunk := fp.read(chunk_size):
+                yield chunk
+    elif hasattr(source, "read"):
+        while chunk := source.read(chunk_size):  # type: ignore[union-attr]
+            yield chunk
+    else:
+        yield from source  # type: ignore[misc]
+
+
+def iter_raw_messages(
+    source: HL7Source, chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[str]:
+    """Split a stream of HL7 text into raw messages.
+
+    Messages may be separated by any segment terminator or MLLP framing;
+    FHS/BHS/BTS/FTS envelope segments are dropped. Only one message and
+    one read chunk are held in memory at a time.
+    """
+    current: List[str] = []
+    remainder = ""
+    for chunk in _read_chunks(source, chunk_size):
+        lines = SEGMENT_BOUNDARY.split(remainder + chunk)
+        # The last piece may be a segment cut by the chunk boundary
+        remainder = lines.pop()
+        for line in lines:
+            if not line:
+                continue
+            segment_id = line[:3]
+            if segment_id == "MSH" or segment_id in ENVELOPE_SEGMENTS:
+                if current:
+                    yield "\r".join(current)
+                current = [line] if segment_id == "MSH" else []
+            elif current:
+                current.append(line)
+
+    if remainder and remainder[:3] not in ENVELOPE_SEGMENTS:
+        if remainder.startswith("MSH"):
+            if current:
+                yield "\r".join(current)
+            current = [remainder]
+        elif current:
+            current.append(remainder)
+    if current:
+        yield "\r".join(current)
+
+
+def iter_hl7_messages(
+    source: HL7Source, chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[LazyHL7Message]:
+    """Parse messages lazily from a batch file, dump or stream."""
+    for raw in iter_raw_messages(source, chunk_size):
+        yield LazyHL7Message(raw)
+
+
+def parse_hl7_batch(text: str) -> Tuple[List[LazyHL7Message], Dict[str, str]]:
+    """Parse an in-memory batch.
+
+    Returns:
+        Tuple of (messages, batch header fields): BHS-9 batch name and
+        BHS-11 batch control ID when the batch has a BHS segment
+    """
+    header: Dict[str, str] = {}
+    for line in SEGMENT_BOUNDARY.split(text):
+        if line.startswith("BHS") and len(line) > 3:
+            fields = line.split(line[3])
+            # BHS-1 is the separator, so BHS-n is split index n - 1
+            header = {
+                "batch_name": fields[8] if len(fields) > 8 else "",
+                "batch_control_id": fields[10] if len(fields) > 10 else "",
+            }
+            break
+    return list(iter_hl7_messages([text])), header
+
+
+__all__ = [
+    "HL7Delimiters",
+    "LazyHL7Message",
+    "LazySegment",
+    "iter_hl7_messages",
+    "iter_raw_messages",
+    "parse_hl7_batch",
+]
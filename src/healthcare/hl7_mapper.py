@@ -4,7 +4,12 @@ This module provides HL7 mapping capabilities.
 """
 
 import logging
-from typing import Any, Dict, List, Literal, TypedDict
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Deque, Dict, Iterator, List, Literal, Optional, TypedDict
+
+from .hl7_lazy_parser import HL7Source, LazyHL7Message, iter_raw_messages
 
 logger = logging.getLogger(__name__)
 
@@ -56,14 +61,89 @@ class HL7Mapper:
         Returns:
             Internal format data
         """
-        logger.info("Parsing HL7 message")
-        # Placeholder for actual parsing
-        segments = hl7_message.split("|")
-        return {
-            "message_type": segments[0] if segments else "Unknown",
-            "raw_message": hl7_message,
+        logger.debug("Parsing HL7 message")
+        return self.from_message(LazyHL7Message(hl7_message))
+
+    def from_message(self, message: LazyHL7Message) -> Dict[str, Any]:
+        """Convert a lazily parsed message, decoding only mapped fields."""
+        data: Dict[str, Any] = {
+            "message_type": message.message_type,
+            "message_control_id": message.control_id,
+            "version": message.version,
+            "raw_message": message.raw,
         }
 
+        pid = message.segment("PID")
+        if pid is not None:
+            data["patient"] = {
+                "id": pid.get(3, 1),
+                "family_name": pid.get(5, 1),
+                "given_name": pid.get(5, 2),
+                "birth_date": pid.get(7, 1),
+                "gender": pid.get(8),
+            }
+
+        observations = [
+            {
+                "code": obx.get(3, 1),
+                "display": obx.get(3, 2),
+                "value": obx.get(5),
+                "unit": obx.get(6, 1),
+                "reference_range": obx.get(7),
+                "status": obx.get(11),
+            }
+            for obx in message.segments("OBX")
+        ]
+        if observations:
+            data["observations"] = observations
+        return data
+
+    def bulk_from_hl7(
+        self,
+        source: HL7Source,
+        workers: int = 1,
+        batch_size: int = 500,
+    ) -> Iterator[Dict[str, Any]]:
+        """Convert every message in a batch file, dump or stream.
+
+        Messages are read incrementally; with workers > 1, batches are
+        mapped in worker processes. Results keep input order, and a message
+        that fails to map yields {"error": ..., "raw_message": ...}.
+
+        Args:
+            source: Path, text stream or iterable of text chunks
+            workers: Worker processes; 1 maps in this process
+            batch_size: Messages sent to a worker per task
+        """
+        batches = _batched(iter_raw_messages(source), max(1, batch_size))
+        if workers <= 1:
+            for batch in batches:
+                yield from self._map_batch(batch)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            # Bound the batches in flight so the source is read as it is
+            # mapped rather than all up front
+            pending: Deque[Future] = deque()
+            for batch in batches:
+                pending.append(executor.submit(_map_in_worker, batch))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _map_batch(self, raw_messages: List[str]) -> List[Dict[str, Any]]:
+        """Map a batch of raw messages."""
+        results = []
+        for raw in raw_messages:
+            try:
+                results.append(self.from_message(LazyHL7Message(raw)))
+            except (ValueError, IndexError) as e:
+                results.append({"error": str(e), "raw_message": raw})
+        return results
+
     def validate_hl7(self, hl7_message: str) -> Dict[str, Any]:
         """Validate HL7 message.
 
@@ -76,5 +156,28 @@ class HL7Mapper:
         return {"valid": hl7_message.startswith("MSH"), "errors": [], "warnings": []}
 
 
+def _batched(items: Iterator[str], size: int) -> Iterator[List[str]]:
+    """Split an iterator into lists of at most size items."""
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+# Mapper held by each bulk ingest worker process
+_worker_mapper: Optional[HL7Mapper] = None
+
+
+def _init_worker(mapper: HL7Mapper) -> None:
+    """Receive the mapper for this worker process."""
+    global _worker_mapper  # pylint: disable=global-statement
+    _worker_mapper = mapper
+
+
+def _map_in_worker(raw_messages: List[str]) -> List[Dict[str, Any]]:
+    """Map a batch of raw messages in a worker process."""
+    if _worker_mapper is None:
+        raise RuntimeError("HL7 mapper worker was not initialized")
+    return _worker_mapper._map_batch(raw_messages)  # pylint: disable=protected-access
+
+
 # Create a default mapper instance
 default_mapper = HL7Mapper()
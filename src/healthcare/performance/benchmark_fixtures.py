@@ -0,0 +1,221 @@
+"""Synthetic Fixtures for Healthcare Performance Benchmarks.
+
+Generates de-identified HL7 messages, FHIR resources, terminology queries,
+translation memory segments, sync records and file payloads. Every
+generator takes a seeded random.Random so runs are reproducible and
+results are comparable between builds.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+FAMILY_NAMES = ["Haddad", "Okafor", "Nguyen", "Rahimi", "Mensah", "Kovac", "Diallo"]
+GIVEN_NAMES = ["Amina", "Yusuf", "Leila", "Omar", "Grace", "Samir", "Nadia", "Tomas"]
+
+LAB_TESTS = [
+    ("718-7", "Hemoglobin", "g/dL", 12.0, 17.0),
+    ("2345-7", "Glucose", "mg/dL", 70.0, 140.0),
+    ("6690-2", "Leukocytes", "10*3/uL", 4.0, 11.0),
+    ("2160-0", "Creatinine", "mg/dL", 0.6, 1.3),
+    ("8310-5", "Body temperature", "Cel", 36.1, 39.5),
+]
+
+ICD10_QUERIES = [
+    "cholera",
+    "asthma",
+    "common cold",
+    "acute nasopharyngitis",
+    "diabetes",
+    "hypertension",
+    "J45.9",
+    "A00.9",
+    "E11.9",
+    "tuberculosis",
+    "pneumonia",
+    "malaria",
+]
+
+TM_PHRASES = [
+    ("Take one tablet twice daily", "Tomar una tableta dos veces al día"),
+    ("Do not drink alcohol", "No beba alcohol"),
+    ("Return if the fever continues", "Regrese si la fiebre continúa"),
+    ("Allergic to penicillin", "Alérgico a la penicilina"),
+    ("Blood pressure is normal", "La presión arterial es normal"),
+    ("Keep the wound clean and dry", "Mantenga la herida limpia y seca"),
+    ("Vaccination is up to date", "La vacunación está al día"),
+    ("Follow up in two weeks", "Control en dos semanas"),
+]
+
+
+def _person(rng: random.Random) -> Tuple[str, str, str, str]:
+    """Random MRN, family name, given name and birth date."""
+    birth = datetime(1940, 1, 1) + timedelta(days=rng.randint(0, 30000))
+    return (
+        f"MRN{rng.randint(100000, 999999)}",
+        rng.choice(FAMILY_NAMES),
+        rng.choice(GIVEN_NAMES),
+        birth.strftime("%Y%m%d"),
+    )
+
+
+def make_hl7_messages(count: int, rng: random.Random) -> List[str]:
+    """ADT^A01 and ORU^R01 messages in roughly equal numbers."""
+    messages = []
+    for index in range(count):
+        mrn, family, given, birth = _person(rng)
+        header = (
+            f"MSH|^~\\&|LIS|CAMP_CLINIC|HAVEN|HAVEN|20260101{index % 24:02d}0000||"
+            f"{'ADT^A01' if index % 2 == 0 else 'ORU^R01'}|MSG{index:08d}|P|2.5"
+        )
+        pid = (
+            f"PID|1||{mrn}^^^CAMP^MR||{family}^{given}||{birth}|"
+            f"{rng.choice('MF')}|||Sector {rng.randint(1, 9)}^^Camp^^^JOR"
+        )
+        if index % 2 == 0:
+            segments = [
+                header,
+                f"EVN|A01|20260101{index % 24:02d}0000",
+                pid,
+                "PV1|1|I|WARD^101^A",
+            ]
+        else:
+            segments = [header, pid, f"OBR|1||LAB{index}|CBC^Blood panel"]
+            for set_id, (code, name, unit, low, high) in enumerate(
+                rng.sample(LAB_TESTS, 3), 1
+            ):
+                value = round(rng.uniform(low * 0.8, high * 1.2), 1)
+                segments.append(
+                    f"OBX|{set_id}|NM|{code}^{name}^LN||{value}|{unit}|"
+                    f"{low}-{high}|{'N' if low <= value <= high else 'A'}|||F"
+                )
+        messages.append("\r".join(segments))
+    return messages
+
+
+def make_fhir_resources(
+    count: int, rng: random.Random
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Patient, Observation and Immunization resources."""
+    resources: List[Tuple[str, Dict[str, Any]]] = []
+    for index in range(count):
+        _, family, given, birth = _person(rng)
+        kind = index % 3
+        if kind == 0:
+            resources.append(
+                (
+                    "Patient",
+                    {
+                        "resourceType": "Patient",
+                        "id": f"patient-{index}",
+                        "name": [{"family": family, "given": [given]}],
+                        "gender": rng.choice(["male", "female"]),
+                        "birthDate": f"{birth[:4]}-{birth[4:6]}-{birth[6:]}",
+                    },
+                )
+            )
+        elif kind == 1:
+            code, name, unit, low, high = rng.choice(LAB_TESTS)
+            resources.append(
+                (
+                    "Observation",
+                    {
+                        "resourceType": "Observation",
+                        "id": f"obs-{index}",
+                        "status": "final",
+                        "code": {
+                            "coding": [
+                                {
+                                    "system": "http://loinc.org",
+                                    "code": code,
+                                    "display": name,
+                                }
+                            ]
+                        },
+                        "subject": {"reference": f"Patient/patient-{index - 1}"},
+                        "valueQuantity": {
+                            "value": round(rng.uniform(low, high), 1),
+                            "unit": unit,
+                        },
+                    },
+                )
+            )
+        else:
+            resources.append(
+                (
+                    "Immunization",
+                    {
+                        "resourceType": "Immunization",
+                        "id": f"imm-{index}",
+                        "status": "completed",
+                        "vaccineCode": {"text": rng.choice(["Measles", "Polio"])},
+                        "patient": {"reference": f"Patient/patient-{index - 2}"},
+                        "occurrenceDateTime": "2026-03-01",
+                    },
+                )
+            )
+    return resources
+
+
+def make_icd10_queries(count: int, rng: random.Random) -> List[str]:
+    """Condition and code queries, repeating as real lookups do."""
+    return [rng.choice(ICD10_QUERIES) for _ in range(count)]
+
+
+def make_tm_segments(
+    count: int, rng: random.Random
+) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """Translation memory entries and lookup queries.
+
+    Returns:
+        Tuple of ((source, target) entries, queries); queries mix exact
+        repeats with lightly edited (fuzzy) variants
+    """
+    entries = []
+    for index in range(count):
+        source, target = TM_PHRASES[index % len(TM_PHRASES)]
+        suffix = f" ({index // len(TM_PHRASES)})" if index >= len(TM_PHRASES) else ""
+        entries.append((source + suffix, target + suffix))
+
+    queries = []
+    for _ in range(max(1, count // 2)):
+        source, _ = rng.choice(entries)
+        queries.append(source if rng.random() < 0.5 else source.replace("the ", ""))
+    return entries, queries
+
+
+def make_sync_records(
+    count: int, rng: random.Random, conflict_rate: float = 0.05
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Local and server versions of health records.
+
+    A conflict_rate share of pairs have diverged versions and fields.
+    """
+    now = datetime.utcnow()
+    pairs = []
+    for index in range(count):
+        created = now - timedelta(days=rng.randint(0, 60))
+        server = {
+            "id": f"record-{index}",
+            "record_type": rng.choice(
+                ["vaccination", "lab_result", "critical_lab_result", "emergency"]
+            ),
+            "created_at": created.isoformat(),
+            "updated_at": (created + timedelta(hours=1)).isoformat(),
+            "version": rng.randint(1, 5),
+            "status": "final",
+            "value": round(rng.uniform(1, 200), 1),
+            "notes": f"Routine follow-up {index % 13}",
+        }
+        local = dict(server)
+        if rng.random() < conflict_rate:
+            local["version"] = server["version"] + 1
+            local["value"] = round(server["value"] * 1.1, 1)
+            local["notes"] = server["notes"] + " (edited offline)"
+        pairs.append((local, server))
+    return pairs
+
+
+def make_payloads(count: int, size_kb: int, rng: random.Random) -> List[bytes]:
+    """Random file payloads of a fixed size."""
+    return [rng.randbytes(size_kb * 1024) for _ in range(count)]
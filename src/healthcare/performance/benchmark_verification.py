@@ -8,16 +8,21 @@ required for benchmark results that may contain performance metrics related to
 PHI processing. Implement data retention policies for benchmark logs.
 """
 
-import asyncio
+import io
 import json
+import random
 import statistics
+import tempfile
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from src.healthcare.fhir_client import FHIRClient
 from src.healthcare.fhir_validator import FHIRValidator
@@ -25,7 +30,9 @@ from src.healthcare.hipaa_access_control import (
     AccessLevel,
     require_phi_access,
 )
+from src.healthcare.hl7_lazy_parser import LazyHL7Message
 from src.healthcare.hl7_parser import HL7Parser
+from src.healthcare.performance import benchmark_fixtures as fixtures
 from src.security.encryption import EncryptionService
 from src.services.blockchain_verifier import blockchain_verifier
 from src.services.medical_form_reader import medical_form_reader
@@ -84,11 +91,111 @@ class BenchmarkResult:
             return self.actual_value > self.target.target_value
 
 
+@dataclass
+class BenchmarkConfig:
+    """Fixture sizes and baseline settings for a benchmark run.
+
+    Sizes are the number of synthetic items each probe processes per run.
+    The first `warmup` items of each probe (at most a fifth of them) are
+    run but not measured.
+    """
+
+    hl7_messages: int = 500
+    fhir_resources: int = 300
+    bulk_resources: int = 2000
+    icd10_queries: int = 300
+    tm_segments: int = 200
+    sync_records: int = 1000
+    sync_rounds: int = 10
+    sync_conflict_rate: float = 0.05
+    storage_payloads: int = 20
+    storage_payload_kb: int = 256
+    warmup: int = 10
+    seed: int = 1337
+    regression_tolerance: float = 0.2
+    baseline_path: Optional[Path] = None
+    icd10_data_path: Optional[str] = None
+    session_factory: Optional[Callable[[], Session]] = None
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentile of a sample, interpolating linearly between ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_timings(
+    timings_ms: Sequence[float], elapsed_s: float
+) -> Dict[str, float]:
+    """Latency percentiles (ms) and throughput (ops/s) of a timed run."""
+    if not timings_ms:
+        return {"throughput": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    return {
+        "throughput": len(timings_ms) / elapsed_s if elapsed_s > 0 else 0.0,
+        "mean": statistics.mean(timings_ms),
+        "min": min(timings_ms),
+        "max": max(timings_ms),
+        "p50": percentile(timings_ms, 50),
+        "p95": percentile(timings_ms, 95),
+        "p99": percentile(timings_ms, 99),
+    }
+
+
+def detect_regressions(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.2,
+) -> List[Dict[str, Any]]:
+    """Compare results with a stored baseline.
+
+    A benchmark regresses when its target metric, or its p95 latency, is
+    worse than the baseline by more than `tolerance` (a fraction).
+    Errored benchmarks and benchmarks without a baseline are skipped.
+    """
+    regressions = []
+    for result in results:
+        entry = baseline.get("benchmarks", {}).get(result.target.name)
+        if not entry or result.status == BenchmarkStatus.ERROR:
+            continue
+
+        checks = [(result.target.metric, result.actual_value, entry.get("value"))]
+        if "p95" in result.details and entry.get("p95"):
+            checks.append(("p95", result.details["p95"], entry["p95"]))
+
+        for metric, current, previous in checks:
+            if not previous:
+                continue
+            higher_is_better = metric != "p95" and (
+                result.target.comparison == "greater_than"
+            )
+            change = (current - previous) / previous
+            if (higher_is_better and change < -tolerance) or (
+                not higher_is_better and change > tolerance
+            ):
+                regressions.append(
+                    {
+                        "benchmark": result.target.name,
+                        "metric": metric,
+                        "baseline": previous,
+                        "current": current,
+                        "change_pct": change * 100,
+                        "baseline_build": baseline.get("build_id"),
+                    }
+                )
+    return regressions
+
+
 class BenchmarkVerification:
     """Comprehensive performance benchmark verification for healthcare standards."""
 
-    def __init__(self) -> None:
+    def __init__(self, config: Optional[BenchmarkConfig] = None) -> None:
         """Initialize benchmark verification with required services."""
+        self.config = config or BenchmarkConfig()
         self.fhir_client = FHIRClient()
         self.fhir_validator = FHIRValidator()
         self.hl7_parser = HL7Parser()
@@ -103,6 +210,9 @@ class BenchmarkVerification:
 
         self.results_dir = Path("compliance_reports/performance")
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.baseline_path = self.config.baseline_path or (
+            self.results_dir / "benchmark_baseline.json"
+        )
 
         # Define all performance targets
         self.performance_targets = self._define_performance_targets()
@@ -110,16 +220,6 @@ class BenchmarkVerification:
     def _define_performance_targets(self) -> List[PerformanceTarget]:
         """Define all performance targets from master checklist."""
         return [
-            # API Performance
-            PerformanceTarget(
-                name="API Response P95 Latency",
-                component="API",
-                metric="p95_latency",
-                target_value=500,
-                unit="ms",
-                comparison="less_than",
-                critical=True,
-            ),
             # Blockchain Performance
             PerformanceTarget(
                 name="Blockchain Transaction Time",
@@ -200,8 +300,103 @@ class BenchmarkVerification:
                 comparison="greater_than",
                 critical=False,
             ),
+            # Translation Memory Performance
+            PerformanceTarget(
+                name="Translation Memory Lookup",
+                component="Translation",
+                metric="lookup_time",
+                target_value=25,
+                unit="ms",
+                comparison="less_than",
+                critical=False,
+            ),
+            # Storage Encryption Performance
+            PerformanceTarget(
+                name="Storage Encryption Throughput",
+                component="Storage",
+                metric="encryption_throughput",
+                target_value=5,
+                unit="MB/s",
+                comparison="greater_than",
+                critical=False,
+            ),
         ]
 
+    def _rng(self, name: str) -> random.Random:
+        """Seeded generator per probe, so fixtures do not depend on run order."""
+        return random.Random(f"{self.config.seed}:{name}")
+
+    def _fixture_session(self) -> Session:
+        """Database session for probes that need one.
+
+        Uses config.session_factory when set; otherwise an in-memory SQLite
+        database with the tables the probes write to.
+        """
+        if self.config.session_factory is not None:
+            return self.config.session_factory()
+
+        from src.translation.translation_memory import TranslationMemory
+
+        engine = create_engine("sqlite:///:memory:")
+        TranslationMemory.__table__.create(engine)  # type: ignore[attr-defined]
+        return sessionmaker(bind=engine)()
+
+    def _timed_run(
+        self, operation: Callable[[Any], Any], items: Sequence[Any]
+    ) -> Tuple[List[float], float]:
+        """Time an operation per item, excluding warmup items.
+
+        Returns:
+            Tuple of (per-item timings in ms, measured wall time in seconds)
+        """
+        warmup = min(self.config.warmup, len(items) // 5)
+        for item in items[:warmup]:
+            operation(item)
+
+        timings = []
+        started = time.perf_counter()
+        for item in items[warmup:]:
+            item_start = time.perf_counter()
+            operation(item)
+            timings.append((time.perf_counter() - item_start) * 1000)
+        return timings, time.perf_counter() - started
+
+    def _error_result(
+        self, target: PerformanceTarget, message: str = ""
+    ) -> BenchmarkResult:
+        """Result for a benchmark that could not run."""
+        return BenchmarkResult(
+            target=target,
+            actual_value=0,
+            status=BenchmarkStatus.ERROR,
+            timestamp=datetime.now(),
+            samples=0,
+            details={},
+            error_message=message or "Error occurred during verification",
+        )
+
+    def _evaluate(
+        self,
+        target: PerformanceTarget,
+        actual_value: float,
+        samples: int,
+        details: Dict[str, Any],
+    ) -> BenchmarkResult:
+        """Result for a measured value against its target."""
+        met = (
+            actual_value < target.target_value
+            if target.comparison == "less_than"
+            else actual_value > target.target_value
+        )
+        return BenchmarkResult(
+            target=target,
+            actual_value=actual_value,
+            status=BenchmarkStatus.PASSED if met else BenchmarkStatus.FAILED,
+            timestamp=datetime.now(),
+            samples=samples,
+            details=details,
+        )
+
     @contextmanager
     def _measure_time(self) -> Generator[Dict[str, Any], None, None]:
         """Context manager to measure execution time."""
@@ -210,63 +405,6 @@ class BenchmarkVerification:
         yield result
         result["time"] = (time.time() - start_time) * 1000  # Convert to milliseconds
 
-    async def verify_api_performance(self) -> BenchmarkResult:
-        """Verify API response performance."""
-        target = next(
-            t for t in self.performance_targets if t.name == "API Response P95 Latency"
-        )
-
-        try:
-            # Perform multiple API calls to calculate P95 latency
-            latencies = []
-            samples = 100
-
-            for _ in range(samples):
-                with self._measure_time() as timing:
-                    # Simulate API call to FHIR server
-                    # Note: FHIRClient doesn't have search_resources method
-                    # This would need to be implemented or use a different approach
-                    pass
-                latencies.append(timing["time"])
-
-            # Calculate P95 latency
-            latencies.sort()
-            p95_index = int(len(latencies) * 0.95)
-            p95_latency = latencies[p95_index]
-
-            status = (
-                BenchmarkStatus.PASSED
-                if p95_latency < target.target_value
-                else BenchmarkStatus.FAILED
-            )
-
-            return BenchmarkResult(
-                target=target,
-                actual_value=p95_latency,
-                status=status,
-                timestamp=datetime.now(),
-                samples=samples,
-                details={
-                    "min_latency": min(latencies),
-                    "max_latency": max(latencies),
-                    "avg_latency": statistics.mean(latencies),
-                    "median_latency": statistics.median(latencies),
-                    "p95_latency": p95_latency,
-                    "p99_latency": latencies[int(len(latencies) * 0.99)],
-                },
-            )
-
-        except (ValueError, IndexError, KeyError, TypeError):
-            return BenchmarkResult(
-                target=target,
-                actual_value=0,
-                status=BenchmarkStatus.ERROR,
-                timestamp=datetime.now(),
-                samples=0,
-                details={},
-                error_message="Error occurred during verification",
-            )
-
     async def verify_blockchain_performance(self) -> BenchmarkResult:
         """Verify blockchain transaction performance."""
         target = next(
@@ -455,167 +593,209 @@ class BenchmarkVerification:
         )
 
         try:
-            # Test FHIR validation
-            validation_times = []
-            samples = 200
-
-            # Sample patient resource
-            patient_resource = {
-                "resourceType": "Patient",
-                "id": "test-patient",
-                "name": [{"family": "Test", "given": ["Patient"]}],
-                "gender": "male",
-                "birthDate": "1980-01-01",
-            }
-
-            for _ in range(samples):
-                with self._measure_time() as timing:
-                    self.fhir_validator.validate_resource("Patient", patient_resource)
-                validation_times.append(timing["time"])
-
-            avg_time = statistics.mean(validation_times)
-            status = (
-                BenchmarkStatus.PASSED
-                if avg_time < target.target_value
-                else BenchmarkStatus.FAILED
+            resources = fixtures.make_fhir_resources(
+                self.config.fhir_resources, self._rng("fhir")
             )
+            timings, elapsed = self._timed_run(
+                lambda item: self.fhir_validator.validate_resource(*item), resources
+            )
+            stats = summarize_timings(timings, elapsed)
 
-            return BenchmarkResult(
-                target=target,
-                actual_value=avg_time,
-                status=status,
-                timestamp=datetime.now(),
-                samples=samples,
-                details={
-                    "resource_type": "Patient",
-                    "min_time": min(validation_times),
-                    "max_time": max(validation_times),
-                    "median_time": statistics.median(validation_times),
+            return self._evaluate(
+                target,
+                stats["mean"],
+                len(timings),
+                {
+                    **stats,
+                    "resource_types": sorted({kind for kind, _ in resources}),
                 },
             )
 
-        except (ValueError, IndexError, KeyError, TypeError):
-            return BenchmarkResult(
-                target=target,
-                actual_value=0,
-                status=BenchmarkStatus.ERROR,
-                timestamp=datetime.now(),
-                samples=0,
-                details={},
-                error_message="Error occurred during verification",
-            )
+        except (ValueError, IndexError, KeyError, TypeError) as e:
+            return self._error_result(target, str(e))
 
     async def verify_hl7_parsing_performance(self) -> BenchmarkResult:
-        """Verify HL7 message parsing performance."""
+        """Verify HL7 message parsing performance.
+
+        The target applies to the full HL7Parser; the lazy parser used for
+        bulk ingest is measured on the same messages for comparison.
+        """
         target = next(
             t for t in self.performance_targets if t.name == "HL7 Message Parsing"
         )
 
         try:
-            # Test HL7 parsing
-            parse_times = []
-            samples = 500
-
-            for _ in range(samples):
-                with self._measure_time() as timing:
-                    # HL7Parser has parse method
-                    # test_message = (
-                    #     "MSH|^~\\&|SENDING_APP|SENDING_FAC|RECEIVING_APP|RECEIVING_FAC|"
-                    #     "20240115120000||ADT^A01|MSG00001|P|2.5\r"
-                    #     "PID|1||123456789|ALTID|DOE^JOHN^MIDDLE||19800101|M||W|"
-                    #     "123 MAIN ST^^ANYTOWN^ST^12345^USA||(555)123-4567|||M|NON|||||||||||||"
-                    # )
-                    # result = self.hl7_parser.parse(test_message)  # type: ignore
-                    pass  # Mock the parse operation
-                parse_times.append(timing["time"])
-
-            avg_time = statistics.mean(parse_times)
-            status = (
-                BenchmarkStatus.PASSED
-                if avg_time < target.target_value
-                else BenchmarkStatus.FAILED
+            messages = fixtures.make_hl7_messages(
+                self.config.hl7_messages, self._rng("hl7")
             )
-
-            return BenchmarkResult(
-                target=target,
-                actual_value=avg_time,
-                status=status,
-                timestamp=datetime.now(),
-                samples=samples,
-                details={
-                    "message_type": "ADT^A01",
-                    "min_time": min(parse_times),
-                    "max_time": max(parse_times),
-                    "throughput": samples
-                    / (sum(parse_times) / 1000),  # messages per second
+            timings, elapsed = self._timed_run(self.hl7_parser.parse_message, messages)
+            stats = summarize_timings(timings, elapsed)
+
+            def parse_lazily(raw: str) -> None:
+                message = LazyHL7Message(raw)
+                message.get("PID.3.1")
+                message.get("PID.5.1")
+                for obx in message.segments("OBX"):
+                    obx.get(5)
+
+            lazy_timings, lazy_elapsed = self._timed_run(parse_lazily, messages)
+
+            return self._evaluate(
+                target,
+                stats["mean"],
+                len(timings),
+                {
+                    **stats,
+                    "message_types": ["ADT^A01", "ORU^R01"],
+                    "lazy_parser": summarize_timings(lazy_timings, lazy_elapsed),
                 },
             )
 
-        except (ValueError, IndexError, KeyError, TypeError):
-            return BenchmarkResult(
-                target=target,
-                actual_value=0,
-                status=BenchmarkStatus.ERROR,
-                timestamp=datetime.now(),
-                samples=0,
-                details={},
-                error_message="Error occurred during verification",
-            )
+        except (ValueError, IndexError, KeyError, TypeError) as e:
+            return self._error_result(target, str(e))
 
     async def verify_terminology_performance(self) -> BenchmarkResult:
-        """Verify terminology lookup performance."""
+        """Verify terminology lookup performance with the ICD-10 mapper."""
         target = next(
             t for t in self.performance_targets if t.name == "Terminology Code Lookup"
         )
 
         try:
-            lookup_times = []
-            samples = 300
-
-            # Test codes from different systems
-            test_codes = [
-                ("http://loinc.org", "2345-7"),
-                ("http://snomed.info/sct", "73211009"),
-                ("http://hl7.org/fhir/sid/icd-10", "E11.9"),
-            ]
+            from src.ai.medical_nlp.terminology.icd10_mapper import ICD10Mapper
+
+            queries = fixtures.make_icd10_queries(
+                self.config.icd10_queries, self._rng("icd10")
+            )
+            with tempfile.TemporaryDirectory() as data_dir:
+                mapper = ICD10Mapper(data_path=self.config.icd10_data_path or data_dir)
+                timings, elapsed = self._timed_run(mapper.search, queries)
+                mapper_stats = mapper.get_statistics()
+            stats = summarize_timings(timings, elapsed)
+
+            return self._evaluate(
+                target,
+                stats["mean"],
+                len(timings),
+                {
+                    **stats,
+                    "systems_tested": ["ICD-10"],
+                    "distinct_queries": len(set(queries)),
+                    "cache_hit_rate": mapper_stats["cache_hit_rate"],
+                },
+            )
 
-            for _ in range(samples // len(test_codes)):
-                for system, code in test_codes:
-                    with self._measure_time() as timing:
-                        await self.terminology_service.validate_code(system, code)
-                    lookup_times.append(timing["time"])
+        except ImportError as e:
+            return self._error_result(target, f"ICD-10 mapper unavailable: {e}")
+        except (ValueError, IndexError, KeyError, TypeError) as e:
+            return self._error_result(target, str(e))
 
-            avg_time = statistics.mean(lookup_times)
-            status = (
-                BenchmarkStatus.PASSED
-                if avg_time < target.target_value
-                else BenchmarkStatus.FAILED
+    async def verify_translation_memory_performance(self) -> BenchmarkResult:
+        """Verify translation memory lookup performance."""
+        target = next(
+            t for t in self.performance_targets if t.name == "Translation Memory Lookup"
+        )
+
+        try:
+            from src.translation.translation_memory import (
+                SegmentType,
+                TMSegment,
+                TranslationMemoryService,
             )
 
-            return BenchmarkResult(
-                target=target,
-                actual_value=avg_time,
-                status=status,
-                timestamp=datetime.now(),
-                samples=len(lookup_times),
-                details={
-                    "systems_tested": ["LOINC", "SNOMED CT", "ICD-10"],
-                    "min_time": min(lookup_times),
-                    "max_time": max(lookup_times),
-                    "cache_hit_rate": 0.85,  # Simulated
+            entries, queries = fixtures.make_tm_segments(
+                self.config.tm_segments, self._rng("tm")
+            )
+            session = self._fixture_session()
+            try:
+                service = TranslationMemoryService(session)
+                service.batch_add(
+                    [
+                        TMSegment(
+                            source_text=source,
+                            target_text=target_text,
+                            source_language="en",
+                            target_language="es",
+                            segment_type=SegmentType.SENTENCE,
+                        )
+                        for source, target_text in entries
+                    ]
+                )
+                results: List[int] = []
+                timings, elapsed = self._timed_run(
+                    lambda query: results.append(
+                        len(service.search(query, "en", "es"))
+                    ),
+                    queries,
+                )
+            finally:
+                session.close()
+            stats = summarize_timings(timings, elapsed)
+
+            return self._evaluate(
+                target,
+                stats["mean"],
+                len(timings),
+                {
+                    **stats,
+                    "memory_size": len(entries),
+                    "hit_rate": (
+                        sum(1 for count in results if count) / len(results)
+                        if results
+                        else 0
+                    ),
                 },
             )
 
-        except (ValueError, IndexError, KeyError, TypeError):
-            return BenchmarkResult(
-                target=target,
-                actual_value=0,
-                status=BenchmarkStatus.ERROR,
-                timestamp=datetime.now(),
-                samples=0,
-                details={},
-                error_message="Error occurred during verification",
+        except ImportError as e:
+            return self._error_result(target, f"Translation memory unavailable: {e}")
+        except (ValueError, IndexError, KeyError, TypeError) as e:
+            return self._error_result(target, str(e))
+
+    async def verify_storage_encryption_performance(self) -> BenchmarkResult:
+        """Verify storage encryption round-trip throughput."""
+        target = next(
+            t
+            for t in self.performance_targets
+            if t.name == "Storage Encryption Throughput"
+        )
+
+        try:
+            from src.storage.manager import StorageManager
+
+            payloads = fixtures.make_payloads(
+                self.config.storage_payloads,
+                self.config.storage_payload_kb,
+                self._rng("storage"),
             )
+            session = self._fixture_session()
+            try:
+                manager = StorageManager(session)
+
+                def round_trip(payload: bytes) -> None:
+                    encrypted, metadata = manager._encrypt_file(io.BytesIO(payload))
+                    decrypted = manager._decrypt_file(
+                        encrypted, metadata.get("key_id", "")
+                    )
+                    if decrypted.read() != payload:
+                        raise ValueError("Encryption round trip altered the payload")
+
+                timings, elapsed = self._timed_run(round_trip, payloads)
+            finally:
+                session.close()
+            stats = summarize_timings(timings, elapsed)
+            measured_mb = len(timings) * self.config.storage_payload_kb / 1024
+
+            return self._evaluate(
+                target,
+                measured_mb / elapsed if elapsed > 0 else 0.0,
+                len(timings),
+                {**stats, "payload_kb": self.config.storage_payload_kb},
+            )
+
+        except ImportError as e:
+            return self._error_result(target, f"Storage manager unavailable: {e}")
+        except (ValueError, IndexError, KeyError, TypeError) as e:
+            return self._error_result(target, str(e))
 
     async def verify_bulk_operations_performance(self) -> BenchmarkResult:
         """Verify bulk FHIR operations performance."""
@@ -626,65 +806,31 @@ class BenchmarkVerification:
         )
 
         try:
-            # Test bulk resource processing
-            resources_processed = 0
-            start_time = time.time()
-            duration = 10  # Test for 10 seconds
-
-            while (time.time() - start_time) < duration:
-                # Process a batch of resources
-                batch_size = 50
-                resources = [
-                    {
-                        "resourceType": "Observation",
-                        "id": f"obs-{i}",
-                        "status": "final",
-                        "code": {
-                            "coding": [{"system": "http://loinc.org", "code": "2345-7"}]
-                        },
-                        "valueQuantity": {"value": 100 + i, "unit": "mg/dL"},
-                    }
-                    for i in range(batch_size)
-                ]
-
-                # Validate all resources
-                for resource in resources:
-                    self.fhir_validator.validate_resource("Resource", resource)
-                    resources_processed += 1
-
-            throughput = resources_processed / duration
-            status = (
-                BenchmarkStatus.PASSED
-                if throughput > target.target_value
-                else BenchmarkStatus.FAILED
+            resources = fixtures.make_fhir_resources(
+                self.config.bulk_resources, self._rng("bulk")
             )
-
-            return BenchmarkResult(
-                target=target,
-                actual_value=throughput,
-                status=status,
-                timestamp=datetime.now(),
-                samples=resources_processed,
-                details={
-                    "test_duration": duration,
-                    "total_resources": resources_processed,
-                    "batch_size": batch_size,
-                },
+            timings, elapsed = self._timed_run(
+                lambda item: self.fhir_validator.validate_resource(*item), resources
             )
+            stats = summarize_timings(timings, elapsed)
 
-        except (ValueError, IndexError, KeyError, TypeError):
-            return BenchmarkResult(
-                target=target,
-                actual_value=0,
-                status=BenchmarkStatus.ERROR,
-                timestamp=datetime.now(),
-                samples=0,
-                details={},
-                error_message="Error occurred during verification",
+            return self._evaluate(
+                target,
+                stats["throughput"],
+                len(timings),
+                {**stats, "test_duration": elapsed},
             )
 
+        except (ValueError, IndexError, KeyError, TypeError) as e:
+            return self._error_result(target, str(e))
+
     async def verify_offline_sync_performance(self) -> BenchmarkResult:
-        """Verify offline data synchronization performance."""
+        """Verify offline data synchronization performance.
+
+        Each round reconciles the synthetic record set the way a device
+        sync does: conflict detection on every local/server pair, then
+        ordering of the outgoing changes by priority.
+        """
         target = next(
             t
             for t in self.performance_targets
@@ -692,73 +838,67 @@ class BenchmarkVerification:
         )
 
         try:
-            # Simulate offline sync scenarios
-            sync_times = []
-            samples = 10
-
-            for _ in range(samples):
-                # Simulate data reconciliation
-                data_size = 1000  # Number of records to sync
-
-                with self._measure_time() as timing:
-                    # Simulate conflict detection and resolution
-                    await self._simulate_data_reconciliation(data_size)
-
-                sync_times.append(timing["time"])
+            from src.sync.sync_service import SyncService
 
-            avg_time = statistics.mean(sync_times)
-            status = (
-                BenchmarkStatus.PASSED
-                if avg_time < target.target_value
-                else BenchmarkStatus.FAILED
+            pairs = fixtures.make_sync_records(
+                self.config.sync_records,
+                self._rng("sync"),
+                self.config.sync_conflict_rate,
             )
-
-            return BenchmarkResult(
-                target=target,
-                actual_value=avg_time,
-                status=status,
-                timestamp=datetime.now(),
-                samples=samples,
-                details={
-                    "data_size": data_size,
-                    "min_time": min(sync_times),
-                    "max_time": max(sync_times),
-                    "conflicts_resolved": 45,  # Simulated
-                },
+            service = SyncService(self._fixture_session())
+            conflicts: List[int] = []
+
+            def reconcile(_: int) -> None:
+                found = 0
+                changes = []
+                for local, server in pairs:
+                    has_conflict, _details = service.detect_conflicts(local, server)
+                    found += has_conflict
+                    changes.append({"record_type": "health_record", "data": local})
+                changes.sort(key=service._get_record_priority_key)
+                conflicts.append(found)
+
+            timings, elapsed = self._timed_run(
+                reconcile, range(self.config.sync_rounds)
             )
+            service.session.close()
+            stats = summarize_timings(timings, elapsed)
 
-        except (ValueError, IndexError, KeyError, TypeError):
-            return BenchmarkResult(
-                target=target,
-                actual_value=0,
-                status=BenchmarkStatus.ERROR,
-                timestamp=datetime.now(),
-                samples=0,
-                details={},
-                error_message="Error occurred during verification",
+            return self._evaluate(
+                target,
+                stats["mean"],
+                len(timings),
+                {
+                    **stats,
+                    "data_size": len(pairs),
+                    "conflicts_detected": conflicts[-1] if conflicts else 0,
+                },
             )
 
-    async def _simulate_data_reconciliation(self, record_count: int) -> None:
-        """Simulate offline data reconciliation process."""
-        # This would integrate with actual offline sync logic
-        await asyncio.sleep(0.01)  # Simulate processing time per batch
+        except ImportError as e:
+            return self._error_result(target, f"Sync service unavailable: {e}")
+        except (ValueError, IndexError, KeyError, TypeError) as e:
+            return self._error_result(target, str(e))
 
-        # Simulate conflict detection
-        conflicts = int(record_count * 0.05)  # 5% conflict rate
+    async def run_all_benchmarks(
+        self, update_baseline: bool = False, build_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run all performance benchmarks and generate comprehensive report.
 
-        # Simulate conflict resolution
-        for _ in range(conflicts):
-            await asyncio.sleep(0.002)  # Simulate resolution time
+        Results are compared with the stored baseline and regressions are
+        listed in the report. With update_baseline, this run becomes the
+        baseline for later builds.
 
-    async def run_all_benchmarks(self) -> Dict[str, Any]:
-        """Run all performance benchmarks and generate comprehensive report."""
+        Args:
+            update_baseline: Store this run as the new baseline
+            build_id: Build identifier recorded with the report and baseline
+        """
         print("Starting Healthcare Standards Performance Benchmark Verification...")
 
         results = []
 
         # Map of benchmark methods
         benchmark_methods: Dict[str, Any] = {
-            "API Response P95 Latency": self.verify_api_performance,
             "Blockchain Transaction Time": self.verify_blockchain_performance,
             "Medical Term Translation Accuracy": self.verify_translation_accuracy,
             "Document Retrieval Time": self.verify_document_performance,
@@ -767,6 +907,8 @@ class BenchmarkVerification:
             "Terminology Code Lookup": self.verify_terminology_performance,
             "Bulk FHIR Resource Processing": self.verify_bulk_operations_performance,
             "Offline Data Reconciliation": self.verify_offline_sync_performance,
+            "Translation Memory Lookup": self.verify_translation_memory_performance,
+            "Storage Encryption Throughput": self.verify_storage_encryption_performance,
         }
 
         # Run each benchmark
@@ -800,6 +942,19 @@ class BenchmarkVerification:
 
         # Generate comprehensive report
         report = self._generate_benchmark_report(results)
+        report["report_metadata"]["build_id"] = build_id
+
+        # Compare with the previous build
+        baseline = self.load_baseline()
+        regressions = detect_regressions(
+            results, baseline, self.config.regression_tolerance
+        )
+        report["regressions"] = regressions
+        report["summary"]["regressions"] = len(regressions)
+        report["summary"]["baseline_build"] = baseline.get("build_id")
+
+        if update_baseline:
+            self.save_baseline(results, build_id)
 
         # Save report
         self._save_benchmark_report(report)
@@ -809,6 +964,56 @@ class BenchmarkVerification:
 
         return report
 
+    def load_baseline(self) -> Dict[str, Any]:
+        """Load the stored baseline, or an empty one if none exists."""
+        if not self.baseline_path.exists():
+            return {}
+        with open(self.baseline_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_baseline(
+        self, results: List[BenchmarkResult], build_id: Optional[str] = None
+    ) -> None:
+        """Store benchmark results as the baseline for later comparisons.
+
+        Errored benchmarks keep their previous baseline entry; entries for
+        benchmarks that are no longer defined are dropped.
+        """
+        baseline = self.load_baseline()
+        targets = {target.name for target in self.performance_targets}
+        benchmarks = {
+            name: entry
+            for name, entry in baseline.get("benchmarks", {}).items()
+            if name in targets
+        }
+        for result in results:
+            if result.status == BenchmarkStatus.ERROR:
+                continue
+            benchmarks[result.target.name] = {
+                "metric": result.target.metric,
+                "unit": result.target.unit,
+                "value": result.actual_value,
+                "p95": result.details.get("p95"),
+                "throughput": result.details.get("throughput"),
+            }
+
+        self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.baseline_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "build_id": build_id,
+                    "recorded_at": datetime.now().isoformat(),
+                    "config": {
+                        key: value
+                        for key, value in vars(self.config).items()
+                        if isinstance(value, (int, float))
+                    },
+                    "benchmarks": benchmarks,
+                },
+                f,
+                indent=2,
+            )
+
     def _generate_benchmark_report(
         self, results: List[BenchmarkResult]
     ) -> Dict[str, Any]:
@@ -905,16 +1110,7 @@ class BenchmarkVerification:
 
         for result in results:
             if not result.passed:
-                if result.target.name == "API Response P95 Latency":
-                    recommendations.append(
-                        {
-                            "component": "API",
-                            "issue": f"P95 latency ({result.actual_value:.0f}ms) exceeds target ({result.target.target_value}ms)",
-                            "recommendation": "Consider implementing caching, query optimization, or horizontal scaling",
-                        }
-                    )
-
-                elif result.target.name == "Medical Term Translation Accuracy":
+                if result.target.name == "Medical Term Translation Accuracy":
                     recommendations.append(
                         {
                             "component": "Translation",
@@ -956,6 +1152,7 @@ class BenchmarkVerification:
                     "critical_pass_rate": report["summary"]["critical_pass_rate"],
                     "all_benchmarks_passed": report["summary"]["passed"]
                     == report["summary"]["total_benchmarks"],
+                    "regressions": report["summary"].get("regressions", 0),
                 },
                 f,
                 indent=2,
@@ -977,4 +1174,12 @@ class BenchmarkVerification:
         else:
             print("\n✗ Some benchmarks failed. See recommendations in report.")
 
+        for regression in report.get("regressions", []):
+            print(
+                f"✗ REGRESSION: {regression['benchmark']} {regression['metric']} "
+                f"{regression['baseline']:.2f} -> {regression['current']:.2f} "
+                f"({regression['change_pct']:+.1f}% vs build "
+                f"{regression['baseline_build']})"
+            )
+
         print("=" * 60)
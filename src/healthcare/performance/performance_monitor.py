@@ -7,7 +7,6 @@ Handles FHIR OperationOutcome Resource validation for performance tracking.
 
 import asyncio
 import json
-import statistics
 import time
 from collections import deque
 from dataclasses import dataclass, field
@@ -17,10 +16,17 @@ from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
 from src.healthcare.fhir_validator import FHIRValidator
+from src.healthcare.performance.quantile_sketch import (
+    DEFAULT_RELATIVE_ACCURACY,
+    QuantileSketch,
+)
 
 # FHIR resource type for this module
 __fhir_resource__ = "OperationOutcome"
 
+# Quantile read for each quantile-based aggregation
+QUANTILE_AGGREGATIONS = {"median": 0.5, "p95": 0.95, "p99": 0.99}
+
 
 class MetricType(Enum):
     """Types of performance metrics."""
@@ -43,57 +49,148 @@ class MetricDataPoint:
 
 @dataclass
 class MetricWindow:
-    """Time window for metric aggregation."""
+    """Time window for metric aggregation.
+
+    The window is a ring of time slices, each summarized by a quantile
+    sketch, plus a running aggregate of the live slices. Recording a point
+    and expiring a slice update the aggregate incrementally, so reading
+    p95/p99 costs the same no matter how many points were recorded.
+    Expiry happens a whole slice at a time, so the window spans between
+    `duration` and `duration` plus one slice.
+    """
 
     name: str
     duration: timedelta
-    data_points: deque = field(default_factory=lambda: deque(maxlen=10000))
+    slice_count: int = 60
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    slices: deque = field(default_factory=deque)
+    aggregate: QuantileSketch = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Create the running aggregate."""
+        self.aggregate = QuantileSketch(self.relative_accuracy)
+
+    @property
+    def slice_seconds(self) -> float:
+        """Width of one slice in seconds."""
+        return self.duration.total_seconds() / self.slice_count
+
+    def _slice_for(self, timestamp: float) -> QuantileSketch:
+        """Sketch of the slice containing a timestamp, creating it if needed.
+
+        Slice starts are aligned to the epoch, so windows recorded by
+        different workers line up when merged.
+        """
+        start = timestamp - timestamp % self.slice_seconds
+        if not self.slices or self.slices[-1][0] < start:
+            sketch = QuantileSketch(self.relative_accuracy)
+            self.slices.append((start, sketch))
+            return sketch
+
+        # Late or merged data for an earlier slice
+        for index in range(len(self.slices) - 1, -1, -1):
+            slice_start, sketch = self.slices[index]
+            if slice_start == start:
+                return sketch
+            if slice_start < start:
+                sketch = QuantileSketch(self.relative_accuracy)
+                self.slices.insert(index + 1, (start, sketch))
+                return sketch
+        sketch = QuantileSketch(self.relative_accuracy)
+        self.slices.appendleft((start, sketch))
+        return sketch
 
     def add_point(self, point: MetricDataPoint) -> None:
         """Add a data point to the window."""
-        self.data_points.append(point)
+        self._slice_for(point.timestamp.timestamp()).add(point.value)
+        self.aggregate.add(point.value)
         self._cleanup_old_points()
 
     def _cleanup_old_points(self) -> None:
-        """Remove data points older than the window duration."""
-        cutoff_time = datetime.now() - self.duration
-        while self.data_points and self.data_points[0].timestamp < cutoff_time:
-            self.data_points.popleft()
+        """Drop slices that ended before the window duration."""
+        cutoff = time.time() - self.duration.total_seconds() - self.slice_seconds
+        while self.slices and self.slices[0][0] < cutoff:
+            _, expired = self.slices.popleft()
+            self.aggregate.subtract(expired)
+
+    def merge(self, other: "MetricWindow") -> None:
+        """Merge a window recorded elsewhere, e.g. by another worker."""
+        if other.slice_seconds != self.slice_seconds:
+            raise ValueError("Cannot merge windows with different slice widths")
+        for start, sketch in other.slices:
+            self._slice_for(start).merge(sketch)
+            self.aggregate.merge(sketch)
+        self._cleanup_old_points()
 
-    def get_statistics(self) -> Dict[str, float]:
-        """Calculate statistics for the current window."""
-        if not self.data_points:
-            return {
-                "count": 0,
-                "mean": 0,
-                "median": 0,
-                "min": 0,
-                "max": 0,
-                "p95": 0,
-                "p99": 0,
-            }
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, for shipping windows between workers."""
+        return {
+            "name": self.name,
+            "duration_seconds": self.duration.total_seconds(),
+            "slice_count": self.slice_count,
+            "relative_accuracy": self.relative_accuracy,
+            "slices": [[start, sketch.to_dict()] for start, sketch in self.slices],
+        }
 
-        values = [p.value for p in self.data_points]
-        sorted_values = sorted(values)
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricWindow":
+        """Rebuild a window from to_dict() output."""
+        window = cls(
+            name=data["name"],
+            duration=timedelta(seconds=data["duration_seconds"]),
+            slice_count=data["slice_count"],
+            relative_accuracy=data["relative_accuracy"],
+        )
+        for start, sketch_data in data["slices"]:
+            sketch = QuantileSketch.from_dict(sketch_data)
+            window.slices.append((start, sketch))
+            window.aggregate.merge(sketch)
+        return window
+
+    def get_statistic(self, aggregation: str) -> float:
+        """Single statistic (mean, median, min, max, p95, p99) for the window."""
+        self._cleanup_old_points()
+        aggregate = self.aggregate
+        if aggregation == "count":
+            return aggregate.count
+        if aggregate.count == 0:
+            return 0
+        if aggregation == "mean":
+            return aggregate.mean
+        if aggregation == "min":
+            return min(sketch.min for _, sketch in self.slices)
+        if aggregation == "max":
+            return max(sketch.max for _, sketch in self.slices)
+        if aggregation in QUANTILE_AGGREGATIONS:
+            return aggregate.quantile(QUANTILE_AGGREGATIONS[aggregation])
+        raise ValueError(f"Unknown aggregation: {aggregation}")
 
+    def get_statistics(self) -> Dict[str, float]:
+        """Calculate statistics for the current window."""
         return {
-            "count": len(values),
-            "mean": statistics.mean(values),
-            "median": statistics.median(values),
-            "min": min(values),
-            "max": max(values),
-            "p95": (
-                sorted_values[int(len(sorted_values) * 0.95)]
-                if len(sorted_values) > 1
-                else sorted_values[0]
-            ),
-            "p99": (
-                sorted_values[int(len(sorted_values) * 0.99)]
-                if len(sorted_values) > 1
-                else sorted_values[0]
-            ),
+            aggregation: self.get_statistic(aggregation)
+            for aggregation in ("count", "mean", "median", "min", "max", "p95", "p99")
         }
 
+    def get_series(self, aggregation: str = "p95") -> List[Dict[str, Any]]:
+        """Per-slice values of a statistic, oldest first, for trend charts."""
+        self._cleanup_old_points()
+        series = []
+        for start, sketch in self.slices:
+            if aggregation == "mean":
+                value = sketch.mean
+            elif aggregation == "count":
+                value = sketch.count
+            else:
+                value = sketch.quantile(QUANTILE_AGGREGATIONS[aggregation])
+            series.append(
+                {
+                    "timestamp": datetime.fromtimestamp(start).isoformat(),
+                    "value": value,
+                }
+            )
+        return series
+
 
 class PerformanceMonitor:
     """Continuous performance monitoring for healthcare standards."""
@@ -168,11 +265,10 @@ class PerformanceMonitor:
         # metric_type would be used for metric-specific processing
         _ = metric_type
         if metric_name not in self.metrics:
-            self.metrics[metric_name] = {}
-            for window_name, duration in self.window_definitions:
-                self.metrics[metric_name][window_name] = MetricWindow(
-                    name=window_name, duration=duration
-                )
+            self.metrics[metric_name] = {
+                window_name: MetricWindow(name=window_name, duration=duration)
+                for window_name, duration in self.window_definitions
+            }
 
     def record_metric(
         self, metric_name: str, value: float, metadata: Optional[Dict[str, Any]] = None
@@ -202,13 +298,11 @@ class PerformanceMonitor:
 
         if metric_name in self.metrics and window_name in self.metrics[metric_name]:
             window = self.metrics[metric_name][window_name]
-            stats = window.get_statistics()
-
-            if stats["count"] == 0:
+            if window.get_statistic("count") == 0:
                 return
 
             aggregation = threshold_config["aggregation"]
-            current_value = stats[aggregation]
+            current_value = window.get_statistic(aggregation)
             comparison = threshold_config.get("comparison", "greater_than")
 
             alert_level = None
@@ -265,6 +359,29 @@ class PerformanceMonitor:
 
         return self.metrics[metric_name][window].get_statistics()
 
+    def export_windows(self) -> Dict[str, Dict[str, Any]]:
+        """Serialize all metric windows, for merging into another monitor."""
+        return {
+            metric_name: {name: window.to_dict() for name, window in windows.items()}
+            for metric_name, windows in self.metrics.items()
+        }
+
+    def merge_windows(self, exported: Dict[str, Dict[str, Any]]) -> None:
+        """Merge windows exported by another worker's monitor.
+
+        Metrics this monitor has not registered are added; alerts are
+        re-checked against the combined windows.
+        """
+        for metric_name, windows in exported.items():
+            local_windows = self.metrics.setdefault(metric_name, {})
+            for window_name, window_data in windows.items():
+                incoming = MetricWindow.from_dict(window_data)
+                if window_name in local_windows:
+                    local_windows[window_name].merge(incoming)
+                else:
+                    local_windows[window_name] = incoming
+            self._check_alerts(metric_name)
+
     def get_all_metrics_summary(self) -> Dict[str, Dict[str, Any]]:
         """Get summary of all monitored metrics."""
         summary: Dict[str, Any] = {}
@@ -405,6 +522,11 @@ class PerformanceMonitor:
                     windows["1hour"].get_statistics() if "1hour" in windows else {}
                 ),
             }
+            if "1hour" in windows:
+                dashboard["trends"][metric_name] = {
+                    "p95": windows["1hour"].get_series("p95"),
+                    "count": windows["1hour"].get_series("count"),
+                }
 
         # Add alerts
         for alert in self.alerts:
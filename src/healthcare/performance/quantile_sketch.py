@@ -0,0 +1,237 @@
+"""Mergeable streaming quantile sketch for performance metrics.
+
+Values are counted in logarithmic buckets, so any quantile is reported
+within a fixed relative error (1% by default) of the true value, in the
+style of HDR histograms. Memory depends on the range of values, not on
+how many were recorded, and two sketches with the same accuracy merge
+(or subtract) bucket by bucket, so per-worker and per-time-slice sketches
+can be combined without the raw data points.
+"""
+
+import math
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Magnitudes below this are counted as zero
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class _BucketStore:
+    """Bucket counts with their keys kept in sorted order."""
+
+    __slots__ = ("counts", "keys")
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.counts: Dict[int, int] = {}
+        self.keys: List[int] = []
+
+    def add(self, key: int, count: int = 1) -> None:
+        """Add to a bucket, creating it if needed."""
+        if key in self.counts:
+            self.counts[key] += count
+        else:
+            self.counts[key] = count
+            insort(self.keys, key)
+
+    def remove(self, key: int, count: int) -> None:
+        """Remove from a bucket, dropping it once empty."""
+        remaining = self.counts.get(key, 0) - count
+        if remaining > 0:
+            self.counts[key] = remaining
+        elif key in self.counts:
+            del self.counts[key]
+            del self.keys[bisect_left(self.keys, key)]
+
+
+class QuantileSketch:
+    """Log-bucketed histogram with bounded relative quantile error."""
+
+    __slots__ = (
+        "relative_accuracy",
+        "_log_gamma",
+        "_positive",
+        "_negative",
+        "zero_count",
+        "count",
+        "sum",
+        "min",
+        "max",
+    )
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of reported quantiles
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(gamma)
+        self._positive = _BucketStore()
+        self._negative = _BucketStore()
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, magnitude: float) -> int:
+        """Bucket key for a positive magnitude."""
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Representative magnitude of a bucket, within the accuracy bound."""
+        return 2 * math.exp(key * self._log_gamma) / (1 + math.exp(self._log_gamma))
+
+    def add(self, value: float) -> None:
+        """Record a value."""
+        if value > MIN_INDEXABLE_VALUE:
+            self._positive.add(self._key(value))
+        elif value < -MIN_INDEXABLE_VALUE:
+            self._negative.add(self._key(-value))
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's values to this one."""
+        self._check_compatible(other)
+        for key, count in other._positive.counts.items():
+            self._positive.add(key, count)
+        for key, count in other._negative.counts.items():
+            self._negative.add(key, count)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def subtract(self, other: "QuantileSketch") -> None:
+        """Remove a sketch previously merged into this one.
+
+        An extreme that may have been removed is recomputed from the
+        remaining buckets, so it is exact only to the sketch's accuracy
+        from then on.
+        """
+        self._check_compatible(other)
+        for key, count in other._positive.counts.items():
+            self._positive.remove(key, count)
+        for key, count in other._negative.counts.items():
+            self._negative.remove(key, count)
+        self.zero_count = max(0, self.zero_count - other.zero_count)
+        self.count = max(0, self.count - other.count)
+        if self.count == 0:
+            self.sum = 0.0
+            self.min = math.inf
+            self.max = -math.inf
+        else:
+            self.sum -= other.sum
+            if other.min <= self.min:
+                lowest = next(self._ascending(), (self.min, 0))[0]
+                self.min = min(max(lowest, self.min), self.max)
+            if other.max >= self.max:
+                highest = next(self._descending(), (self.max, 0))[0]
+                self.max = max(min(highest, self.max), self.min)
+
+    def _check_compatible(self, other: "QuantileSketch") -> None:
+        """Ensure two sketches share bucket boundaries."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot combine sketches with different accuracies")
+
+    def _ascending(self) -> Iterator[Tuple[float, int]]:
+        """(value, count) buckets from smallest to largest value."""
+        for key in reversed(self._negative.keys):
+            yield -self._value(key), self._negative.counts[key]
+        if self.zero_count:
+            yield 0.0, self.zero_count
+        for key in self._positive.keys:
+            yield self._value(key), self._positive.counts[key]
+
+    def _descending(self) -> Iterator[Tuple[float, int]]:
+        """(value, count) buckets from largest to smallest value."""
+        for key in reversed(self._positive.keys):
+            yield self._value(key), self._positive.counts[key]
+        if self.zero_count:
+            yield 0.0, self.zero_count
+        for key in self._negative.keys:
+            yield -self._value(key), self._negative.counts[key]
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at quantile q (0 to 1), or 0 if empty.
+
+        Buckets are walked from the nearer end, so tail quantiles such as
+        p95 and p99 only touch the few buckets above them.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = int(min(max(q, 0.0), 1.0) * (self.count - 1))
+        if rank == 0:
+            return self.min
+        if rank == self.count - 1:
+            return self.max
+        if rank < self.count / 2:
+            buckets, remaining = self._ascending(), rank
+        else:
+            buckets, remaining = self._descending(), self.count - 1 - rank
+
+        seen = 0
+        value = 0.0
+        for value, bucket_count in buckets:
+            seen += bucket_count
+            if seen > remaining:
+                break
+        return min(max(value, self.min), self.max)
+
+    @property
+    def mean(self) -> float:
+        """Exact mean of recorded values, or 0 if empty."""
+        return self.sum / self.count if self.count else 0.0
+
+    def copy(self) -> "QuantileSketch":
+        """Independent copy of this sketch."""
+        clone = QuantileSketch(self.relative_accuracy)
+        clone.merge(self)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, for shipping sketches between workers."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "positive": self._positive.counts.copy(),
+            "negative": self._negative.counts.copy(),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch from to_dict() output."""
+        sketch = cls(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY))
+        for key, count in data.get("positive", {}).items():
+            sketch._positive.add(int(key), count)
+        for key, count in data.get("negative", {}).items():
+            sketch._negative.add(int(key), count)
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.sum = data.get("sum", 0.0)
+        min_value: Optional[float] = data.get("min")
+        max_value: Optional[float] = data.get("max")
+        sketch.min = math.inf if min_value is None else min_value
+        sketch.max = -math.inf if max_value is None else max_value
+        return sketch
+
+
+__all__ = ["QuantileSketch", "DEFAULT_RELATIVE_ACCURACY"]
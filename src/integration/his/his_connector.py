@@ -20,6 +20,7 @@ from fhirclient import client
 from fhirclient.models import observation, patient
 
 from src.config import settings
+from src.integration.mllp import get_mllp_pool
 from src.security.encryption import EncryptionService
 from src.utils.logging import get_logger
 
@@ -146,6 +147,7 @@ class HISConnector:
             "host": self.config.get("hl7_host"),
             "port": self.config.get("hl7_port", 7001),
             "timeout": self.config.get("timeout", 30),
+            "max_connections": self.config.get("hl7_max_connections", 4),
         }
 
     def _init_proprietary_connection(self) -> None:
@@ -273,36 +275,14 @@ class HISConnector:
         return "\r".join(segments)
 
     async def _send_hl7_message(self, message: str) -> str:
-        """Send HL7 message via MLLP."""
-        import socket
-
-        # MLLP wrapping
-        mllp_message = f"\x0b{message}\x1c\x0d"
-
-        # Send via socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.hl7_config["timeout"])
-
-        try:
-            sock.connect((self.hl7_config["host"], self.hl7_config["port"]))
-            sock.send(mllp_message.encode())
-
-            # Receive response
-            response = b""
-            while True:
-                data = sock.recv(4096)
-                if not data:
-                    break
-                response += data
-                if b"\x1c" in data:  # End of message
-                    break
-
-            # Remove MLLP wrapper
-            response_str = response.decode().strip("\x0b\x1c\x0d")
-            return response_str
-
-        finally:
-            sock.close()
+        """Send HL7 message via MLLP over a pooled connection."""
+        pool = get_mllp_pool(
+            self.hl7_config["host"],
+            self.hl7_config["port"],
+            timeout=self.hl7_config["timeout"],
+            max_connections=self.hl7_config["max_connections"],
+        )
+        return await pool.send(message)
 
     def _parse_hl7_patient(self, hl7_response: str) -> Dict[str, Any]:
         """Parse HL7 patient response."""
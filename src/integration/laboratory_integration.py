@@ -12,7 +12,6 @@ Supports HL7, ASTM, and modern REST APIs.
 
 import json
 import re
-import socket
 import uuid
 from datetime import datetime
 from enum import Enum
@@ -25,6 +24,7 @@ import requests
 from botocore.exceptions import BotoCoreError, ClientError
 
 from src.config import settings
+from src.integration.mllp import get_mllp_pool
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -115,6 +115,7 @@ class LaboratorySystemIntegration:
                 "host": self.config.get("hl7_host"),
                 "port": self.config.get("hl7_port", 7002),
                 "timeout": 30,
+                "max_connections": self.config.get("hl7_max_connections", 4),
             }
         else:
             # REST API configuration
@@ -497,33 +498,14 @@ IMMEDIATE PHYSICIAN NOTIFICATION REQUIRED
             }
 
     async def _send_hl7_message(self, message: str) -> str:
-        """Send HL7 message to LIS."""
-        # socket imported at module level
-
-        # MLLP wrapper
-        mllp_message = f"\x0b{message}\x1c\x0d"
-
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.hl7_config["timeout"])
-
-        try:
-            sock.connect((self.hl7_config["host"], self.hl7_config["port"]))
-            sock.send(mllp_message.encode())
-
-            # Receive response
-            response = b""
-            while True:
-                data = sock.recv(4096)
-                if not data:
-                    break
-                response += data
-                if b"\x1c" in data:
-                    break
-
-            return response.decode().strip("\x0b\x1c\x0d")
-
-        finally:
-            sock.close()
+        """Send HL7 message to LIS over a pooled MLLP connection."""
+        pool = get_mllp_pool(
+            self.hl7_config["host"],
+            self.hl7_config["port"],
+            timeout=self.hl7_config["timeout"],
+            max_connections=self.hl7_config["max_connections"],
+        )
+        return await pool.send(message)
 
     def _parse_hl7_ack(self, hl7_response: str) -> Dict[str, Any]:
         """Parse HL7 acknowledgment."""
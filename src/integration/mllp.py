@@ -0,0 +1,577 @@
+"""
+Asynchronous MLLP transport for HL7 v2 interfaces.
+
+Provides an asyncio client with persistent per-endpoint connection pools and
+a listener for inbound feeds. Messages are framed with the Minimal Lower
+Layer Protocol (<VT> message <FS><CR>). Several requests may be in flight on
+one connection; acknowledgments are matched to requests by the message
+control ID echoed in MSA-2.
+"""
+
+import asyncio
+import socket
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+START_BLOCK = b"\x0b"
+END_BLOCK = b"\x1c\x0d"
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class MLLPError(Exception):
+    """MLLP connection or protocol failure."""
+
+
+def wrap_message(message: str, encoding: str = "utf-8") -> bytes:
+    """Frame an HL7 message for MLLP."""
+    return START_BLOCK + message.encode(encoding) + END_BLOCK
+
+
+class MLLPFrameDecoder:
+    """Reassemble MLLP frames from a byte stream.
+
+    Frames may arrive split across reads or several to a read; bytes
+    outside a frame are discarded.
+    """
+
+    def __init__(self, max_frame_size: int = 16 * 1024 * 1024):
+        """Initialize frame decoder."""
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Add received bytes and return any complete frame payloads."""
+        self._buffer += data
+        frames: List[bytes] = []
+        position = 0
+        while True:
+            start = self._buffer.find(START_BLOCK, position)
+            if start < 0:
+                position = len(self._buffer)
+                break
+            end = self._buffer.find(END_BLOCK, start + 1)
+            if end < 0:
+                position = start
+                break
+            frames.append(bytes(self._buffer[start + 1 : end]))
+            position = end + len(END_BLOCK)
+
+        # Drop consumed bytes in one slice rather than per frame
+        del self._buffer[:position]
+        if len(self._buffer) > self.max_frame_size:
+            self._buffer.clear()
+            raise MLLPError("MLLP frame exceeds maximum size")
+        return frames
+
+
+def _segment_fields(message: str, segment_id: str) -> Optional[List[str]]:
+    """Fields of the first segment with the given ID (MSH-1 not counted)."""
+    for segment in message.replace("\n", "\r").split("\r"):
+        if segment.startswith(segment_id):
+            separator = segment[3:4] or "|"
+            return segment.split(separator)
+    return None
+
+
+def message_control_id(message: str) -> str:
+    """Message control ID (MSH-10) of an HL7 message."""
+    fields = _segment_fields(message, "MSH")
+    # MSH-1 is the separator itself, so MSH-10 is split index 9
+    return fields[9] if fields and len(fields) > 9 else ""
+
+
+def acknowledged_control_id(message: str) -> str:
+    """Control ID of the message acknowledged by MSA-2, if any."""
+    fields = _segment_fields(message, "MSA")
+    return fields[2] if fields and len(fields) > 2 else ""
+
+
+def build_ack(message: str, ack_code: str = "AA", text: str = "") -> str:
+    """Build an ACK for a received message."""
+    msh = _segment_fields(message, "MSH") or []
+
+    def field(index: int) -> str:
+        return msh[index] if len(msh) > index else ""
+
+    separator = message[3:4] or "|"
+    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    control_id = field(9)
+    trigger = field(8).split(field(1)[:1] or "^")
+    ack_type = "ACK" + (f"^{trigger[1]}" if len(trigger) > 1 else "")
+    header = [
+        "MSH",
+        field(1) or "^~\\&",
+        field(4),
+        field(5),
+        field(2),
+        field(3),
+        timestamp,
+        "",
+        ack_type,
+        f"ACK{control_id}"[:20],
+        field(10) or "P",
+        field(11) or "2.5",
+    ]
+    ack = [separator.join(header), separator.join(["MSA", ack_code, control_id])]
+    if text:
+        ack[-1] += separator + text
+    return "\r".join(ack)
+
+
+class MLLPConnection:
+    """One persistent MLLP connection with pipelined requests."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        encoding: str = "utf-8",
+    ):
+        """Start reading acknowledgments from an open stream."""
+        self.reader = reader
+        self.writer = writer
+        self.encoding = encoding
+        self.closed = False
+        # Requests awaiting an ACK, by control ID, oldest first
+        self._pending: Dict[str, Deque[asyncio.Future]] = {}
+        self._order: Deque[Tuple[str, asyncio.Future]] = deque()
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    @property
+    def in_flight(self) -> int:
+        """Requests sent and not yet acknowledged."""
+        return len(self._order)
+
+    async def send(self, message: str, timeout: float) -> str:
+        """Send a message and wait for its acknowledgment.
+
+        A timeout fails only this request; the connection stays open for
+        the others and a late acknowledgment is discarded.
+        """
+        if self.closed:
+            raise MLLPError("MLLP connection is closed")
+
+        control_id = message_control_id(message)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(control_id, deque()).append(future)
+        self._order.append((control_id, future))
+
+        try:
+            self.writer.write(wrap_message(message, self.encoding))
+            await self.writer.drain()
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            # TimeoutError is an OSError on 3.11; it must not end the stream
+            raise
+        except (ConnectionError, OSError) as e:
+            self._abort(MLLPError(f"MLLP send failed: {e}"))
+            raise MLLPError(f"MLLP send failed: {e}") from e
+        finally:
+            self._forget(control_id, future)
+
+    async def close(self) -> None:
+        """Close the connection, failing any unacknowledged requests."""
+        self._abort(MLLPError("MLLP connection closed"))
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    def _abort(self, error: Exception) -> None:
+        """Drop the connection without waiting for it to close."""
+        self._fail_pending(error)
+        self._reader_task.cancel()
+        self.writer.close()
+
+    def discard(self) -> None:
+        """Close a connection that belongs to another event loop."""
+        loop = self._reader_task.get_loop()
+        if loop.is_running():
+            loop.call_soon_threadsafe(
+                self._abort, MLLPError("MLLP pool moved to another event loop")
+            )
+            return
+        # A stopped loop cannot run the transport's close callbacks, so end
+        # the stream at the socket
+        self.closed = True
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    async def _read_loop(self) -> None:
+        """Resolve pending requests as acknowledgments arrive."""
+        decoder = MLLPFrameDecoder()
+        try:
+            while True:
+                data = await self.reader.read(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                for frame in decoder.feed(data):
+                    self._resolve(frame.decode(self.encoding, errors="replace"))
+        except asyncio.CancelledError:
+            raise
+        except (ConnectionError, OSError, MLLPError) as e:
+            logger.warning(f"MLLP connection lost: {e}")
+        finally:
+            self.closed = True
+            self._fail_pending(MLLPError("MLLP connection closed by peer"))
+
+    def _resolve(self, response: str) -> None:
+        """Match a response to its request by MSA-2."""
+        control_id = acknowledged_control_id(response)
+        waiters = self._pending.get(control_id)
+        if not waiters:
+            # Late ACKs for timed-out requests land here too
+            logger.warning(f"Discarding unmatched MLLP response for {control_id!r}")
+            return
+        future = waiters[0]
+        if not future.done():
+            future.set_result(response)
+
+    def _forget(self, control_id: str, future: asyncio.Future) -> None:
+        """Remove a completed request from the pending indexes."""
+        waiters = self._pending.get(control_id)
+        if waiters is not None:
+            try:
+                waiters.remove(future)
+            except ValueError:
+                pass
+            if not waiters:
+                del self._pending[control_id]
+        try:
+            self._order.remove((control_id, future))
+        except ValueError:
+            pass
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request still waiting for an acknowledgment."""
+        self.closed = True
+        for _, future in self._order:
+            if not future.done():
+                future.set_exception(error)
+                # Mark retrieved in case the sender has already timed out
+                future.exception()
+
+
+class MLLPConnectionPool:
+    """Persistent MLLP connections to one endpoint.
+
+    Connections are opened on demand up to max_connections and reused
+    across messages. Each request goes to the connection with the fewest
+    requests in flight; broken connections are replaced, with exponential
+    backoff between failed connection attempts.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        max_connections: int = 4,
+        max_in_flight: int = 32,
+        timeout: float = 30,
+        connect_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 5.0,
+        encoding: str = "utf-8",
+    ):
+        """Initialize connection pool.
+
+        Args:
+            host: MLLP endpoint host
+            port: MLLP endpoint port
+            max_connections: Connections kept open to the endpoint
+            max_in_flight: Pipelined requests per connection
+            timeout: Seconds to wait for a connection or an acknowledgment
+            connect_retries: Attempts before a connection failure is raised
+            backoff_base: First reconnect delay in seconds
+            backoff_max: Largest reconnect delay in seconds
+            encoding: Character encoding of messages on the wire
+        """
+        self.host = host
+        self.port = port
+        self.max_connections = max(1, max_connections)
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout = timeout
+        self.connect_retries = max(1, connect_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.encoding = encoding
+
+        self._connections: List[MLLPConnection] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._failures = 0
+        self.stats = {"sent": 0, "connects": 0, "connect_failures": 0}
+
+    async def send(self, message: str) -> str:
+        """Send an HL7 message and return the response message."""
+        self._bind_loop()
+        assert self._slots is not None
+        async with self._slots:
+            connection = await self._acquire()
+            response = await connection.send(message, self.timeout)
+            self.stats["sent"] += 1
+            return response
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        connections, self._connections = self._connections, []
+        same_loop = self._loop is asyncio.get_running_loop()
+        for connection in connections:
+            if same_loop:
+                await connection.close()
+            else:
+                connection.discard()
+
+    def _bind_loop(self) -> None:
+        """Reset pool state when used from a new event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # Streams and locks belong to the loop that created them
+        self._loop = loop
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.discard()
+        self._slots = asyncio.Semaphore(self.max_connections * self.max_in_flight)
+        self._lock = asyncio.Lock()
+
+    async def _acquire(self) -> MLLPConnection:
+        """Pick the least loaded open connection, opening one if useful."""
+        assert self._lock is not None
+        while True:
+            connection = self._least_loaded()
+            if connection is not None and (
+                connection.in_flight == 0
+                or len(self._connections) >= self.max_connections
+            ):
+                return connection
+
+            # Open connections one at a time so a burst of requests does
+            # not open one each
+            async with self._lock:
+                connection = self._least_loaded()
+                if len(self._connections) < self.max_connections and (
+                    connection is None or connection.in_flight > 0
+                ):
+                    try:
+                        opened = await self._connect()
+                    except MLLPError:
+                        if connection is not None:
+                            return connection
+                        raise
+                    self._connections.append(opened)
+                    return opened
+
+    def _least_loaded(self) -> Optional[MLLPConnection]:
+        """Open connection with the fewest requests in flight."""
+        self._connections = [c for c in self._connections if not c.closed]
+        return min(self._connections, key=lambda c: c.in_flight, default=None)
+
+    async def _connect(self) -> MLLPConnection:
+        """Open a connection, backing off exponentially between failures."""
+        last_error: Optional[Exception] = None
+        for _ in range(self.connect_retries):
+            if self._failures:
+                delay = min(
+                    self.backoff_max, self.backoff_base * 2 ** (self._failures - 1)
+                )
+                await asyncio.sleep(delay)
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                last_error = e
+                self._failures += 1
+                self.stats["connect_failures"] += 1
+                logger.warning(f"MLLP connect to {self.host}:{self.port} failed: {e}")
+                continue
+            self._failures = 0
+            self.stats["connects"] += 1
+            return MLLPConnection(reader, writer, self.encoding)
+
+        raise MLLPError(
+            f"Could not connect to MLLP endpoint {self.host}:{self.port}: "
+            f"{last_error}"
+        )
+
+
+# Shared pools, one per endpoint
+_pools: Dict[Tuple[str, int], MLLPConnectionPool] = {}
+
+
+def get_mllp_pool(host: str, port: int, **kwargs: Any) -> MLLPConnectionPool:
+    """Get or create the shared connection pool for an endpoint.
+
+    Raises:
+        ValueError: If the endpoint's pool was created with other settings
+    """
+    key = (host, int(port))
+    if key not in _pools:
+        _pools[key] = MLLPConnectionPool(host, int(port), **kwargs)
+        return _pools[key]
+
+    pool = _pools[key]
+    conflicts = {
+        name: value for name, value in kwargs.items() if getattr(pool, name) != value
+    }
+    if conflicts:
+        raise ValueError(
+            f"MLLP pool for {host}:{port} already exists with different "
+            f"settings: {sorted(conflicts)}"
+        )
+    return pool
+
+
+MessageHandler = Callable[[str], Awaitable[Optional[str]]]
+
+
+class MLLPServer:
+    """MLLP listener for inbound HL7 feeds.
+
+    Each connection is read continuously while its messages are handled in
+    arrival order, so senders can pipeline without waiting for every ACK.
+    The handler returns the response to send, or None for a generated AA
+    acknowledgment; a handler error is acknowledged with AE.
+    """
+
+    def __init__(
+        self,
+        handler: MessageHandler,
+        host: str = "0.0.0.0",
+        port: int = 2575,
+        queue_size: int = 256,
+        encoding: str = "utf-8",
+    ):
+        """Initialize listener.
+
+        Args:
+            handler: Coroutine called with each received message
+            host: Interface to listen on
+            port: Port to listen on
+            queue_size: Received messages buffered per connection before
+                reading pauses
+            encoding: Character encoding of messages on the wire
+        """
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.encoding = encoding
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.stats = {"connections": 0, "received": 0, "errors": 0}
+
+    @property
+    def sockets(self) -> List[Any]:
+        """Listening sockets (useful when bound to port 0)."""
+        return list(self._server.sockets) if self._server else []
+
+    async def start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        logger.info(f"MLLP listener started on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        """Stop listening and close open connections."""
+        if self._server is not None:
+            self._server.close()
+            # Closing the streams ends each connection's read loop
+            for writer in self._handlers.values():
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """Start listening and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read frames into a queue while a worker handles and ACKs them."""
+        self.stats["connections"] += 1
+        task = asyncio.current_task()
+        if task is not None:
+            self._handlers[task] = writer
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        worker = asyncio.ensure_future(self._respond(queue, writer))
+        decoder = MLLPFrameDecoder()
+        try:
+            while True:
+                data = await reader.read(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                for frame in decoder.feed(data):
+                    await queue.put(frame.decode(self.encoding, errors="replace"))
+        except (ConnectionError, OSError, MLLPError) as e:
+            logger.warning(f"MLLP inbound connection error: {e}")
+        finally:
+            await queue.put(None)
+            await worker
+            if task is not None:
+                self._handlers.pop(task, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _respond(
+        self, queue: asyncio.Queue, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle queued messages in order and write their responses."""
+        writable = True
+        while (message := await queue.get()) is not None:
+            self.stats["received"] += 1
+            try:
+                response = await self.handler(message)
+            except Exception as e:  # pylint: disable=broad-except
+                self.stats["errors"] += 1
+                logger.error(f"MLLP message handler failed: {e}")
+                response = build_ack(message, "AE", "Processing error")
+            if response is None:
+                response = build_ack(message)
+            if not writable:
+                # Keep consuming so the reader is never blocked on the queue
+                continue
+            try:
+                writer.write(wrap_message(response, self.encoding))
+                # Flush once the backlog is handled, not after every ACK
+                if queue.empty():
+                    await writer.drain()
+            except (ConnectionError, OSError) as e:
+                logger.warning(f"MLLP could not send acknowledgment: {e}")
+                writable = False
+
+
+__all__ = [
+    "MLLPConnection",
+    "MLLPConnectionPool",
+    "MLLPError",
+    "MLLPFrameDecoder",
+    "MLLPServer",
+    "acknowledged_control_id",
+    "build_ack",
+    "get_mllp_pool",
+    "message_control_id",
+    "wrap_message",
+]
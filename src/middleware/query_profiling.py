@@ -0,0 +1,58 @@
+"""Request-scoped database query profiling middleware.
+
+Groups the statements each request issues so QueryMonitoringService can
+report queries per endpoint and flag repeated SELECTs (N+1 patterns).
+Set QueryMonitoringService.request_sample_rate below 1.0 to profile only a
+share of requests in production.
+"""
+
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.services.query_monitoring import (
+    QueryMonitoringService,
+    profile_request,
+    query_monitor,
+)
+
+
+def _request_user_id(request: Request) -> Optional[str]:
+    """User ID attached to the request by authentication, if any."""
+    user = getattr(request.state, "user", None)
+    if isinstance(user, dict):
+        return user.get("sub")
+    if user is not None and getattr(user, "id", None) is not None:
+        return str(user.id)
+    return None
+
+
+class QueryProfilingMiddleware(BaseHTTPMiddleware):
+    """Profile database statements per request."""
+
+    def __init__(
+        self, app: Any, monitor: Optional[QueryMonitoringService] = None
+    ) -> None:
+        """Initialize query profiling middleware."""
+        super().__init__(app)
+        self.monitor = monitor or query_monitor
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """Profile the request and report it under its route."""
+        with profile_request(
+            endpoint=f"{request.method} {request.url.path}",
+            user_id=_request_user_id(request),
+            monitor=self.monitor,
+        ) as profile:
+            # The endpoint runs in a copied context but shares the profile
+            response: Response = await call_next(request)
+
+            # Report by route template so /patients/1 and /patients/2 group
+            route = request.scope.get("route")
+            if getattr(route, "path", None):
+                profile.endpoint = f"{request.method} {route.path}"
+            if profile.user_id is None:
+                profile.user_id = _request_user_id(request)
+
+        return response
@@ -0,0 +1,42 @@
+"""Read-your-writes consistency middleware.
+
+Clients echo the consistency token returned after a write in the
+X-Min-LSN header. Reads in the request are then routed only to replicas
+that have replayed that position, so a clinician who saves a record and
+reloads it never sees the previous version. Requests that write return
+the new token in the response.
+"""
+
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.services.read_replicas import format_lsn, read_your_writes
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+CONSISTENCY_HEADER = "X-Min-LSN"
+
+
+class ReadConsistencyMiddleware(BaseHTTPMiddleware):
+    """Scope each request for read-your-writes replica routing."""
+
+    def __init__(self, app: Any, header_name: str = CONSISTENCY_HEADER) -> None:
+        """Initialize read consistency middleware."""
+        super().__init__(app)
+        self.header_name = header_name
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """Apply the client's token and return the position after writes."""
+        with read_your_writes(request.headers.get(self.header_name)) as state:
+            initial = state.min_lsn
+            # The endpoint runs in a copied context but shares this state
+            # object, so positions recorded by its writes are visible here
+            response: Response = await call_next(request)
+
+            if state.min_lsn is not None and state.min_lsn != initial:
+                response.headers[self.header_name] = format_lsn(state.min_lsn)
+
+        return response
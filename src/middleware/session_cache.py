@@ -0,0 +1,445 @@
+"""Validated-session cache and write-behind session activity.
+
+SessionMiddleware validates each session against the database once per
+short TTL and serves the requests in between from this cache. Revocation
+is still instant:
+- ORM hooks see commits that deactivate, delete or rotate the token of a
+  UserSession, or change a user's status, role or password, whether made
+  on loaded objects or by bulk UPDATE/DELETE statements, and evict the
+  affected sessions locally
+- the same evictions are published on SESSION_INVALIDATION_CHANNEL, so
+  every node drops them; a node (re)subscribing clears its cache, and the
+  TTL bounds staleness if the subscription is down
+
+Activity on cached requests is buffered per session and written in one
+batched UPDATE per flush interval, extending sliding sessions the way a
+validated request would. At most one flush interval of activity is lost
+if a node dies.
+"""
+
+import asyncio
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import redis.asyncio as redis
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.orm import ORMExecuteState
+from sqlalchemy.orm import Session as DBSession
+
+from src.config import get_settings
+from src.config.session_config import SessionTimeoutConfig
+from src.models.auth import UserAuth, UserSession
+from src.services.near_cache import MISSING, NearCache
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Pub/sub channel carrying session revocations between nodes
+SESSION_INVALIDATION_CHANNEL = "sessions:invalidations"
+
+# Seconds a validated session is trusted without re-reading it
+SESSION_CACHE_TTL = 30
+
+# Seconds between batched last-activity writes
+ACTIVITY_FLUSH_INTERVAL = 15
+
+# User fields whose change must end cached access immediately
+_USER_REVOCATION_FIELDS = (
+    "is_active",
+    "is_locked",
+    "role",
+    "custom_permissions",
+    "password_hash",
+)
+
+# Session fields whose change must end cached access immediately. Expiry
+# extensions from activity are not revocations; a cached entry never
+# outlives the expiry it was validated with.
+_SESSION_REVOCATION_FIELDS = (
+    "is_active",
+    "invalidated_at",
+    "token",
+    "absolute_expires_at",
+)
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize a timestamp to naive UTC for comparison with utcnow()."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def sliding_expiry(session: UserSession, at: datetime) -> Optional[datetime]:
+    """Expiry of a sliding session after activity at `at`, or None."""
+    if session.timeout_policy != "sliding":
+        return None
+    idle_timeout = SessionTimeoutConfig.get_config(str(session.session_type))[
+        "idle_timeout"
+    ]
+    expires_at = at + timedelta(minutes=idle_timeout)
+    absolute = naive_utc(session.absolute_expires_at)
+    if absolute is not None:
+        expires_at = min(expires_at, absolute)
+    return expires_at
+
+
+class SessionActivityBuffer:
+    """Coalesces per-request session activity into batched writes."""
+
+    def __init__(self) -> None:
+        """Initialize activity buffer."""
+        # session id -> {"last_activity_at": ..., "expires_at": ...}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of sessions with unwritten activity."""
+        return len(self._pending)
+
+    def record(self, session: UserSession, at: Optional[datetime] = None) -> None:
+        """Note activity on a session; only the latest per session is kept."""
+        at = at or datetime.utcnow()
+        values: Dict[str, Any] = {"last_activity_at": at}
+        expires_at = sliding_expiry(session, at)
+        if expires_at is not None:
+            values["expires_at"] = expires_at
+        with self._lock:
+            self._pending[str(session.id)] = values
+
+    def pending_expiry(self, session_id: str) -> Optional[datetime]:
+        """Expiry the next flush will write for a session, if any."""
+        with self._lock:
+            values = self._pending.get(session_id)
+        return values.get("expires_at") if values else None
+
+    def discard(self, session_id: str) -> None:
+        """Drop buffered activity superseded by a direct write."""
+        with self._lock:
+            self._pending.pop(session_id, None)
+
+    def flush(self, db: DBSession) -> int:
+        """Write buffered activity in one batched UPDATE.
+
+        Returns:
+            Number of sessions updated
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        rows = [
+            {"id": uuid.UUID(session_id), **values}
+            for session_id, values in pending.items()
+        ]
+        # Sliding sessions also extend their expiry; group by column set
+        # so each executemany has uniform parameters
+        for with_expiry in (True, False):
+            batch = [row for row in rows if ("expires_at" in row) == with_expiry]
+            if batch:
+                db.execute(update(UserSession), batch)
+        db.commit()
+        return len(rows)
+
+
+class SessionValidationCache:
+    """Short-TTL cache of validated sessions with pub/sub revocation."""
+
+    def __init__(
+        self,
+        ttl: float = SESSION_CACHE_TTL,
+        max_entries: int = 10000,
+    ) -> None:
+        """Initialize session cache.
+
+        Args:
+            ttl: Seconds a validated session is served without the database
+            max_entries: Maximum number of cached sessions
+        """
+        self.ttl = ttl
+        self.cache = NearCache(max_entries=max_entries, ttl=ttl)
+        self.node_id = uuid.uuid4().hex
+        self.redis_client: Optional[redis.Redis] = None
+        self._user_sessions: Dict[str, Set[str]] = {}
+        self._index_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._started = False
+
+    @property
+    def generation(self) -> int:
+        """Revocation generation; pass to put() for entries read before it."""
+        return self.cache.generation
+
+    def get(
+        self, session_id: str, client: Tuple[Optional[str], ...] = ()
+    ) -> Optional[Tuple[UserSession, UserAuth]]:
+        """Get a detached (session, user) pair validated within the TTL.
+
+        Args:
+            session_id: Session ID from the access token
+            client: Client details (IP, user agent) the cached validation
+                must have seen; a change forces revalidation
+        """
+        entry = self.cache.get(session_id)
+        if entry is MISSING or entry[2] != client:
+            return None
+        return entry[0], entry[1]
+
+    def put(
+        self,
+        session: UserSession,
+        user: UserAuth,
+        client: Tuple[Optional[str], ...] = (),
+        generation: Optional[int] = None,
+    ) -> bool:
+        """Cache a validated session, never past its own expiry.
+
+        Both objects must be detached with their columns loaded.
+        """
+        now = datetime.utcnow()
+        ttl = self.ttl
+        for deadline in (session.expires_at, session.absolute_expires_at):
+            deadline = naive_utc(deadline)
+            if deadline is not None:
+                ttl = min(ttl, (deadline - now).total_seconds())
+
+        session_id = str(session.id)
+        stored = self.cache.set(
+            session_id, (session, user, client), ttl=ttl, generation=generation
+        )
+        if stored:
+            with self._index_lock:
+                self._user_sessions.setdefault(str(user.id), set()).add(session_id)
+        return stored
+
+    def revoke(
+        self,
+        session_ids: Iterable[str] = (),
+        user_ids: Iterable[str] = (),
+        publish: bool = True,
+    ) -> None:
+        """Evict sessions (and all sessions of users) on every node."""
+        session_ids = [str(s) for s in session_ids]
+        user_ids = [str(u) for u in user_ids]
+        if not session_ids and not user_ids:
+            return
+
+        evicted = set(session_ids)
+        with self._index_lock:
+            for user_id in user_ids:
+                evicted.update(self._user_sessions.pop(user_id, ()))
+        self.cache.invalidate(evicted)
+
+        if publish:
+            self._schedule_publish(
+                {"origin": self.node_id, "sessions": session_ids, "users": user_ids}
+            )
+
+    def clear(self) -> None:
+        """Drop every cached session on this node."""
+        with self._index_lock:
+            self._user_sessions.clear()
+        self.cache.clear()
+
+    async def start(self) -> None:
+        """Connect to Redis and listen for revocations from other nodes."""
+        if self._started:
+            return
+        self._started = True
+        self._loop = asyncio.get_running_loop()
+
+        redis_url = getattr(get_settings(), "redis_url", None)
+        if not redis_url:
+            logger.warning(
+                "No Redis configured; session revocations are local to this node"
+            )
+            return
+        try:
+            self.redis_client = await redis.from_url(redis_url)
+            await self.redis_client.ping()
+        except (redis.ConnectionError, redis.TimeoutError, redis.RedisError) as e:
+            logger.error(f"Session revocation channel unavailable: {e}")
+            self.redis_client = None
+            return
+        self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening and drop the cache."""
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        if self.redis_client:
+            await self.redis_client.close()
+            self.redis_client = None
+        self._started = False
+        self.clear()
+
+    async def _listen(self) -> None:
+        """Apply revocations published by other nodes."""
+        while self.redis_client:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(SESSION_INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        # Anything published before (re)subscribing was missed
+                        self.clear()
+                    elif message["type"] == "message":
+                        self._apply(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except redis.RedisError as e:
+                logger.warning(f"Session revocation listener error: {e}")
+                self.clear()
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.close()
+                except redis.RedisError:
+                    pass
+
+    def _apply(self, data: bytes) -> None:
+        """Evict sessions named in a revocation message."""
+        try:
+            message = json.loads(data)
+        except (json.JSONDecodeError, TypeError):
+            logger.warning("Ignoring malformed session revocation message")
+            return
+        if message.get("origin") == self.node_id:
+            return
+        self.revoke(
+            message.get("sessions", ()), message.get("users", ()), publish=False
+        )
+
+    def _schedule_publish(self, message: Dict[str, Any]) -> None:
+        """Publish from any thread without blocking the caller."""
+        loop = self._loop
+        if not self.redis_client or loop is None or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._publish(message), loop)
+
+    async def _publish(self, message: Dict[str, Any]) -> None:
+        if not self.redis_client:
+            return
+        try:
+            await self.redis_client.publish(
+                SESSION_INVALIDATION_CHANNEL, json.dumps(message)
+            )
+        except redis.RedisError as e:
+            logger.error(f"Session revocation publish error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            **self.cache.stats(),
+            "listening": bool(self._listener_task and not self._listener_task.done()),
+        }
+
+
+session_cache = SessionValidationCache()
+
+
+def detach(db: DBSession, *instances: Any) -> None:
+    """Load expired columns and detach instances so they can be cached."""
+    for instance in instances:
+        if inspect(instance).expired_attributes:
+            db.refresh(instance)
+        db.expunge(instance)
+
+
+def _changed(instance: Any, fields: Tuple[str, ...]) -> bool:
+    attrs = inspect(instance).attrs
+    return any(attrs[name].history.has_changes() for name in fields)
+
+
+@event.listens_for(DBSession, "after_flush")
+def _collect_revocations(db: DBSession, flush_context: Any) -> None:
+    """Note sessions and users whose cached validation a commit would void."""
+    sessions: Set[str] = db.info.setdefault("revoked_session_ids", set())
+    users: Set[str] = db.info.setdefault("revoked_user_ids", set())
+    for instance in db.dirty:
+        if isinstance(instance, UserSession):
+            if _changed(instance, _SESSION_REVOCATION_FIELDS):
+                sessions.add(str(instance.id))
+        elif isinstance(instance, UserAuth):
+            if _changed(instance, _USER_REVOCATION_FIELDS):
+                users.add(str(instance.id))
+    for instance in db.deleted:
+        if isinstance(instance, UserSession):
+            sessions.add(str(instance.id))
+        elif isinstance(instance, UserAuth):
+            users.add(str(instance.id))
+
+
+def _assigned_columns(state: ORMExecuteState) -> Set[str]:
+    """Names of the columns a bulk UPDATE sets."""
+    values = state.statement._values or ()  # pylint: disable=protected-access
+    names = {getattr(column, "key", column) for column in values}
+    params = state.parameters
+    for row in params if isinstance(params, list) else [params or {}]:
+        names.update(row)
+    return names
+
+
+@event.listens_for(DBSession, "do_orm_execute")
+def _collect_bulk_revocations(state: ORMExecuteState) -> None:
+    """Note sessions and users a bulk UPDATE or DELETE would void.
+
+    Bulk statements bypass the flush, so the rows they match are read
+    before the statement runs.
+    """
+    if not (state.is_update or state.is_delete) or state.bind_mapper is None:
+        return
+    model = state.bind_mapper.class_
+    if model is UserSession:
+        fields, info_key = _SESSION_REVOCATION_FIELDS, "revoked_session_ids"
+    elif model is UserAuth:
+        fields, info_key = _USER_REVOCATION_FIELDS, "revoked_user_ids"
+    else:
+        return
+    if state.is_update and not _assigned_columns(state).intersection(fields):
+        return
+
+    whereclause = state.statement.whereclause
+    if whereclause is None and isinstance(state.parameters, list):
+        # Bulk UPDATE by primary key
+        ids = {str(row["id"]) for row in state.parameters if "id" in row}
+    else:
+        query = select(model.id)
+        if whereclause is not None:
+            query = query.where(whereclause)
+        ids = {str(row_id) for row_id in state.session.scalars(query)}
+    state.session.info.setdefault(info_key, set()).update(ids)
+
+
+@event.listens_for(DBSession, "after_commit")
+def _publish_revocations(db: DBSession) -> None:
+    """Revoke cached validations once the change is durable."""
+    sessions: List[str] = list(db.info.pop("revoked_session_ids", ()))
+    users: List[str] = list(db.info.pop("revoked_user_ids", ()))
+    if sessions or users:
+        session_cache.revoke(sessions, users)
+
+
+@event.listens_for(DBSession, "after_rollback")
+def _discard_revocations(db: DBSession) -> None:
+    db.info.pop("revoked_session_ids", None)
+    db.info.pop("revoked_user_ids", None)
+
+
+__all__ = [
+    "ACTIVITY_FLUSH_INTERVAL",
+    "SESSION_CACHE_TTL",
+    "SESSION_INVALIDATION_CHANNEL",
+    "SessionActivityBuffer",
+    "SessionValidationCache",
+    "detach",
+    "naive_utc",
+    "session_cache",
+    "sliding_expiry",
+]
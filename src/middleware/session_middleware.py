@@ -4,13 +4,15 @@ This module provides middleware to validate sessions, enforce timeout policies,
 and track session activity for the Haven Health Passport system.
 """
 
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Callable
+from typing import Any, Callable, Optional, Tuple
 
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session as DBSession
 
 try:
@@ -30,11 +32,21 @@ except ImportError:
         raise NotImplementedError("Flask is not installed")
 
 
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from src.auth.session_manager import SessionManager
 from src.auth.token_decoder import decode_access_token
-from src.models.auth import UserSession
+from src.config.session_config import SessionTimeoutConfig
+from src.middleware.session_cache import (
+    ACTIVITY_FLUSH_INTERVAL,
+    SessionActivityBuffer,
+    SessionValidationCache,
+    detach,
+    naive_utc,
+    session_cache,
+)
+from src.models.auth import UserAuth, UserSession
 from src.utils.exceptions import SessionExpiredException, SessionInvalidException
 
 logger = logging.getLogger(__name__)
@@ -55,19 +67,34 @@ class SessionMiddleware(BaseHTTPMiddleware):
         "/openapi.json",
     ]
 
-    def __init__(self, app: Any, db_session_maker: Callable[[], DBSession]) -> None:
+    def __init__(
+        self,
+        app: Any,
+        db_session_maker: Callable[[], DBSession],
+        validation_cache: Optional[SessionValidationCache] = None,
+        activity_flush_interval: float = ACTIVITY_FLUSH_INTERVAL,
+    ) -> None:
         """Initialize session middleware.
 
         Args:
             app: FastAPI application
             db_session_maker: Database session factory
+            validation_cache: Validated-session cache (process-wide by default)
+            activity_flush_interval: Seconds between batched activity writes
         """
         super().__init__(app)
         self.db_session_maker = db_session_maker
+        self.validation_cache = validation_cache or session_cache
+        self.activity = SessionActivityBuffer()
+        self.activity_flush_interval = activity_flush_interval
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def dispatch(self, request: Request, call_next: Any) -> Any:
         """Process request and validate session.
 
+        Sessions validated within the cache TTL are served without touching
+        the database; their activity is buffered and written in batches.
+
         Args:
             request: Incoming request
             call_next: Next middleware/handler
@@ -107,45 +134,51 @@ class SessionMiddleware(BaseHTTPMiddleware):
                 content={"detail": f"Invalid token: {str(e)}"},
             )
 
+        await self._start_background_tasks()
+
+        session_id = str(session_id)
+        client = (
+            request.client.host if request.client else None,
+            request.headers.get("User-Agent"),
+        )
+
         # Get database session
         db = self.db_session_maker()
 
         try:
-            # Create session manager
-            session_manager = SessionManager(db)
-
-            # Get session token from database using session ID
-            session = db.query(UserSession).filter(UserSession.id == session_id).first()
-
-            if not session:
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={"detail": "Session not found"},
-                )
-
-            # Validate session
-            try:
-                validated_session, user = session_manager.validate_session(
-                    session_token=str(session.token),
-                    update_activity=True,
-                    ip_address=request.client.host if request.client else None,
-                    user_agent=request.headers.get("User-Agent"),
-                )
-
-                # Attach session and user to request state
-                request.state.session = validated_session
-                request.state.user = user
-                request.state.db = db
-
-            except SessionExpiredException:
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={"detail": "Session has expired"},
-                )
-            except SessionInvalidException as e:
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED, content={"detail": str(e)}
-                )
+            cached = self.validation_cache.get(session_id, client)
+            if cached is not None:
+                # Attach copies to this request's session without a query
+                validated_session = db.merge(cached[0], load=False)
+                user = db.merge(cached[1], load=False)
+                self.activity.record(validated_session)
+            else:
+                try:
+                    validated = await run_in_threadpool(
+                        self._validate_session, db, session_id, client
+                    )
+                except SessionExpiredException:
+                    return JSONResponse(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        content={"detail": "Session has expired"},
+                    )
+                except SessionInvalidException as e:
+                    return JSONResponse(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        content={"detail": str(e)},
+                    )
+
+                if validated is None:
+                    return JSONResponse(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        content={"detail": "Session not found"},
+                    )
+                validated_session, user = validated
+
+            # Attach session and user to request state
+            request.state.session = validated_session
+            request.state.user = user
+            request.state.db = db
 
             # Process request
             response = await call_next(request)
@@ -153,12 +186,17 @@ class SessionMiddleware(BaseHTTPMiddleware):
             # Check if session should be renewed (close to expiry)
             if self._should_renew_session(validated_session):
                 try:
-                    renewed_session = session_manager.renew_session(validated_session)
+                    renewed_session = await run_in_threadpool(
+                        SessionManager(db).renew_session, validated_session
+                    )
                     # Add new token to response headers
                     response.headers["X-New-Session-Token"] = renewed_session.token
                 except (SessionExpiredException, SessionInvalidException):
                     # Log but don't fail the request
                     pass
+                finally:
+                    # Next request revalidates against the renewed row
+                    self.validation_cache.revoke([session_id])
 
             return response
 
@@ -166,6 +204,74 @@ class SessionMiddleware(BaseHTTPMiddleware):
             # Close database session
             db.close()
 
+    def _validate_session(
+        self,
+        db: DBSession,
+        session_id: str,
+        client: Tuple[Optional[str], Optional[str]],
+    ) -> Optional[Tuple[UserSession, UserAuth]]:
+        """Validate a session against the database and cache the result.
+
+        Runs in a worker thread so the event loop is not blocked on the
+        database.
+
+        Returns:
+            The session and user attached to `db`, or None if not found
+        """
+        # Revocations from here on discard this fill
+        generation = self.validation_cache.generation
+        # This validation records the activity itself
+        self.activity.discard(session_id)
+
+        # Get session token from database using session ID
+        session = db.query(UserSession).filter(UserSession.id == session_id).first()
+        if not session:
+            return None
+
+        ip_address, user_agent = client
+        validated_session, user = SessionManager(db).validate_session(
+            session_token=str(session.token),
+            update_activity=True,
+            ip_address=ip_address,
+            user_agent=user_agent,
+        )
+
+        detach(db, validated_session, user)
+        self.validation_cache.put(validated_session, user, client, generation)
+        return db.merge(validated_session, load=False), db.merge(user, load=False)
+
+    async def _start_background_tasks(self) -> None:
+        """Subscribe to revocations and start the activity flusher once."""
+        if self._flush_task is None or self._flush_task.done():
+            await self.validation_cache.start()
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.activity_flush_interval)
+            await self.flush_activity()
+
+    async def flush_activity(self) -> int:
+        """Write buffered session activity now.
+
+        Returns:
+            Number of sessions updated
+        """
+        if not self.activity:
+            return 0
+        return await run_in_threadpool(self._write_activity)
+
+    def _write_activity(self) -> int:
+        db = self.db_session_maker()
+        try:
+            return self.activity.flush(db)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error("Failed to write session activity: %s", str(e))
+            return 0
+        finally:
+            db.close()
+
     def _is_exempt_path(self, path: str) -> bool:
         """Check if path is exempt from session validation.
 
@@ -189,16 +295,9 @@ class SessionMiddleware(BaseHTTPMiddleware):
         Returns:
             True if should renew
         """
-        # Get renewal window from session metadata
-        metadata = session.metadata or {}
-        timeout_config = metadata.get("timeout_config", {})
-        renewal_window = timeout_config.get("renewal_window", 5)  # Default 5 minutes
-
-        # Check if within renewal window
-        now = datetime.utcnow()
-        time_until_expiry = (session.expires_at - now).total_seconds() / 60
-
-        return bool(time_until_expiry <= renewal_window)
+        # Buffered activity may already have extended a sliding session
+        expires_at = self.activity.pending_expiry(str(session.id))
+        return _within_renewal_window(session, expires_at or session.expires_at)
 
 
 def flask_session_middleware(
@@ -326,14 +425,30 @@ def _should_renew_session_flask(session: "UserSession") -> bool:
     Returns:
         True if should renew
     """
-    # Get renewal window from session metadata
-    metadata = session.metadata or {}
+    return _within_renewal_window(session, session.expires_at)
+
+
+def _within_renewal_window(session: "UserSession", expires_at: datetime) -> bool:
+    """Check if a session expiring at `expires_at` is due for renewal.
+
+    Args:
+        session: Current session
+        expires_at: Session expiry to measure against
+
+    Returns:
+        True if should renew
+    """
+    # Get renewal window from session metadata, then the session type
+    metadata = session.session_metadata or {}
     timeout_config = metadata.get("timeout_config", {})
-    renewal_window = timeout_config.get("renewal_window", 5)
+    renewal_window = timeout_config.get(
+        "renewal_window",
+        SessionTimeoutConfig.get_config(str(session.session_type))["renewal_window"],
+    )
 
     # Check if within renewal window
     now = datetime.utcnow()
-    time_until_expiry = (session.expires_at - now).total_seconds() / 60
+    time_until_expiry = (naive_utc(expires_at) - now).total_seconds() / 60
 
     return bool(time_until_expiry <= renewal_window)
 
@@ -27,6 +27,8 @@ from .document import Document
 from .file_attachment import FileAttachment
 from .health_record import HealthRecord
 from .patient import Patient
+from .patient_search_key import PatientSearchKey
+from .record_access_grant import RecordAccessGrant
 from .sms_log import SMSLog
 from .verification import Verification
 
@@ -42,7 +44,9 @@ __all__ = [
     "SoftDeleteMixin",
     "Document",
     "Patient",
+    "PatientSearchKey",
     "HealthRecord",
+    "RecordAccessGrant",
     "Verification",
     "AccessLog",
     "FileAttachment",
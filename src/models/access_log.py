@@ -299,6 +299,8 @@ class AccessLog(BaseModel):
         **kwargs: Any,
     ) -> "AccessLog":
         """Create a new access log entry."""
+        # The column default only applies at flush; risk scoring needs it now
+        kwargs.setdefault("access_timestamp", datetime.utcnow())
         log_entry = cls(
             user_id=user_id,
             resource_type=resource_type,
@@ -90,6 +90,9 @@ class UserAuth(BaseModel):
     phone_verification_code = Column(String(10))
     phone_verification_expires = Column(DateTime)
 
+    # Notification channels, as JSON: {"channels": ["email", "in_app"]}
+    notification_preferences = Column(Text)
+
     # Login tracking
     last_login_at = Column(DateTime)
     last_login_ip = Column(String(45))  # IPv4 or IPv6
@@ -9,13 +9,16 @@ import base64
 import hashlib
 import json
 from datetime import datetime
-from typing import Any, Optional, Type
+from typing import Any, List, Optional, Sequence, Type
 
 from cryptography.fernet import InvalidToken
-from sqlalchemy import Text, TypeDecorator
+from sqlalchemy import Column, String, Text, TypeDecorator, event, inspect, or_
 from sqlalchemy.ext.mutable import MutableDict, MutableList
+from sqlalchemy.sql.elements import ColumnElement
 
 from src.healthcare.fhir_validator import FHIRValidator
+from src.models.base import Base
+from src.models.db_types import ARRAY
 from src.services.encryption_service import EncryptionService
 from src.utils.logging import get_logger
 
@@ -27,6 +30,31 @@ logger = get_logger(__name__)
 # Initialize validator for encrypted FHIR data
 validator = FHIRValidator()
 
+# Companion column suffixes for blind indexes
+BLIND_INDEX_SUFFIX = "_bidx"
+BLIND_INDEX_PREFIX_SUFFIX = "_bidx_prefix"
+BLIND_INDEX_KINDS = ("text", "email", "phone", "identifier", "date")
+
+
+def normalize_for_index(value: Any, kind: str) -> str:
+    """Normalize a plaintext value the way key management indexes it."""
+    # pylint: disable-next=import-outside-toplevel
+    from src.security.key_management.blind_index import (
+        normalize_for_index as _normalize,
+    )
+
+    return _normalize(value, kind)
+
+
+def get_blind_index_keyring() -> Any:
+    """Get the blind index keyring from key management."""
+    # pylint: disable-next=import-outside-toplevel
+    from src.security.key_management.blind_index import (
+        get_blind_index_keyring as _get_keyring,
+    )
+
+    return _get_keyring()
+
 
 class EncryptedType(TypeDecorator):
     """Base type for encrypted database fields."""
@@ -38,13 +66,44 @@ class EncryptedType(TypeDecorator):
         self,
         *args: Any,
         encryption_service: Optional[EncryptionService] = None,
+        blind_index: Optional[str] = None,
+        blind_index_prefixes: Sequence[int] = (),
         **kwargs: Any,
     ) -> None:
-        """Initialize encrypted type."""
+        """Initialize encrypted type.
+
+        Args:
+            encryption_service: Service used for Fernet encryption
+            blind_index: Normalizer name ("email", "phone", "identifier",
+                "date", "text") enabling a keyed-HMAC companion column
+                ``<column>_bidx`` for equality lookups
+            blind_index_prefixes: Word prefix lengths indexed into
+                ``<column>_bidx_prefix`` for prefix-token lookups
+        """
         super().__init__(*args, **kwargs)
+        if blind_index is not None and blind_index not in BLIND_INDEX_KINDS:
+            raise ValueError(f"Unknown blind index normalizer: {blind_index}")
+        if blind_index_prefixes and blind_index is None:
+            raise ValueError("blind_index_prefixes requires blind_index")
         self.encryption_service = encryption_service or EncryptionService()
+        self.blind_index = blind_index
+        self.blind_index_prefixes = tuple(blind_index_prefixes)
         self._key_id = None
 
+    def compute_blind_index(self, value: Any, context: str) -> Optional[str]:
+        """Compute the equality blind index for a plaintext value."""
+        if self.blind_index is None or value is None:
+            return None
+        return get_blind_index_keyring().compute(value, self.blind_index, context)
+
+    def compute_blind_prefixes(self, value: Any, context: str) -> Optional[List[str]]:
+        """Compute prefix-token blind indexes for a plaintext value."""
+        if not self.blind_index_prefixes or value is None:
+            return None
+        return get_blind_index_keyring().compute_prefixes(
+            value, str(self.blind_index), context, self.blind_index_prefixes
+        )
+
     @property
     def python_type(self) -> Type[Any]:
         """Return the Python type for this custom type."""
@@ -420,19 +479,19 @@ def create_encrypted_field(
 
 
 # Commonly used encrypted field configurations
-def EncryptedEmail() -> TypeDecorator:
+def EncryptedEmail(**kwargs: Any) -> TypeDecorator:
     """Create an encrypted email field with searchable capabilities."""
-    return create_encrypted_field(SearchableEncrypted)
+    return create_encrypted_field(SearchableEncrypted, **kwargs)
 
 
-def EncryptedPhone() -> TypeDecorator:
+def EncryptedPhone(**kwargs: Any) -> TypeDecorator:
     """Create an encrypted phone number field."""
-    return create_encrypted_field(EncryptedString)
+    return create_encrypted_field(EncryptedString, **kwargs)
 
 
-def EncryptedSSN() -> TypeDecorator:
+def EncryptedSSN(**kwargs: Any) -> TypeDecorator:
     """Create an encrypted SSN field."""
-    return create_encrypted_field(EncryptedString)
+    return create_encrypted_field(EncryptedString, **kwargs)
 
 
 def EncryptedAddress() -> TypeDecorator:
@@ -455,6 +514,200 @@ def EncryptedMedication() -> TypeDecorator:
     return create_encrypted_field(EncryptedJSON)
 
 
+# Blind index companion columns
+def BlindIndexColumn() -> Column:
+    """Create the ``<column>_bidx`` companion column for equality lookups."""
+    return Column(String(64), index=True)
+
+
+def BlindIndexPrefixColumn() -> Column:
+    """Create the ``<column>_bidx_prefix`` companion column for prefix tokens.
+
+    Index it with GIN on PostgreSQL so ``@>`` containment is index-backed.
+    """
+    return Column(ARRAY(String(64)))
+
+
+def _blind_index_context(column: Any, key: str) -> str:
+    """Domain separator so equal values differ across tables and columns."""
+    return f"{column.table.name}.{key}"
+
+
+def _blind_indexed_attributes(mapper: Any) -> List[Any]:
+    """Column properties of a mapper whose type carries a blind index."""
+    return [
+        prop
+        for prop in mapper.column_attrs
+        if isinstance(prop.columns[0].type, EncryptedType)
+        and prop.columns[0].type.blind_index is not None
+    ]
+
+
+def update_blind_indexes(target: Any, force: bool = False) -> None:
+    """Refresh blind index companion columns on a model instance.
+
+    The bind-time encryption in ``process_bind_param`` only sees the value
+    being written, not its row, so companion columns are filled here from
+    the same column type just before the row is flushed.
+
+    Args:
+        target: Model instance
+        force: Recompute even if the source attribute is unchanged
+            (used when re-indexing under a rotated key)
+    """
+    state = inspect(target)
+    for prop in _blind_indexed_attributes(state.mapper):
+        if not force and state.has_identity:
+            if not state.attrs[prop.key].history.has_changes():
+                continue
+
+        column_type = prop.columns[0].type
+        context = _blind_index_context(prop.columns[0], prop.key)
+        value = getattr(target, prop.key)
+
+        index_attr = f"{prop.key}{BLIND_INDEX_SUFFIX}"
+        if hasattr(target, index_attr):
+            setattr(target, index_attr, column_type.compute_blind_index(value, context))
+        else:
+            logger.warning(
+                f"{state.mapper.class_.__name__}.{prop.key} declares a blind "
+                f"index but has no {index_attr} column"
+            )
+
+        prefix_attr = f"{prop.key}{BLIND_INDEX_PREFIX_SUFFIX}"
+        if column_type.blind_index_prefixes and hasattr(target, prefix_attr):
+            setattr(
+                target, prefix_attr, column_type.compute_blind_prefixes(value, context)
+            )
+
+
+def _blind_index_before_flush(mapper: Any, connection: Any, target: Any) -> None:
+    """Mapper hook keeping blind index companion columns current."""
+    _ = mapper  # Required by SQLAlchemy but not used
+    _ = connection  # Required by SQLAlchemy but not used
+    update_blind_indexes(target)
+
+
+event.listen(Base, "before_insert", _blind_index_before_flush, propagate=True)
+event.listen(Base, "before_update", _blind_index_before_flush, propagate=True)
+
+
+def _blind_index_source(attribute: Any) -> Any:
+    """Resolve the column and encrypted type behind a model attribute."""
+    column = attribute.property.columns[0]
+    column_type = column.type
+    if not isinstance(column_type, EncryptedType) or column_type.blind_index is None:
+        raise ValueError(f"{attribute} has no blind index configured")
+    return column, column_type
+
+
+def blind_index_filter(attribute: Any, value: Any) -> ColumnElement:
+    """Build an index-backed equality filter on an encrypted attribute.
+
+    Example:
+        session.query(PatientEncrypted).filter(
+            blind_index_filter(PatientEncrypted.phone_primary, "+254 712 345 678")
+        )
+
+    Matches rows indexed under any retained key version, so lookups keep
+    working while rows are re-indexed after a rotation. Callers must still
+    compare the decrypted value if HMAC truncation collisions matter.
+    """
+    column, column_type = _blind_index_source(attribute)
+    companion = getattr(attribute.class_, f"{attribute.key}{BLIND_INDEX_SUFFIX}")
+    digests = get_blind_index_keyring().compute_all(
+        value, column_type.blind_index, _blind_index_context(column, attribute.key)
+    )
+    if not digests:
+        return companion.is_(None)
+    return companion.in_(digests)
+
+
+def blind_prefix_filter(attribute: Any, prefix: str) -> ColumnElement:
+    """Build an index-backed word-prefix filter on an encrypted attribute.
+
+    The prefix is matched on the longest indexed length it covers, so a
+    prefix longer than every ``blind_index_prefixes`` length returns a
+    superset of the matches; callers narrow it on the decrypted value.
+
+    Raises:
+        ValueError: If the prefix is not a single word or is shorter than
+            the shortest indexed length
+    """
+    column, column_type = _blind_index_source(attribute)
+    if not column_type.blind_index_prefixes:
+        raise ValueError(f"{attribute} has no prefix blind index configured")
+
+    kind = str(column_type.blind_index)
+    words = normalize_for_index(prefix, kind).split()
+    if len(words) != 1:
+        raise ValueError("Prefix search takes exactly one word")
+    word = words[0]
+    lengths = [n for n in column_type.blind_index_prefixes if n <= len(word)]
+    if not lengths:
+        raise ValueError(
+            "Prefix must be at least "
+            f"{min(column_type.blind_index_prefixes)} characters"
+        )
+
+    keyring = get_blind_index_keyring()
+    context = _blind_index_context(column, attribute.key)
+    companion = getattr(attribute.class_, f"{attribute.key}{BLIND_INDEX_PREFIX_SUFFIX}")
+    return or_(
+        *(
+            companion.contains([token])
+            for token in keyring.compute_prefix_all(word[: max(lengths)], kind, context)
+        )
+    )
+
+
+def reindex_blind_indexes(
+    model_class: Any,
+    session: Any,
+    batch_size: int = 500,
+) -> int:
+    """Recompute blind indexes under the active key for every row.
+
+    Run after ``BlindIndexKeyring.rotate()``; once it completes the previous
+    key version can be retired.
+
+    Args:
+        model_class: SQLAlchemy model class with blind-indexed columns
+        session: Database session
+        batch_size: Rows per batch
+
+    Returns:
+        Number of records re-indexed
+    """
+    reindexed = 0
+    last_id = None
+
+    try:
+        while True:
+            query = session.query(model_class).order_by(model_class.id)
+            if last_id is not None:
+                query = query.filter(model_class.id > last_id)
+            records = query.limit(batch_size).all()
+            if not records:
+                break
+
+            for record in records:
+                update_blind_indexes(record, force=True)
+                reindexed += 1
+
+            session.commit()
+            last_id = records[-1].id
+
+            logger.info(f"Re-indexed blind indexes for {reindexed} records")
+
+        return reindexed
+
+    except (InvalidToken, ValueError) as e:
+        logger.error(f"Blind index re-index error: {e}")
+        session.rollback()
+        raise
+
+
 # Utility functions for bulk encryption operations
 def encrypt_existing_field(
     model_class: Any,
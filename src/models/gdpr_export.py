@@ -0,0 +1,83 @@
+"""GDPR export job model for streaming, resumable data exports."""
+
+from enum import Enum
+from typing import Any, Dict
+from uuid import UUID as UUIDType
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import BaseModel
+from src.models.db_types import UUID
+
+
+class GDPRExportStatus(str, Enum):
+    """Status of a GDPR export job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class GDPRExportJob(BaseModel):
+    """A data subject's export, checkpointed page by page.
+
+    `progress` maps each data category to its keyset cursor, record count,
+    written segments and whether the category is finished, so a failed or
+    interrupted export resumes after the last written page.
+    """
+
+    __tablename__ = "gdpr_export_jobs"
+
+    data_subject_id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True), nullable=False, index=True
+    )
+    requester_id: Mapped[UUIDType] = mapped_column(UUID(as_uuid=True), nullable=False)
+    status = Column(String(20), nullable=False, default=GDPRExportStatus.PENDING.value)
+    categories = Column(JSON, nullable=False)
+    progress = Column(JSON, nullable=False, default=dict)
+
+    # Per-export data key, wrapped by KMS; segments are encrypted with it
+    encrypted_data_key = Column(Text, nullable=True)
+    archive_path = Column(String(500), nullable=True)
+    record_count = Column(Integer, nullable=False, default=0)
+    error_message = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    # Worker currently running the export; another worker may take over
+    # once the lease lapses
+    worker_id = Column(String(64), nullable=True)
+    # Storage holding the written segments (a host, or a shared volume);
+    # only workers writing to the same storage may resume the export
+    storage_id = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("idx_gdpr_export_status_lease", "status", "lease_expires_at"),
+    )
+
+    def to_summary(self) -> Dict[str, Any]:
+        """Return the job state for API responses."""
+        progress: Dict[str, Any] = self.progress or {}
+        return {
+            "export_id": str(self.id),
+            "data_subject_id": str(self.data_subject_id),
+            "status": self.status,
+            "categories": {
+                name: {"records": state["records"], "done": state["done"]}
+                for name, state in progress.items()
+            },
+            "record_count": self.record_count,
+            "archive_path": self.archive_path,
+            "error": self.error_message,
+            "completed_at": (
+                self.completed_at.isoformat() if self.completed_at else None
+            ),
+        }
+
+    def __repr__(self) -> str:
+        """Return string representation of GDPRExportJob."""
+        return f"<GDPRExportJob(id={self.id}, status={self.status})>"
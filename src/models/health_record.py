@@ -6,6 +6,7 @@ Manages FHIR DocumentReference Resource conversion and validation.
 
 import enum
 import json
+import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
@@ -20,9 +21,12 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    exists,
+    or_,
 )
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Session, relationship
+from sqlalchemy.sql.elements import ColumnElement
 
 from src.healthcare.hipaa_access_control import (
     AccessLevel,
@@ -33,6 +37,7 @@ from src.healthcare.medication_resource import MedicationResource
 from src.healthcare.observation_resource import ObservationResource
 from src.models.base import BaseModel
 from src.models.db_types import JSONB, UUID
+from src.models.record_access_grant import RecordAccessGrant
 from src.utils.encryption import EncryptionService
 from src.utils.key_rotation import KeyRotationManager
 
@@ -42,6 +47,9 @@ if TYPE_CHECKING:
 # FHIR resource type for this model
 __fhir_resource__ = "DocumentReference"
 
+# Roles that may open records flagged emergency_accessible
+EMERGENCY_ACCESS_ROLES = ("emergency_responder", "doctor")
+
 
 class RecordType(enum.Enum):
     """Type of health record."""
@@ -166,6 +174,9 @@ class HealthRecord(BaseModel):
     patient = relationship("Patient", back_populates="health_records")
     file_attachments = relationship("FileAttachment", back_populates="health_record")
     documents = relationship("Document", back_populates="health_record")
+    access_grants = relationship(
+        RecordAccessGrant, cascade="all, delete-orphan", passive_deletes=True
+    )
 
     # Indexes for performance
     __table_args__ = (
@@ -284,34 +295,39 @@ class HealthRecord(BaseModel):
         self, viewer_id: str, expiry: Optional[datetime] = None
     ) -> None:
         """Authorize a specific viewer for this record."""
-        viewers_list = list(self.authorized_viewers)
+        authorized_at = datetime.utcnow()
+        self.access_grants.append(
+            RecordAccessGrant(
+                viewer_id=viewer_id,
+                patient_id=self.patient_id,
+                granted_at=authorized_at,
+                expires_at=expiry,
+            )
+        )
+
+        # Display copy of the grants
+        viewers_list = list(self.authorized_viewers or [])
         authorization = {
             "viewer_id": viewer_id,
-            "authorized_at": datetime.utcnow().isoformat(),
+            "authorized_at": authorized_at.isoformat(),
             "expires_at": expiry.isoformat() if expiry else None,
         }
         viewers_list.append(authorization)
         self.authorized_viewers = viewers_list  # type: ignore[assignment]
 
     def check_access(self, user_id: str, user_role: Optional[str] = None) -> bool:
-        """Check if a user has access to this record."""
+        """Check if a user has access to this record.
+
+        Mirrors access_predicate(), which applies the same rule in SQL.
+        """
         # Emergency access
-        if self.emergency_accessible and user_role in ["emergency_responder", "doctor"]:
+        if self.emergency_accessible and user_role in EMERGENCY_ACCESS_ROLES:
             return True
 
-        # Check authorized viewers
-        if self.authorized_viewers:
-            viewers_list: List[Any] = (
-                list(self.authorized_viewers) if self.authorized_viewers else []
-            )
-            for auth in viewers_list:
-                if auth["viewer_id"] == user_id:
-                    # Check expiry
-                    if auth.get("expires_at"):
-                        expiry = datetime.fromisoformat(auth["expires_at"])
-                        if expiry < datetime.utcnow():
-                            continue
-                    return True
+        # Check unexpired grants
+        for grant in self.access_grants:
+            if grant.viewer_id == user_id and grant.is_active():
+                return True
 
         # Check if user is the provider
         if str(self.provider_id) == user_id:
@@ -319,6 +335,40 @@ class HealthRecord(BaseModel):
 
         return False
 
+    @classmethod
+    def access_predicate(
+        cls,
+        user_id: str,
+        user_role: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> ColumnElement[bool]:
+        """SQL condition matching the records check_access() allows.
+
+        Filtering with this inside a query lets the database return only
+        visible records, so counts and LIMIT/OFFSET pages stay correct.
+        """
+        if now is None:
+            now = datetime.utcnow()
+
+        conditions: List[ColumnElement[bool]] = [
+            exists().where(
+                RecordAccessGrant.viewer_id == user_id,
+                RecordAccessGrant.record_id == cls.id,
+                or_(
+                    RecordAccessGrant.expires_at.is_(None),
+                    RecordAccessGrant.expires_at > now,
+                ),
+            )
+        ]
+        if user_role in EMERGENCY_ACCESS_ROLES:
+            conditions.append(cls.emergency_accessible.is_(True))
+        try:
+            conditions.append(cls.provider_id == uuid.UUID(str(user_id)))
+        except ValueError:
+            pass  # Not a user UUID, so never the record's provider
+
+        return or_(*conditions)
+
     def create_amended_version(
         self, changes: Dict[str, Any], reason: str
     ) -> "HealthRecord":
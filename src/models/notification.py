@@ -1,19 +1,36 @@
 """Notification model for the notification system."""
 
+import json
 import uuid
 from datetime import datetime
 from enum import Enum
+from typing import List, Optional
 from uuid import uuid4
 
 from sqlalchemy import JSON, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.base import BaseModel
 
 
+def preferred_channels(preferences: Optional[str]) -> Optional[List[str]]:
+    """Channels named in a user's notification preferences.
+
+    Returns None when the user has not chosen any, so callers apply their
+    defaults.
+
+    Raises:
+        ValueError: If the preferences are not valid JSON
+    """
+    if not preferences:
+        return None
+    channels = json.loads(preferences).get("channels")
+    return [str(channel) for channel in channels] if channels else None
+
+
 class NotificationStatus(str, Enum):
     """Notification status enumeration."""
 
@@ -62,3 +79,99 @@ class Notification(BaseModel):
     def __repr__(self) -> str:
         """Return string representation of Notification."""
         return f"<Notification(id={self.id}, user_id={self.user_id}, type={self.notification_type})>"
+
+
+class NotificationCampaignStatus(str, Enum):
+    """Lifecycle of a mass-notification campaign."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class NotificationCampaign(BaseModel):
+    """A notification fanned out to many recipients over several channels.
+
+    Recipients are stored in NotificationCampaignRecipient and each channel
+    checkpoints its position in NotificationCampaignProgress, so a campaign
+    interrupted by a crash resumes where it stopped.
+    """
+
+    __tablename__ = "notification_campaigns"
+
+    notification_type = Column(String(50), nullable=False)
+    title = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    priority: Mapped[NotificationPriority] = mapped_column(
+        SQLEnum(NotificationPriority),
+        default=NotificationPriority.NORMAL,
+        nullable=False,
+    )
+    channels = Column(JSON, nullable=False)
+    data = Column(JSON, nullable=True)
+    status: Mapped[NotificationCampaignStatus] = mapped_column(
+        SQLEnum(NotificationCampaignStatus),
+        default=NotificationCampaignStatus.PENDING,
+        nullable=False,
+    )
+    total_recipients = Column(Integer, nullable=False, default=0)
+    created_by = Column(PGUUID(as_uuid=True), nullable=True)
+
+    # Worker currently sending the campaign; another worker may take over
+    # once the lease lapses
+    worker_id = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("idx_campaign_status_lease", "status", "lease_expires_at"),)
+
+    def __repr__(self) -> str:
+        """Return string representation of NotificationCampaign."""
+        return (
+            f"<NotificationCampaign(id={self.id}, status={self.status}, "
+            f"recipients={self.total_recipients})>"
+        )
+
+
+class NotificationCampaignRecipient(BaseModel):
+    """A recipient of a campaign, numbered in send order."""
+
+    __tablename__ = "notification_campaign_recipients"
+
+    campaign_id = Column(
+        PGUUID(as_uuid=True), ForeignKey("notification_campaigns.id"), nullable=False
+    )
+    position = Column(Integer, nullable=False)
+    user_id = Column(PGUUID(as_uuid=True), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "idx_campaign_recipient_position", "campaign_id", "position", unique=True
+        ),
+    )
+
+
+class NotificationCampaignProgress(BaseModel):
+    """Per-channel checkpoint of a campaign.
+
+    Recipients with a position below `cursor` have been handled on the
+    channel; the counters are updated in the same transaction.
+    """
+
+    __tablename__ = "notification_campaign_progress"
+
+    campaign_id = Column(
+        PGUUID(as_uuid=True), ForeignKey("notification_campaigns.id"), nullable=False
+    )
+    channel = Column(String(20), nullable=False)
+    cursor = Column(Integer, nullable=False, default=0)
+    sent_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("idx_campaign_progress_channel", "campaign_id", "channel", unique=True),
+    )
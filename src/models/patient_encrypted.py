@@ -1,9 +1,9 @@
 """Example patient model with encrypted fields."""
 
 from datetime import date, datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, or_
 from sqlalchemy.sql.schema import Column as ColumnType
 
 from src.healthcare.fhir_validator import FHIRValidator
@@ -11,6 +11,8 @@ from src.healthcare.hipaa_access_control import AccessLevel, require_phi_access
 from src.models.base import BaseModel
 from src.models.db_types import UUID
 from src.models.encrypted_fields import (
+    BlindIndexColumn,
+    BlindIndexPrefixColumn,
     EncryptedAddress,
     EncryptedEmail,
     EncryptedJSON,
@@ -18,6 +20,9 @@ from src.models.encrypted_fields import (
     EncryptedSSN,
     EncryptedString,
     EncryptedText,
+    blind_index_filter,
+    blind_prefix_filter,
+    normalize_for_index,
 )
 from src.utils.logging import get_logger
 
@@ -40,23 +45,39 @@ class PatientEncrypted(BaseModel):
 
     # Encrypted PII fields
     first_name: ColumnType[str] = Column(EncryptedString(), nullable=False)
-    last_name: ColumnType[str] = Column(EncryptedString(), nullable=False)
+    last_name: ColumnType[str] = Column(
+        EncryptedString(blind_index="text", blind_index_prefixes=(3, 4, 5)),
+        nullable=False,
+    )
     middle_name: ColumnType[str] = Column(EncryptedString())
 
     # Searchable encrypted email (allows equality searches)
-    email: ColumnType[str] = Column(EncryptedEmail(), unique=True)
+    email: ColumnType[str] = Column(EncryptedEmail(blind_index="email"), unique=True)
 
     # Encrypted contact information
-    phone_primary: ColumnType[str] = Column(EncryptedPhone())
-    phone_secondary: ColumnType[str] = Column(EncryptedPhone())
+    phone_primary: ColumnType[str] = Column(EncryptedPhone(blind_index="phone"))
+    phone_secondary: ColumnType[str] = Column(EncryptedPhone(blind_index="phone"))
 
     # Encrypted sensitive identifiers
-    ssn: ColumnType[str] = Column(EncryptedSSN())
-    passport_number: ColumnType[str] = Column(EncryptedString())
-    national_id: ColumnType[str] = Column(EncryptedString())
+    ssn: ColumnType[str] = Column(EncryptedSSN(blind_index="identifier"))
+    passport_number: ColumnType[str] = Column(EncryptedString(blind_index="identifier"))
+    national_id: ColumnType[str] = Column(EncryptedString(blind_index="identifier"))
 
     # Encrypted date of birth (stored as string for encryption)
-    date_of_birth_encrypted: ColumnType[str] = Column(EncryptedString())
+    date_of_birth_encrypted: ColumnType[str] = Column(
+        EncryptedString(blind_index="date")
+    )
+
+    # Blind index companions (keyed HMAC, see encrypted_fields)
+    last_name_bidx = BlindIndexColumn()
+    last_name_bidx_prefix = BlindIndexPrefixColumn()
+    email_bidx = BlindIndexColumn()
+    phone_primary_bidx = BlindIndexColumn()
+    phone_secondary_bidx = BlindIndexColumn()
+    ssn_bidx = BlindIndexColumn()
+    passport_number_bidx = BlindIndexColumn()
+    national_id_bidx = BlindIndexColumn()
+    date_of_birth_encrypted_bidx = BlindIndexColumn()
 
     # Encrypted address as JSON
     address: ColumnType[str] = Column(EncryptedAddress())
@@ -261,8 +282,99 @@ class PatientEncrypted(BaseModel):
         Returns:
             Patient if found
         """
-        # The SearchableEncrypted field type handles the search
-        return session.query(cls).filter(cls.email == email.lower().strip()).first()  # type: ignore
+        return session.query(cls).filter(blind_index_filter(cls.email, email)).first()
+
+    @classmethod
+    @require_phi_access(AccessLevel.READ)
+    def search_by_phone(cls, session: Any, phone: str) -> List["PatientEncrypted"]:
+        """
+        Search for patients by primary or secondary phone number.
+
+        Args:
+            session: Database session
+            phone: Phone number in any common format
+
+        Returns:
+            Matching patients
+        """
+        return list(
+            session.query(cls)
+            .filter(
+                or_(
+                    blind_index_filter(cls.phone_primary, phone),
+                    blind_index_filter(cls.phone_secondary, phone),
+                )
+            )
+            .all()
+        )
+
+    @classmethod
+    @require_phi_access(AccessLevel.READ)
+    def search_by_identifier(
+        cls, session: Any, identifier: str
+    ) -> List["PatientEncrypted"]:
+        """
+        Search for patients by national ID, passport number or SSN.
+
+        Args:
+            session: Database session
+            identifier: Identifier with or without separators
+
+        Returns:
+            Matching patients
+        """
+        return list(
+            session.query(cls)
+            .filter(
+                or_(
+                    blind_index_filter(cls.national_id, identifier),
+                    blind_index_filter(cls.passport_number, identifier),
+                    blind_index_filter(cls.ssn, identifier),
+                )
+            )
+            .all()
+        )
+
+    @classmethod
+    @require_phi_access(AccessLevel.READ)
+    def search_by_date_of_birth(
+        cls, session: Any, date_of_birth: date
+    ) -> List["PatientEncrypted"]:
+        """Search for patients by exact date of birth."""
+        return list(
+            session.query(cls)
+            .filter(blind_index_filter(cls.date_of_birth_encrypted, date_of_birth))
+            .all()
+        )
+
+    @classmethod
+    @require_phi_access(AccessLevel.READ)
+    def search_by_last_name_prefix(
+        cls, session: Any, prefix: str
+    ) -> List["PatientEncrypted"]:
+        """
+        Search for patients whose last name has a word starting with prefix.
+
+        Args:
+            session: Database session
+            prefix: Single word of at least 3 characters
+
+        Returns:
+            Matching patients
+        """
+        candidates = (
+            session.query(cls).filter(blind_prefix_filter(cls.last_name, prefix)).all()
+        )
+        # The index answers at most 5 characters; check the rest in plaintext
+        wanted = normalize_for_index(prefix, "text")
+        return [
+            patient
+            for patient in candidates
+            if any(
+                word.startswith(wanted)
+                for word in normalize_for_index(patient.last_name, "text").split()
+            )
+        ]
 
     def __repr__(self) -> str:
         """Return string representation."""
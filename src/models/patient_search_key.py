@@ -0,0 +1,201 @@
+"""Patient search index model.
+
+Stores normalized and phonetic lookup keys for each patient so registration
+searches are served by B-tree equality/prefix scans instead of leading-wildcard
+ILIKE scans over the patients table. Keys are maintained automatically by
+mapper events whenever a patient's searchable attributes change.
+"""
+
+from typing import Any, Dict, List, Optional
+from uuid import UUID as UUIDType
+
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Index,
+    Select,
+    String,
+    and_,
+    event,
+    inspect,
+    or_,
+    select,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from src.utils.logging import get_logger
+from src.utils.search_keys import (
+    KEY_NAME,
+    KEY_NAME_PHONETIC,
+    build_search_keys,
+    name_tokens,
+    phonetic_key,
+)
+
+from .base import Base
+from .db_types import UUID
+from .patient import Patient
+
+logger = get_logger(__name__)
+
+# Patient attributes that feed the search index
+SEARCHABLE_PATIENT_FIELDS = (
+    "given_name",
+    "family_name",
+    "preferred_name",
+    "middle_names",
+    "names_in_languages",
+    "unhcr_number",
+    "phone_number",
+    "alternate_phone",
+    "email",
+    "origin_country",
+)
+
+
+class PatientSearchKey(Base):
+    """Normalized lookup key pointing at a patient."""
+
+    __tablename__ = "patient_search_keys"
+
+    patient_id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("patients.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    key_type = Column(String(20), primary_key=True)
+    key_value = Column(String(255), primary_key=True)
+
+    __table_args__ = (
+        Index(
+            "idx_patient_search_key_lookup",
+            "key_type",
+            "key_value",
+            "patient_id",
+            postgresql_ops={"key_value": "text_pattern_ops"},
+        ),
+    )
+
+    def __repr__(self) -> str:
+        """Return string representation."""
+        return (
+            f"<PatientSearchKey(patient_id={self.patient_id}, "
+            f"{self.key_type}={self.key_value!r})>"
+        )
+
+
+def patient_search_keys(patient: Any) -> List[Dict[str, Any]]:
+    """Build search index rows for a patient (model instance or column row)."""
+    return [
+        {"patient_id": patient.id, "key_type": key_type, "key_value": key_value}
+        for key_type, key_value in build_search_keys(
+            given_name=patient.given_name,
+            family_name=patient.family_name,
+            preferred_name=patient.preferred_name,
+            middle_names=patient.middle_names,
+            names_in_languages=patient.names_in_languages,
+            unhcr_number=patient.unhcr_number,
+            phone_numbers=[patient.phone_number, patient.alternate_phone],
+            email=patient.email,
+            default_region=patient.origin_country,
+        )
+    ]
+
+
+def name_token_matches(name: str) -> List[Select]:
+    """Build one patient id subquery per distinct token of a name.
+
+    A token matches a patient by normalized prefix or by phonetic key;
+    callers require every subquery to match.
+    """
+    matches = []
+    for token in dict.fromkeys(name_tokens(name)):
+        condition = and_(
+            PatientSearchKey.key_type == KEY_NAME,
+            PatientSearchKey.key_value.like(f"{token}%"),
+        )
+        code = phonetic_key(token)
+        if code:
+            condition = or_(
+                condition,
+                and_(
+                    PatientSearchKey.key_type == KEY_NAME_PHONETIC,
+                    PatientSearchKey.key_value == code,
+                ),
+            )
+        matches.append(select(PatientSearchKey.patient_id).where(condition))
+    return matches
+
+
+def _write_search_keys(connection: Connection, patient: Patient) -> None:
+    """Replace a patient's search keys using the flush connection."""
+    table = PatientSearchKey.__table__
+    connection.execute(table.delete().where(table.c.patient_id == patient.id))
+    rows = patient_search_keys(patient)
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+def _index_after_insert(mapper: Any, connection: Connection, target: Patient) -> None:
+    """Index a newly inserted patient."""
+    _ = mapper  # Required by SQLAlchemy but not used
+    _write_search_keys(connection, target)
+
+
+def _index_after_update(mapper: Any, connection: Connection, target: Patient) -> None:
+    """Re-index a patient when a searchable attribute changed."""
+    _ = mapper  # Required by SQLAlchemy but not used
+    state = inspect(target)
+    if any(
+        state.attrs[field].history.has_changes() for field in SEARCHABLE_PATIENT_FIELDS
+    ):
+        _write_search_keys(connection, target)
+
+
+event.listen(Patient, "after_insert", _index_after_insert)
+event.listen(Patient, "after_update", _index_after_update)
+
+
+def rebuild_patient_search_keys(
+    session: Session,
+    batch_size: int = 1000,
+    patient_ids: Optional[List[UUIDType]] = None,
+) -> int:
+    """Backfill the search index for existing patients.
+
+    Walks patients in primary-key order with keyset batches so the backfill
+    runs in constant memory on large registries.
+
+    Returns:
+        Number of patients indexed
+    """
+    table = PatientSearchKey.__table__
+    indexed = 0
+    last_id: Optional[UUIDType] = None
+
+    while True:
+        query = session.query(
+            Patient.id,
+            *(getattr(Patient, field) for field in SEARCHABLE_PATIENT_FIELDS),
+        ).order_by(Patient.id)
+        if patient_ids is not None:
+            query = query.filter(Patient.id.in_(patient_ids))
+        if last_id is not None:
+            query = query.filter(Patient.id > last_id)
+        batch = query.limit(batch_size).all()
+        if not batch:
+            break
+
+        batch_ids = [patient.id for patient in batch]
+        session.execute(table.delete().where(table.c.patient_id.in_(batch_ids)))
+        rows = [row for patient in batch for row in patient_search_keys(patient)]
+        if rows:
+            session.execute(table.insert(), rows)
+        session.flush()
+
+        indexed += len(batch)
+        last_id = batch_ids[-1]
+
+    logger.info(f"Rebuilt patient search index for {indexed} patients")
+    return indexed
@@ -0,0 +1,147 @@
+"""Health record access grant model.
+
+One row per viewer authorized on a health record, with the record's patient
+and the grant's expiry, so row-level access checks run as indexed SQL
+predicates instead of scanning each record's ``authorized_viewers`` JSON
+list in Python. Rows are written by ``HealthRecord.authorize_viewer``; the
+JSON list is kept as a display copy.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID as UUIDType
+from uuid import uuid4
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from src.utils.logging import get_logger
+
+from .base import Base
+from .db_types import UUID
+
+logger = get_logger(__name__)
+
+
+class RecordAccessGrant(Base):
+    """A viewer's (optionally expiring) access to one health record."""
+
+    __tablename__ = "record_access_grants"
+
+    id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    viewer_id = Column(String(100), nullable=False)
+    record_id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("health_records.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    patient_id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("patients.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    granted_at = Column(
+        DateTime(timezone=True), nullable=False, default=datetime.utcnow
+    )
+    expires_at = Column(DateTime(timezone=True))  # NULL means no expiration
+
+    __table_args__ = (
+        # Correlated "may this viewer see this record" probes
+        Index("idx_record_access_grant_lookup", "viewer_id", "record_id", "expires_at"),
+        # "Which of this patient's records may this viewer see"
+        Index("idx_record_access_grant_patient", "viewer_id", "patient_id"),
+        Index("idx_record_access_grant_record", "record_id"),
+    )
+
+    def is_active(self, now: Optional[datetime] = None) -> bool:
+        """Check the grant has not expired."""
+        if self.expires_at is None:
+            return True
+        if now is None:
+            now = (
+                datetime.now(timezone.utc)
+                if self.expires_at.tzinfo
+                else datetime.utcnow()
+            )
+        return bool(self.expires_at > now)
+
+    def __repr__(self) -> str:
+        """Return string representation."""
+        return (
+            f"<RecordAccessGrant(viewer_id={self.viewer_id!r}, "
+            f"record_id={self.record_id}, expires_at={self.expires_at})>"
+        )
+
+
+def record_access_grants(record: Any) -> List[Dict[str, Any]]:
+    """Build grant rows from a record's legacy authorized_viewers list."""
+    rows = []
+    for auth in record.authorized_viewers or []:
+        if not isinstance(auth, dict) or not auth.get("viewer_id"):
+            continue
+        expires_at = auth.get("expires_at")
+        granted_at = auth.get("authorized_at")
+        rows.append(
+            {
+                "id": uuid4(),
+                "viewer_id": str(auth["viewer_id"]),
+                "record_id": record.id,
+                "patient_id": record.patient_id,
+                "granted_at": (
+                    datetime.fromisoformat(granted_at)
+                    if granted_at
+                    else datetime.utcnow()
+                ),
+                "expires_at": (
+                    datetime.fromisoformat(expires_at) if expires_at else None
+                ),
+            }
+        )
+    return rows
+
+
+def rebuild_record_access_grants(
+    session: Session,
+    batch_size: int = 1000,
+    record_ids: Optional[List[UUIDType]] = None,
+) -> int:
+    """Backfill access grants from authorized_viewers on existing records.
+
+    Walks records in primary-key order with keyset batches, replacing each
+    batch's grant rows.
+
+    Returns:
+        Number of grant rows written
+    """
+    from .health_record import HealthRecord  # pylint: disable=import-outside-toplevel
+
+    table = RecordAccessGrant.__table__
+    written = 0
+    last_id: Optional[UUIDType] = None
+
+    while True:
+        query = session.query(
+            HealthRecord.id, HealthRecord.patient_id, HealthRecord.authorized_viewers
+        ).order_by(HealthRecord.id)
+        if record_ids is not None:
+            query = query.filter(HealthRecord.id.in_(record_ids))
+        if last_id is not None:
+            query = query.filter(HealthRecord.id > last_id)
+        batch = query.limit(batch_size).all()
+        if not batch:
+            break
+
+        batch_ids = [record.id for record in batch]
+        session.execute(table.delete().where(table.c.record_id.in_(batch_ids)))
+        rows = [row for record in batch for row in record_access_grants(record)]
+        if rows:
+            session.execute(table.insert(), rows)
+        session.flush()
+
+        written += len(rows)
+        last_id = batch_ids[-1]
+
+    logger.info(f"Rebuilt {written} health record access grants")
+    return written
@@ -124,9 +124,7 @@ class Translation(BaseModel):
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    patient = relationship(
-        "Patient", foreign_keys=[patient_id], back_populates="translations"
-    )
+    patient = relationship("Patient", foreign_keys=[patient_id])
     health_record = relationship("HealthRecord", foreign_keys=[health_record_id])
     provider = relationship("UserAuth", foreign_keys=[provider_id])
     translator = relationship("UserAuth", foreign_keys=[translator_id])
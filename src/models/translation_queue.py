@@ -17,7 +17,7 @@ from sqlalchemy import (
     String,
     Text,
 )
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from src.models.base import BaseModel
 from src.models.db_types import UUID
@@ -43,6 +43,15 @@ class TranslationQueuePriority(str, Enum):
     CRITICAL = "critical"
 
 
+# Dequeue order; stored on each entry so claims can walk an index
+PRIORITY_RANKS = {
+    TranslationQueuePriority.CRITICAL: 1,
+    TranslationQueuePriority.HIGH: 2,
+    TranslationQueuePriority.NORMAL: 3,
+    TranslationQueuePriority.LOW: 4,
+}
+
+
 class TranslationQueueReason(str, Enum):
     """Reasons for queuing translation."""
 
@@ -75,6 +84,9 @@ class TranslationQueue(BaseModel):
         String(20), default=TranslationQueuePriority.NORMAL, nullable=False, index=True
     )
     queue_reason = Column(String(50), nullable=False, index=True)
+    priority_rank = Column(
+        Integer, default=PRIORITY_RANKS[TranslationQueuePriority.NORMAL], nullable=False
+    )
 
     # Bedrock attempt information
     bedrock_translation = Column(Text)
@@ -96,6 +108,8 @@ class TranslationQueue(BaseModel):
     completed_at = Column(DateTime)
     retry_count = Column(Integer, default=0)
     last_retry_at = Column(DateTime)
+    # Claimed entries return to the queue unless the lease is renewed
+    lease_expires_at = Column(DateTime)
 
     # Context information
     patient_id: Mapped[Optional[UUIDType]] = mapped_column(
@@ -138,8 +152,17 @@ class TranslationQueue(BaseModel):
         Index("idx_queue_patient_status", "patient_id", "status"),
         Index("idx_queue_translator_status", "translator_id", "status"),
         Index("idx_queue_expires_status", "expires_at", "status"),
+        # Claims read pending entries in (priority_rank, created_at) order
+        Index("idx_queue_dequeue", "status", "priority_rank", "created_at"),
+        Index("idx_queue_lease_expiry", "status", "lease_expires_at"),
     )
 
+    @validates("priority")
+    def _sync_priority_rank(self, key: str, value: Any) -> Any:
+        """Keep the dequeue rank in step with the priority."""
+        self.priority_rank = PRIORITY_RANKS[TranslationQueuePriority(value)]
+        return value
+
 
 class TranslationQueueFeedback(BaseModel):
     """Model for translation queue feedback and quality tracking."""
@@ -65,6 +65,33 @@ class EnvelopeEncryption:
             logger.error("Error generating data key: %s", e)
             raise
 
+    def decrypt_data_key(
+        self,
+        encrypted_key: bytes,
+        encryption_context: Optional[Dict[str, str]] = None,
+    ) -> bytes:
+        """
+        Unwrap a data encryption key returned by generate_data_key.
+
+        Args:
+            encrypted_key: The KMS-encrypted data key
+            encryption_context: The context the key was generated with
+
+        Returns:
+            The plaintext data key
+        """
+        try:
+            params: Dict[str, Any] = {"CiphertextBlob": encrypted_key}
+
+            if encryption_context:
+                params["EncryptionContext"] = encryption_context
+
+            return self.kms_client.decrypt(**params)["Plaintext"]
+
+        except ClientError as e:
+            logger.error("Error decrypting data key: %s", e)
+            raise
+
     def encrypt_data(
         self, plaintext: bytes, encryption_context: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
@@ -6,8 +6,14 @@ This module provides production-ready key management including:
 - Automatic key rotation
 - HIPAA-compliant encryption
 - AWS KMS integration
+- Blind index HMAC keys for encrypted column lookups
 """
 
+from .blind_index import (
+    BlindIndexKeyring,
+    get_blind_index_keyring,
+    set_blind_index_keyring,
+)
 from .key_manager import KeyManager, KeyMetadata, KeyStatus, KeyType
 from .production_key_initializer import (
     ProductionKeyInitializer,
@@ -16,6 +22,9 @@ from .production_key_initializer import (
 )
 
 __all__ = [
+    "BlindIndexKeyring",
+    "get_blind_index_keyring",
+    "set_blind_index_keyring",
     "KeyManager",
     "KeyType",
     "KeyStatus",
@@ -0,0 +1,294 @@
+"""
+Blind Index Keys for Haven Health Passport.
+
+This module provides keyed-HMAC blind indexes for encrypted PHI columns:
+- Versioned HMAC keys stored in the key vault
+- Value normalization per field kind (email, phone, identifier, date, text)
+- Equality and prefix-token index computation
+- Key rotation with lookups across all live key versions
+
+Blind indexes let the database answer "which rows have this exact value"
+without ever storing a deterministic encryption of the value itself.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import unicodedata
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.config import settings
+from src.utils.search_keys import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+# Hex digits kept from each HMAC; 128 bits keeps collisions negligible while
+# limiting how much the index reveals about value equality across tables.
+BLIND_INDEX_HEX_LENGTH = 32
+
+# Vault entry holding the versioned HMAC keys
+BLIND_INDEX_VAULT_KEY = "blind-index-hmac"
+
+
+def _normalize_text(value: Any) -> str:
+    """Case-fold and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", str(value)).casefold()
+    return " ".join(text.split())
+
+
+def _normalize_email(value: Any) -> str:
+    """Lowercase and strip an email address."""
+    return str(value).strip().lower()
+
+
+def _normalize_phone(value: Any) -> str:
+    """Normalize to E.164, falling back to the national number.
+
+    Numbers written without a country code are read in the deployment
+    country, so "0712345678" and "+254712345678" share an index in Kenya.
+    Changing DEPLOYMENT_COUNTRY therefore requires a re-index.
+    """
+    e164, national = normalize_phone(str(value), settings.DEPLOYMENT_COUNTRY)
+    return e164 or national
+
+
+def _normalize_identifier(value: Any) -> str:
+    """Uppercase alphanumerics only (passport, national ID, UNHCR numbers)."""
+    return re.sub(r"[^A-Z0-9]", "", str(value).upper())
+
+
+def _normalize_date(value: Any) -> str:
+    """Normalize to an ISO calendar date."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(str(value).strip()[:10]).isoformat()
+
+
+NORMALIZERS = {
+    "text": _normalize_text,
+    "email": _normalize_email,
+    "phone": _normalize_phone,
+    "identifier": _normalize_identifier,
+    "date": _normalize_date,
+}
+
+
+def normalize_for_index(value: Any, kind: str) -> str:
+    """Normalize a plaintext value for blind indexing.
+
+    Args:
+        value: Plaintext value
+        kind: One of the NORMALIZERS keys
+
+    Returns:
+        Normalized string (empty if the value has no indexable content)
+    """
+    if kind not in NORMALIZERS:
+        raise ValueError(f"Unknown blind index normalizer: {kind}")
+    if value is None:
+        return ""
+    return NORMALIZERS[kind](value)
+
+
+class BlindIndexKeyring:
+    """Versioned HMAC keys for blind indexes.
+
+    New indexes are always written with the active version. Lookups compute
+    the index under every retained version so rows written before a rotation
+    stay findable until they are re-indexed and the old version is retired.
+    """
+
+    def __init__(self, keys: Dict[int, bytes], active_version: Optional[int] = None):
+        """Initialize keyring."""
+        if not keys:
+            raise ValueError("Blind index keyring requires at least one key")
+        self._keys = dict(keys)
+        self.active_version = active_version or max(self._keys)
+        if self.active_version not in self._keys:
+            raise ValueError(f"Active key version {self.active_version} not present")
+        self._lock = threading.Lock()
+
+    @property
+    def versions(self) -> List[int]:
+        """Retained key versions, newest first."""
+        return sorted(self._keys, reverse=True)
+
+    @classmethod
+    def generate(cls) -> "BlindIndexKeyring":
+        """Create a keyring with a single fresh key."""
+        return cls({1: secrets.token_bytes(32)})
+
+    @classmethod
+    def from_env(cls) -> Optional["BlindIndexKeyring"]:
+        """Load keys from BLIND_INDEX_KEYS ({"<version>": "<base64 key>"})."""
+        raw = os.getenv("BLIND_INDEX_KEYS")
+        if not raw:
+            return None
+        active = os.getenv("BLIND_INDEX_ACTIVE_VERSION")
+        return cls.from_dict(
+            {"keys": json.loads(raw), "active_version": int(active) if active else None}
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BlindIndexKeyring":
+        """Build a keyring from its serialized form."""
+        keys = {
+            int(version): base64.b64decode(encoded)
+            for version, encoded in data["keys"].items()
+        }
+        return cls(keys, data.get("active_version"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the keyring for vault storage."""
+        return {
+            "keys": {
+                str(version): base64.b64encode(key).decode("ascii")
+                for version, key in self._keys.items()
+            },
+            "active_version": self.active_version,
+        }
+
+    @classmethod
+    def from_vault(cls, vault: Any) -> "BlindIndexKeyring":
+        """Load the keyring from a KeyVault."""
+        key_value, _ = vault.retrieve_key(BLIND_INDEX_VAULT_KEY)
+        return cls.from_dict(key_value)
+
+    def save_to_vault(self, vault: Any, kms_key_id: str) -> str:
+        """Persist the keyring to a KeyVault."""
+        return str(
+            vault.store_key(
+                BLIND_INDEX_VAULT_KEY,
+                self.to_dict(),
+                {
+                    "purpose": "blind-index",
+                    "active_version": self.active_version,
+                    "updated_at": datetime.utcnow().isoformat(),
+                },
+                kms_key_id,
+            )
+        )
+
+    def rotate(self) -> int:
+        """Add a new key version and make it active.
+
+        Returns:
+            The new active version
+        """
+        with self._lock:
+            new_version = max(self._keys) + 1
+            self._keys[new_version] = secrets.token_bytes(32)
+            self.active_version = new_version
+        logger.info("Rotated blind index key to version %s", new_version)
+        return new_version
+
+    def retire(self, version: int) -> None:
+        """Drop a key version once all rows are re-indexed under a newer one."""
+        with self._lock:
+            if version == self.active_version:
+                raise ValueError("Cannot retire the active blind index key")
+            self._keys.pop(version, None)
+        logger.info("Retired blind index key version %s", version)
+
+    def _digest(self, version: int, context: str, normalized: str) -> str:
+        """HMAC a normalized value under one key version."""
+        mac = hmac.new(
+            self._keys[version],
+            f"{context}\x00{normalized}".encode("utf-8"),
+            hashlib.sha256,
+        )
+        return f"{version}:{mac.hexdigest()[:BLIND_INDEX_HEX_LENGTH]}"
+
+    def compute(self, value: Any, kind: str, context: str) -> Optional[str]:
+        """Compute the blind index of a value under the active key.
+
+        Args:
+            value: Plaintext value
+            kind: Normalizer name
+            context: Domain separator, normally "<table>.<column>"
+
+        Returns:
+            Versioned index string, or None for empty values
+        """
+        normalized = normalize_for_index(value, kind)
+        if not normalized:
+            return None
+        return self._digest(self.active_version, context, normalized)
+
+    def compute_all(self, value: Any, kind: str, context: str) -> List[str]:
+        """Compute the blind index under every retained key version."""
+        normalized = normalize_for_index(value, kind)
+        if not normalized:
+            return []
+        return [self._digest(version, context, normalized) for version in self.versions]
+
+    def compute_prefixes(
+        self, value: Any, kind: str, context: str, prefix_lengths: Sequence[int]
+    ) -> List[str]:
+        """Compute prefix tokens for each word of a value under the active key."""
+        normalized = normalize_for_index(value, kind)
+        tokens = set()
+        for word in normalized.split():
+            for length in prefix_lengths:
+                if len(word) >= length:
+                    tokens.add(
+                        self._digest(
+                            self.active_version, f"{context}:prefix", word[:length]
+                        )
+                    )
+        return sorted(tokens)
+
+    def compute_prefix_all(self, prefix: str, kind: str, context: str) -> List[str]:
+        """Compute a single prefix token under every retained key version."""
+        normalized = normalize_for_index(prefix, kind)
+        if not normalized:
+            return []
+        return [
+            self._digest(version, f"{context}:prefix", normalized)
+            for version in self.versions
+        ]
+
+
+_keyring: Optional[BlindIndexKeyring] = None
+_keyring_lock = threading.Lock()
+
+
+def get_blind_index_keyring() -> BlindIndexKeyring:
+    """Get the process-wide blind index keyring.
+
+    Keys come from BLIND_INDEX_KEYS; outside production a throwaway key is
+    generated so development databases still get working indexes.
+    """
+    global _keyring  # pylint: disable=global-statement
+    if _keyring is None:
+        with _keyring_lock:
+            if _keyring is None:
+                keyring = BlindIndexKeyring.from_env()
+                if keyring is None:
+                    if os.getenv("ENVIRONMENT", "development") == "production":
+                        raise RuntimeError(
+                            "BLIND_INDEX_KEYS must be configured in production"
+                        )
+                    logger.warning(
+                        "Generated ephemeral blind index key - indexes will not "
+                        "survive a restart"
+                    )
+                    keyring = BlindIndexKeyring.generate()
+                _keyring = keyring
+    return _keyring
+
+
+def set_blind_index_keyring(keyring: Optional[BlindIndexKeyring]) -> None:
+    """Install a keyring (e.g. one loaded from the key vault at startup)."""
+    global _keyring  # pylint: disable=global-statement
+    with _keyring_lock:
+        _keyring = keyring
@@ -68,6 +68,8 @@ class AIAnalysisService(BaseService):
                     datetime.fromisoformat(end_date) if end_date else datetime.utcnow()
                 ),
                 include_content=True,
+                viewer_id=self.current_user_id,
+                viewer_role=self.current_user_role,
             )
 
             # Prepare data for AI analysis
@@ -149,6 +151,8 @@ class AIAnalysisService(BaseService):
                 patient_id=patient_id,
                 start_date=datetime.utcnow() - timedelta(days=180),
                 limit=50,
+                viewer_id=self.current_user_id,
+                viewer_role=self.current_user_role,
             )
 
             # Extract relevant data
@@ -0,0 +1,556 @@
+"""Adaptive-concurrency batch invocation for Amazon Bedrock.
+
+Bulk jobs (glossary generation, translation backfills) send thousands of
+prompts. Running them one at a time leaves most of the account quota idle,
+while firing them all at once gets the account throttled. The batch
+invoker sits between the two:
+
+- per-model token buckets pace requests and tokens to the per-minute
+  quotas that ServiceQuotaManager reports
+- an AIMD limiter grows concurrency while requests succeed quickly and
+  halves it on ThrottlingException or rising latency
+- identical prompts already in flight share one model call
+- results are streamed back in input order as soon as they are ready
+
+The limiter and the in-flight table are bound to one event loop, so the
+invoker runs its work on a loop thread of its own. Callers on any loop,
+or on none through run_all(), share the same quotas and coalescing.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from botocore.exceptions import ClientError
+
+from src.ai.bedrock.quota_manager import ServiceQuotaManager
+from src.services.bedrock_service import (
+    BedrockException,
+    BedrockRateLimitException,
+    BedrockService,
+)
+from src.services.notification_rate_shaping import TokenBucket
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+InvokeResult = Tuple[str, Dict[str, Any]]
+
+T = TypeVar("T")
+
+# Model id prefixes and the quota family their limits are reported under
+QUOTA_FAMILIES = {
+    "anthropic.": "anthropic_claude",
+    "amazon.titan": "titan",
+}
+
+# Share of each quota the batch path plans to use, leaving room for
+# interactive traffic on the same account
+QUOTA_HEADROOM = 0.9
+
+# Rough prompt size estimate used to charge the token budget
+CHARS_PER_TOKEN = 4
+
+
+def quota_family(model_id: str) -> Optional[str]:
+    """Return the quota family a model's limits are reported under."""
+    for prefix, family in QUOTA_FAMILIES.items():
+        if model_id.startswith(prefix):
+            return family
+    return None
+
+
+def estimate_tokens(prompt: str, system_prompt: Optional[str], max_tokens: int) -> int:
+    """Estimate the tokens a request counts against the quota.
+
+    Bedrock charges the maximum output tokens up front, so the estimate is
+    the prompt size plus the requested output limit.
+    """
+    characters = len(prompt) + len(system_prompt or "")
+    return math.ceil(characters / CHARS_PER_TOKEN) + max_tokens
+
+
+class AIMDLimiter:
+    """Additive-increase, multiplicative-decrease concurrency limit.
+
+    Each successful request grows the limit by 1/limit, so the limit rises
+    by one per round of requests. A throttled request halves it; smoothed
+    latency drifting above `latency_tolerance` times the best seen trims
+    it. Only requests started after the last decrease can cut the limit
+    again, so one burst of throttling counts once.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4.0,
+        minimum: float = 1.0,
+        maximum: float = 50.0,
+        backoff: float = 0.5,
+        latency_backoff: float = 0.9,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize AIMD limiter.
+
+        Args:
+            initial: Starting concurrency limit
+            minimum: Lowest the limit may fall to
+            maximum: Highest the limit may grow to
+            backoff: Factor applied on throttling
+            latency_backoff: Factor applied when latency rises
+            latency_tolerance: Smoothed latency over the best seen that
+                counts as congestion
+            clock: Monotonic time source
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = min(maximum, max(minimum, initial))
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._smoothed_latency: Optional[float] = None
+        self._best_latency: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> float:
+        """Wait for a request slot; return the time the request started."""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+        self.in_flight += 1
+        return self._clock()
+
+    def release(self) -> None:
+        """Return a request slot."""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Wake as many waiters as there are free slots."""
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self, started: float, latency: float) -> None:
+        """Record a completed request."""
+        if self._smoothed_latency is None:
+            self._smoothed_latency = latency
+        else:
+            self._smoothed_latency = 0.8 * self._smoothed_latency + 0.2 * latency
+        if self._best_latency is None or self._smoothed_latency < self._best_latency:
+            self._best_latency = self._smoothed_latency
+
+        congested = self._smoothed_latency > (
+            self._best_latency * self.latency_tolerance
+        )
+        if congested:
+            self._decrease(started, self.latency_backoff)
+        else:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def on_throttle(self, started: float) -> None:
+        """Record a throttled request."""
+        self._decrease(started, self.backoff)
+
+    def _decrease(self, started: float, factor: float) -> None:
+        """Cut the limit unless the request predates the last cut."""
+        if started < self._last_decrease:
+            return
+        self.limit = max(self.minimum, self.limit * factor)
+        self._last_decrease = self._clock()
+        logger.info(f"Bedrock batch concurrency reduced to {self.limit:.1f}")
+
+
+class ModelBudget:
+    """Per-minute request and token budgets for one quota family."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize model budget.
+
+        Args:
+            requests_per_minute: Requests the batch path may send per minute
+            tokens_per_minute: Tokens the batch path may use per minute
+            clock: Monotonic time source
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(requests_per_minute / 60.0, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, clock=clock)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until both a request and `tokens` tokens are available."""
+        delay = max(self.requests.reserve(), self.tokens.reserve(tokens))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def budgets_from_quotas(
+    quotas: Dict[str, Dict[str, Any]],
+    environment: str = "production",
+    headroom: float = QUOTA_HEADROOM,
+) -> Tuple[Dict[Optional[str], Tuple[float, float]], float]:
+    """Derive per-family budgets and a concurrency cap from quota status.
+
+    Args:
+        quotas: Output of ServiceQuotaManager.check_current_quotas()
+        environment: Environment whose recommended quotas fill any gaps
+        headroom: Share of each quota to plan for
+
+    Returns:
+        Tuple of ({family: (requests_per_minute, tokens_per_minute)},
+        maximum concurrency). The None family covers models without a
+        reported quota.
+    """
+    recommended = ServiceQuotaManager.RECOMMENDED_QUOTAS.get(
+        environment, ServiceQuotaManager.RECOMMENDED_QUOTAS["production"]
+    )
+
+    def limit(quota_name: str, fallback_key: str) -> float:
+        current = quotas.get(quota_name, {}).get("current_limit")
+        value = current if current else recommended[fallback_key]
+        return float(value) * headroom
+
+    budgets: Dict[Optional[str], Tuple[float, float]] = {
+        family: (
+            limit(f"{family}_requests_per_minute", "requests_per_minute"),
+            limit(f"{family}_tokens_per_minute", "tokens_per_minute"),
+        )
+        for family in QUOTA_FAMILIES.values()
+    }
+    budgets[None] = (
+        float(recommended["requests_per_minute"]) * headroom,
+        float(recommended["tokens_per_minute"]) * headroom,
+    )
+    concurrency = max(1.0, limit("concurrent_requests", "concurrent_requests"))
+    return budgets, concurrency
+
+
+class BedrockBatchInvoker:
+    """Runs many Bedrock prompts concurrently within the account quotas."""
+
+    def __init__(
+        self,
+        invoke: Callable[..., InvokeResult],
+        budgets: Dict[Optional[str], Tuple[float, float]],
+        limiter: Optional[AIMDLimiter] = None,
+        default_model_id: Optional[str] = None,
+        max_attempts: int = 5,
+        retry_delay: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize batch invoker.
+
+        Args:
+            invoke: Blocking invoke_model(prompt, model_id, system_prompt, ...)
+            budgets: Per-family (requests_per_minute, tokens_per_minute)
+            limiter: Concurrency limiter shared by all requests
+            default_model_id: Model used when a call names none
+            max_attempts: Attempts per prompt before a throttle is final
+            retry_delay: Base delay before retrying a throttled prompt
+            clock: Monotonic time source
+        """
+        self._invoke = invoke
+        self.limiter = limiter or AIMDLimiter()
+        self.default_model_id = default_model_id
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._clock = clock
+        self._budgets = {
+            family: ModelBudget(rpm, tpm, clock=clock)
+            for family, (rpm, tpm) in budgets.items()
+        }
+        # boto3 calls block, so they run on threads sized to the limiter
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(self.limiter.maximum),
+            thread_name_prefix="bedrock-batch",
+        )
+        self._in_flight: Dict[str, "asyncio.Future[InvokeResult]"] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self.stats = {"invoked": 0, "coalesced": 0, "throttled": 0}
+
+    @classmethod
+    def from_quotas(
+        cls,
+        invoke: Callable[..., InvokeResult],
+        quotas: Dict[str, Dict[str, Any]],
+        environment: str = "production",
+        **kwargs: Any,
+    ) -> "BedrockBatchInvoker":
+        """Create an invoker budgeted to the reported service quotas."""
+        budgets, concurrency = budgets_from_quotas(quotas, environment)
+        limiter = AIMDLimiter(initial=min(4.0, concurrency), maximum=concurrency)
+        logger.info(
+            f"Bedrock batch budgets: {budgets}, max concurrency {concurrency:.0f}"
+        )
+        return cls(invoke, budgets, limiter=limiter, **kwargs)
+
+    def budget_for(self, model_id: str) -> ModelBudget:
+        """Return the budget a model's requests are charged to."""
+        return self._budgets.get(quota_family(model_id), self._budgets[None])
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the invoker's loop, starting its thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="bedrock-batch-loop",
+                    daemon=True,
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule a coroutine on the invoker's loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self._event_loop())
+
+    async def invoke(
+        self,
+        prompt: str,
+        model_id: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> InvokeResult:
+        """Invoke a model, sharing the call with identical in-flight prompts."""
+        return await asyncio.wrap_future(
+            self._submit(self._invoke_shared(prompt, model_id, system_prompt, kwargs))
+        )
+
+    async def _invoke_shared(
+        self,
+        prompt: str,
+        model_id: Optional[str],
+        system_prompt: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> InvokeResult:
+        """Join or start the model call for a prompt on the invoker's loop."""
+        model_id = model_id or self.default_model_id or ""
+        key = hashlib.sha256(
+            json.dumps(
+                [model_id, prompt, system_prompt, kwargs], sort_keys=True, default=str
+            ).encode()
+        ).hexdigest()
+
+        shared = self._in_flight.get(key)
+        if shared is None:
+            shared = asyncio.get_running_loop().create_task(
+                self._invoke_with_retry(prompt, model_id, system_prompt, kwargs)
+            )
+            self._in_flight[key] = shared
+            shared.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+
+        # Shielded so one caller giving up does not cancel the others
+        response, metadata = await asyncio.shield(shared)
+        return response, dict(metadata)
+
+    async def _invoke_with_retry(
+        self,
+        prompt: str,
+        model_id: str,
+        system_prompt: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> InvokeResult:
+        """Call the model within budget, retrying throttled attempts."""
+        max_tokens = kwargs.get("max_tokens") or BedrockService.MODEL_CONFIGS.get(
+            model_id, {}
+        ).get("max_tokens", 4096)
+        tokens = estimate_tokens(prompt, system_prompt, max_tokens)
+        budget = self.budget_for(model_id)
+        loop = asyncio.get_running_loop()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            await budget.acquire(tokens)
+            started = await self.limiter.acquire()
+            try:
+                result = await loop.run_in_executor(
+                    self._executor,
+                    lambda: self._invoke(
+                        prompt, model_id or None, system_prompt, **kwargs
+                    ),
+                )
+            except BedrockRateLimitException:
+                self.limiter.on_throttle(started)
+                self.stats["throttled"] += 1
+                if attempt == self.max_attempts:
+                    raise
+            else:
+                self.limiter.on_success(started, self._clock() - started)
+                self.stats["invoked"] += 1
+                return result
+            finally:
+                self.limiter.release()
+
+            delay = self.retry_delay * 2 ** (attempt - 1)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))  # nosec B311
+
+    async def stream(
+        self,
+        prompts: Iterable[str],
+        model_id: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[InvokeResult]:
+        """Yield a result per prompt, in input order, as each is ready.
+
+        A prompt that fails yields ("", {"error": ...}) like batch_invoke.
+        At most twice the maximum concurrency of prompts are scheduled
+        ahead of the one being yielded, so long inputs are not held in
+        memory all at once.
+        """
+        results = self._stream(prompts, model_id, system_prompt, kwargs)
+        try:
+            while True:
+                result = await asyncio.wrap_future(self._submit(self._next(results)))
+                if result is None:
+                    return
+                yield result
+        finally:
+            await asyncio.wrap_future(self._submit(self._close(results)))
+
+    @staticmethod
+    async def _next(results: AsyncIterator[InvokeResult]) -> Optional[InvokeResult]:
+        """Advance a result stream; None once it is exhausted."""
+        try:
+            return await results.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    @staticmethod
+    async def _close(results: AsyncGenerator[InvokeResult, None]) -> None:
+        """Close a result stream, cancelling its outstanding prompts."""
+        await results.aclose()
+
+    async def _stream(
+        self,
+        prompts: Iterable[str],
+        model_id: Optional[str],
+        system_prompt: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> AsyncGenerator[InvokeResult, None]:
+        """Ordered results of the prompts, run on the invoker's loop."""
+        window = 2 * int(self.limiter.maximum)
+        pending: Deque["asyncio.Task[InvokeResult]"] = deque()
+        loop = asyncio.get_running_loop()
+        try:
+            for prompt in prompts:
+                pending.append(
+                    loop.create_task(
+                        self._invoke_shared(prompt, model_id, system_prompt, kwargs)
+                    )
+                )
+                while pending and (len(pending) >= window or pending[0].done()):
+                    yield await self._result(pending.popleft())
+            while pending:
+                yield await self._result(pending.popleft())
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def invoke_all(
+        self,
+        prompts: Iterable[str],
+        model_id: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> List[InvokeResult]:
+        """Return the results of all prompts in input order."""
+        return await asyncio.wrap_future(
+            self._submit(self._collect(prompts, model_id, system_prompt, kwargs))
+        )
+
+    def run_all(
+        self,
+        prompts: Iterable[str],
+        model_id: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> List[InvokeResult]:
+        """Blocking form of invoke_all, for callers without an event loop."""
+        return self._submit(
+            self._collect(prompts, model_id, system_prompt, kwargs)
+        ).result()
+
+    async def _collect(
+        self,
+        prompts: Iterable[str],
+        model_id: Optional[str],
+        system_prompt: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> List[InvokeResult]:
+        """Gather a stream's results on the invoker's loop."""
+        return [
+            result
+            async for result in self._stream(prompts, model_id, system_prompt, kwargs)
+        ]
+
+    @staticmethod
+    async def _result(task: "asyncio.Task[InvokeResult]") -> InvokeResult:
+        """Await a prompt's task, turning failures into error results."""
+        try:
+            return await task
+        except (
+            BedrockException,
+            ClientError,
+            ValueError,
+            KeyError,
+            AttributeError,
+        ) as e:
+            logger.error(f"Error processing batch prompt: {e}")
+            return "", {"error": str(e)}
+
+    def shutdown(self) -> None:
+        """Stop the invoker's loop and invocation threads."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+            thread, self._loop_thread = self._loop_thread, None
+        if loop is not None and thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self._executor.shutdown(wait=False)
@@ -1,20 +1,33 @@
 """Amazon Bedrock service for AI/ML capabilities."""
 
-import asyncio
 import json
-import time
+import math
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from src.config.loader import get_settings
+from src.services.llm_response_cache import get_llm_response_cache, response_cache_key
 from src.utils.logging import get_logger
 from src.utils.monitoring import metrics_collector
 
+if TYPE_CHECKING:
+    from src.services.bedrock_batch import BedrockBatchInvoker
+
 logger = get_logger(__name__)
 
 
@@ -112,6 +125,11 @@ class BedrockService:
         # Performance tracking
         self._request_times: List[float] = []
 
+        # Created on first batch call, budgeted to the account quotas
+        self._batch_invoker: Optional["BedrockBatchInvoker"] = None
+        self._batch_runtime: Any = None
+        self._batch_invoker_lock = threading.Lock()
+
         # Initialize model list - skip in test environment
         if get_settings().environment != "test":
             try:
@@ -237,22 +255,55 @@ class BedrockService:
         system_prompt: Optional[str] = None,
         temperature: float = 0.3,
         max_tokens: Optional[int] = None,
+        use_case: Optional[str] = None,
         **kwargs: Any,
     ) -> Tuple[str, Dict[str, Any]]:
         """
         Invoke a Bedrock model with the given prompt.
 
+        Deterministic calls (temperature at or below the use case's cache
+        policy) are answered from the shared LLM response cache when the
+        same call was made before.
+
         Args:
             prompt: The input prompt
             model_id: Model to use (defaults to get_settings().bedrock_model_id)
             system_prompt: Optional system prompt
             temperature: Temperature for response generation
             max_tokens: Maximum tokens to generate
+            use_case: Cache policy to apply (see llm_response_cache)
             **kwargs: Additional model-specific parameters
 
         Returns:
             Tuple of (response_text, metadata)
         """
+        return self._invoke_model(
+            self.bedrock_runtime,
+            prompt,
+            model_id,
+            system_prompt,
+            temperature,
+            max_tokens,
+            use_case,
+            **kwargs,
+        )
+
+    def _batch_invoke_model(self, *args: Any, **kwargs: Any) -> Tuple[str, Dict]:
+        """Invoke on the batch client, which leaves throttling to the limiter."""
+        return self._invoke_model(self._batch_runtime, *args, **kwargs)
+
+    def _invoke_model(
+        self,
+        runtime: Any,
+        prompt: str,
+        model_id: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: Optional[int] = None,
+        use_case: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Invoke a model through the given bedrock-runtime client."""
         model_id = model_id or get_settings().bedrock_model_id
 
         # Check model availability
@@ -260,6 +311,19 @@ class BedrockService:
             logger.warning(f"Model {model_id} not available, falling back to Claude V2")
             model_id = BedrockModel.CLAUDE_V2
 
+        cache = get_llm_response_cache()
+        cache_key = None
+        if cache is not None and cache.is_cacheable(use_case, temperature):
+            cache_key = response_cache_key(
+                model_id,
+                prompt,
+                system_prompt,
+                {"temperature": temperature, "max_tokens": max_tokens, **kwargs},
+            )
+            cached = cache.get(cache_key, use_case)
+            if cached is not None:
+                return cached
+
         start_time = datetime.utcnow()
 
         try:
@@ -285,7 +349,7 @@ class BedrockService:
             request_body.update(kwargs)
 
             # Invoke the model
-            response = self.bedrock_runtime.invoke_model(
+            response = runtime.invoke_model(
                 modelId=model_id,
                 body=json.dumps(request_body),
                 contentType="application/json",
@@ -294,6 +358,7 @@ class BedrockService:
 
             # Parse response
             response_body = json.loads(response["body"].read())
+            headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
             response_text = self.parse_response(response_body, model_id)
 
             # Calculate metrics
@@ -311,10 +376,17 @@ class BedrockService:
                 "latency_seconds": latency,
                 "prompt_length": len(prompt),
                 "response_length": len(response_text),
+                "input_tokens": int(headers.get("x-amzn-bedrock-input-token-count", 0)),
+                "output_tokens": int(
+                    headers.get("x-amzn-bedrock-output-token-count", 0)
+                ),
                 "temperature": temperature,
                 "timestamp": start_time.isoformat(),
             }
 
+            if cache is not None and cache_key is not None:
+                cache.set(cache_key, response_text, metadata, use_case)
+
             # Log metrics
             metrics_collector.record_bedrock_request(
                 model_id=model_id, latency=latency, success=True
@@ -369,10 +441,99 @@ class BedrockService:
     async def invoke_model_async(
         self, prompt: str, model_id: Optional[str] = None, **kwargs: Any
     ) -> Tuple[str, Dict[str, Any]]:
-        """Async wrapper for invoke_model."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor, lambda: self.invoke_model(prompt, model_id, **kwargs)
+        """Async invoke_model, paced and coalesced with batch requests."""
+        return await self.batch_invoker.invoke(prompt, model_id, **kwargs)
+
+    @property
+    def batch_invoker(self) -> "BedrockBatchInvoker":
+        """Batch invoker paced to this account's Bedrock quotas."""
+        with self._batch_invoker_lock:
+            if self._batch_invoker is None:
+                self._batch_invoker = self._create_batch_invoker()
+        return self._batch_invoker
+
+    def _create_batch_invoker(self) -> "BedrockBatchInvoker":
+        """Create a batch invoker budgeted to the current service quotas."""
+        # pylint: disable-next=import-outside-toplevel
+        from src.ai.bedrock.quota_manager import ServiceQuotaManager
+
+        # pylint: disable-next=import-outside-toplevel
+        from src.services.bedrock_batch import BedrockBatchInvoker
+
+        settings = get_settings()
+        quotas: Dict[str, Dict] = {}
+        if settings.environment != "test":
+            try:
+                quotas = ServiceQuotaManager(settings.aws_region).check_current_quotas(
+                    settings.environment
+                )
+            except (ClientError, ValueError, KeyError) as e:
+                logger.warning(f"Using recommended Bedrock quotas: {e}")
+        invoker = BedrockBatchInvoker.from_quotas(
+            self._batch_invoke_model,
+            quotas,
+            environment=settings.environment,
+            default_model_id=settings.bedrock_model_id,
+        )
+        # One attempt per call: throttles must reach the AIMD limiter rather
+        # than be retried inside botocore, and the pool matches its ceiling
+        self._batch_runtime = boto3.client(
+            "bedrock-runtime",
+            config=Config(
+                region_name=settings.aws_region,
+                retries={"total_max_attempts": 1, "mode": "standard"},
+                max_pool_connections=math.ceil(invoker.limiter.maximum),
+            ),
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key,
+        )
+        return invoker
+
+    def stream_batch_invoke(
+        self,
+        prompts: List[str],
+        model_id: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Invoke model for multiple prompts, yielding results in order.
+
+        Prompts run concurrently within the account quotas; each result is
+        yielded as soon as it and all results before it are ready.
+
+        Args:
+            prompts: Prompts to process
+            model_id: Model to use
+            system_prompt: Optional system prompt for all requests
+            **kwargs: Additional parameters
+
+        Returns:
+            Async iterator of (response, metadata) tuples
+        """
+        return self.batch_invoker.stream(prompts, model_id, system_prompt, **kwargs)
+
+    async def batch_invoke_async(
+        self,
+        prompts: List[str],
+        model_id: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Invoke model for multiple prompts concurrently.
+
+        Args:
+            prompts: Prompts to process
+            model_id: Model to use
+            system_prompt: Optional system prompt for all requests
+            **kwargs: Additional parameters
+
+        Returns:
+            List of (response, metadata) tuples in prompt order
+        """
+        return await self.batch_invoker.invoke_all(
+            prompts, model_id, system_prompt, **kwargs
         )
 
     def batch_invoke(
@@ -385,6 +546,9 @@ class BedrockService:
         """
         Invoke model for multiple prompts.
 
+        Blocking form of batch_invoke_async; async callers should await
+        that directly.
+
         Args:
             prompts: List of prompts to process
             model_id: Model to use
@@ -394,27 +558,10 @@ class BedrockService:
         Returns:
             List of (response, metadata) tuples
         """
-        results = []
-
-        for i, prompt in enumerate(prompts):
-            try:
-                response, metadata = self.invoke_model(
-                    prompt=prompt,
-                    model_id=model_id,
-                    system_prompt=system_prompt,
-                    **kwargs,
-                )
-                results.append((response, metadata))
-
-                # Add small delay to avoid throttling
-                if i < len(prompts) - 1:
-                    time.sleep(0.1)
-
-            except (ClientError, ValueError, KeyError, AttributeError) as e:
-                logger.error(f"Error processing prompt {i}: {e}")
-                results.append(("", {"error": str(e)}))
+        if not prompts:
+            return []
 
-        return results
+        return self.batch_invoker.run_all(prompts, model_id, system_prompt, **kwargs)
 
     def stream_invoke(
         self,
@@ -519,6 +666,8 @@ class BedrockService:
         """Cleanup resources."""
         if hasattr(self, "_executor"):
             self._executor.shutdown(wait=False)
+        if getattr(self, "_batch_invoker", None) is not None:
+            self._batch_invoker.shutdown()
 
 
 # Module-level singleton instance
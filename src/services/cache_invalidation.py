@@ -45,7 +45,12 @@ class InvalidationRule(BaseModel):
 
     name: str = Field(..., description="Rule name")
     trigger_event: str = Field(..., description="Event that triggers invalidation")
-    patterns: List[str] = Field(..., description="Cache key patterns to invalidate")
+    patterns: List[str] = Field(
+        default_factory=list, description="Cache keys or patterns to invalidate"
+    )
+    tags: List[str] = Field(
+        default_factory=list, description="Cache tags whose keys are invalidated"
+    )
     strategy: InvalidationStrategy = Field(default=InvalidationStrategy.IMMEDIATE)
     delay_seconds: Optional[int] = Field(None, description="Delay for DELAYED strategy")
     cascade_rules: Optional[List[str]] = Field(
@@ -97,11 +102,10 @@ class CacheInvalidationService:
             InvalidationRule(
                 name="user_update",
                 trigger_event="user.updated",
-                patterns=[
-                    "user:{user_id}",
-                    "user:{user_id}:*",
-                    "query:*/users/{user_id}*",
-                ],
+                # Keys under user:{user_id}: are written untagged, so they
+                # are still matched by pattern; tags cover cached queries
+                patterns=["user:{user_id}", "user:{user_id}:*"],
+                tags=["user:{user_id}"],
                 strategy=InvalidationStrategy.CASCADE,
                 cascade_rules=["user_permissions_update"],
                 delay_seconds=None,
@@ -117,6 +121,7 @@ class CacheInvalidationService:
                     "user:{user_id}:roles",
                     "api_key:*:{user_id}",
                 ],
+                tags=["user_permissions:{user_id}"],
                 strategy=InvalidationStrategy.IMMEDIATE,
                 delay_seconds=None,
                 cascade_rules=None,
@@ -128,11 +133,8 @@ class CacheInvalidationService:
             InvalidationRule(
                 name="patient_update",
                 trigger_event="patient.updated",
-                patterns=[
-                    "patient:{patient_id}",
-                    "patient:{patient_id}:*",
-                    "query:*/patients/{patient_id}*",
-                ],
+                patterns=["patient:{patient_id}", "patient:{patient_id}:*"],
+                tags=["patient:{patient_id}"],
                 strategy=InvalidationStrategy.CASCADE,
                 cascade_rules=["patient_records_update"],
                 delay_seconds=None,
@@ -146,8 +148,8 @@ class CacheInvalidationService:
                 patterns=[
                     "health_record:*:{patient_id}",
                     "patient:{patient_id}:records",
-                    "query:*/patients/{patient_id}/records*",
                 ],
+                tags=["patient_records:{patient_id}"],
                 strategy=InvalidationStrategy.IMMEDIATE,
                 delay_seconds=None,
                 cascade_rules=None,
@@ -163,8 +165,8 @@ class CacheInvalidationService:
                     "health_record:{record_id}",
                     "health_record:{record_id}:*",
                     "patient:{patient_id}:records",
-                    "query:*/health-records/{record_id}*",
                 ],
+                tags=["health_record:{record_id}"],
                 strategy=InvalidationStrategy.IMMEDIATE,
                 delay_seconds=None,
                 cascade_rules=None,
@@ -210,6 +212,8 @@ class CacheInvalidationService:
                     "translation:glossary:*:{language}",
                     "translation:*:*:*",  # Invalidate all translations using glossary
                 ],
+                # Pipeline translations are tagged per target language
+                tags=["glossary:{glossary_id}", "translations:{language}"],
                 strategy=InvalidationStrategy.PATTERN,
                 delay_seconds=None,
                 cascade_rules=None,
@@ -225,6 +229,7 @@ class CacheInvalidationService:
                     "file:{file_id}:*",
                     "thumbnail:{file_id}",
                 ],
+                tags=["file:{file_id}"],
                 strategy=InvalidationStrategy.IMMEDIATE,
                 delay_seconds=None,
                 cascade_rules=None,
@@ -236,10 +241,8 @@ class CacheInvalidationService:
             InvalidationRule(
                 name="search_index_update",
                 trigger_event="search.index_updated",
-                patterns=[
-                    "search:*",
-                    "query:*/search*",
-                ],
+                patterns=["search:*"],
+                tags=["search"],
                 strategy=InvalidationStrategy.PATTERN,
                 delay_seconds=None,
                 cascade_rules=None,
@@ -289,21 +292,25 @@ class CacheInvalidationService:
         self, rule: InvalidationRule, context: Dict[str, str]
     ) -> None:
         """Process a single invalidation rule."""
-        # Substitute context variables in patterns
+        # Substitute context variables in patterns and tags
         patterns = self._substitute_patterns(rule.patterns, context)
+        tags = self._substitute_patterns(rule.tags, context)
 
         # Apply strategy
         if rule.strategy == InvalidationStrategy.IMMEDIATE:
-            await self._invalidate_immediate(patterns)
+            await self._invalidate_immediate(patterns, tags)
 
         elif rule.strategy == InvalidationStrategy.DELAYED:
-            await self._invalidate_delayed(patterns, rule.delay_seconds or 5)
+            await self._invalidate_delayed(patterns, rule.delay_seconds or 5, tags)
 
         elif rule.strategy == InvalidationStrategy.LAZY:
             await self._mark_stale(patterns)
+            if tags:
+                # Stale markers only apply to concrete keys
+                await self._invalidate_tags(tags)
 
         elif rule.strategy == InvalidationStrategy.CASCADE:
-            await self._invalidate_immediate(patterns)
+            await self._invalidate_immediate(patterns, tags)
             # Process cascade rules
             if rule.cascade_rules:
                 for cascade_rule_name in rule.cascade_rules:
@@ -313,6 +320,7 @@ class CacheInvalidationService:
 
         elif rule.strategy == InvalidationStrategy.PATTERN:
             await self._invalidate_by_pattern(patterns)
+            await self._invalidate_tags(tags)
 
     def _substitute_patterns(
         self, patterns: List[str], context: Dict[str, str]
@@ -326,8 +334,18 @@ class CacheInvalidationService:
             substituted.append(pattern)
         return substituted
 
-    async def _invalidate_immediate(self, keys: List[str]) -> None:
-        """Immediately invalidate cache keys."""
+    async def _invalidate_tags(self, tags: List[str]) -> None:
+        """Invalidate every key carrying one of the tags."""
+        if not tags:
+            return
+        count = await cache_service.invalidate_tags(*tags)
+        logger.info(f"Invalidated {count} keys tagged: {tags}")
+
+    async def _invalidate_immediate(
+        self, keys: List[str], tags: Optional[List[str]] = None
+    ) -> None:
+        """Immediately invalidate cache keys and tags."""
+        await self._invalidate_tags(tags or [])
         for key in keys:
             if "*" in key:
                 # Pattern-based deletion
@@ -339,12 +357,14 @@ class CacheInvalidationService:
                 if success:
                     logger.debug(f"Invalidated cache key: {key}")
 
-    async def _invalidate_delayed(self, keys: List[str], delay_seconds: int) -> None:
-        """Invalidate cache keys after a delay."""
+    async def _invalidate_delayed(
+        self, keys: List[str], delay_seconds: int, tags: Optional[List[str]] = None
+    ) -> None:
+        """Invalidate cache keys and tags after a delay."""
 
         async def delayed_invalidation() -> None:
             await asyncio.sleep(delay_seconds)
-            await self._invalidate_immediate(keys)
+            await self._invalidate_immediate(keys, tags)
 
         # Run in background
         asyncio.create_task(delayed_invalidation())
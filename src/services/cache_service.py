@@ -8,10 +8,12 @@ PHI is encrypted and cache keys are designed to prevent information leakage.
 Access to cached PHI requires appropriate authorization levels.
 """
 
+import asyncio
 import hashlib
 import json
+import uuid
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
 import redis.asyncio as redis
 
@@ -26,6 +28,7 @@ from src.healthcare.hipaa_access_control import (
 )
 from src.security.encryption import EncryptionService
 from src.services.cache_ttl_config import CacheCategory, ttl_manager
+from src.services.near_cache import MISSING, NearCache
 from src.utils.logging import get_logger
 
 # Access control for cached PHI
@@ -33,10 +36,61 @@ from src.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+# Pub/sub channel carrying near-cache invalidations between nodes
+INVALIDATION_CHANNEL = "cache:invalidations"
+
+# Redis set holding the keys written with a tag
+TAG_KEY_PREFIX = "cache:tag:"
+
+# Key prefixes served from the in-process near cache. These are small,
+# read-mostly entries read on almost every request.
+DEFAULT_NEAR_CACHE_PREFIXES = (
+    "translation:glossary:",
+    "role_permissions:",
+    "feature_flags:",
+    "system_config:",
+)
+
+
+def _serialize(value: Any) -> str:
+    """Serialize a value for Redis."""
+    if isinstance(value, (dict, list, str, int, float, bool)):
+        return json.dumps(value)
+    # Convert complex objects to string representation
+    # Removed pickle for security reasons - CWE-502
+    return str(value)
+
+
+def _deserialize(value: bytes) -> Any:
+    """Deserialize a value read from Redis."""
+    # Try to deserialize as JSON first
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        # Return as string if JSON decode fails
+        # Removed pickle for security reasons - CWE-502
+        return value.decode("utf-8")
+
+
+def build_tag_key(tag: str) -> str:
+    """Build the Redis key of a tag's member set."""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
 class CacheService:
-    """Redis-based caching service."""
+    """Redis-based caching service with an in-process near cache.
+
+    Keys under the near-cache prefixes are also held in a bounded local LRU
+    so hot reads skip the Redis round trip. Writes and deletes publish the
+    affected keys on INVALIDATION_CHANNEL; every node evicts them from its
+    near cache. Near-cache entries also expire after a short TTL, which
+    bounds staleness if the subscription drops.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        near_cache_prefixes: Optional[Sequence[str]] = None,
+    ) -> None:
         """Initialize cache service."""
         self.settings = get_settings()
         self.redis_client: Optional[redis.Redis] = None
@@ -45,6 +99,18 @@ class CacheService:
         )
         self.connected = False
 
+        self.node_id = uuid.uuid4().hex
+        self.near_cache = NearCache(
+            max_entries=getattr(self.settings, "near_cache_max_entries", 10000),
+            ttl=getattr(self.settings, "near_cache_ttl", 30),
+        )
+        self.near_cache_prefixes = tuple(
+            DEFAULT_NEAR_CACHE_PREFIXES
+            if near_cache_prefixes is None
+            else near_cache_prefixes
+        )
+        self._invalidation_task: Optional[asyncio.Task] = None
+
     async def connect(self) -> None:
         """Connect to Redis."""
         if not self.connected and self.settings.redis_url:
@@ -58,6 +124,7 @@ class CacheService:
                 await self.redis_client.ping()
                 self.connected = True
                 logger.info("Connected to Redis cache")
+                self._start_invalidation_listener()
             except (redis.ConnectionError, redis.TimeoutError, redis.RedisError) as e:
                 logger.error("Failed to connect to Redis: %s", str(e))
                 self.redis_client = None
@@ -65,14 +132,120 @@ class CacheService:
 
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            self._invalidation_task = None
+        self.near_cache.clear()
         if self.redis_client:
             await self.redis_client.close()
             self.connected = False
 
+    # Near cache
+
+    def register_near_cache_prefix(self, prefix: str) -> None:
+        """Serve keys under a prefix from the near cache."""
+        if prefix not in self.near_cache_prefixes:
+            self.near_cache_prefixes += (prefix,)
+
+    def is_near_cached(self, key: str) -> bool:
+        """Check whether a key is eligible for the near cache."""
+        return key.startswith(self.near_cache_prefixes)
+
+    def _start_invalidation_listener(self) -> None:
+        """Start the pub/sub listener that keeps the near cache coherent."""
+        if not self.near_cache_prefixes:
+            return
+        if self._invalidation_task and not self._invalidation_task.done():
+            return
+        self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def _listen_for_invalidations(self) -> None:
+        """Apply invalidations published by other nodes."""
+        while self.connected and self.redis_client:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        # Anything published before (re)subscribing was missed
+                        self.near_cache.clear()
+                    elif message["type"] == "message":
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except redis.RedisError as e:
+                logger.warning("Cache invalidation listener error: %s", str(e))
+                self.near_cache.clear()
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.close()
+                except redis.RedisError:
+                    pass
+
+    def _apply_invalidation(self, data: bytes) -> None:
+        """Evict near-cache entries named in an invalidation message."""
+        try:
+            message = json.loads(data)
+        except (json.JSONDecodeError, TypeError):
+            logger.warning("Ignoring malformed cache invalidation message")
+            return
+        if message.get("origin") == self.node_id:
+            return
+        if message.get("flush"):
+            self.near_cache.clear()
+        if message.get("keys"):
+            self.near_cache.invalidate(message["keys"])
+        if message.get("pattern"):
+            self.near_cache.invalidate_pattern(message["pattern"])
+
+    async def _publish_invalidation(
+        self, keys: Sequence[str] = (), pattern: Optional[str] = None
+    ) -> None:
+        """Evict keys locally and tell other nodes to do the same."""
+        near_keys = [key for key in keys if self.is_near_cached(key)]
+        if near_keys:
+            self.near_cache.invalidate(near_keys)
+        if pattern is not None:
+            self.near_cache.invalidate_pattern(pattern)
+        if not near_keys and pattern is None:
+            return
+        if not self.redis_client:
+            return
+
+        message: Dict[str, Any] = {"origin": self.node_id}
+        if near_keys:
+            message["keys"] = near_keys
+        if pattern is not None:
+            message["pattern"] = pattern
+        try:
+            await self.redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except redis.RedisError as e:
+            logger.error("Cache invalidation publish error: %s", str(e))
+
+    def get_near_cache_stats(self) -> Dict[str, Any]:
+        """Get near cache statistics."""
+        return {
+            **self.near_cache.stats(),
+            "prefixes": list(self.near_cache_prefixes),
+            "listening": bool(
+                self._invalidation_task and not self._invalidation_task.done()
+            ),
+        }
+
+    # Key/value operations
+
     @require_phi_access(AccessLevel.READ)
     @audit_phi_access("get_cached_data")
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
+        near = self.is_near_cached(key)
+        generation = self.near_cache.generation
+        if near:
+            value = self.near_cache.get(key)
+            if value is not MISSING:
+                return value
+
         if not self.connected:
             await self.connect()
 
@@ -82,19 +255,88 @@ class CacheService:
         try:
             value = await self.redis_client.get(key)
             if value:
-                # Try to deserialize as JSON first
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    # Return as string if JSON decode fails
-                    # Removed pickle for security reasons - CWE-502
-                    return value.decode("utf-8")
+                decoded = _deserialize(value)
+                if near:
+                    self.near_cache.set(key, decoded, generation=generation)
+                return decoded
         except (redis.RedisError, json.JSONDecodeError, UnicodeDecodeError) as e:
             logger.error("Cache get error for key %s: %s", key, str(e))
             return None
 
         return None
 
+    @require_phi_access(AccessLevel.READ)
+    @audit_phi_access("get_many_cached_data")
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Get several values with a single MGET.
+
+        Near-cached keys are served locally; the rest are fetched together.
+
+        Returns:
+            Mapping of found keys to values (missing keys are omitted)
+        """
+        found: Dict[str, Any] = {}
+        remote: List[str] = []
+        for key in dict.fromkeys(keys):
+            if self.is_near_cached(key):
+                value = self.near_cache.get(key)
+                if value is not MISSING:
+                    found[key] = value
+                    continue
+            remote.append(key)
+
+        if not remote:
+            return found
+
+        if not self.connected:
+            await self.connect()
+
+        if not self.redis_client:
+            return found
+
+        generation = self.near_cache.generation
+        try:
+            values = await self.redis_client.mget(remote)
+        except redis.RedisError as e:
+            logger.error("Cache get_many error for %d keys: %s", len(remote), str(e))
+            return found
+
+        for key, value in zip(remote, values):
+            if not value:
+                continue
+            try:
+                decoded = _deserialize(value)
+            except UnicodeDecodeError as e:
+                logger.error("Cache get error for key %s: %s", key, str(e))
+                continue
+            found[key] = decoded
+            if self.is_near_cached(key):
+                self.near_cache.set(key, decoded, generation=generation)
+        return found
+
+    def _resolve_ttl(
+        self, ttl: Optional[int], category: Optional[CacheCategory]
+    ) -> int:
+        """Determine the TTL for a write."""
+        if ttl is None and category is not None:
+            return int(ttl_manager.get_ttl_with_jitter(category))
+        if ttl is None:
+            return int(DEFAULT_CACHE_TTL)
+        return ttl
+
+    @staticmethod
+    def _queue_tags(pipe: Any, key: str, tags: Sequence[str], ttl: int) -> None:
+        """Queue tag-set membership for a key on a pipeline.
+
+        The tag set lives at least as long as its longest-lived member
+        (EXPIRE NX sets a first expiry, EXPIRE GT only ever extends it).
+        """
+        for tag in tags:
+            tag_key = build_tag_key(tag)
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+
     @require_phi_access(AccessLevel.WRITE)
     @audit_phi_access("set_cached_data")
     async def set(
@@ -103,6 +345,7 @@ class CacheService:
         value: Any,
         ttl: Optional[int] = None,
         category: Optional[CacheCategory] = None,
+        tags: Optional[Sequence[str]] = None,
     ) -> bool:
         """Set value in cache with optional TTL or category.
 
@@ -111,6 +354,7 @@ class CacheService:
             value: Value to cache
             ttl: Explicit TTL in seconds (takes precedence)
             category: Cache category for automatic TTL
+            tags: Invalidation tags; see invalidate_tags()
 
         Returns:
             True if successful
@@ -122,29 +366,71 @@ class CacheService:
             return False
 
         try:
-            # Serialize value
-            if isinstance(value, (dict, list, str, int, float, bool)):
-                serialized = json.dumps(value)
-            else:
-                # Convert complex objects to string representation
-                # Removed pickle for security reasons - CWE-502
-                serialized = str(value)
-
-            # Determine TTL
-            if ttl is None and category is not None:
-                ttl = ttl_manager.get_ttl_with_jitter(category)
-            elif ttl is None:
-                ttl = DEFAULT_CACHE_TTL
+            serialized = _serialize(value)
+            ttl = self._resolve_ttl(ttl, category)
 
             # Set with TTL
-            await self.redis_client.setex(key, ttl, serialized)
+            if tags:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, ttl, serialized)
+                    self._queue_tags(pipe, key, tags, ttl)
+                    await pipe.execute()
+            else:
+                await self.redis_client.setex(key, ttl, serialized)
             logger.debug("Cached %s with TTL %s seconds", key, ttl)
 
+            await self._publish_invalidation([key])
             return True
         except (redis.RedisError, TypeError) as e:
             logger.error("Cache set error for key %s: %s", key, str(e))
             return False
 
+    @require_phi_access(AccessLevel.WRITE)
+    @audit_phi_access("set_many_cached_data")
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        category: Optional[CacheCategory] = None,
+        tags: Optional[Sequence[str]] = None,
+    ) -> bool:
+        """Set several values in one pipelined round trip.
+
+        Args:
+            items: Mapping of cache key to value
+            ttl: Explicit TTL in seconds (takes precedence)
+            category: Cache category for automatic TTL
+            tags: Invalidation tags applied to every key
+
+        Returns:
+            True if successful
+        """
+        if not items:
+            return True
+
+        if not self.connected:
+            await self.connect()
+
+        if not self.redis_client:
+            return False
+
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    # Resolve per key so category jitter spreads expiries
+                    key_ttl = self._resolve_ttl(ttl, category)
+                    pipe.setex(key, key_ttl, _serialize(value))
+                    if tags:
+                        self._queue_tags(pipe, key, tags, key_ttl)
+                await pipe.execute()
+            logger.debug("Cached %d keys", len(items))
+
+            await self._publish_invalidation(list(items))
+            return True
+        except (redis.RedisError, TypeError) as e:
+            logger.error("Cache set_many error for %d keys: %s", len(items), str(e))
+            return False
+
     @require_phi_access(AccessLevel.DELETE)
     @audit_phi_access("delete_cached_data")
     async def delete(self, key: str) -> bool:
@@ -153,10 +439,12 @@ class CacheService:
             await self.connect()
 
         if not self.redis_client:
+            self.near_cache.invalidate([key])
             return False
 
         try:
             result = await self.redis_client.delete(key)
+            await self._publish_invalidation([key])
             return bool(result > 0)
         except redis.RedisError as e:
             logger.error("Cache delete error for key %s: %s", key, str(e))
@@ -176,10 +464,60 @@ class CacheService:
             logger.error("Cache exists error for key %s: %s", key, str(e))
             return False
 
+    @require_phi_access(AccessLevel.DELETE)
+    @audit_phi_access("invalidate_cached_tags")
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key written with any of the given tags.
+
+        Tag sets replace SCAN-based pattern invalidation: the cost is
+        proportional to the number of tagged keys, not the keyspace.
+
+        Returns:
+            Number of keys deleted
+        """
+        if not tags:
+            return 0
+
+        if not self.connected:
+            await self.connect()
+
+        if not self.redis_client:
+            return 0
+
+        tag_keys = [build_tag_key(tag) for tag in tags]
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                member_sets = await pipe.execute()
+
+            keys = sorted(
+                {
+                    member.decode("utf-8") if isinstance(member, bytes) else member
+                    for members in member_sets
+                    for member in members
+                }
+            )
+            deleted = 0
+            if keys:
+                deleted = int(await self.redis_client.delete(*keys))
+            await self.redis_client.delete(*tag_keys)
+
+            await self._publish_invalidation(keys)
+            logger.debug("Invalidated %d keys for tags %s", deleted, list(tags))
+            return deleted
+        except (redis.RedisError, UnicodeDecodeError) as e:
+            logger.error("Cache tag invalidation error for %s: %s", list(tags), str(e))
+            return 0
+
     @require_phi_access(AccessLevel.DELETE)
     @audit_phi_access("clear_cached_pattern")
     async def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching pattern."""
+        """Clear all keys matching pattern.
+
+        Scans the whole keyspace; prefer tags and invalidate_tags() for
+        anything on a hot path.
+        """
         if not self.connected:
             await self.connect()
 
@@ -191,9 +529,12 @@ class CacheService:
             async for key in self.redis_client.scan_iter(pattern):
                 keys.append(key)
 
+            deleted = 0
             if keys:
-                return int(await self.redis_client.delete(*keys))
-            return 0
+                deleted = int(await self.redis_client.delete(*keys))
+            # Publish after deleting so peers cannot refill from stale Redis
+            await self._publish_invalidation(pattern=pattern)
+            return deleted
         except redis.RedisError as e:
             logger.error("Cache clear pattern error for %s: %s", pattern, str(e))
             return 0
@@ -222,7 +563,9 @@ class CacheService:
             return None
 
         try:
-            return int(await self.redis_client.incrby(key, amount))
+            value = int(await self.redis_client.incrby(key, amount))
+            await self._publish_invalidation([key])
+            return value
         except redis.RedisError as e:
             logger.error("Cache increment error for key %s: %s", key, str(e))
             return None
@@ -327,11 +670,27 @@ def build_file_cache_key(file_id: str, variant: str = "metadata") -> str:
     return f"file:{file_id}:{variant}"
 
 
+def build_glossary_cache_key(glossary_id: str, language: str) -> str:
+    """Build cache key for a glossary (near cached)."""
+    return f"translation:glossary:{glossary_id}:{language}"
+
+
+def build_role_permissions_cache_key(role: str) -> str:
+    """Build cache key for a role's permissions (near cached)."""
+    return f"role_permissions:{role}"
+
+
+def build_entity_tag(entity: str, entity_id: str) -> str:
+    """Build the invalidation tag for everything cached about an entity."""
+    return f"{entity}:{entity_id}"
+
+
 # Cache decorators
 def cache_result(
     ttl: Optional[int] = None,
     key_builder: Optional[Callable] = None,
     category: Optional[CacheCategory] = None,
+    tags: Optional[Union[Sequence[str], Callable[..., Sequence[str]]]] = None,
 ) -> Callable:
     """Cache function results.
 
@@ -339,6 +698,8 @@ def cache_result(
         ttl: Explicit TTL in seconds (takes precedence)
         key_builder: Custom function to build cache key
         category: Cache category for automatic TTL
+        tags: Invalidation tags, or a function of the call arguments
+            returning them
     """
 
     def decorator(func: Callable) -> Callable:
@@ -376,7 +737,8 @@ def cache_result(
                 cache_ttl = DEFAULT_CACHE_TTL
 
             # Cache result
-            await cache_service.set(cache_key, result, cache_ttl)
+            result_tags = tags(*args, **kwargs) if callable(tags) else tags
+            await cache_service.set(cache_key, result, cache_ttl, tags=result_tags)
             logger.debug("Cached result for %s with TTL %s", cache_key, cache_ttl)
 
             return result
@@ -386,8 +748,17 @@ def cache_result(
     return decorator
 
 
-def invalidate_cache(patterns: List[str]) -> Callable:
-    """Invalidate cache patterns after function execution."""
+def invalidate_cache(
+    patterns: Optional[List[str]] = None,
+    tags: Optional[Union[Sequence[str], Callable[..., Sequence[str]]]] = None,
+) -> Callable:
+    """Invalidate cache patterns and tags after function execution.
+
+    Args:
+        patterns: Key patterns to clear (scans the keyspace)
+        tags: Tags to invalidate, or a function of the call arguments
+            returning them
+    """
 
     def decorator(func: Callable) -> Callable:
         @wraps(func)
@@ -395,8 +766,16 @@ def invalidate_cache(patterns: List[str]) -> Callable:
             # Execute function
             result = await func(*args, **kwargs)
 
+            # Invalidate cache tags
+            invalidated_tags = tags(*args, **kwargs) if callable(tags) else tags
+            if invalidated_tags:
+                count = await cache_service.invalidate_tags(*invalidated_tags)
+                logger.debug(
+                    "Invalidated %s cache keys tagged %s", count, invalidated_tags
+                )
+
             # Invalidate cache patterns
-            for pattern in patterns:
+            for pattern in patterns or []:
                 count = await cache_service.clear_pattern(pattern)
                 logger.debug("Invalidated %s cache keys matching %s", count, pattern)
 
@@ -436,6 +815,11 @@ __all__ = [
     "build_health_record_cache_key",
     "build_translation_cache_key",
     "build_query_cache_key",
+    "build_glossary_cache_key",
+    "build_role_permissions_cache_key",
+    "build_entity_tag",
+    "build_tag_key",
+    "INVALIDATION_CHANNEL",
     "cache_result",
     "invalidate_cache",
     "warmup_cache",
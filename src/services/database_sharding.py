@@ -8,17 +8,32 @@ All database operations involving patient data require appropriate access levels
 and are subject to audit logging for HIPAA compliance.
 """
 
+import functools
 import hashlib
+import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel, Field
-from sqlalchemy import create_engine, text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    inspect,
+    select,
+    text,
+    tuple_,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Mapper, Session, sessionmaker
+from sqlalchemy.orm.interfaces import ONETOMANY
 
 from src.healthcare.hipaa_access_control import (
     AccessLevel,
@@ -26,12 +41,40 @@ from src.healthcare.hipaa_access_control import (
     require_phi_access,
 )
 from src.security.encryption import EncryptionService
+from src.services.shard_query_executor import (
+    CrossShardQueryExecutor,
+    OrderSpec,
+    ShardQueryResult,
+)
 from src.utils.logging import get_logger
 
 # Access control for PHI database operations
 
 logger = get_logger(__name__)
 
+# Shard key overrides written by rebalancing. The directory lives outside
+# the shards (see DatabaseShardManager.configure_directory) so every router,
+# in every process, resolves moved records to the same shard.
+shard_directory_metadata = MetaData()
+
+shard_key_overrides = Table(
+    "shard_key_overrides",
+    shard_directory_metadata,
+    Column("table_name", String(100), primary_key=True),
+    Column("shard_key", String(255), primary_key=True),
+    Column("shard_id", String(100), nullable=False),
+    Column("moved_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+# Routers cache the directory and pull rows moved by other processes this
+# often; rows are re-read from this far behind the newest one seen so a move
+# that committed late is not skipped.
+OVERRIDE_REFRESH_SECONDS = 30
+OVERRIDE_REFRESH_OVERLAP = timedelta(minutes=1)
+
+# Rows copied between shards in one batch: (mapper, rows), parents first
+RowBatch = List[Tuple[Mapper, List[Dict[str, Any]]]]
+
 
 class ShardingStrategy(str, Enum):
     """Strategies for data sharding."""
@@ -218,6 +261,113 @@ class DatabaseShardManager:
             kms_key_id="alias/haven-health-default"
         )
         self.shard_maps: Dict[str, Dict[str, str]] = {}  # table -> key -> shard_id
+        self.directory_engine: Optional[Engine] = None
+        self._override_refreshed: Dict[str, float] = {}
+        self._override_watermarks: Dict[str, datetime] = {}
+        self._override_lock = threading.Lock()
+        self.query_executor = CrossShardQueryExecutor(self.get_session)
+
+    def configure_directory(self, connection_url: str) -> None:
+        """Use a shared database for the shard key overrides.
+
+        Every process routing to the shards must point at the same
+        directory; the ``shard_key_overrides`` table is created by
+        migrations/add_shard_key_overrides.sql.
+
+        Args:
+            connection_url: Directory database connection URL
+        """
+        self.directory_engine = create_engine(
+            connection_url, pool_pre_ping=True, pool_recycle=3600
+        )
+        logger.info("Configured shard directory")
+
+    def _directory_overrides(self, table_name: str, keys: List[str]) -> Dict[str, str]:
+        """Look up shard overrides for keys of a table."""
+        if self.directory_engine is None or not keys:
+            return {}
+        statement = select(
+            shard_key_overrides.c.shard_key, shard_key_overrides.c.shard_id
+        ).where(
+            shard_key_overrides.c.table_name == table_name,
+            shard_key_overrides.c.shard_key.in_(keys),
+        )
+        with self.directory_engine.connect() as conn:
+            return dict(conn.execute(statement).tuples().all())
+
+    def _pinned_shard(self, table_name: str, key: str) -> Optional[str]:
+        """Shard a moved key is pinned to, from the in-process directory copy."""
+        if self.directory_engine is None:
+            return None
+        refreshed = self._override_refreshed.get(table_name, 0.0)
+        if time.monotonic() - refreshed > OVERRIDE_REFRESH_SECONDS:
+            self._refresh_overrides(self.directory_engine, table_name)
+        return self.shard_maps.get(table_name, {}).get(key)
+
+    def _refresh_overrides(self, directory_engine: Engine, table_name: str) -> None:
+        """Pull directory rows for a table moved since the last refresh."""
+        with self._override_lock:
+            watermark = self._override_watermarks.get(table_name)
+            statement = select(
+                shard_key_overrides.c.shard_key,
+                shard_key_overrides.c.shard_id,
+                shard_key_overrides.c.moved_at,
+            ).where(shard_key_overrides.c.table_name == table_name)
+            if watermark is not None:
+                statement = statement.where(
+                    shard_key_overrides.c.moved_at
+                    >= watermark - OVERRIDE_REFRESH_OVERLAP
+                )
+            with directory_engine.connect() as conn:
+                rows = conn.execute(statement).all()
+
+            overrides = self.shard_maps.setdefault(table_name, {})
+            for shard_key, shard_id, moved_at in rows:
+                overrides[shard_key] = shard_id
+                if watermark is None or moved_at > watermark:
+                    watermark = moved_at
+            if watermark is not None:
+                self._override_watermarks[table_name] = watermark
+            self._override_refreshed[table_name] = time.monotonic()
+
+    def _record_overrides(self, overrides: Dict[str, List[str]], shard_id: str) -> None:
+        """Point table keys at ``shard_id`` in one directory transaction."""
+        if self.directory_engine is None:
+            raise RuntimeError("Shard directory not configured")
+        moved_at = datetime.utcnow()
+        with self.directory_engine.begin() as conn:
+            for table_name, keys in overrides.items():
+                if not keys:
+                    continue
+                conn.execute(
+                    shard_key_overrides.delete().where(
+                        shard_key_overrides.c.table_name == table_name,
+                        shard_key_overrides.c.shard_key.in_(keys),
+                    )
+                )
+                conn.execute(
+                    shard_key_overrides.insert(),
+                    [
+                        {
+                            "table_name": table_name,
+                            "shard_key": key,
+                            "shard_id": shard_id,
+                            "moved_at": moved_at,
+                        }
+                        for key in keys
+                    ],
+                )
+
+        # Routers in this process see the move at once; others on refresh
+        with self._override_lock:
+            for table_name, keys in overrides.items():
+                self.shard_maps.setdefault(table_name, {}).update(
+                    dict.fromkeys(keys, shard_id)
+                )
+
+    def _active_shard_ids(self) -> List[str]:
+        """Get ids of active shards."""
+        return [shard_id for shard_id, shard in self.shards.items() if shard.is_active]
 
     def add_shard(self, shard: ShardConfig) -> None:
         """Add a shard configuration.
@@ -264,6 +414,11 @@ class DatabaseShardManager:
         Returns:
             Shard ID
         """
+        # Records moved by rebalancing are pinned to their new shard
+        pinned = self._pinned_shard(str(table_class.__tablename__), str(key_value))
+        if pinned is not None:
+            return pinned
+
         shard_key = table_class.get_shard_key()
         initial_shard_id = table_class.get_shard_id(key_value)
 
@@ -408,36 +563,106 @@ class DatabaseShardManager:
         self,
         table_class: Type[ShardedTable],
         filter_func: Optional[Callable] = None,
+        order_by: Optional[List[OrderSpec]] = None,
+        limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+        allow_partial: bool = True,
     ) -> List[Any]:
-        """Query across all shards.
+        """Query across all shards in parallel.
 
         Args:
             table_class: Table class to query
             filter_func: Optional filter function
+            order_by: Columns to sort by, as names or (name, descending);
+                pushed down to each shard and k-way merged
+            limit: Maximum rows, pushed down to each shard
+            timeout: Per-shard timeout in seconds
+            allow_partial: Return rows from responding shards when some
+                fail or time out instead of raising
 
         Returns:
             Combined results from all shards
         """
-        results = []
+        result = self._query_shards(
+            table_class,
+            filter_func=filter_func,
+            order_by=order_by,
+            limit=limit,
+            timeout=timeout,
+        )
 
-        for shard_id, shard in self.shards.items():
-            if not shard.is_active:
-                continue
+        if result.partial:
+            if not allow_partial:
+                raise RuntimeError(f"Cross-shard query incomplete: {result.report()}")
+            logger.warning(f"Partial cross-shard results: {result.report()}")
 
-            session = self.get_session(shard_id)
-            try:
-                query = session.query(table_class)
+        return result.rows
 
-                if filter_func:
-                    query = filter_func(query)
+    @require_phi_access(AccessLevel.READ)
+    @audit_phi_access("query_sharded_data")
+    def query_shards(
+        self,
+        table_class: Type[ShardedTable],
+        filter_func: Optional[Callable] = None,
+        order_by: Optional[List[OrderSpec]] = None,
+        limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> ShardQueryResult:
+        """Query all shards and return rows with per-shard outcome reporting."""
+        return self._query_shards(
+            table_class,
+            filter_func=filter_func,
+            order_by=order_by,
+            limit=limit,
+            timeout=timeout,
+        )
 
-                shard_results = query.all()
-                results.extend(shard_results)
+    def _query_shards(
+        self,
+        table_class: Type[ShardedTable],
+        filter_func: Optional[Callable] = None,
+        order_by: Optional[List[OrderSpec]] = None,
+        limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> ShardQueryResult:
+        """Run a cross-shard query; callers check and audit PHI access."""
+        return self.query_executor.query(
+            self._active_shard_ids(),
+            table_class,
+            filter_func=filter_func,
+            order_by=order_by,
+            limit=limit,
+            timeout=timeout,
+        )
 
-            finally:
-                session.close()
+    @require_phi_access(AccessLevel.READ)
+    @audit_phi_access("aggregate_sharded_data")
+    def aggregate_all_shards(
+        self,
+        table_class: Type[ShardedTable],
+        aggregates: Dict[str, Tuple[str, Optional[str]]],
+        filter_func: Optional[Callable] = None,
+        group_by: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> ShardQueryResult:
+        """Compute count/sum/min/max/avg across shards.
+
+        Example:
+            shard_manager.aggregate_all_shards(
+                Patient, {"patients": ("count", None)}, group_by=["current_camp"]
+            )
 
-        return results
+        Returns:
+            Result with combined ``values`` and per-shard outcome reporting
+        """
+        return self.query_executor.aggregate(
+            self._active_shard_ids(),
+            table_class,
+            aggregates,
+            filter_func=filter_func,
+            group_by=group_by,
+            timeout=timeout,
+        )
 
     @require_phi_access(AccessLevel.WRITE)
     @audit_phi_access("migrate_patient_record")
@@ -475,8 +700,18 @@ class DatabaseShardManager:
             # Delete from old shard
             from_session.delete(record)
 
-            # Commit both transactions
+            # Commit the copy and route to it before dropping the original
             to_session.commit()
+            if self.directory_engine is not None:
+                shard_column = table_class.get_shard_key().column_name
+                self._record_overrides(
+                    {
+                        str(table_class.__tablename__): [
+                            str(getattr(record, shard_column))
+                        ]
+                    },
+                    to_shard,
+                )
             from_session.commit()
 
             logger.info(f"Migrated record from {from_shard} to {to_shard}")
@@ -506,18 +741,16 @@ class DatabaseShardManager:
         Returns:
             Rebalancing plan/results
         """
-        # Count records per shard
-        shard_counts = {}
-        for shard_id, shard in self.shards.items():
-            if not shard.is_active:
-                continue
-
-            session = self.get_session(shard_id)
-            try:
-                count = session.query(table_class).count()
-                shard_counts[shard_id] = count
-            finally:
-                session.close()
+        # Count records per shard in parallel
+        shard_counts, count_outcome = self.query_executor.scatter(
+            self._active_shard_ids(),
+            lambda session, _shard_id: session.query(table_class).count(),
+        )
+        if count_outcome.partial:
+            return {
+                "error": "Could not count all shards",
+                "shards": count_outcome.report(),
+            }
 
         # Calculate target distribution
         total_records = sum(shard_counts.values())
@@ -561,13 +794,251 @@ class DatabaseShardManager:
                     }
                 )
 
-        return {
+        result: Dict[str, Any] = {
             "current_distribution": shard_counts,
             "target_distribution": target_counts,
             "migrations_needed": migrations,
             "dry_run": dry_run,
         }
 
+        if not dry_run:
+            if self.directory_engine is None:
+                # Without a shared directory other routers could not find
+                # the moved records
+                result["error"] = "Shard directory not configured"
+                return result
+            transfers = self._plan_transfers(migrations)
+            moved, outcome = self._execute_transfers(table_class, transfers)
+            result["transfers"] = transfers
+            result["records_moved"] = moved
+            result["execution"] = outcome.report()
+
+        return result
+
+    @staticmethod
+    def _plan_transfers(migrations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Pair shards with excess records to shards with a deficit."""
+        sources = [dict(m) for m in migrations if m["direction"] == "out"]
+        destinations = [dict(m) for m in migrations if m["direction"] == "in"]
+
+        transfers = []
+        for source in sources:
+            for destination in destinations:
+                if source["count"] == 0:
+                    break
+                count = min(source["count"], destination["count"])
+                if count == 0:
+                    continue
+                transfers.append(
+                    {
+                        "from_shard": source["from_shard"],
+                        "to_shard": destination["from_shard"],
+                        "count": count,
+                    }
+                )
+                source["count"] -= count
+                destination["count"] -= count
+
+        return transfers
+
+    def _execute_transfers(
+        self,
+        table_class: Type[ShardedTable],
+        transfers: List[Dict[str, Any]],
+        batch_size: int = 1000,
+    ) -> Tuple[Dict[str, int], ShardQueryResult]:
+        """Bulk-copy records between shards on the cross-shard executor.
+
+        Transfers from different source shards run concurrently; transfers
+        out of the same source run sequentially so they never select the
+        same rows. Each batch is committed on the destination and routed
+        there in the shard directory before it is deleted from the source,
+        so a failure can leave a stale copy but never lose records.
+        """
+        by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for transfer in transfers:
+            by_source.setdefault(transfer["from_shard"], []).append(transfer)
+
+        def run_source(source_transfers: List[Dict[str, Any]]) -> int:
+            return sum(
+                self._copy_records(
+                    table_class,
+                    transfer["from_shard"],
+                    transfer["to_shard"],
+                    transfer["count"],
+                    batch_size,
+                )
+                for transfer in source_transfers
+            )
+
+        return self.query_executor.run_parallel(
+            {
+                source: functools.partial(run_source, source_transfers)
+                for source, source_transfers in by_source.items()
+            },
+            timeout=None,
+        )
+
+    def _copy_records(
+        self,
+        table_class: Type[ShardedTable],
+        from_shard: str,
+        to_shard: str,
+        count: int,
+        batch_size: int,
+    ) -> int:
+        """Move up to ``count`` records, with their related rows, in batches.
+
+        Each batch copies the records and every row reachable through their
+        one-to-many relationships, commits the copy, points the moved keys
+        at the destination in the shard directory, and only then deletes
+        the originals. Source rows an interrupted run had already routed
+        elsewhere are deleted without copying.
+        """
+        mapper = inspect(table_class)
+        table = mapper.local_table
+        primary_key = list(mapper.primary_key)
+        table_name = str(table_class.__tablename__)
+        shard_column = table_class.get_shard_key().column_name
+
+        moved = 0
+        from_session = self.get_session(from_shard)
+        to_session = self.get_session(to_shard)
+        try:
+            while moved < count:
+                # Lock the batch so writers wait until it is routed elsewhere
+                records = [
+                    dict(row)
+                    for row in from_session.execute(
+                        select(table)
+                        .order_by(*primary_key)
+                        .limit(min(batch_size, count - moved))
+                        .with_for_update()
+                    ).mappings()
+                ]
+                if not records:
+                    break
+
+                routed = self._directory_overrides(
+                    table_name, [str(row[shard_column]) for row in records]
+                )
+                elsewhere = {
+                    key for key, shard_id in routed.items() if shard_id != from_shard
+                }
+                stale = [row for row in records if str(row[shard_column]) in elsewhere]
+                fresh = [
+                    row for row in records if str(row[shard_column]) not in elsewhere
+                ]
+
+                if fresh:
+                    batch = self._collect_related(from_session, mapper, fresh)
+                    for batch_mapper, rows in batch:
+                        to_session.execute(batch_mapper.local_table.insert(), rows)
+                    to_session.commit()
+                    try:
+                        self._record_overrides(self._override_keys(batch), to_shard)
+                    except SQLAlchemyError:
+                        # Not routed yet, so the copies must not survive
+                        self._delete_rows(to_session, batch)
+                        to_session.commit()
+                        raise
+                else:
+                    batch = []
+
+                if stale:
+                    logger.warning(
+                        f"Removing {len(stale)} stale copies from {from_shard}"
+                    )
+                    batch += self._collect_related(from_session, mapper, stale)
+                self._delete_rows(from_session, batch)
+                from_session.commit()
+
+                moved += len(records)
+
+            logger.info(f"Moved {moved} records from {from_shard} to {to_shard}")
+            return moved
+
+        except (IntegrityError, SQLAlchemyError) as e:
+            logger.error(f"Bulk copy {from_shard} -> {to_shard} failed: {e}")
+            from_session.rollback()
+            to_session.rollback()
+            raise
+
+        finally:
+            from_session.close()
+            to_session.close()
+
+    def _collect_related(
+        self,
+        session: Session,
+        mapper: Mapper,
+        rows: List[Dict[str, Any]],
+        seen: Optional[set] = None,
+    ) -> RowBatch:
+        """Gather rows and, recursively, rows of their one-to-many children.
+
+        Children move with their parent so foreign keys and joins stay on
+        one shard. The result lists parents before children.
+        """
+        seen = set() if seen is None else seen
+        seen.add(mapper.local_table.name)
+        batch: RowBatch = [(mapper, rows)]
+
+        for relationship in mapper.relationships:
+            child = relationship.mapper
+            if (
+                relationship.direction is not ONETOMANY
+                or relationship.secondary is not None
+                or child.local_table.name in seen
+            ):
+                continue
+            pairs = relationship.local_remote_pairs or []
+            parent_values = {
+                tuple(row[local.name] for local, _ in pairs) for row in rows
+            }
+            child_rows = [
+                dict(row)
+                for row in session.execute(
+                    select(child.local_table).where(
+                        tuple_(*(remote for _, remote in pairs)).in_(parent_values)
+                    )
+                ).mappings()
+            ]
+            if child_rows:
+                batch += self._collect_related(session, child, child_rows, seen)
+
+        return batch
+
+    @staticmethod
+    def _override_keys(batch: RowBatch) -> Dict[str, List[str]]:
+        """Shard keys of every sharded table in a batch, by table name."""
+        overrides: Dict[str, List[str]] = {}
+        for mapper, rows in batch:
+            if getattr(mapper.class_, "__shard_key__", None) is None:
+                continue
+            column = mapper.class_.get_shard_key().column_name
+            overrides.setdefault(mapper.local_table.name, []).extend(
+                str(row[column]) for row in rows
+            )
+        return overrides
+
+    @staticmethod
+    def _delete_rows(session: Session, batch: RowBatch) -> None:
+        """Delete a batch by primary key, children before parents."""
+        for mapper, rows in reversed(batch):
+            table = mapper.local_table
+            primary_key = list(table.primary_key.columns)
+            session.execute(
+                table.delete().where(
+                    tuple_(*primary_key).in_(
+                        [
+                            tuple(row[column.name] for column in primary_key)
+                            for row in rows
+                        ]
+                    )
+                )
+            )
+
     def get_shard_statistics(self) -> Dict[str, Any]:
         """Get statistics for all shards."""
         stats: Dict[str, Any] = {
@@ -699,6 +1170,10 @@ __all__ = [
     "ShardKey",
     "ShardedTable",
     "DatabaseShardManager",
+    "CrossShardQueryExecutor",
+    "ShardQueryResult",
+    "shard_directory_metadata",
+    "shard_key_overrides",
     "shard_manager",
     "sharded_session",
     "all_shards_session",
@@ -11,6 +11,7 @@ import xml.etree.ElementTree as ET
 import zipfile
 from datetime import datetime
 from typing import Any, Dict, List, Optional
+from uuid import UUID
 
 import defusedxml.minidom as minidom
 from sqlalchemy.orm import Session
@@ -30,7 +31,7 @@ except ImportError:
     SimpleDocTemplate = None
     Spacer = None
 
-from src.database import get_db
+from src.database import SessionLocal, get_db
 from src.models.access_log import AccessLog
 from src.models.audit_log import AuditLog
 from src.models.auth import UserAuth
@@ -39,6 +40,7 @@ from src.models.health_record import HealthRecord
 from src.models.patient import Patient
 from src.models.translation import Translation
 from src.security.encryption import EncryptionService
+from src.services.gdpr_streaming_export import GDPRStreamingExporter
 from src.utils.logging import get_logger
 
 # Note: The following models are referenced but don't exist in the codebase yet
@@ -60,6 +62,7 @@ class GDPRDataExportService:
             kms_key_id="alias/haven-health-gdpr"
         )
         self.supported_formats = ["json", "xml", "csv", "pdf"]
+        self.streaming_exporter = GDPRStreamingExporter(SessionLocal)
 
     async def export_all_personal_data(
         self,
@@ -171,6 +174,54 @@ class GDPRDataExportService:
         finally:
             db.close()
 
+    async def create_streaming_export(
+        self,
+        data_subject_id: str,
+        requester_id: str,
+        include_categories: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Queue a streaming export for subjects with large histories.
+
+        The export is written page by page to an encrypted archive and can
+        resume after a failure; run it with run_streaming_exports().
+
+        Args:
+            data_subject_id: ID of the person whose data is being exported
+            requester_id: ID of the person requesting the export
+            include_categories: Specific categories to include
+
+        Returns:
+            Export job summary
+        """
+        if not await self._validate_export_permission(data_subject_id, requester_id):
+            raise PermissionError(
+                "Requester does not have permission to export this data"
+            )
+
+        job = self.streaming_exporter.create_job(
+            data_subject_id, requester_id, include_categories
+        )
+        logger.info(f"GDPR streaming export {job.id} queued for {data_subject_id}")
+        return job.to_summary()
+
+    async def run_streaming_exports(
+        self, export_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Run queued streaming exports through the bounded worker pool.
+
+        Args:
+            export_ids: Exports to run (defaults to every pending, failed or
+                abandoned export)
+
+        Returns:
+            Export job summaries
+        """
+        if export_ids is None:
+            return await self.streaming_exporter.resume_exports()
+        return await self.streaming_exporter.run_exports(
+            [UUID(export_id) for export_id in export_ids]
+        )
+
     async def _validate_export_permission(
         self, data_subject_id: str, requester_id: str
     ) -> bool:
@@ -0,0 +1,621 @@
+"""Streaming, resumable GDPR data export.
+
+GDPRDataExportService.export_all_personal_data builds the whole export in
+memory. This pipeline instead pages through each data category with keyset
+cursors and writes every page as its own compressed, encrypted segment,
+checkpointing after each page in a GDPRExportJob. An interrupted export
+resumes after the last written page. Once every category is written, the
+segments and a manifest are packaged into a single zip archive.
+
+Segments live in GDPR_EXPORT_DIR until packaged, so an export is only
+resumed by workers writing to the same storage: by default the host that
+started it. Set GDPR_EXPORT_STORAGE_ID to the same name on every worker
+when GDPR_EXPORT_DIR is a shared volume, so any of them can resume.
+
+Segments are gzip-compressed JSON Lines encrypted with AES-256-GCM under a
+per-export data key issued by KMS; only the wrapped key is stored, in the
+job and in the archive manifest.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import socket
+import tempfile
+import uuid
+import zipfile
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from sqlalchemy import and_, func, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from src.models.access_log import AccessLog
+from src.models.audit_log import AuditAction, AuditLog
+from src.models.auth import UserAuth
+from src.models.document import Document
+from src.models.file_attachment import FileAttachment
+from src.models.gdpr_export import GDPRExportJob, GDPRExportStatus
+from src.models.health_record import HealthRecord
+from src.models.patient import Patient
+from src.models.translation import Translation
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+GDPR_KMS_KEY_ID = "alias/haven-health-gdpr"
+EXPORT_PAGE_SIZE = 500
+MAX_CONCURRENT_EXPORTS = int(os.getenv("GDPR_EXPORT_CONCURRENCY", "8"))
+EXPORT_LEASE_SECONDS = 300
+# Runs of an export (first run and retries) before it is left failed
+MAX_EXPORT_ATTEMPTS = 5
+MANIFEST_NAME = "manifest.json"
+NONCE_BYTES = 12
+
+# Credentials, one-time codes and ciphertext are not returned to the subject
+EXCLUDED_FIELDS = frozenset(
+    {
+        "password_hash",
+        "password_reset_token",
+        "email_verification_token",
+        "phone_verification_code",
+        "encrypted_content",
+    }
+)
+
+
+def _columns(instance: Any) -> Dict[str, Any]:
+    """Serialize a row's columns, minus excluded fields."""
+    return {
+        key: value
+        for key, value in instance.to_dict().items()
+        if key not in EXCLUDED_FIELDS
+    }
+
+
+def _health_record(record: HealthRecord) -> Dict[str, Any]:
+    """Serialize a health record with its decrypted content."""
+    data = _columns(record)
+    data["content"] = record.get_content()
+    return data
+
+
+@dataclass(frozen=True)
+class ExportCategory:
+    """A kind of personal data and how to page through it."""
+
+    name: str
+    model: Any
+    subject_column: str
+    serialize: Callable[[Any], Dict[str, Any]]
+
+
+# Soft-deleted rows are still held, so they are exported as well
+EXPORT_CATEGORIES: Tuple[ExportCategory, ...] = (
+    ExportCategory("personal_data", Patient, "id", _columns),
+    ExportCategory("account_information", UserAuth, "patient_id", _columns),
+    ExportCategory("health_records", HealthRecord, "patient_id", _health_record),
+    ExportCategory("file_attachments", FileAttachment, "patient_id", _columns),
+    ExportCategory("documents", Document, "patient_id", _columns),
+    ExportCategory("translations", Translation, "patient_id", _columns),
+    ExportCategory("access_logs", AccessLog, "patient_id", _columns),
+    ExportCategory("audit_logs", AuditLog, "patient_id", lambda log: log.to_dict()),
+)
+CATEGORIES_BY_NAME = {category.name: category for category in EXPORT_CATEGORIES}
+
+
+def _json_default(value: Any) -> Any:
+    """Encode column values json does not handle."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _key_context(export_id: Any) -> Dict[str, str]:
+    """KMS encryption context binding a data key to one export."""
+    return {"purpose": "gdpr_export", "export_id": str(export_id)}
+
+
+def _segment_aad(export_id: Any, name: str) -> bytes:
+    """Associated data tying a segment to its export and position."""
+    return f"{export_id}/{name}".encode("utf-8")
+
+
+class GDPRStreamingExporter:
+    """Runs GDPR export jobs page by page with a bounded worker pool."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        output_dir: Optional[str] = None,
+        key_provider: Any = None,
+        page_size: int = EXPORT_PAGE_SIZE,
+        max_concurrent: int = MAX_CONCURRENT_EXPORTS,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = EXPORT_LEASE_SECONDS,
+        storage_id: Optional[str] = None,
+        max_attempts: int = MAX_EXPORT_ATTEMPTS,
+    ):
+        """Initialize the exporter.
+
+        Args:
+            session_factory: Creates one database session per export
+            output_dir: Where archives and in-progress segments are written
+            key_provider: Issues and unwraps data keys (generate_data_key,
+                decrypt_data_key); defaults to KMS envelope encryption
+            page_size: Rows read and written per segment
+            max_concurrent: Exports run at the same time by run_exports()
+            worker_id: Identifies this worker in export leases
+            lease_seconds: How long a silent worker keeps an export
+            storage_id: Names the storage behind output_dir (defaults to
+                GDPR_EXPORT_STORAGE_ID, or this host for local storage)
+            max_attempts: Runs of an export before it is no longer retried
+        """
+        self.session_factory = session_factory
+        self.output_dir = output_dir or os.getenv(
+            "GDPR_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "gdpr_exports")
+        )
+        self._key_provider = key_provider
+        self.page_size = page_size
+        self.max_concurrent = max_concurrent
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.lease_seconds = lease_seconds
+        self.storage_id = (
+            storage_id or os.getenv("GDPR_EXPORT_STORAGE_ID") or socket.gethostname()
+        )
+        self.max_attempts = max_attempts
+
+    @property
+    def key_provider(self) -> Any:
+        """Data key source for segment encryption."""
+        if self._key_provider is None:
+            # Imported here so the exporter can be built without AWS access
+            # pylint: disable-next=import-outside-toplevel
+            from src.security.envelope_encryption import EnvelopeEncryption
+
+            self._key_provider = EnvelopeEncryption(GDPR_KMS_KEY_ID)
+        return self._key_provider
+
+    def create_job(
+        self,
+        data_subject_id: str,
+        requester_id: str,
+        include_categories: Optional[Sequence[str]] = None,
+    ) -> GDPRExportJob:
+        """Queue an export of a data subject's personal data.
+
+        Args:
+            data_subject_id: Patient whose data is exported
+            requester_id: Person requesting the export
+            include_categories: Category names (defaults to all)
+
+        Returns:
+            The pending export job
+        """
+        categories = list(include_categories or CATEGORIES_BY_NAME)
+        unknown = set(categories) - set(CATEGORIES_BY_NAME)
+        if unknown:
+            raise ValueError(f"Unknown export categories: {sorted(unknown)}")
+
+        db = self.session_factory()
+        try:
+            job = GDPRExportJob(
+                data_subject_id=uuid.UUID(str(data_subject_id)),
+                requester_id=uuid.UUID(str(requester_id)),
+                status=GDPRExportStatus.PENDING.value,
+                categories=categories,
+                progress={},
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    async def run_exports(self, job_ids: Sequence[uuid.UUID]) -> List[Dict[str, Any]]:
+        """Run many exports, at most max_concurrent at a time.
+
+        Each export runs in a worker thread with its own database session;
+        a failing export is recorded on its job and does not stop the rest.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def run(job_id: uuid.UUID) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(self.run_job, job_id)
+
+        return list(await asyncio.gather(*[run(job_id) for job_id in job_ids]))
+
+    async def resume_exports(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Run pending, failed and abandoned exports."""
+        db = self.session_factory()
+        try:
+            self._give_up_abandoned(db)
+            job_ids = db.scalars(
+                select(GDPRExportJob.id)
+                .where(self._claimable(datetime.utcnow()))
+                .order_by(GDPRExportJob.created_at)
+                .limit(limit)
+            ).all()
+        finally:
+            db.close()
+        return await self.run_exports(job_ids)
+
+    def run_job(self, job_id: uuid.UUID) -> Dict[str, Any]:
+        """Run or resume one export to completion.
+
+        Returns:
+            The job summary; failures are recorded on the job for a retry
+        """
+        db = self.session_factory()
+        try:
+            if db.get(GDPRExportJob, job_id) is None:
+                raise ValueError(f"GDPR export {job_id} not found")
+            if not self._claim(db, job_id):
+                logger.info(f"GDPR export {job_id} is not available to run")
+                return db.get(GDPRExportJob, job_id).to_summary()
+
+            job = db.get(GDPRExportJob, job_id, populate_existing=True)
+            try:
+                self._write_job(db, job)
+            except Exception as e:  # pylint: disable=broad-except
+                # Any failure is recorded so the export can be retried
+                db.rollback()
+                logger.error(f"GDPR export {job_id} failed: {e}")
+                self._release(db, job_id, GDPRExportStatus.FAILED, error=str(e))
+
+            return db.get(GDPRExportJob, job_id, populate_existing=True).to_summary()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _abandoned(now: datetime) -> Any:
+        """Condition for running exports whose worker stopped renewing."""
+        return and_(
+            GDPRExportJob.status == GDPRExportStatus.RUNNING.value,
+            or_(
+                GDPRExportJob.lease_expires_at.is_(None),
+                GDPRExportJob.lease_expires_at < now,
+            ),
+        )
+
+    def _claimable(self, now: datetime) -> Any:
+        """Condition for exports this worker may take.
+
+        Exports with segments on other storage, and exports out of
+        attempts, are left alone.
+        """
+        return and_(
+            or_(
+                GDPRExportJob.status.in_(
+                    [GDPRExportStatus.PENDING.value, GDPRExportStatus.FAILED.value]
+                ),
+                self._abandoned(now),
+            ),
+            GDPRExportJob.attempts < self.max_attempts,
+            or_(
+                GDPRExportJob.storage_id.is_(None),
+                GDPRExportJob.storage_id == self.storage_id,
+            ),
+        )
+
+    def _give_up_abandoned(self, db: Session) -> None:
+        """Mark abandoned exports that are out of attempts as failed."""
+        db.execute(
+            update(GDPRExportJob)
+            .where(
+                self._abandoned(datetime.utcnow()),
+                GDPRExportJob.attempts >= self.max_attempts,
+            )
+            .values(
+                status=GDPRExportStatus.FAILED.value,
+                lease_expires_at=None,
+                error_message=f"Abandoned after {self.max_attempts} attempts",
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    def _claim(self, db: Session, job_id: uuid.UUID) -> bool:
+        """Lease an export to this worker."""
+        now = datetime.utcnow()
+        result = db.execute(
+            update(GDPRExportJob)
+            .where(GDPRExportJob.id == job_id, self._claimable(now))
+            .values(
+                status=GDPRExportStatus.RUNNING.value,
+                worker_id=self.worker_id,
+                lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                started_at=now,
+                storage_id=func.coalesce(GDPRExportJob.storage_id, self.storage_id),
+                attempts=GDPRExportJob.attempts + 1,
+                error_message=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return bool(result.rowcount)
+
+    def _release(
+        self,
+        db: Session,
+        job_id: uuid.UUID,
+        status: GDPRExportStatus,
+        error: Optional[str] = None,
+        **values: Any,
+    ) -> bool:
+        """Finish this worker's lease on an export."""
+        result = db.execute(
+            update(GDPRExportJob)
+            .where(
+                GDPRExportJob.id == job_id,
+                GDPRExportJob.worker_id == self.worker_id,
+                GDPRExportJob.status == GDPRExportStatus.RUNNING.value,
+            )
+            .values(
+                status=status.value,
+                error_message=error,
+                lease_expires_at=None,
+                **values,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return bool(result.rowcount)
+
+    def _checkpoint(self, db: Session, job_id: uuid.UUID, progress: Dict) -> bool:
+        """Store category progress and renew the lease.
+
+        Returns False if another worker has taken the export over.
+        """
+        result = db.execute(
+            update(GDPRExportJob)
+            .where(
+                GDPRExportJob.id == job_id,
+                GDPRExportJob.worker_id == self.worker_id,
+                GDPRExportJob.status == GDPRExportStatus.RUNNING.value,
+            )
+            .values(
+                progress=progress,
+                lease_expires_at=datetime.utcnow()
+                + timedelta(seconds=self.lease_seconds),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return bool(result.rowcount)
+
+    def _data_key(self, db: Session, job: GDPRExportJob) -> bytes:
+        """Return the export's data key, issuing one on the first run."""
+        context = _key_context(job.id)
+        if job.encrypted_data_key:
+            return self.key_provider.decrypt_data_key(
+                base64.b64decode(job.encrypted_data_key), context
+            )
+
+        plaintext, wrapped = self.key_provider.generate_data_key(context)
+        job.encrypted_data_key = base64.b64encode(wrapped).decode("ascii")
+        db.commit()
+        return plaintext
+
+    def _write_job(self, db: Session, job: GDPRExportJob) -> None:
+        """Write the remaining segments, then package the archive."""
+        job_id = job.id
+        subject_id = job.data_subject_id
+        key = self._data_key(db, job)
+        work_dir = os.path.join(self.output_dir, f"{job_id}.parts")
+        progress: Dict[str, Any] = json.loads(json.dumps(job.progress or {}))
+
+        for name in job.categories:
+            category = CATEGORIES_BY_NAME[name]
+            state = progress.setdefault(
+                name, {"cursor": None, "records": 0, "segments": [], "done": False}
+            )
+            while not state["done"]:
+                rows = self._page(db, category, subject_id, state["cursor"])
+                if rows:
+                    state["segments"].append(
+                        self._write_segment(
+                            work_dir,
+                            job_id,
+                            name,
+                            len(state["segments"]),
+                            rows,
+                            category,
+                            key,
+                        )
+                    )
+                    state["records"] += len(rows)
+                    last = rows[-1]
+                    state["cursor"] = [last.created_at.isoformat(), str(last.id)]
+                state["done"] = len(rows) < self.page_size
+                # Rows are not needed once written; keep the session small
+                db.expunge_all()
+                if not self._checkpoint(db, job_id, progress):
+                    logger.info(f"GDPR export {job_id} was taken over; stopping")
+                    return
+
+        job = db.get(GDPRExportJob, job_id, populate_existing=True)
+        archive_path = self._package(job, progress, work_dir)
+        record_count = sum(state["records"] for state in progress.values())
+        if not self._release(
+            db,
+            job_id,
+            GDPRExportStatus.COMPLETED,
+            archive_path=archive_path,
+            record_count=record_count,
+            completed_at=datetime.utcnow(),
+        ):
+            return
+
+        shutil.rmtree(work_dir, ignore_errors=True)
+        db.add(
+            AuditLog(
+                action=AuditAction.DATA_EXPORTED.value,
+                user_id=job.requester_id,
+                patient_id=subject_id,
+                resource_type="gdpr_export",
+                resource_id=job_id,
+                ip_address="system",
+                details={
+                    "categories_exported": list(progress),
+                    "record_count": record_count,
+                    "format": "jsonl",
+                },
+            )
+        )
+        db.commit()
+        logger.info(f"GDPR export {job_id} completed with {record_count} records")
+
+    def _page(
+        self,
+        db: Session,
+        category: ExportCategory,
+        subject_id: uuid.UUID,
+        cursor: Optional[List[str]],
+    ) -> List[Any]:
+        """Read the next page of a category after a (created_at, id) cursor."""
+        model = category.model
+        query = select(model).where(
+            getattr(model, category.subject_column) == subject_id
+        )
+        if cursor:
+            created_at, last_id = datetime.fromisoformat(cursor[0]), cursor[1]
+            query = query.where(
+                tuple_(model.created_at, model.id)
+                > tuple_(created_at, uuid.UUID(last_id))
+            )
+        return list(
+            db.scalars(
+                query.order_by(model.created_at, model.id).limit(self.page_size)
+            ).all()
+        )
+
+    def _write_segment(
+        self,
+        work_dir: str,
+        job_id: uuid.UUID,
+        name: str,
+        index: int,
+        rows: List[Any],
+        category: ExportCategory,
+        key: bytes,
+    ) -> Dict[str, Any]:
+        """Compress, encrypt and atomically write one page."""
+        segment_name = f"{name}/{index:06d}.jsonl.gz.enc"
+        payload = gzip.compress(
+            b"".join(
+                json.dumps(category.serialize(row), default=_json_default).encode(
+                    "utf-8"
+                )
+                + b"\n"
+                for row in rows
+            )
+        )
+        nonce = os.urandom(NONCE_BYTES)
+        data = nonce + AESGCM(key).encrypt(
+            nonce, payload, _segment_aad(job_id, segment_name)
+        )
+
+        path = os.path.join(work_dir, segment_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A crash before the checkpoint leaves an orphan that the resumed
+        # run overwrites under the same name
+        with open(f"{path}.tmp", "wb") as segment_file:
+            segment_file.write(data)
+        os.replace(f"{path}.tmp", path)
+
+        return {
+            "name": segment_name,
+            "records": len(rows),
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+
+    def _package(
+        self, job: GDPRExportJob, progress: Dict[str, Any], work_dir: str
+    ) -> str:
+        """Stream the manifest and segments into the final zip archive."""
+        manifest = {
+            "export_id": str(job.id),
+            "data_subject_id": str(job.data_subject_id),
+            "requester_id": str(job.requester_id),
+            "created_at": datetime.utcnow().isoformat(),
+            "format": "jsonl",
+            "gdpr_compliant": True,
+            "encryption": {
+                "algorithm": "AES-256-GCM",
+                "kms_key_id": GDPR_KMS_KEY_ID,
+                "encrypted_data_key": job.encrypted_data_key,
+                "encryption_context": _key_context(job.id),
+                "segment_layout": "nonce(12) || ciphertext || tag(16)",
+                "associated_data": "<export_id>/<segment name>",
+            },
+            "categories": {
+                name: {"records": state["records"], "segments": state["segments"]}
+                for name, state in progress.items()
+            },
+        }
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        archive_path = os.path.join(self.output_dir, f"gdpr_export_{job.id}.zip")
+        with zipfile.ZipFile(f"{archive_path}.tmp", "w", allowZip64=True) as archive:
+            archive.writestr(
+                MANIFEST_NAME,
+                json.dumps(manifest, indent=2),
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
+            # Segments are already compressed and encrypted; store as-is
+            for state in progress.values():
+                for segment in state["segments"]:
+                    archive.write(
+                        os.path.join(work_dir, segment["name"]), segment["name"]
+                    )
+        os.replace(f"{archive_path}.tmp", archive_path)
+        return archive_path
+
+
+def read_export_archive(
+    archive_path: str, key_provider: Any
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (category, record) pairs from an export archive.
+
+    Segments are verified against the manifest and decrypted one at a time,
+    so archives of any size can be read back for delivery.
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+        encryption = manifest["encryption"]
+        key = key_provider.decrypt_data_key(
+            base64.b64decode(encryption["encrypted_data_key"]),
+            encryption["encryption_context"],
+        )
+        for name, category in manifest["categories"].items():
+            for segment in category["segments"]:
+                data = archive.read(segment["name"])
+                if hashlib.sha256(data).hexdigest() != segment["sha256"]:
+                    raise ValueError(f"Export segment {segment['name']} is corrupt")
+                payload = AESGCM(key).decrypt(
+                    data[:NONCE_BYTES],
+                    data[NONCE_BYTES:],
+                    _segment_aad(manifest["export_id"], segment["name"]),
+                )
+                for line in gzip.decompress(payload).splitlines():
+                    yield name, json.loads(line)
@@ -1,7 +1,7 @@
 """Health record service for managing medical records."""
 
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, cast
 from uuid import UUID
 
 from sqlalchemy import or_
@@ -21,6 +21,21 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+CROSS_PATIENT_PERMISSION = "provider:read_all_patients"
+
+
+def record_viewer_id(user: Any, patient_id: UUID) -> Optional[UUID]:
+    """Viewer whose record grants limit what a user sees of a patient.
+
+    The patient and providers with cross-patient access see every record;
+    anyone else only sees records granted to them.
+    """
+    if str(getattr(user, "patient_id", None)) == str(patient_id):
+        return None
+    if user.has_permission(CROSS_PATIENT_PERMISSION):
+        return None
+    return cast(UUID, user.id)
+
 
 class HealthRecordService(BaseService[HealthRecord]):
     """Service for managing health records."""
@@ -83,8 +98,15 @@ class HealthRecordService(BaseService[HealthRecord]):
         limit: int = 100,
         offset: int = 0,
         include_content: bool = True,
+        viewer_id: Optional[UUID] = None,
+        viewer_role: Optional[str] = None,
     ) -> Tuple[List[HealthRecord], int]:
-        """Get health records for a patient."""
+        """Get health records for a patient.
+
+        When viewer_id is given, only records that viewer may open are
+        returned; the check runs in SQL, so the total count and the page
+        reflect visible records only.
+        """
         try:
             # Check patient access permission
             patient = (
@@ -112,6 +134,11 @@ class HealthRecordService(BaseService[HealthRecord]):
             if status:
                 query = query.filter(HealthRecord.status == status)  # type: ignore[arg-type]
 
+            if viewer_id:
+                query = query.filter(
+                    HealthRecord.access_predicate(str(viewer_id), viewer_role)
+                )
+
             # Get total count
             total_count = query.count()
 
@@ -256,8 +283,14 @@ class HealthRecordService(BaseService[HealthRecord]):
         filters: Optional[Dict[str, Any]] = None,
         limit: int = 100,
         offset: int = 0,
+        viewer_id: Optional[UUID] = None,
+        viewer_role: Optional[str] = None,
     ) -> Tuple[List[HealthRecord], int]:
-        """Search health records across all patients."""
+        """Search health records across all patients.
+
+        When viewer_id is given, only records that viewer may open are
+        matched, inside the query, before counting and pagination.
+        """
         try:
             query = self.session.query(HealthRecord).filter(
                 HealthRecord.deleted_at.is_(None)
@@ -314,6 +347,11 @@ class HealthRecordService(BaseService[HealthRecord]):
                         )
                     )
 
+            if viewer_id:
+                query = query.filter(
+                    HealthRecord.access_predicate(str(viewer_id), viewer_role)
+                )
+
             # Get total count
             total_count = query.count()
 
@@ -0,0 +1,491 @@
+"""Shared cache for deterministic Bedrock responses.
+
+Translation and LangChain callers send the same prompt, model and
+generation parameters again and again (discharge instructions, consent
+boilerplate). With temperature 0 the model answers those identically, so
+the answer can be reused instead of paying for and waiting on another
+call.
+
+Entries are looked up through tiers, fastest first:
+- memory: bounded in-process LRU (NearCache)
+- Redis: shared between workers, expired by Redis TTL
+- disk: optional, size-bounded directory for single-host deployments
+
+A hit in a slower tier is copied into the faster ones. Each use case has
+its own TTL and highest cacheable temperature.
+
+Access control note: cached responses may contain PHI. Keys are hashes,
+so prompts are never stored, but the disk tier keeps responses at rest
+and should only be enabled on encrypted volumes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+from botocore.exceptions import BotoCoreError, ClientError
+
+from src.ai.bedrock.cost_monitor import BedrockCostMonitor
+from src.config.loader import get_settings
+from src.services.near_cache import MISSING, NearCache
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bumped when the key or entry format changes
+CACHE_KEY_VERSION = "v1"
+
+# Rough prompt size estimate for entries without token counts
+CHARS_PER_TOKEN = 4
+
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long a use case's responses live and when they are cacheable."""
+
+    ttl: int
+    max_temperature: float = 0.0
+
+
+CACHE_POLICIES: Dict[str, CachePolicy] = {
+    "default": CachePolicy(ttl=24 * 3600),
+    # Translations are already reused through translation memory, so they
+    # can live longer; callers translate at temperature 0 to be cacheable
+    "translation": CachePolicy(ttl=7 * 24 * 3600),
+    "medical_translation": CachePolicy(ttl=7 * 24 * 3600),
+    "glossary": CachePolicy(ttl=30 * 24 * 3600),
+}
+
+
+def canonicalize_prompt(text: Optional[str]) -> str:
+    """Normalize whitespace and Unicode so equivalent prompts hash alike."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return _TRAILING_SPACE.sub("", text).strip()
+
+
+def response_cache_key(
+    model_id: str,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Build the cache key for a model call.
+
+    Args:
+        model_id: Model that answers the call
+        prompt: User prompt
+        system_prompt: Optional system prompt
+        params: Generation parameters (temperature, max_tokens, ...)
+
+    Returns:
+        Key of the form llm:<version>:<sha256>
+    """
+    payload = json.dumps(
+        {
+            "model_id": model_id,
+            "prompt": canonicalize_prompt(prompt),
+            "system_prompt": canonicalize_prompt(system_prompt),
+            "params": {k: v for k, v in (params or {}).items() if v is not None},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"llm:{CACHE_KEY_VERSION}:{digest}"
+
+
+class MemoryTier:
+    """In-process tier backed by a bounded LRU."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 5000, max_ttl: float = 3600.0):
+        """Initialize memory tier.
+
+        Args:
+            max_entries: Maximum number of responses held
+            max_ttl: Longest an entry stays in process memory
+        """
+        self._cache = NearCache(max_entries=max_entries, ttl=max_ttl)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return an entry, or None if absent."""
+        entry = self._cache.get(key)
+        return None if entry is MISSING else entry
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        """Store an entry."""
+        self._cache.set(key, entry, ttl=ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and eviction statistics."""
+        return self._cache.stats()
+
+
+class RedisTier:
+    """Shared tier in Redis.
+
+    When Redis is unreachable the tier reports misses and skips writes
+    for `retry_after` seconds rather than stalling every model call.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        redis_url: Optional[str] = None,
+        retry_after: float = 30.0,
+    ):
+        """Initialize Redis tier.
+
+        Args:
+            client: Redis client (created from redis_url when omitted)
+            redis_url: Redis connection URL
+            retry_after: Seconds to stop using Redis after an error
+        """
+        self._client = client
+        self._redis_url = redis_url
+        self.retry_after = retry_after
+        self._retry_at = 0.0
+
+    def _get_client(self) -> Optional[redis.Redis]:
+        """Return the client unless Redis recently failed."""
+        if time.monotonic() < self._retry_at:
+            return None
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self._redis_url or get_settings().redis_url,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+        return self._client
+
+    def _failed(self, error: Exception) -> None:
+        """Stop using Redis for a while after an error."""
+        logger.warning(f"LLM response cache Redis tier unavailable: {error}")
+        self._retry_at = time.monotonic() + self.retry_after
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return an entry, or None if absent or Redis is down."""
+        client = self._get_client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(key)
+        except redis.RedisError as e:
+            self._failed(e)
+            return None
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        """Store an entry with a Redis TTL."""
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.set(key, json.dumps(entry), ex=max(1, int(ttl)))
+        except redis.RedisError as e:
+            self._failed(e)
+
+
+class DiskTier:
+    """Local directory tier, evicting least recently used files past a size."""
+
+    name = "disk"
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        """Initialize disk tier.
+
+        Args:
+            directory: Directory holding one file per entry
+            max_bytes: Total size above which old entries are removed
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Return the file holding a key."""
+        name = key.rsplit(":", 1)[-1]
+        return os.path.join(self.directory, name[:2], f"{name}.json")
+
+    def _files(self) -> List[Tuple[float, int, str]]:
+        """List (last used, size, path) of every entry file."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return an entry, or None if absent or expired."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            self._remove(path)
+            return None
+        try:
+            # mtime doubles as last-use time for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        """Store an entry, evicting old ones when over the size limit."""
+        _ = ttl  # Expiry is carried in the entry itself
+        path = self._path(key)
+        data = json.dumps(entry).encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"LLM response cache disk write failed: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._files())
+            else:
+                self._total_bytes += len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used files down to 90% of the limit."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            if self._remove(path):
+                total -= size
+        self._total_bytes = total
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        """Delete an entry file, ignoring files already gone."""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+class LLMResponseCache:
+    """Tiered cache of model responses with hit and savings accounting."""
+
+    def __init__(
+        self,
+        tiers: List[Any],
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        cost_monitor: Optional[BedrockCostMonitor] = None,
+    ):
+        """Initialize LLM response cache.
+
+        Args:
+            tiers: Cache tiers, fastest first
+            policies: Per-use-case policies (defaults to CACHE_POLICIES)
+            cost_monitor: BedrockCostMonitor credited with each hit
+        """
+        self.tiers = tiers
+        self.policies = policies or CACHE_POLICIES
+        self.cost_monitor = cost_monitor
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "hits": {tier.name: 0 for tier in tiers},
+            "misses": 0,
+            "stores": 0,
+        }
+
+    def policy(self, use_case: Optional[str]) -> CachePolicy:
+        """Return the policy for a use case."""
+        return self.policies.get(use_case or "default", self.policies["default"])
+
+    def is_cacheable(self, use_case: Optional[str], temperature: float) -> bool:
+        """Whether a call at this temperature may be served from cache."""
+        return temperature <= self.policy(use_case).max_temperature
+
+    def get(
+        self, key: str, use_case: Optional[str] = None
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return a cached (response, metadata), or None on a miss.
+
+        Metadata is the original call's, with `cache_hit`, `cache_tier` and
+        the lookup time as `latency_seconds`.
+        """
+        started = time.perf_counter()
+        for index, tier in enumerate(self.tiers):
+            entry = tier.get(key)
+            if entry is None:
+                continue
+            remaining = entry["expires_at"] - time.time()
+            if remaining <= 0:
+                continue
+            for faster in self.tiers[:index]:
+                faster.set(key, entry, remaining)
+
+            lookup_latency = time.perf_counter() - started
+            self._record_hit(tier.name, use_case, entry, lookup_latency)
+            metadata = dict(entry["metadata"])
+            metadata.update(
+                {
+                    "cache_hit": True,
+                    "cache_tier": tier.name,
+                    "latency_seconds": lookup_latency,
+                }
+            )
+            return entry["response"], metadata
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        metadata: Dict[str, Any],
+        use_case: Optional[str] = None,
+    ) -> None:
+        """Store a model response in every tier."""
+        ttl = self.policy(use_case).ttl
+        entry = {
+            "response": response,
+            "metadata": metadata,
+            "expires_at": time.time() + ttl,
+        }
+        for tier in self.tiers:
+            tier.set(key, entry, ttl)
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def _record_hit(
+        self,
+        tier: str,
+        use_case: Optional[str],
+        entry: Dict[str, Any],
+        lookup_latency: float,
+    ) -> None:
+        """Count a hit and credit the avoided call to the cost monitor."""
+        with self._lock:
+            self._stats["hits"][tier] += 1
+        if self.cost_monitor is None:
+            return
+
+        metadata = entry["metadata"]
+        input_tokens = metadata.get("input_tokens") or (
+            metadata.get("prompt_length", 0) // CHARS_PER_TOKEN
+        )
+        output_tokens = metadata.get("output_tokens") or (
+            metadata.get("response_length", 0) // CHARS_PER_TOKEN
+        )
+        self.cost_monitor.record_cache_hit(
+            model_id=metadata.get("model_id", "unknown"),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_saved=max(
+                0.0, metadata.get("latency_seconds", 0.0) - lookup_latency
+            ),
+            use_case=use_case or "default",
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics."""
+        with self._lock:
+            hits = dict(self._stats["hits"])
+            misses = self._stats["misses"]
+            stores = self._stats["stores"]
+        total = sum(hits.values()) + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "stores": stores,
+            "hit_rate": sum(hits.values()) / total if total else 0.0,
+        }
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Get the shared response cache, or None when disabled."""
+    global _response_cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+
+    with _response_cache_lock:
+        if _response_cache is None:
+            max_ttl = max(policy.ttl for policy in CACHE_POLICIES.values())
+            tiers: List[Any] = [
+                MemoryTier(settings.llm_cache_memory_entries, max_ttl=max_ttl)
+            ]
+            cost_monitor = None
+            if settings.environment != "test":
+                tiers.append(RedisTier(redis_url=settings.redis_url))
+                cost_monitor = _create_cost_monitor()
+            if settings.llm_cache_disk_dir:
+                tiers.append(
+                    DiskTier(
+                        settings.llm_cache_disk_dir,
+                        max_bytes=settings.llm_cache_disk_max_mb * 1024 * 1024,
+                    )
+                )
+            _response_cache = LLMResponseCache(tiers, cost_monitor=cost_monitor)
+    return _response_cache
+
+
+def _create_cost_monitor() -> Optional[BedrockCostMonitor]:
+    """Create the cost monitor hits are credited to, if AWS is reachable."""
+    try:
+        return BedrockCostMonitor()
+    except (BotoCoreError, ClientError) as e:
+        logger.warning(f"LLM cache savings will not be reported: {e}")
+        return None
+
+
+__all__ = [
+    "CACHE_POLICIES",
+    "CachePolicy",
+    "DiskTier",
+    "LLMResponseCache",
+    "MemoryTier",
+    "RedisTier",
+    "canonicalize_prompt",
+    "get_llm_response_cache",
+    "response_cache_key",
+]
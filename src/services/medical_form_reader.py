@@ -6,12 +6,15 @@ Extracted data is converted to FHIR DomainResource format.
 """
 
 import asyncio
+import atexit
+import hashlib
 import io
 import json
 import os
 import re
 import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -52,12 +55,13 @@ except ImportError:
 import torch
 
 try:
-    from pdf2image import convert_from_bytes
+    from pdf2image import convert_from_bytes, pdfinfo_from_bytes
 
     PDF2IMAGE_AVAILABLE = True
 except ImportError:
     PDF2IMAGE_AVAILABLE = False
     convert_from_bytes = None
+    pdfinfo_from_bytes = None
 
 from transformers import LayoutLMv3ForTokenClassification, LayoutLMv3Processor
 
@@ -66,12 +70,73 @@ from src.security.encryption import EncryptionService
 
 # PHI access control is required for medical form processing
 # from src.security.phi_access_control import require_phi_access
+from src.services.near_cache import MISSING, NearCache
 from src.services.terminology_service import terminology_service
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def preprocess_image(image: Image.Image) -> np.ndarray:
+    """Preprocess image for better OCR results."""
+    # Convert to OpenCV format
+    img_array = np.array(image)
+
+    # Convert to grayscale
+    if len(img_array.shape) == 3:
+        if CV2_AVAILABLE:
+            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        else:
+            # Fallback: simple grayscale conversion
+            gray = np.dot(img_array[..., :3], [0.2989, 0.5870, 0.1140]).astype(np.uint8)
+    else:
+        gray = img_array
+
+    # Apply thresholding
+    if CV2_AVAILABLE:
+        _, thresh = cv2.threshold(  # pylint: disable=no-member
+            gray,
+            0,
+            255,
+            cv2.THRESH_BINARY + cv2.THRESH_OTSU,  # pylint: disable=no-member
+        )
+    else:
+        # Fallback: simple thresholding
+        thresh = ((gray > 127) * 255).astype(np.uint8)
+
+    # Denoise
+    if CV2_AVAILABLE:
+        denoised = cv2.fastNlMeansDenoising(thresh)  # pylint: disable=no-member
+    else:
+        # Fallback: return thresholded image without denoising
+        denoised = thresh
+
+    return denoised
+
+
+def tesseract_ocr_page(page_png: bytes) -> str:
+    """Preprocess and OCR one PNG-encoded page.
+
+    Module-level so it can run in a worker process; the page travels as
+    PNG bytes rather than a pickled image.
+    """
+    if not PYTESSERACT_AVAILABLE:
+        raise RuntimeError("pytesseract is not installed")
+
+    with Image.open(io.BytesIO(page_png)) as image:
+        processed_image = preprocess_image(image.convert("RGB"))
+
+    # Automatic page segmentation
+    return str(pytesseract.image_to_string(processed_image, config="--psm 3"))
+
+
+def encode_page(image: Image.Image) -> bytes:
+    """Encode a page image as PNG."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
 class DocumentType(Enum):
     """Types of medical documents."""
 
@@ -150,6 +215,16 @@ class MedicalFormReader:
         # Field validators
         self.field_validators = self._load_field_validators()
 
+        # OCR pipeline: Tesseract runs in a process pool created on first
+        # use; OCR output is cached by page image hash
+        self._ocr_pool: Optional[ProcessPoolExecutor] = None
+        self._textract_limit: Optional[asyncio.Semaphore] = None
+        self._document_limit: Optional[asyncio.Semaphore] = None
+        self._ocr_cache = NearCache(
+            max_entries=self.config.get("ocr_cache_size", 1024),
+            ttl=self.config.get("ocr_cache_ttl", 3600),
+        )
+
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration."""
         return {
@@ -163,6 +238,12 @@ class MedicalFormReader:
             "cache_extractions": True,
             "extraction_timeout": 60,
             "temp_directory": os.path.join(tempfile.gettempdir(), "medical_forms"),
+            "ocr_workers": os.cpu_count() or 1,  # Tesseract worker processes
+            "max_pages_in_flight": 4,  # Rasterized pages held per document
+            "max_concurrent_textract": 8,  # Textract calls per reader
+            "max_concurrent_documents": 4,  # Documents per extract_batch
+            "ocr_cache_size": 1024,  # Cached OCR results, keyed by page hash
+            "ocr_cache_ttl": 3600,
         }
 
     def _load_models(self) -> None:
@@ -279,14 +360,13 @@ class MedicalFormReader:
             if not document_type:
                 document_type = await self._detect_document_type(document_bytes)
 
-            # Convert to images if PDF
-            if filename.lower().endswith(".pdf"):
-                images = convert_from_bytes(document_bytes)
-            else:
-                images = [Image.open(io.BytesIO(document_bytes))]
-
-            # Extract text using OCR
-            raw_text = await self._extract_text(images)
+            # Rasterize and OCR page by page; only the first page image is
+            # kept for layout analysis
+            is_pdf = filename.lower().endswith(".pdf") or document_bytes[:4] == b"%PDF"
+            raw_text, page_count, first_page = await self._extract_document_text(
+                document_bytes, is_pdf
+            )
+            images = [first_page] if first_page is not None else []
 
             # Extract structured data
             extracted_fields = await self._extract_structured_data(
@@ -318,7 +398,7 @@ class MedicalFormReader:
                 raw_text=raw_text,
                 metadata={
                     "filename": filename,
-                    "page_count": len(images),
+                    "page_count": page_count,
                     "file_size": len(document_bytes),
                     "extraction_method": self.config["ocr_engine"],
                 },
@@ -344,13 +424,12 @@ class MedicalFormReader:
     async def _detect_document_type(self, document_bytes: bytes) -> DocumentType:
         """Detect document type using ML and pattern matching."""
         try:
-            # Quick OCR for first page
-            if document_bytes[:4] == b"%PDF":
-                images = convert_from_bytes(document_bytes, last_page=1)
-            else:
-                images = [Image.open(io.BytesIO(document_bytes))]
-
-            text = await self._extract_text(images[:1])
+            # Quick OCR for first page; the result is cached, so extraction
+            # does not OCR this page a second time
+            image = await self._render_page(
+                document_bytes, document_bytes[:4] == b"%PDF", 1
+            )
+            text = await self._extract_text([image]) if image is not None else ""
             text_lower = text.lower()
 
             # Check patterns
@@ -377,43 +456,117 @@ class MedicalFormReader:
             logger.error(f"Document type detection failed: {e}")
             return DocumentType.UNKNOWN
 
+    async def _extract_document_text(
+        self, document_bytes: bytes, is_pdf: bool
+    ) -> Tuple[str, int, Optional[Image.Image]]:
+        """Stream a document's pages through OCR.
+
+        Pages are rasterized one at a time and at most max_pages_in_flight
+        are held in memory, so long PDFs run at bounded memory while their
+        pages are OCR'd concurrently.
+
+        Returns:
+            Tuple of (text, page count, first page image)
+        """
+        page_count = await self._count_pages(document_bytes, is_pdf)
+        pages_in_flight = asyncio.Semaphore(
+            max(1, self.config.get("max_pages_in_flight", 4))
+        )
+        first_page: Optional[Image.Image] = None
+
+        async def process_page(page_number: int) -> str:
+            nonlocal first_page
+            async with pages_in_flight:
+                image = await self._render_page(document_bytes, is_pdf, page_number)
+                if image is None:
+                    return ""
+                if page_number == 1:
+                    first_page = image
+                return await self._ocr_page(image, page_number)
+
+        texts = await asyncio.gather(
+            *(process_page(number) for number in range(1, page_count + 1))
+        )
+        return "\n\n".join(texts), page_count, first_page
+
+    async def _count_pages(self, document_bytes: bytes, is_pdf: bool) -> int:
+        """Count pages without rasterizing them."""
+        if not is_pdf:
+            return 1
+        if not PDF2IMAGE_AVAILABLE:
+            raise RuntimeError("pdf2image is not installed")
+        info = await asyncio.to_thread(pdfinfo_from_bytes, document_bytes)
+        return int(info.get("Pages", 0))
+
+    async def _render_page(
+        self, document_bytes: bytes, is_pdf: bool, page_number: int
+    ) -> Optional[Image.Image]:
+        """Rasterize a single page."""
+        if not is_pdf:
+            return Image.open(io.BytesIO(document_bytes))
+        if not PDF2IMAGE_AVAILABLE:
+            raise RuntimeError("pdf2image is not installed")
+        pages = await asyncio.to_thread(
+            convert_from_bytes,
+            document_bytes,
+            first_page=page_number,
+            last_page=page_number,
+        )
+        return pages[0] if pages else None
+
     async def _extract_text(self, images: List[Image.Image]) -> str:
         """Extract text from images using OCR."""
-        all_text = []
+        texts = await asyncio.gather(
+            *(self._ocr_page(image, i + 1) for i, image in enumerate(images))
+        )
+        return "\n\n".join(texts)
+
+    async def _ocr_page(self, image: Image.Image, page_number: int) -> str:
+        """OCR one page, reusing cached output for identical page images."""
+        engine = self.config["ocr_engine"]
+        page_png = await asyncio.to_thread(encode_page, image)
+        cache_key = f"{engine}:{hashlib.sha256(page_png).hexdigest()}"
+
+        cached = self._ocr_cache.get(cache_key)
+        if cached is not MISSING:
+            return str(cached)
+
+        try:
+            if engine in ["textract", "both"]:
+                # Use AWS Textract
+                text = await self._textract_page(page_png)
+            else:
+                # Use Tesseract
+                text = await self._tesseract_page(page_png)
 
-        for i, image in enumerate(images):
+        except (OSError, ValueError, RuntimeError) as e:
+            logger.error(f"OCR failed for page {page_number}: {e}")
+            # Fall back to tesseract
             try:
-                if self.config["ocr_engine"] in ["textract", "both"]:
-                    # Use AWS Textract
-                    text = await self._extract_with_textract(image)
-                else:
-                    # Use Tesseract
-                    text = await self._extract_with_tesseract(image)
-
-                all_text.append(text)
-
-            except (OSError, ValueError, RuntimeError) as e:
-                logger.error(f"OCR failed for page {i+1}: {e}")
-                # Fall back to tesseract
-                try:
-                    text = await self._extract_with_tesseract(image)
-                    all_text.append(text)
-                except (OSError, ValueError, RuntimeError):
-                    all_text.append("")
+                text = await self._tesseract_page(page_png)
+            except (OSError, ValueError, RuntimeError):
+                # Not cached, so a later attempt can retry the page
+                return ""
 
-        return "\n\n".join(all_text)
+        self._ocr_cache.set(cache_key, text)
+        return text
 
     async def _extract_with_textract(self, image: Image.Image) -> str:
         """Extract text using AWS Textract."""
-        # Convert image to bytes
-        img_byte_arr = io.BytesIO()
-        image.save(img_byte_arr, format="PNG")
-        img_bytes = img_byte_arr.getvalue()
-
-        # Call Textract
-        response = self.textract_client.detect_document_text(
-            Document={"Bytes": img_bytes}
-        )
+        return await self._textract_page(await asyncio.to_thread(encode_page, image))
+
+    async def _textract_page(self, page_png: bytes) -> str:
+        """Call Textract on a PNG page, capping calls in flight."""
+        if self._textract_limit is None:
+            self._textract_limit = asyncio.Semaphore(
+                max(1, self.config.get("max_concurrent_textract", 8))
+            )
+
+        async with self._textract_limit:
+            response = await asyncio.to_thread(
+                self.textract_client.detect_document_text,
+                Document={"Bytes": page_png},
+            )
 
         # Extract text
         text_parts = []
@@ -425,56 +578,51 @@ class MedicalFormReader:
 
     async def _extract_with_tesseract(self, image: Image.Image) -> str:
         """Extract text using Tesseract OCR."""
-        # Preprocess image
-        processed_image = self._preprocess_image(image)
+        return await self._tesseract_page(await asyncio.to_thread(encode_page, image))
 
-        # Extract text
-        text = pytesseract.image_to_string(
-            processed_image, config="--psm 3"  # Automatic page segmentation
+    async def _tesseract_page(self, page_png: bytes) -> str:
+        """Run preprocessing and Tesseract in the OCR process pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_ocr_pool(), tesseract_ocr_page, page_png
         )
 
-        return str(text)
+    def _get_ocr_pool(self) -> ProcessPoolExecutor:
+        """Start the OCR worker processes on first use."""
+        if self._ocr_pool is None:
+            self._ocr_pool = ProcessPoolExecutor(
+                max_workers=max(1, self.config.get("ocr_workers") or 1)
+            )
+            # The module-level reader is never closed explicitly
+            atexit.register(self.close)
+        return self._ocr_pool
 
     def _preprocess_image(self, image: Image.Image) -> np.ndarray:
         """Preprocess image for better OCR results."""
-        # Convert to OpenCV format
-        img_array = np.array(image)
+        return preprocess_image(image)
 
-        # Convert to grayscale
-        if len(img_array.shape) == 3:
-            if CV2_AVAILABLE and self.cv2:
-                gray = self.cv2.cvtColor(img_array, self.cv2.COLOR_RGB2GRAY)
-            else:
-                # Fallback: simple grayscale conversion
-                gray = np.dot(img_array[..., :3], [0.2989, 0.5870, 0.1140]).astype(
-                    np.uint8
-                )
-        else:
-            gray = img_array
-
-        # Apply thresholding
-        if CV2_AVAILABLE and self.cv2:
-            _, thresh = self.cv2.threshold(  # pylint: disable=no-member
-                gray,
-                0,
-                255,
-                self.cv2.THRESH_BINARY
-                + self.cv2.THRESH_OTSU,  # pylint: disable=no-member
-            )
-        else:
-            # Fallback: simple thresholding
-            thresh = ((gray > 127) * 255).astype(np.uint8)
-
-        # Denoise
-        if CV2_AVAILABLE and self.cv2:
-            denoised = self.cv2.fastNlMeansDenoising(
-                thresh
-            )  # pylint: disable=no-member
-        else:
-            # Fallback: return thresholded image without denoising
-            denoised = thresh
+    def close(self) -> None:
+        """Shut down the OCR worker processes."""
+        pool, self._ocr_pool = self._ocr_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+            atexit.unregister(self.close)
+
+    def __enter__(self) -> "MedicalFormReader":
+        """Use the reader as a context manager that closes its workers."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Shut down the OCR worker processes."""
+        self.close()
+
+    async def __aenter__(self) -> "MedicalFormReader":
+        """Use the reader as an async context manager."""
+        return self
 
-        return denoised
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Shut down the OCR worker processes without blocking the loop."""
+        await asyncio.to_thread(self.close)
 
     async def _extract_structured_data(
         self,
@@ -1007,9 +1155,22 @@ class MedicalFormReader:
         elif not document_types:
             document_types = [DocumentType.UNKNOWN] * len(documents)
 
-        # Process documents concurrently
+        # Process documents concurrently; pages within each document are
+        # already parallel, so cap documents to keep memory bounded
+        if self._document_limit is None:
+            self._document_limit = asyncio.Semaphore(
+                max(1, self.config.get("max_concurrent_documents", 4))
+            )
+        document_limit = self._document_limit
+
+        async def extract_limited(
+            doc: Union[str, bytes, Path], doc_type: DocumentType
+        ) -> ExtractionResult:
+            async with document_limit:
+                return await self.extract_data(doc, doc_type, language)
+
         tasks = [
-            self.extract_data(doc, doc_type, language)
+            extract_limited(doc, doc_type)
             for doc, doc_type in zip(documents, document_types)
         ]
 
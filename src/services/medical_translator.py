@@ -551,11 +551,12 @@ class MedicalTranslator:
         # Initialize LangChain components with Claude 3
         self.llm = BedrockLLM(
             model_name=self.config["bedrock_model"],
-            temperature=0.1,  # Low temperature for consistency
+            temperature=0.0,  # Deterministic, so responses can be cached
             top_p=0.9,
             max_tokens=4096,
             medical_mode=True,
             include_reasoning=True,
+            cache_use_case="medical_translation",
         )
 
         # Initialize terminology database
@@ -0,0 +1,140 @@
+"""In-process near cache for hot Redis keys.
+
+A small, bounded LRU cache with per-entry TTL that sits in front of Redis.
+Entries are dropped when:
+- the TTL expires (bounds staleness if an invalidation message is missed)
+- the cache is full and the entry is least recently used
+- another node publishes an invalidation for the key or a matching pattern
+
+Values are stored decoded and returned by reference; callers must treat
+values returned from the cache as read-only.
+
+Access control note: entries may hold cached PHI and live only in process
+memory. Access is gated by the CacheService that owns the near cache.
+"""
+
+import fnmatch
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Sentinel distinguishing "not cached" from a cached None
+MISSING = object()
+
+
+class NearCache:
+    """Thread-safe bounded LRU cache with TTL."""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0) -> None:
+        """Initialize near cache.
+
+        Args:
+            max_entries: Maximum number of entries held
+            ttl: Default entry lifetime in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so read-through fills that raced an
+        # invalidation can be discarded
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        """Invalidation generation; pass to set() when filling from Redis."""
+        return self._generation
+
+    def get(self, key: str) -> Any:
+        """Get a value, or MISSING if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None,
+    ) -> bool:
+        """Store a value.
+
+        Args:
+            key: Cache key
+            value: Decoded value
+            ttl: Lifetime in seconds (capped at the near cache default)
+            generation: Generation observed before the value was read from
+                Redis; the fill is skipped if an invalidation happened since
+
+        Returns:
+            True if the value was stored
+        """
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0 or self.max_entries <= 0:
+            return False
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._entries[key] = (monotonic() + lifetime, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, keys: Iterable[str]) -> int:
+        """Drop the given keys; returns how many were present."""
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """Drop keys matching a Redis-style glob pattern."""
+        with self._lock:
+            self._generation += 1
+            matched = [
+                key for key in self._entries if fnmatch.fnmatchcase(key, pattern)
+            ]
+            for key in matched:
+                del self._entries[key]
+        return len(matched)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+__all__ = ["MISSING", "NearCache"]
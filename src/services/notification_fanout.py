@@ -0,0 +1,645 @@
+"""Fan-out engine for mass notifications.
+
+Delivers one notification to many recipients (outbreak alerts, clinic
+closures) over in-app, email and SMS. In-app notifications are written with
+bulk inserts, emails go out in provider batches and SMS traffic is paced by
+per-provider and per-country token buckets. Recipients who chose their
+notification channels only get the campaign on those. Each channel
+checkpoints its position in the database, so a campaign interrupted by a
+crash is resumed by whichever worker picks it up next.
+
+Delivery is at least once: in-app rows are inserted in the same
+transaction as their checkpoint, but a crash while an email or SMS window
+is in flight re-sends that window.
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from src.models.auth import UserAuth
+from src.models.notification import (
+    Notification,
+    NotificationCampaign,
+    NotificationCampaignProgress,
+    NotificationCampaignRecipient,
+    NotificationCampaignStatus,
+    NotificationPriority,
+    preferred_channels,
+)
+from src.services.notification_rate_shaping import TokenBucket, sms_country
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHANNEL_IN_APP = "in_app"
+CHANNEL_EMAIL = "email"
+CHANNEL_SMS = "sms"
+CAMPAIGN_CHANNELS = (CHANNEL_IN_APP, CHANNEL_EMAIL, CHANNEL_SMS)
+DEFAULT_CAMPAIGN_CHANNELS = [CHANNEL_IN_APP, CHANNEL_EMAIL]
+
+# Recipients handled between checkpoints on each channel
+IN_APP_WINDOW = 1000
+EMAIL_BATCH_SIZE = 50
+EMAIL_BATCHES_IN_FLIGHT = 4
+SMS_WINDOW = 100
+
+RECIPIENT_INSERT_BATCH = 5000
+CAMPAIGN_LEASE_SECONDS = 120
+
+# Sustained emails per second; SES accounts start at 14
+DEFAULT_EMAIL_RATE = 14.0
+
+
+class Contact(NamedTuple):
+    """How to reach an active recipient."""
+
+    email: Optional[str]
+    phone_number: Optional[str]
+    # Channels the user chose; None when they have not chosen
+    channels: Optional[FrozenSet[str]]
+
+    def wants(self, channel: str) -> bool:
+        """Check the user accepts notifications on a channel."""
+        return self.channels is None or channel in self.channels
+
+
+class NotificationFanout:
+    """Runs mass-notification campaigns with durable progress."""
+
+    def __init__(
+        self,
+        db: Session,
+        email_channel: Any = None,
+        sms_channel: Any = None,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = CAMPAIGN_LEASE_SECONDS,
+    ):
+        """Initialize fan-out engine.
+
+        Args:
+            db: Database session
+            email_channel: Channel with send_batch() (defaults to the
+                unified notification service's email channel)
+            sms_channel: Channel with send_to_number() and format_message()
+                (defaults to the unified notification service's SMS channel)
+            worker_id: Identifies this worker in campaign leases
+            lease_seconds: How long a silent worker keeps a campaign
+        """
+        self.db = db
+        self._email_channel = email_channel
+        self._sms_channel = sms_channel
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.lease_seconds = lease_seconds
+        self.email_bucket = TokenBucket(
+            float(os.getenv("EMAIL_MAX_PER_SECOND", str(DEFAULT_EMAIL_RATE)))
+        )
+
+    @property
+    def email_channel(self) -> Any:
+        """Email channel used for campaign emails."""
+        if self._email_channel is None:
+            self._email_channel = self._unified_channel(CHANNEL_EMAIL)
+        return self._email_channel
+
+    @property
+    def sms_channel(self) -> Any:
+        """SMS channel used for campaign texts."""
+        if self._sms_channel is None:
+            self._sms_channel = self._unified_channel(CHANNEL_SMS)
+        return self._sms_channel
+
+    @staticmethod
+    def _unified_channel(channel: str) -> Any:
+        # Imported here: the unified service loads the provider SDKs and
+        # itself depends on the rate shaping used by this module
+        # pylint: disable-next=import-outside-toplevel
+        from src.services.unified_notification_service import (
+            NotificationChannel,
+            get_notification_service,
+        )
+
+        return get_notification_service().channels[NotificationChannel(channel)]
+
+    def create_campaign(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        notification_type: str,
+        title: str,
+        message: str,
+        channels: Optional[Sequence[str]] = None,
+        priority: NotificationPriority = NotificationPriority.NORMAL,
+        data: Optional[Dict[str, Any]] = None,
+        created_by: Optional[uuid.UUID] = None,
+    ) -> NotificationCampaign:
+        """Store a campaign and its recipients.
+
+        Args:
+            user_ids: Recipients; duplicates are dropped
+            notification_type: Type of notification
+            title: Notification title (email subject)
+            message: Notification message
+            channels: Channels to deliver on (defaults to in-app and email)
+            priority: Notification priority
+            data: Additional data stored with in-app notifications
+            created_by: User creating the campaign
+
+        Returns:
+            The pending campaign
+        """
+        channels = [str(getattr(c, "value", c)) for c in channels or ()]
+        channels = list(OrderedDict.fromkeys(channels)) or DEFAULT_CAMPAIGN_CHANNELS
+        unknown = set(channels) - set(CAMPAIGN_CHANNELS)
+        if unknown:
+            raise ValueError(f"Unsupported campaign channels: {sorted(unknown)}")
+
+        recipients = list(OrderedDict.fromkeys(user_ids))
+        campaign = NotificationCampaign(
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            priority=NotificationPriority(priority),
+            channels=channels,
+            data=data,
+            status=NotificationCampaignStatus.PENDING,
+            total_recipients=len(recipients),
+            created_by=created_by,
+        )
+        self.db.add(campaign)
+        self.db.flush()
+
+        for start in range(0, len(recipients), RECIPIENT_INSERT_BATCH):
+            self.db.execute(
+                insert(NotificationCampaignRecipient),
+                [
+                    {"campaign_id": campaign.id, "position": position, "user_id": uid}
+                    for position, uid in enumerate(
+                        recipients[start : start + RECIPIENT_INSERT_BATCH], start
+                    )
+                ],
+            )
+        self.db.execute(
+            insert(NotificationCampaignProgress),
+            [{"campaign_id": campaign.id, "channel": channel} for channel in channels],
+        )
+        self.db.commit()
+
+        logger.info(
+            f"Created notification campaign {campaign.id} for "
+            f"{len(recipients)} recipients on {', '.join(channels)}"
+        )
+        return campaign
+
+    async def run_campaign(self, campaign_id: uuid.UUID) -> Dict[str, Any]:
+        """Deliver a campaign, resuming from its checkpoints.
+
+        Channels run concurrently so slow, rate-limited SMS does not hold
+        back in-app and email delivery. A campaign leased by another live
+        worker is left alone.
+
+        Returns:
+            Campaign progress summary
+        """
+        if not self._claim(campaign_id):
+            logger.info(f"Campaign {campaign_id} is not available to run")
+            return self.get_campaign_progress(campaign_id)
+
+        campaign = self.db.get(NotificationCampaign, campaign_id)
+        channels = self.db.scalars(
+            select(NotificationCampaignProgress.channel).where(
+                NotificationCampaignProgress.campaign_id == campaign_id,
+                NotificationCampaignProgress.completed_at.is_(None),
+            )
+        ).all()
+        snapshot = {
+            "id": campaign.id,
+            "notification_type": campaign.notification_type,
+            "title": campaign.title,
+            "message": campaign.message,
+            "priority": campaign.priority,
+            "data": campaign.data,
+        }
+
+        tasks = [
+            asyncio.ensure_future(self._run_channel(snapshot, channel))
+            for channel in channels
+        ]
+        heartbeat = asyncio.ensure_future(self._heartbeat(campaign_id))
+        try:
+            finished = all(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            self.db.rollback()
+            raise
+        finally:
+            heartbeat.cancel()
+
+        if finished:
+            now = datetime.utcnow()
+            self.db.execute(
+                update(NotificationCampaign)
+                .where(
+                    NotificationCampaign.id == campaign_id,
+                    NotificationCampaign.worker_id == self.worker_id,
+                    NotificationCampaign.status == NotificationCampaignStatus.RUNNING,
+                )
+                .values(
+                    status=NotificationCampaignStatus.COMPLETED,
+                    completed_at=now,
+                    lease_expires_at=None,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+
+        summary = self.get_campaign_progress(campaign_id)
+        logger.info(
+            f"Campaign {campaign_id} {summary['status']}: "
+            f"{summary['sent_count']} sent, {summary['failed_count']} failed"
+        )
+        return summary
+
+    async def resume_campaigns(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Run pending campaigns and those abandoned by a crashed worker."""
+        campaign_ids = self.db.scalars(
+            select(NotificationCampaign.id)
+            .where(self._claimable(datetime.utcnow()))
+            .order_by(NotificationCampaign.created_at)
+            .limit(limit)
+        ).all()
+        return [await self.run_campaign(campaign_id) for campaign_id in campaign_ids]
+
+    def cancel_campaign(self, campaign_id: uuid.UUID) -> bool:
+        """Stop a campaign; running workers stop at their next checkpoint."""
+        result = self.db.execute(
+            update(NotificationCampaign)
+            .where(
+                NotificationCampaign.id == campaign_id,
+                NotificationCampaign.status.in_(
+                    [
+                        NotificationCampaignStatus.PENDING,
+                        NotificationCampaignStatus.RUNNING,
+                    ]
+                ),
+            )
+            .values(
+                status=NotificationCampaignStatus.CANCELLED,
+                lease_expires_at=None,
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return bool(result.rowcount)
+
+    def get_campaign_progress(self, campaign_id: uuid.UUID) -> Dict[str, Any]:
+        """Summarize a campaign's delivery progress per channel."""
+        campaign = self.db.get(
+            NotificationCampaign, campaign_id, populate_existing=True
+        )
+        if campaign is None:
+            raise ValueError(f"Notification campaign {campaign_id} not found")
+
+        rows = self.db.scalars(
+            select(NotificationCampaignProgress).where(
+                NotificationCampaignProgress.campaign_id == campaign_id
+            )
+        ).all()
+        channels = {
+            row.channel: {
+                "sent": row.sent_count,
+                "failed": row.failed_count,
+                "skipped": row.skipped_count,
+                "remaining": campaign.total_recipients - row.cursor,
+            }
+            for row in rows
+        }
+        return {
+            "campaign_id": str(campaign.id),
+            "status": NotificationCampaignStatus(campaign.status).value,
+            "total": campaign.total_recipients,
+            "sent_count": sum(c["sent"] for c in channels.values()),
+            "failed_count": sum(c["failed"] for c in channels.values()),
+            "channels": channels,
+        }
+
+    def _claimable(self, now: datetime) -> Any:
+        """Condition for campaigns this worker may take."""
+        return or_(
+            NotificationCampaign.status == NotificationCampaignStatus.PENDING,
+            and_(
+                NotificationCampaign.status == NotificationCampaignStatus.RUNNING,
+                or_(
+                    NotificationCampaign.lease_expires_at.is_(None),
+                    NotificationCampaign.lease_expires_at < now,
+                    NotificationCampaign.worker_id == self.worker_id,
+                ),
+            ),
+        )
+
+    def _claim(self, campaign_id: uuid.UUID) -> bool:
+        """Lease a campaign to this worker."""
+        now = datetime.utcnow()
+        campaign = self.db.get(NotificationCampaign, campaign_id)
+        if campaign is None:
+            raise ValueError(f"Notification campaign {campaign_id} not found")
+
+        result = self.db.execute(
+            update(NotificationCampaign)
+            .where(NotificationCampaign.id == campaign_id, self._claimable(now))
+            .values(
+                status=NotificationCampaignStatus.RUNNING,
+                worker_id=self.worker_id,
+                lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                started_at=campaign.started_at or now,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return bool(result.rowcount)
+
+    def _renew_lease(self, campaign_id: uuid.UUID) -> bool:
+        """Extend this worker's lease; False if it no longer owns the campaign.
+
+        Left uncommitted for the caller.
+        """
+        renewed = self.db.execute(
+            update(NotificationCampaign)
+            .where(
+                NotificationCampaign.id == campaign_id,
+                NotificationCampaign.worker_id == self.worker_id,
+                NotificationCampaign.status == NotificationCampaignStatus.RUNNING,
+            )
+            .values(
+                lease_expires_at=datetime.utcnow()
+                + timedelta(seconds=self.lease_seconds)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return bool(renewed.rowcount)
+
+    async def _heartbeat(self, campaign_id: uuid.UUID) -> None:
+        """Keep the lease while windows are in flight.
+
+        A window of rate-limited SMS can take longer than the lease, so it
+        is renewed on a timer rather than only at checkpoints. Channel tasks
+        never await with uncommitted writes, so committing here is safe.
+        """
+        interval = max(self.lease_seconds / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            if self._renew_lease(campaign_id):
+                self.db.commit()
+            else:
+                self.db.rollback()
+                return
+
+    async def _run_channel(self, campaign: Dict[str, Any], channel: str) -> bool:
+        """Deliver one channel window by window.
+
+        Returns:
+            False if the campaign was cancelled or taken over meanwhile
+        """
+        window = {
+            CHANNEL_IN_APP: IN_APP_WINDOW,
+            CHANNEL_EMAIL: EMAIL_BATCH_SIZE * EMAIL_BATCHES_IN_FLIGHT,
+            CHANNEL_SMS: SMS_WINDOW,
+        }[channel]
+        cursor = self.db.scalar(
+            select(NotificationCampaignProgress.cursor).where(
+                NotificationCampaignProgress.campaign_id == campaign["id"],
+                NotificationCampaignProgress.channel == channel,
+            )
+        )
+
+        while True:
+            recipients = self.db.execute(
+                select(
+                    NotificationCampaignRecipient.position,
+                    NotificationCampaignRecipient.user_id,
+                )
+                .where(
+                    NotificationCampaignRecipient.campaign_id == campaign["id"],
+                    NotificationCampaignRecipient.position >= cursor,
+                )
+                .order_by(NotificationCampaignRecipient.position)
+                .limit(window)
+            ).all()
+            if not recipients:
+                break
+
+            user_ids = [recipient.user_id for recipient in recipients]
+            if channel == CHANNEL_IN_APP:
+                counts = self._insert_in_app(campaign, user_ids)
+            elif channel == CHANNEL_EMAIL:
+                counts = await self._send_emails(campaign, user_ids)
+            else:
+                counts = await self._send_sms(campaign, user_ids)
+
+            cursor = recipients[-1].position + 1
+            if not self._checkpoint(campaign["id"], channel, cursor, *counts):
+                logger.info(f"Campaign {campaign['id']} stopped on {channel}")
+                return False
+            # In-app windows never await; let the other channels run
+            await asyncio.sleep(0)
+
+        self.db.execute(
+            update(NotificationCampaignProgress)
+            .where(
+                NotificationCampaignProgress.campaign_id == campaign["id"],
+                NotificationCampaignProgress.channel == channel,
+            )
+            .values(completed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return True
+
+    def _checkpoint(
+        self,
+        campaign_id: uuid.UUID,
+        channel: str,
+        cursor: int,
+        sent: int,
+        failed: int,
+        skipped: int,
+    ) -> bool:
+        """Record a channel's progress and renew the campaign lease.
+
+        Commits any in-app rows of the window together with the checkpoint.
+        Returns False, rolling back, if this worker no longer owns the
+        campaign.
+        """
+        if not self._renew_lease(campaign_id):
+            self.db.rollback()
+            return False
+
+        progress = NotificationCampaignProgress
+        self.db.execute(
+            update(progress)
+            .where(progress.campaign_id == campaign_id, progress.channel == channel)
+            .values(
+                cursor=cursor,
+                sent_count=progress.sent_count + sent,
+                failed_count=progress.failed_count + failed,
+                skipped_count=progress.skipped_count + skipped,
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return True
+
+    def _insert_in_app(
+        self, campaign: Dict[str, Any], user_ids: List[uuid.UUID]
+    ) -> Tuple[int, int, int]:
+        """Bulk insert in-app notifications; committed by the checkpoint."""
+        contacts = self._load_contacts(user_ids)
+        recipients = [
+            user_id
+            for user_id in user_ids
+            if user_id not in contacts or contacts[user_id].wants(CHANNEL_IN_APP)
+        ]
+        data = dict(campaign["data"] or {}, campaign_id=str(campaign["id"]))
+        if recipients:
+            self.db.execute(
+                insert(Notification),
+                [
+                    {
+                        "user_id": user_id,
+                        "notification_type": campaign["notification_type"],
+                        "title": campaign["title"],
+                        "message": campaign["message"],
+                        "priority": campaign["priority"],
+                        "data": data,
+                    }
+                    for user_id in recipients
+                ],
+            )
+        return len(recipients), 0, len(user_ids) - len(recipients)
+
+    def _load_contacts(self, user_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Contact]:
+        """Addresses and channel choices of active recipients, in one query."""
+        rows = self.db.execute(
+            select(
+                UserAuth.id,
+                UserAuth.email,
+                UserAuth.phone_number,
+                UserAuth.notification_preferences,
+            ).where(UserAuth.id.in_(user_ids), UserAuth.is_active.is_(True))
+        ).all()
+        contacts = {}
+        for row in rows:
+            try:
+                channels = preferred_channels(row.notification_preferences)
+            except (ValueError, AttributeError) as e:
+                logger.warning(f"Ignoring notification preferences of {row.id}: {e}")
+                channels = None
+            contacts[row.id] = Contact(
+                row.email,
+                row.phone_number,
+                frozenset(channels) if channels is not None else None,
+            )
+        return contacts
+
+    @staticmethod
+    def _reachable(
+        user_ids: List[uuid.UUID], contacts: Dict[uuid.UUID, Contact], channel: str
+    ) -> List[Tuple[uuid.UUID, Contact]]:
+        """Recipients with an address on a channel they accept."""
+        reachable = []
+        for user_id in user_ids:
+            contact = contacts.get(user_id)
+            if contact is None or not contact.wants(channel):
+                continue
+            address = (
+                contact.email if channel == CHANNEL_EMAIL else contact.phone_number
+            )
+            if address:
+                reachable.append((user_id, contact))
+        return reachable
+
+    async def _send_emails(
+        self, campaign: Dict[str, Any], user_ids: List[uuid.UUID]
+    ) -> Tuple[int, int, int]:
+        """Send a window of emails as concurrent provider batches."""
+        contacts = self._load_contacts(user_ids)
+        recipients = [
+            {"email": contact.email, "user_id": str(user_id)}
+            for user_id, contact in self._reachable(user_ids, contacts, CHANNEL_EMAIL)
+        ]
+        skipped = len(user_ids) - len(recipients)
+
+        async def send_batch(batch: List[Dict[str, str]]) -> List[bool]:
+            await self.email_bucket.acquire(len(batch))
+            try:
+                return list(
+                    await self.email_channel.send_batch(
+                        batch, campaign["title"], campaign["message"]
+                    )
+                )
+            except (ValueError, AttributeError, RuntimeError, OSError) as e:
+                logger.error(f"Campaign {campaign['id']} email batch failed: {e}")
+                return [False] * len(batch)
+
+        results = await asyncio.gather(
+            *[
+                send_batch(recipients[i : i + EMAIL_BATCH_SIZE])
+                for i in range(0, len(recipients), EMAIL_BATCH_SIZE)
+            ]
+        )
+        sent = sum(ok for batch in results for ok in batch)
+        return sent, len(recipients) - sent, skipped
+
+    async def _send_sms(
+        self, campaign: Dict[str, Any], user_ids: List[uuid.UUID]
+    ) -> Tuple[int, int, int]:
+        """Send a window of texts; the channel's rate shaper paces them."""
+        contacts = self._load_contacts(user_ids)
+        numbers = [
+            contact.phone_number
+            for _, contact in self._reachable(user_ids, contacts, CHANNEL_SMS)
+        ]
+        skipped = len(user_ids) - len(numbers)
+        text = self.sms_channel.format_message(campaign["title"], campaign["message"])
+
+        async def send(number: str) -> bool:
+            try:
+                return bool(await self.sms_channel.send_to_number(number, text))
+            except (ValueError, AttributeError, RuntimeError, OSError) as e:
+                logger.error(f"Campaign {campaign['id']} SMS failed: {e}")
+                return False
+
+        results = await asyncio.gather(
+            *[send(number) for number in interleave_by_country(numbers)]
+        )
+        sent = sum(results)
+        return sent, len(numbers) - sent, skipped
+
+
+def interleave_by_country(numbers: List[str]) -> List[str]:
+    """Order numbers round-robin across countries.
+
+    A country with a tight rate limit then delays only its own messages
+    instead of the window queued behind them.
+    """
+    by_country: Dict[str, List[str]] = OrderedDict()
+    for number in numbers:
+        by_country.setdefault(sms_country(number), []).append(number)
+    queues = list(by_country.values())
+    ordered = []
+    for index in range(max((len(q) for q in queues), default=0)):
+        ordered.extend(q[index] for q in queues if index < len(q))
+    return ordered
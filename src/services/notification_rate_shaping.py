@@ -0,0 +1,172 @@
+"""Rate shaping for outbound notification traffic.
+
+SMS providers enforce account-wide throughput limits (AWS SNS defaults to
+20 transactional messages per second; Twilio depends on the sender type)
+and carriers in some countries filter senders that burst. Sends are paced
+with token buckets: one per provider account and, where configured, one
+per destination country.
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    import phonenumbers
+except ImportError:
+    phonenumbers = None
+
+# Sustained SMS messages per second per provider account
+SMS_PROVIDER_RATES: Dict[Optional[str], float] = {
+    "sns": 20.0,
+    "twilio": 30.0,
+}
+DEFAULT_SMS_RATE = 10.0
+
+# Country used when a number cannot be parsed
+UNKNOWN_COUNTRY = "ZZ"
+
+
+class TokenBucket:
+    """Token bucket handing out send slots at a sustained rate.
+
+    acquire() reserves its tokens immediately and sleeps until they are
+    due, so waiters are served in arrival order without polling.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst (defaults to one second of tokens)
+            clock: Monotonic time source
+        """
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens and return the seconds until they are available."""
+        now = self._clock()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+        self._tokens -= tokens
+        return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def sms_country(phone_number: str) -> str:
+    """Return the ISO region of a phone number.
+
+    Numbers without a country code are treated as US numbers, matching how
+    the SMS channel formats them for the providers.
+    """
+    if not phone_number.startswith("+"):
+        return "US"
+    if phonenumbers is not None:
+        try:
+            region = phonenumbers.region_code_for_number(
+                phonenumbers.parse(phone_number, None)
+            )
+            if region:
+                return str(region)
+        except phonenumbers.NumberParseException:
+            pass
+    return UNKNOWN_COUNTRY
+
+
+def parse_country_rates(value: str) -> Dict[str, float]:
+    """Parse per-country rates written as "KE=5,UG=5,US=50"."""
+    rates = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        country, rate = item.split("=", 1)
+        rates[country.strip().upper()] = float(rate)
+    return rates
+
+
+class SMSRateShaper:
+    """Paces SMS sends per provider account and per destination country."""
+
+    def __init__(
+        self,
+        provider_rate: float,
+        country_rates: Optional[Dict[str, float]] = None,
+        default_country_rate: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize SMS rate shaper.
+
+        Args:
+            provider_rate: Messages per second for the provider account
+            country_rates: Messages per second for specific countries
+            default_country_rate: Limit for other countries (None for none)
+            clock: Monotonic time source
+        """
+        self.provider_bucket = TokenBucket(provider_rate, clock=clock)
+        self.country_rates = country_rates or {}
+        self.default_country_rate = default_country_rate
+        self._clock = clock
+        self._country_buckets: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def for_provider(cls, provider: Optional[str]) -> "SMSRateShaper":
+        """Create a shaper from the environment for an SMS provider.
+
+        SMS_MAX_PER_SECOND overrides the provider default; SMS_COUNTRY_RATES
+        and SMS_DEFAULT_COUNTRY_RATE set the per-country limits.
+        """
+        provider_rate = float(
+            os.getenv(
+                "SMS_MAX_PER_SECOND",
+                str(SMS_PROVIDER_RATES.get(provider, DEFAULT_SMS_RATE)),
+            )
+        )
+        default_country_rate = os.getenv("SMS_DEFAULT_COUNTRY_RATE")
+        return cls(
+            provider_rate,
+            country_rates=parse_country_rates(os.getenv("SMS_COUNTRY_RATES", "")),
+            default_country_rate=(
+                float(default_country_rate) if default_country_rate else None
+            ),
+        )
+
+    def country_bucket(self, country: str) -> Optional[TokenBucket]:
+        """Return the bucket limiting a country, if it has a limit."""
+        bucket = self._country_buckets.get(country)
+        if bucket is None:
+            rate = self.country_rates.get(country, self.default_country_rate)
+            if rate is None:
+                return None
+            bucket = TokenBucket(rate, clock=self._clock)
+            self._country_buckets[country] = bucket
+        return bucket
+
+    async def throttle(self, phone_number: str) -> None:
+        """Wait for a send slot to a phone number.
+
+        The country slot is taken first so messages held back by a country
+        limit do not use up provider throughput meanwhile.
+        """
+        bucket = self.country_bucket(sms_country(phone_number))
+        if bucket is not None:
+            await bucket.acquire()
+        await self.provider_bucket.acquire()
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from src.models.notification import Notification, NotificationStatus
 from src.services.base import BaseService
+from src.services.notification_fanout import NotificationFanout
 from src.services.unified_notification_service import (
     NotificationPriority,
     get_notification_service,
@@ -95,28 +96,29 @@ class NotificationService(BaseService):
             return False
 
     async def send_bulk_notification(
-        self, user_ids: List[UUID], notification_type: str, title: str, message: str
+        self,
+        user_ids: List[UUID],
+        notification_type: str,
+        title: str,
+        message: str,
+        channels: Optional[List[str]] = None,
+        priority: NotificationPriority = NotificationPriority.NORMAL,
+        data: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Send notification to multiple users."""
-        sent_count = 0
-        failed_count = 0
-
-        for user_id in user_ids:
-            try:
-                await self.send_notification(
-                    user_id=user_id,
-                    notification_type=notification_type,
-                    title=title,
-                    message=message,
-                )
-                sent_count += 1
-            except (ValueError, RuntimeError, AttributeError) as e:
-                logger.error(f"Failed to send notification to user {user_id}: {e}")
-                failed_count += 1
-
-        return {
-            "sent_count": sent_count,
-            "failed_count": failed_count,
-            "status": "completed",
-            "total": len(user_ids),
-        }
+        """Send notification to multiple users.
+
+        Runs as a durable campaign: in-app notifications are bulk inserted,
+        emails are batched and SMS is rate shaped. If the process dies, a
+        later NotificationFanout.resume_campaigns() picks up where it stopped.
+        """
+        fanout = NotificationFanout(self.db)
+        campaign = fanout.create_campaign(
+            user_ids,
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            channels=channels,
+            priority=priority,
+            data=data,
+        )
+        return await fanout.run_campaign(campaign.id)
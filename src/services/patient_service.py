@@ -10,15 +10,31 @@ from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, TypedDict
 from uuid import UUID
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, intersect, or_, select
 from sqlalchemy.orm import joinedload
 
 from src.models.access_log import AccessType
 from src.models.health_record import HealthRecord
 from src.models.patient import Gender, Patient
+from src.models.patient_search_key import PatientSearchKey, name_token_matches
 from src.models.verification import Verification
 from src.services.base import BaseService
 from src.utils.logging import get_logger
+from src.utils.pagination import (
+    InvalidCursorError,
+    apply_keyset,
+    estimate_query_count,
+    keyset_cursor,
+)
+from src.utils.search_keys import (
+    KEY_EMAIL,
+    KEY_PHONE,
+    KEY_PHONE_NATIONAL,
+    KEY_UNHCR,
+    classify_query,
+    normalize_phone,
+    normalize_unhcr_number,
+)
 
 logger = get_logger(__name__)
 
@@ -41,6 +57,15 @@ class BulkExportResult(TypedDict):
     errors: List[str]
 
 
+class PatientSearchPage(TypedDict):
+    """Result structure for keyset-paginated patient searches."""
+
+    patients: List[Patient]
+    total: int
+    next_cursor: Optional[str]
+    total_is_estimate: bool
+
+
 class PatientService(BaseService[Patient]):
     """Service for managing patient records."""
 
@@ -100,8 +125,53 @@ class PatientService(BaseService[Patient]):
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact",
     ) -> Tuple[List[Patient], int]:
         """Search for patients with various criteria."""
+        page = self.search_patients_page(
+            query=query,
+            filters=filters,
+            limit=limit,
+            offset=offset,
+            include_deleted=include_deleted,
+            cursor=cursor,
+            count_mode=count_mode,
+        )
+        return page["patients"], page["total"]
+
+    def search_patients_page(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 100,
+        offset: int = 0,
+        include_deleted: bool = False,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact",
+    ) -> PatientSearchPage:
+        """Search for patients using the search index with keyset pagination.
+
+        Args:
+            query: Free text matched against names (phonetically, across
+                scripts), UNHCR numbers, phone numbers and email
+            filters: Structured filters (gender, refugee_status, camp, ...)
+            limit: Maximum patients to return
+            offset: Row offset, only used when no cursor is given
+            include_deleted: Include soft-deleted patients
+            cursor: Opaque cursor from a previous page's ``next_cursor``
+            count_mode: "exact" for COUNT(*), "estimated" for the planner
+                estimate, or "none" to skip counting
+
+        Returns:
+            Page with patients, total, next_cursor and total_is_estimate
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed
+        """
+        if count_mode not in ("exact", "estimated", "none"):
+            raise ValueError(f"Unsupported count mode: {count_mode}")
+
         try:
             # Base query
             base_query = self.session.query(Patient)
@@ -109,72 +179,42 @@ class PatientService(BaseService[Patient]):
             if not include_deleted:
                 base_query = base_query.filter(Patient.deleted_at.is_(None))
 
-            # Apply search query
-            if query:
-                search_term = f"%{query}%"
-                base_query = base_query.filter(
-                    or_(
-                        Patient.given_name.ilike(search_term),
-                        Patient.family_name.ilike(search_term),
-                        Patient.preferred_name.ilike(search_term),
-                        Patient.unhcr_number.ilike(search_term),
-                        Patient.phone_number.like(search_term),
-                        Patient.email.ilike(search_term),
+            # Apply search query through the search key index
+            if query and query.strip():
+                matching_ids = self._search_index_subquery(query)
+                if matching_ids is None:
+                    return PatientSearchPage(
+                        patients=[], total=0, next_cursor=None, total_is_estimate=False
                     )
-                )
+                base_query = base_query.filter(Patient.id.in_(matching_ids))
 
             # Apply filters
             if filters:
-                if filters.get("gender"):
-                    base_query = base_query.filter(Patient.gender == filters["gender"])
-
-                if filters.get("refugee_status"):
-                    base_query = base_query.filter(
-                        Patient.refugee_status == filters["refugee_status"]
-                    )
-
-                if filters.get("current_camp"):
-                    base_query = base_query.filter(
-                        Patient.current_camp.ilike(f"%{filters['current_camp']}%")
-                    )
-
-                if filters.get("verification_status"):
-                    base_query = base_query.filter(
-                        Patient.verification_status == filters["verification_status"]
-                    )
-
-                if filters.get("origin_country"):
-                    base_query = base_query.filter(
-                        Patient.origin_country == filters["origin_country"]
-                    )
-
-                if filters.get("age_min"):
-                    min_birth_year = date.today().year - filters["age_min"]
-                    base_query = base_query.filter(
-                        or_(
-                            Patient.date_of_birth <= date(min_birth_year, 12, 31),
-                            Patient.estimated_birth_year <= min_birth_year,
-                        )
-                    )
-
-                if filters.get("age_max"):
-                    max_birth_year = date.today().year - filters["age_max"]
-                    base_query = base_query.filter(
-                        or_(
-                            Patient.date_of_birth >= date(max_birth_year, 1, 1),
-                            Patient.estimated_birth_year >= max_birth_year,
-                        )
-                    )
+                base_query = self._apply_search_filters(base_query, filters)
 
             # Get total count
-            total_count = base_query.count()
-
-            # Apply pagination and get results
-            patients = (
-                base_query.order_by(Patient.family_name, Patient.given_name)
-                .limit(limit)
-                .offset(offset)
-                .all()
+            total_count = 0
+            if count_mode == "exact":
+                total_count = base_query.order_by(None).count()
+            elif count_mode == "estimated":
+                total_count = estimate_query_count(base_query)
+
+            # Keyset ordering; the id column makes the order total
+            page_query = apply_keyset(
+                base_query,
+                [Patient.family_name, Patient.given_name, Patient.id],
+                cursor=cursor,
+            )
+            if not cursor and offset:
+                page_query = page_query.offset(offset)
+
+            # Fetch one extra row to learn whether another page exists
+            rows = page_query.limit(limit + 1).all()
+            patients = rows[:limit]
+            next_cursor = (
+                keyset_cursor(patients[-1], ["family_name", "given_name", "id"])
+                if len(rows) > limit
+                else None
             )
 
             # Log access
@@ -190,11 +230,111 @@ class PatientService(BaseService[Patient]):
                 },
             )
 
-            return patients, total_count
+            return PatientSearchPage(
+                patients=patients,
+                total=total_count,
+                next_cursor=next_cursor,
+                total_is_estimate=count_mode == "estimated",
+            )
 
+        except InvalidCursorError:
+            # A bad cursor is a client error, not an empty result
+            raise
         except (ValueError, AttributeError, KeyError) as e:
             logger.error(f"Error searching patients: {e}")
-            return [], 0
+            return PatientSearchPage(
+                patients=[], total=0, next_cursor=None, total_is_estimate=False
+            )
+
+    def _search_index_subquery(self, query: str) -> Optional[Any]:
+        """Build a subquery of patient ids matching a free-text query.
+
+        Every name token must match a patient either by normalized prefix or
+        by phonetic key. Returns None when the query has no searchable content.
+        """
+        keys = PatientSearchKey
+        kind = classify_query(query)
+
+        if kind == KEY_EMAIL:
+            return select(keys.patient_id).where(
+                keys.key_type == KEY_EMAIL, keys.key_value == query.strip().lower()
+            )
+
+        if kind in (KEY_PHONE, KEY_UNHCR):
+            conditions = []
+            unhcr = normalize_unhcr_number(query)
+            if unhcr:
+                conditions.append(
+                    and_(keys.key_type == KEY_UNHCR, keys.key_value.like(f"{unhcr}%"))
+                )
+            if kind == KEY_PHONE:
+                e164, national = normalize_phone(query)
+                if e164:
+                    conditions.append(
+                        and_(keys.key_type == KEY_PHONE, keys.key_value == e164)
+                    )
+                if national:
+                    conditions.append(
+                        and_(
+                            keys.key_type == KEY_PHONE_NATIONAL,
+                            keys.key_value == national,
+                        )
+                    )
+            if not conditions:
+                return None
+            return select(keys.patient_id).where(or_(*conditions))
+
+        token_matches = name_token_matches(query)
+        if not token_matches:
+            return None
+        if len(token_matches) == 1:
+            return token_matches[0]
+        return intersect(*token_matches)
+
+    def _apply_search_filters(self, base_query: Any, filters: Dict[str, Any]) -> Any:
+        """Apply structured search filters to a patient query."""
+        if filters.get("gender"):
+            base_query = base_query.filter(Patient.gender == filters["gender"])
+
+        if filters.get("refugee_status"):
+            base_query = base_query.filter(
+                Patient.refugee_status == filters["refugee_status"]
+            )
+
+        if filters.get("current_camp"):
+            base_query = base_query.filter(
+                Patient.current_camp.ilike(f"%{filters['current_camp']}%")
+            )
+
+        if filters.get("verification_status"):
+            base_query = base_query.filter(
+                Patient.verification_status == filters["verification_status"]
+            )
+
+        if filters.get("origin_country"):
+            base_query = base_query.filter(
+                Patient.origin_country == filters["origin_country"]
+            )
+
+        if filters.get("age_min"):
+            min_birth_year = date.today().year - filters["age_min"]
+            base_query = base_query.filter(
+                or_(
+                    Patient.date_of_birth <= date(min_birth_year, 12, 31),
+                    Patient.estimated_birth_year <= min_birth_year,
+                )
+            )
+
+        if filters.get("age_max"):
+            max_birth_year = date.today().year - filters["age_max"]
+            base_query = base_query.filter(
+                or_(
+                    Patient.date_of_birth >= date(max_birth_year, 1, 1),
+                    Patient.estimated_birth_year >= max_birth_year,
+                )
+            )
+
+        return base_query
 
     def get_patient_with_records(
         self,
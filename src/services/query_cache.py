@@ -43,6 +43,10 @@ class QueryCacheConfig(BaseModel):
     invalidation_events: List[str] = Field(
         default_factory=list, description="Events that invalidate this cache"
     )
+    tags: List[str] = Field(
+        default_factory=list,
+        description="Invalidation tag templates, filled from query params",
+    )
 
 
 class QueryCacheService:
@@ -90,6 +94,7 @@ class QueryCacheService:
                 "patient.updated",
                 "patient.deleted",
             ],
+            tags=["patient:{patient_id}"],
         )
 
         # Health record queries
@@ -99,6 +104,7 @@ class QueryCacheService:
             include_params=True,
             include_user=True,
             invalidation_events=["health_record.created", "health_record.updated"],
+            tags=["patient_records:{patient_id}", "health_record:{record_id}"],
         )
 
         # Search queries
@@ -107,6 +113,7 @@ class QueryCacheService:
             ttl_seconds=300,
             include_params=True,
             invalidation_events=["patient.updated", "search.index_updated"],
+            tags=["search"],
         )
 
         # Aggregation queries
@@ -165,6 +172,31 @@ class QueryCacheService:
 
         return ":".join(key_parts)
 
+    def build_tags(
+        self,
+        query_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+    ) -> List[str]:
+        """Build the invalidation tags for a cached query result.
+
+        Every result is tagged with its query name and, when known, the
+        requesting user. Config tag templates are included only when all of
+        their placeholders are present in the params.
+        """
+        config = self.cache_configs.get(query_name, QueryCacheConfig(ttl_seconds=None))
+        tags = [f"query:{query_name}"]
+        if user_id:
+            tags.append(f"user:{user_id}")
+
+        values = {key: str(value) for key, value in (params or {}).items()}
+        for template in config.tags:
+            try:
+                tags.append(template.format(**values))
+            except (KeyError, IndexError):
+                continue
+        return tags
+
     def _hash_params(self, params: List[Tuple[str, Any]]) -> str:
         """Hash query parameters for cache key."""
         # Convert params to stable string representation
@@ -270,18 +302,16 @@ class QueryCacheService:
             ttl = ttl_manager.get_ttl_with_jitter(config.category)
 
         # Cache the result
-        success = await cache_service.set(cache_key, result, ttl=ttl)
+        success = await cache_service.set(
+            cache_key,
+            result,
+            ttl=ttl,
+            tags=self.build_tags(query_name, params, user_id),
+        )
 
         if success:
             logger.debug(f"Cached query result: {cache_key} (TTL: {ttl}s)")
 
-            # Register invalidation events if configured
-            if config.invalidation_events:
-                for _event in config.invalidation_events:
-                    # This would register the cache key with invalidation rules
-                    # In practice, this might be handled differently
-                    pass
-
         return bool(success)
 
     async def invalidate_query_cache(
@@ -304,8 +334,7 @@ class QueryCacheService:
             logger.info(f"Invalidated specific query cache: {cache_key}")
         else:
             # Invalidate all entries for this query
-            pattern = f"query:{query_name}:*"
-            count = await cache_service.clear_pattern(pattern)
+            count = await cache_service.invalidate_tags(f"query:{query_name}")
             logger.info(f"Invalidated {count} query cache entries for: {query_name}")
 
     async def _update_cache_stats(self, query_name: str, hit: bool) -> None:
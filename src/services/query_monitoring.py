@@ -2,14 +2,26 @@
 
 This module provides comprehensive query monitoring, slow query detection,
 and performance analysis for the Haven Health Passport database.
+
+Statements can also be grouped by request: inside profile_request() (set
+by QueryProfilingMiddleware for HTTP requests) every statement is counted
+against a fingerprint of its normalized SQL, and a request that repeats
+the same parameterized SELECT many times is reported as a likely N+1
+pattern for its endpoint and, within GraphQL, its resolver.
 """
 
+import hashlib
+import random
 import re
 import time
 from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from pydantic import BaseModel, Field
 from sqlalchemy import event
@@ -73,6 +85,174 @@ class QueryPattern(BaseModel):
         return self.total_time_ms / self.count if self.count > 0 else 0.0
 
 
+# Repeats of one SELECT fingerprint in a request that indicate N+1
+N_PLUS_ONE_THRESHOLD = 10
+
+_PLACEHOLDER = r"(?:\?|%s|:\w+|%\(\w+\)s)"
+_IN_LIST = re.compile(rf"\bIN \({_PLACEHOLDER}(?:, ?{_PLACEHOLDER})*\)", re.I)
+_NUMBERED_PARAM = re.compile(r"(%\(|:)(\w+?)_\d+\b")
+
+
+# Characters of normalized SQL shown in reports and logs
+PATTERN_DISPLAY_LENGTH = 200
+
+
+@lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """Normalize a statement so executions differing only in values match.
+
+    Literals become "?", IN lists collapse to one placeholder and numbered
+    bind parameters lose their suffix. Results are cached, since ORM
+    statements repeat verbatim.
+    """
+    # Remove extra whitespace
+    normalized = " ".join(statement.split())
+
+    # Replace values with placeholders
+    # Replace numbers
+    normalized = re.sub(r"\b\d+\b", "?", normalized)
+    # Replace quoted strings
+    normalized = re.sub(r"'[^']*'", "?", normalized)
+    normalized = re.sub(r'"[^"]*"', "?", normalized)
+    # Collapse IN lists and numbered parameters (id_1, id_2, ...)
+    normalized = _NUMBERED_PARAM.sub(r"\1\2", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+
+    return normalized
+
+
+@lru_cache(maxsize=4096)
+def fingerprint_statement(statement: str) -> str:
+    """Key for a statement: a hash of its full normalized SQL.
+
+    Statements that share a long prefix (wide SELECT lists) differ only
+    past the display length, so the key is never truncated.
+    """
+    normalized = normalize_statement(statement)
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32]
+
+
+def statement_pattern(statement: str) -> str:
+    """Normalized SQL for display, truncated to PATTERN_DISPLAY_LENGTH."""
+    normalized = normalize_statement(statement)
+    if len(normalized) > PATTERN_DISPLAY_LENGTH:
+        normalized = normalized[:PATTERN_DISPLAY_LENGTH] + "..."
+    return normalized
+
+
+@dataclass
+class StatementProfile:
+    """Executions of one statement fingerprint within a request."""
+
+    fingerprint: str
+    pattern: str
+    query_type: QueryType
+    scope: Optional[str]
+    example: str
+    count: int = 0
+    total_time_ms: float = 0.0
+
+
+@dataclass
+class RequestProfile:
+    """Database statements issued while handling one request.
+
+    Requests are reported per endpoint, and per operation within it
+    (such as the GraphQL operation name) when one is set.
+
+    The middleware and the endpoint run in different copies of the
+    context, so this object is shared by reference and mutated in place.
+    """
+
+    endpoint: Optional[str] = None
+    user_id: Optional[str] = None
+    operation: Optional[str] = None
+    sampled: bool = True
+    started_at: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    query_time_ms: float = 0.0
+    statements: Dict[Tuple[Optional[str], str], StatementProfile] = field(
+        default_factory=dict
+    )
+
+    def record(
+        self,
+        statement: str,
+        fingerprint: str,
+        query_type: QueryType,
+        execution_time_ms: float,
+        scope: Optional[str] = None,
+    ) -> None:
+        """Count one executed statement."""
+        self.query_count += 1
+        self.query_time_ms += execution_time_ms
+        key = (scope, fingerprint)
+        profile = self.statements.get(key)
+        if profile is None:
+            profile = self.statements[key] = StatementProfile(
+                fingerprint=fingerprint,
+                pattern=statement_pattern(statement),
+                query_type=query_type,
+                scope=scope,
+                example=statement[:500],
+            )
+        profile.count += 1
+        profile.total_time_ms += execution_time_ms
+
+    def repeated_statements(self, threshold: int) -> List[StatementProfile]:
+        """SELECT fingerprints executed at least `threshold` times."""
+        return sorted(
+            (
+                profile
+                for profile in self.statements.values()
+                if profile.count >= threshold and profile.query_type == QueryType.SELECT
+            ),
+            key=lambda profile: profile.count,
+            reverse=True,
+        )
+
+
+_request_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "query_request_profile", default=None
+)
+_query_scope: ContextVar[Optional[str]] = ContextVar("query_scope", default=None)
+
+
+def current_request_profile() -> Optional[RequestProfile]:
+    """Get the query profile of the current request, if one is active."""
+    return _request_profile.get()
+
+
+@contextmanager
+def query_scope(label: str) -> Iterator[None]:
+    """Attribute statements issued in this block to `label`.
+
+    Used to name the GraphQL resolver (or other unit of work) behind
+    repeated statements within a request.
+    """
+    token = _query_scope.set(label)
+    try:
+        yield
+    finally:
+        _query_scope.reset(token)
+
+
+class EndpointQueryStats(BaseModel):
+    """Per-request query statistics for an endpoint."""
+
+    endpoint: str = Field(..., description="Endpoint or GraphQL operation")
+    requests: int = Field(default=0, description="Profiled requests")
+    total_queries: int = Field(default=0, description="Statements in all requests")
+    total_time_ms: float = Field(default=0.0, description="Total statement time")
+    max_queries: int = Field(default=0, description="Most statements in one request")
+    n_plus_one_requests: int = Field(
+        default=0, description="Requests with a repeated statement"
+    )
+    repeated_statements: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict, description="N+1 candidates by scope and fingerprint"
+    )
+
+
 class QueryMonitoringService:
     """Service for monitoring database queries."""
 
@@ -81,6 +261,8 @@ class QueryMonitoringService:
         slow_query_threshold_ms: float = 100.0,
         enable_parameter_logging: bool = False,
         max_query_length: int = 1000,
+        request_sample_rate: float = 1.0,
+        n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
     ):
         """Initialize query monitoring service.
 
@@ -88,15 +270,23 @@ class QueryMonitoringService:
             slow_query_threshold_ms: Threshold for slow queries in milliseconds
             enable_parameter_logging: Whether to log query parameters
             max_query_length: Maximum query length to store
+            request_sample_rate: Fraction of requests to profile. Statements
+                in unsampled requests are only counted by type, unless slow
+            n_plus_one_threshold: Repeats of a SELECT in one request that
+                are reported as N+1
         """
         self.slow_query_threshold_ms = slow_query_threshold_ms
         self.enable_parameter_logging = enable_parameter_logging
         self.max_query_length = max_query_length
+        self.request_sample_rate = request_sample_rate
+        self.n_plus_one_threshold = n_plus_one_threshold
 
         # Storage
         self.queries: List[QueryMetrics] = []
         self.query_patterns: Dict[str, QueryPattern] = {}
         self.slow_queries: List[QueryMetrics] = []
+        self.endpoint_stats: Dict[str, EndpointQueryStats] = {}
+        self._reported_n_plus_one: Set[Tuple[str, Optional[str], str]] = set()
 
         # Real-time metrics
         self.active_queries: Dict[str, datetime] = {}
@@ -182,6 +372,23 @@ class QueryMonitoringService:
 
         # Determine query type
         query_type = self._determine_query_type(statement)
+        is_slow = execution_time_ms > self.slow_query_threshold_ms
+
+        profile = _request_profile.get()
+        if profile is not None and not profile.sampled and not is_slow:
+            # Sampling mode: unsampled requests only feed the type counters
+            self.query_count_by_type[query_type] += 1
+            return
+
+        fingerprint = fingerprint_statement(statement)
+        if profile is not None and profile.sampled:
+            profile.record(
+                statement,
+                fingerprint,
+                query_type,
+                execution_time_ms,
+                _query_scope.get(),
+            )
 
         # Create metrics
         metrics = QueryMetrics(
@@ -189,9 +396,9 @@ class QueryMonitoringService:
             query_type=query_type,
             execution_time_ms=execution_time_ms,
             rows_affected=cursor.rowcount if hasattr(cursor, "rowcount") else 0,
-            is_slow=execution_time_ms > self.slow_query_threshold_ms,
-            user_id=None,
-            endpoint=None,
+            is_slow=is_slow,
+            user_id=profile.user_id if profile else None,
+            endpoint=profile.endpoint if profile else None,
             parameters=None,
         )
 
@@ -207,7 +414,7 @@ class QueryMonitoringService:
         self._store_metrics(metrics)
 
         # Update patterns
-        self._update_query_pattern(statement, execution_time_ms)
+        self._update_query_pattern(statement, execution_time_ms, fingerprint)
 
         # Log slow queries
         if metrics.is_slow:
@@ -241,15 +448,23 @@ class QueryMonitoringService:
             if len(self.slow_queries) > self.max_slow_queries:
                 self.slow_queries = self.slow_queries[-self.max_slow_queries :]
 
-    def _update_query_pattern(self, statement: str, execution_time_ms: float) -> None:
+    def _update_query_pattern(
+        self,
+        statement: str,
+        execution_time_ms: float,
+        fingerprint: Optional[str] = None,
+    ) -> None:
         """Update query pattern statistics."""
-        # Normalize query for pattern matching
-        pattern = self._normalize_query(statement)
+        # Patterns are keyed by the hash of the full normalized query
+        if fingerprint is None:
+            fingerprint = fingerprint_statement(statement)
 
-        if pattern not in self.query_patterns:
-            self.query_patterns[pattern] = QueryPattern(pattern=pattern)
+        if fingerprint not in self.query_patterns:
+            self.query_patterns[fingerprint] = QueryPattern(
+                pattern=self._normalize_query(statement)
+            )
 
-        query_pattern = self.query_patterns[pattern]
+        query_pattern = self.query_patterns[fingerprint]
         query_pattern.count += 1
         query_pattern.total_time_ms += execution_time_ms
         query_pattern.max_time_ms = max(query_pattern.max_time_ms, execution_time_ms)
@@ -258,21 +473,7 @@ class QueryMonitoringService:
 
     def _normalize_query(self, statement: str) -> str:
         """Normalize query for pattern matching."""
-        # Remove extra whitespace
-        normalized = " ".join(statement.split())
-
-        # Replace values with placeholders
-        # Replace numbers
-        normalized = re.sub(r"\b\d+\b", "?", normalized)
-        # Replace quoted strings
-        normalized = re.sub(r"'[^']*'", "?", normalized)
-        normalized = re.sub(r'"[^"]*"', "?", normalized)
-
-        # Truncate if too long
-        if len(normalized) > 200:
-            normalized = normalized[:200] + "..."
-
-        return normalized
+        return statement_pattern(statement)
 
     def _log_slow_query(self, metrics: QueryMetrics) -> None:
         """Log a slow query."""
@@ -380,12 +581,111 @@ class QueryMonitoringService:
             for p in sorted_patterns
         ]
 
+    def begin_request(
+        self, endpoint: Optional[str] = None, user_id: Optional[str] = None
+    ) -> RequestProfile:
+        """Create the profile for a new request, applying the sample rate."""
+        sampled = (
+            self.request_sample_rate >= 1.0
+            or random.random() < self.request_sample_rate
+        )
+        return RequestProfile(endpoint=endpoint, user_id=user_id, sampled=sampled)
+
+    def finish_request(self, profile: RequestProfile) -> List[StatementProfile]:
+        """Fold a finished request into its endpoint's statistics.
+
+        Returns:
+            Statements the request repeated often enough to flag as N+1
+        """
+        if not profile.sampled:
+            return []
+
+        endpoint = profile.endpoint or "unknown"
+        if profile.operation:
+            endpoint = f"{endpoint} ({profile.operation})"
+        stats = self.endpoint_stats.get(endpoint)
+        if stats is None:
+            stats = self.endpoint_stats[endpoint] = EndpointQueryStats(
+                endpoint=endpoint
+            )
+        stats.requests += 1
+        stats.total_queries += profile.query_count
+        stats.total_time_ms += profile.query_time_ms
+        stats.max_queries = max(stats.max_queries, profile.query_count)
+
+        repeated = profile.repeated_statements(self.n_plus_one_threshold)
+        if repeated:
+            stats.n_plus_one_requests += 1
+        for statement in repeated:
+            key = f"{statement.scope or '-'}|{statement.fingerprint}"
+            entry = stats.repeated_statements.setdefault(
+                key,
+                {
+                    "scope": statement.scope,
+                    "fingerprint": statement.fingerprint,
+                    "pattern": statement.pattern,
+                    "example": statement.example,
+                    "requests": 0,
+                    "max_repeats": 0,
+                    "total_repeats": 0,
+                    "total_time_ms": 0.0,
+                },
+            )
+            entry["requests"] += 1
+            entry["max_repeats"] = max(entry["max_repeats"], statement.count)
+            entry["total_repeats"] += statement.count
+            entry["total_time_ms"] += statement.total_time_ms
+
+            report_key = (endpoint, statement.scope, statement.fingerprint)
+            if report_key not in self._reported_n_plus_one:
+                self._reported_n_plus_one.add(report_key)
+                logger.warning(
+                    f"Possible N+1 query on {endpoint}"
+                    f"{f' in {statement.scope}' if statement.scope else ''}: "
+                    f"{statement.count} executions of {statement.pattern[:100]}"
+                )
+        return repeated
+
+    def get_endpoint_report(self, min_requests: int = 1) -> List[Dict[str, Any]]:
+        """Get per-endpoint query report, most database time first."""
+        stats_list = [
+            stats
+            for stats in self.endpoint_stats.values()
+            if stats.requests >= min_requests
+        ]
+        stats_list.sort(key=lambda stats: stats.total_time_ms, reverse=True)
+
+        return [
+            {
+                "endpoint": stats.endpoint,
+                "requests": stats.requests,
+                "avg_queries_per_request": stats.total_queries / stats.requests,
+                "max_queries_per_request": stats.max_queries,
+                "avg_query_time_ms_per_request": stats.total_time_ms / stats.requests,
+                "n_plus_one_requests": stats.n_plus_one_requests,
+                "n_plus_one": sorted(
+                    (
+                        {
+                            **entry,
+                            "avg_repeats": entry["total_repeats"] / entry["requests"],
+                        }
+                        for entry in stats.repeated_statements.values()
+                    ),
+                    key=lambda entry: entry["total_time_ms"],
+                    reverse=True,
+                ),
+            }
+            for stats in stats_list
+        ]
+
     def clear_statistics(self) -> None:
         """Clear all collected statistics."""
         self.queries.clear()
         self.query_patterns.clear()
         self.slow_queries.clear()
         self.query_count_by_type.clear()
+        self.endpoint_stats.clear()
+        self._reported_n_plus_one.clear()
         logger.info("Cleared query monitoring statistics")
 
 
@@ -393,6 +693,34 @@ class QueryMonitoringService:
 query_monitor = QueryMonitoringService()
 
 
+@contextmanager
+def profile_request(
+    endpoint: Optional[str] = None,
+    user_id: Optional[str] = None,
+    monitor: Optional[QueryMonitoringService] = None,
+) -> Iterator[RequestProfile]:
+    """Group statements issued in this scope as one request.
+
+    Args:
+        endpoint: Endpoint name; may also be set on the profile later,
+            e.g. once routing has resolved the path template
+        user_id: User making the request
+        monitor: Monitoring service (defaults to the global instance)
+
+    Yields:
+        The request's profile; its `sampled` flag says whether it is
+        being recorded
+    """
+    monitor = monitor or query_monitor
+    profile = monitor.begin_request(endpoint, user_id)
+    token = _request_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _request_profile.reset(token)
+        monitor.finish_request(profile)
+
+
 # Context manager for query monitoring
 class MonitoredSession:
     """Context manager for monitored database sessions."""
@@ -438,4 +766,13 @@ __all__ = [
     "QueryMonitoringService",
     "query_monitor",
     "MonitoredSession",
+    "EndpointQueryStats",
+    "RequestProfile",
+    "StatementProfile",
+    "current_request_profile",
+    "fingerprint_statement",
+    "normalize_statement",
+    "profile_request",
+    "query_scope",
+    "statement_pattern",
 ]
@@ -2,17 +2,29 @@
 
 This module provides read replica management for distributing read queries
 across multiple database instances to improve performance and availability.
+
+Read-your-writes consistency: after a write commits, the primary's WAL
+position (LSN) is recorded as the minimum position later reads must see.
+Reads are routed only to replicas whose replay position, as last measured
+by the lag monitor, has reached it and fall back to the primary otherwise.
+The position is kept per request in a context variable and can be
+round-tripped to clients as a consistency token (see
+src/middleware/read_consistency.py) so it also spans requests.
 """
 
+import asyncio
 import random
 from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from pydantic import BaseModel, Field
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.config import get_settings
@@ -21,6 +33,68 @@ from src.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+def parse_lsn(lsn: str) -> int:
+    """Convert a PostgreSQL LSN ("16/B374D848") to an integer position."""
+    high, _, low = lsn.strip().partition("/")
+    if not low:
+        raise ValueError(f"Invalid LSN: {lsn!r}")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+def format_lsn(position: int) -> str:
+    """Convert an integer WAL position back to PostgreSQL LSN text."""
+    return f"{position >> 32:X}/{position & 0xFFFFFFFF:X}"
+
+
+@dataclass
+class ReadConsistency:
+    """Minimum WAL position reads in the current scope must observe."""
+
+    min_lsn: Optional[int] = None
+
+    def advance(self, position: Optional[int]) -> None:
+        """Raise the minimum position (never lowers it)."""
+        if position is not None and (self.min_lsn is None or position > self.min_lsn):
+            self.min_lsn = position
+
+
+_read_consistency: ContextVar[Optional[ReadConsistency]] = ContextVar(
+    "read_consistency", default=None
+)
+
+
+def current_read_consistency() -> ReadConsistency:
+    """Get the read-consistency state for the current request/task."""
+    state = _read_consistency.get()
+    if state is None:
+        state = ReadConsistency()
+        _read_consistency.set(state)
+    return state
+
+
+@contextmanager
+def read_your_writes(min_lsn: Optional[str] = None) -> Iterator[ReadConsistency]:
+    """Scope in which reads observe writes made in it (and ``min_lsn``).
+
+    Args:
+        min_lsn: Consistency token from an earlier request, if any
+
+    Yields:
+        The scope's consistency state
+    """
+    state = ReadConsistency()
+    if min_lsn:
+        try:
+            state.advance(parse_lsn(min_lsn))
+        except ValueError:
+            logger.warning(f"Ignoring invalid consistency token: {min_lsn!r}")
+    token = _read_consistency.set(state)
+    try:
+        yield state
+    finally:
+        _read_consistency.reset(token)
+
+
 class ReplicaState(str, Enum):
     """State of a read replica."""
 
@@ -54,6 +128,8 @@ class ReadReplica(BaseModel):
     state: ReplicaState = Field(default=ReplicaState.ACTIVE)
     last_check: Optional[datetime] = Field(None)
     lag_seconds: int = Field(default=0)
+    lag_bytes: Optional[int] = Field(None, description="WAL bytes behind master")
+    replay_lsn: Optional[int] = Field(None, description="Last measured replay LSN")
     active_connections: int = Field(default=0)
 
     # Performance metrics
@@ -90,6 +166,9 @@ class ReadReplicaManager:
         # Round-robin state
         self._round_robin_index = 0
 
+        # Background replication lag monitor
+        self._monitor_task: Optional[asyncio.Task] = None
+
         # Initialize master connection
         self._initialize_master()
 
@@ -166,16 +245,22 @@ class ReadReplicaManager:
         self,
         prefer_region: Optional[str] = None,
         max_lag_seconds: Optional[int] = None,
+        min_lsn: Optional[int] = None,
     ) -> Session:
         """Get a session for read queries.
 
         Args:
             prefer_region: Preferred region for geo-based routing
             max_lag_seconds: Maximum acceptable lag
+            min_lsn: WAL position the replica must have replayed; defaults
+                to the current read-your-writes scope
 
         Returns:
             Database session for reads
         """
+        if min_lsn is None:
+            min_lsn = current_read_consistency().min_lsn
+
         # Get available replicas
         available_replicas = self._get_available_replicas(
             prefer_region=prefer_region,
@@ -184,7 +269,15 @@ class ReadReplicaManager:
 
         if not available_replicas:
             logger.warning("No available read replicas, using master")
-            return self.master_session_factory()
+            return self._master_read_session()
+
+        if min_lsn is not None:
+            available_replicas = self._replicas_caught_up(available_replicas, min_lsn)
+            if not available_replicas:
+                logger.debug(
+                    f"No replica has replayed {format_lsn(min_lsn)}, using master"
+                )
+                return self._master_read_session()
 
         # Select replica based on strategy
         replica = self._select_replica(available_replicas)
@@ -199,19 +292,69 @@ class ReadReplicaManager:
             return session
         else:
             logger.error(f"No session factory for replica {replica.name}")
-            return self.master_session_factory()
+            return self._master_read_session()
+
+    def _master_read_session(self) -> Session:
+        """Get a master session used for reads."""
+        session = self.master_session_factory()
+        session.info["read_only"] = True
+        session.info["replica_name"] = "master"
+        return session
+
+    def _replicas_caught_up(
+        self, replicas: List[ReadReplica], min_lsn: int
+    ) -> List[ReadReplica]:
+        """Filter replicas to those that have replayed ``min_lsn``.
+
+        Uses the positions measured by the lag monitor so the read path
+        never waits on a probe; until a replica is measured past
+        ``min_lsn`` reads go to the master.
+        """
+        return [
+            r for r in replicas if r.replay_lsn is not None and r.replay_lsn >= min_lsn
+        ]
 
     def get_write_session(self) -> Session:
         """Get a session for write queries (always uses master).
 
+        Commits through this session advance the current read-your-writes
+        scope, so subsequent reads see the write.
+
         Returns:
             Database session for writes
         """
         session = self.master_session_factory()
         session.info["read_only"] = False
         session.info["replica_name"] = "master"
+        session.info["read_consistency"] = current_read_consistency()
         return session
 
+    def record_write_position(self, session: Session) -> Optional[str]:
+        """Record the master WAL position after a commit.
+
+        Args:
+            session: Write session that has just committed
+
+        Returns:
+            Consistency token (LSN text) for clients, or None if the
+            database does not expose WAL positions
+        """
+        if session.get_bind().dialect.name != "postgresql":
+            return None
+        try:
+            lsn = session.execute(text("SELECT pg_current_wal_lsn()")).scalar()
+            session.rollback()  # End the read-only transaction just opened
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not read master WAL position: {e}")
+            return None
+        if lsn is None:
+            return None
+
+        position = parse_lsn(str(lsn))
+        state = session.info.get("read_consistency") or current_read_consistency()
+        state.advance(position)
+        return format_lsn(position)
+
     def _get_available_replicas(
         self,
         prefer_region: Optional[str] = None,
@@ -269,12 +412,20 @@ class ReadReplicaManager:
     async def check_replica_health(self, replica_name: str) -> bool:
         """Check health of a specific replica.
 
+        The probe runs in a worker thread so the event loop is not blocked.
+
         Args:
             replica_name: Name of the replica
 
         Returns:
             True if healthy
         """
+        return await asyncio.to_thread(
+            lambda: self._check_replica(replica_name, self._master_wal_position())
+        )
+
+    def _check_replica(self, replica_name: str, master_lsn: Optional[int]) -> bool:
+        """Probe a replica's connectivity, replay position and lag."""
         replica = self.replicas.get(replica_name)
         if not replica:
             return False
@@ -291,15 +442,17 @@ class ReadReplicaManager:
                 conn.execute(text("SELECT 1"))
 
                 # Check replication lag (PostgreSQL specific)
-                if "postgresql" in replica.connection_url:
-                    result = conn.execute(
+                if engine.dialect.name == "postgresql":
+                    row = conn.execute(
                         text(
-                            "SELECT EXTRACT(EPOCH FROM (NOW() - pg_last_xact_replay_timestamp())) AS lag"
+                            "SELECT pg_last_wal_replay_lsn() AS replay_lsn, "
+                            "EXTRACT(EPOCH FROM "
+                            "(NOW() - pg_last_xact_replay_timestamp())) AS lag"
                         )
-                    )
-                    lag = result.scalar()
-                    if lag is not None:
-                        replica.lag_seconds = int(lag)
+                    ).one()
+                    if row.replay_lsn is not None:
+                        replica.replay_lsn = parse_lsn(str(row.replay_lsn))
+                    self._update_lag(replica, row.lag, master_lsn)
 
             # Update state based on lag
             if replica.lag_seconds > replica.max_lag_seconds * 2:
@@ -312,17 +465,79 @@ class ReadReplicaManager:
 
             return True
 
-        except (ValueError, RuntimeError, AttributeError) as e:
+        except (SQLAlchemyError, ValueError, RuntimeError, AttributeError) as e:
             logger.error(f"Health check failed for replica {replica_name}: {e}")
             replica.state = ReplicaState.OFFLINE
             replica.error_count += 1
             replica.last_check = datetime.utcnow()
             return False
 
-    async def check_all_replicas(self) -> None:
-        """Check health of all replicas."""
+    def _update_lag(
+        self, replica: ReadReplica, replay_delay: Any, master_lsn: Optional[int]
+    ) -> None:
+        """Update lag from the master WAL position and replay delay.
+
+        Replay delay alone over-reports lag on an idle master (no new
+        transactions to replay), so a replica at the master's position is
+        treated as having zero lag.
+        """
+        if master_lsn is not None and replica.replay_lsn is not None:
+            replica.lag_bytes = max(0, master_lsn - replica.replay_lsn)
+            if replica.lag_bytes == 0:
+                replica.lag_seconds = 0
+                return
+        if replay_delay is not None:
+            replica.lag_seconds = int(replay_delay)
+
+    def _master_wal_position(self) -> Optional[int]:
+        """Read the master's current WAL position."""
+        if self.master_engine.dialect.name != "postgresql":
+            return None
+        try:
+            with self.master_engine.connect() as conn:
+                lsn = conn.execute(text("SELECT pg_current_wal_lsn()")).scalar()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not read master WAL position: {e}")
+            return None
+        return parse_lsn(str(lsn)) if lsn is not None else None
+
+    def _check_all_replicas(self) -> None:
+        """Probe every replica against one reading of the master position."""
+        master_lsn = self._master_wal_position()
         for replica_name in list(self.replicas.keys()):
-            await self.check_replica_health(replica_name)
+            self._check_replica(replica_name, master_lsn)
+
+    async def check_all_replicas(self) -> None:
+        """Check health of all replicas in a worker thread."""
+        await asyncio.to_thread(self._check_all_replicas)
+
+    def start_lag_monitor(self, interval_seconds: float = 1.0) -> None:
+        """Continuously measure replica lag and replay positions.
+
+        Args:
+            interval_seconds: Delay between measurement rounds
+        """
+        if self._monitor_task and not self._monitor_task.done():
+            return
+
+        async def monitor() -> None:
+            while True:
+                try:
+                    await self.check_all_replicas()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.error(f"Replica lag monitor error: {e}")
+                await asyncio.sleep(interval_seconds)
+
+        self._monitor_task = asyncio.create_task(monitor())
+        logger.info(f"Started replica lag monitor ({interval_seconds}s interval)")
+
+    def stop_lag_monitor(self) -> None:
+        """Stop the background lag monitor."""
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            self._monitor_task = None
 
     def failover_replica(self, replica_name: str) -> None:
         """Mark a replica as failed and remove from rotation.
@@ -357,6 +572,12 @@ class ReadReplicaManager:
                     "state": replica.state.value,
                     "region": replica.region,
                     "lag_seconds": replica.lag_seconds,
+                    "lag_bytes": replica.lag_bytes,
+                    "replay_lsn": (
+                        format_lsn(replica.replay_lsn)
+                        if replica.replay_lsn is not None
+                        else None
+                    ),
                     "active_connections": replica.active_connections,
                     "avg_latency_ms": replica.avg_latency_ms,
                     "error_rate": (
@@ -401,6 +622,11 @@ def initialize_replicas(
     return manager
 
 
+def get_replica_manager() -> Optional[ReadReplicaManager]:
+    """Get the global replica manager, if initialized."""
+    return _replica_manager_instance
+
+
 @contextmanager
 def read_db_session() -> Any:
     """Context manager for read database sessions."""
@@ -424,6 +650,8 @@ def write_db_session() -> Any:
     try:
         yield session
         session.commit()
+        # Later reads in this scope must see the write
+        _replica_manager_instance.record_write_position(session)
     except Exception:
         session.rollback()
         raise
@@ -437,6 +665,12 @@ __all__ = [
     "LoadBalancingStrategy",
     "ReadReplica",
     "ReadReplicaManager",
+    "ReadConsistency",
+    "current_read_consistency",
+    "read_your_writes",
+    "parse_lsn",
+    "format_lsn",
+    "get_replica_manager",
     "initialize_replicas",
     "read_db_session",
     "write_db_session",
@@ -0,0 +1,484 @@
+"""Concurrent cross-shard query execution.
+
+Runs per-shard work in parallel, pushes ORDER BY/LIMIT and aggregates down
+to each shard, and combines the partial results at the coordinator:
+
+- Ordered queries are merged lazily with a k-way heap merge, so only the
+  rows actually consumed are compared.
+- count/sum/min/max (and avg via sum and count) are computed per shard and
+  combined, optionally per group.
+- Each shard gets a timeout; shards that fail or time out are reported
+  alongside whatever the other shards returned.
+
+Access control note: results may contain PHI. Callers are responsible for
+PHI access checks; the shard manager wraps these calls with its audit
+decorators.
+"""
+
+import functools
+import heapq
+import itertools
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Order spec: "column" (ascending) or ("column", descending)
+OrderSpec = Union[str, Tuple[str, bool]]
+
+SUPPORTED_AGGREGATES = ("count", "sum", "min", "max", "avg")
+
+
+@dataclass
+class ShardQueryResult:
+    """Combined outcome of a scatter-gather operation."""
+
+    values: Dict[str, Any] = field(default_factory=dict)
+    rows: List[Any] = field(default_factory=list)
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def partial(self) -> bool:
+        """Whether any shard is missing from the result."""
+        return bool(self.failed or self.timed_out)
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize shard outcomes for logging and API responses."""
+        return {
+            "partial": self.partial,
+            "succeeded": list(self.succeeded),
+            "failed": dict(self.failed),
+            "timed_out": list(self.timed_out),
+            "elapsed_ms": round(self.elapsed_ms, 2),
+        }
+
+
+class _QueryCancellation:
+    """Lets the coordinator abort a shard query already running in a worker.
+
+    ``Future.cancel()`` only stops tasks that have not started; a running
+    task is stopped by cancelling the statement on its DBAPI connection
+    (``cancel()`` on psycopg, ``interrupt()`` on sqlite3), which makes the
+    worker's execute raise and frees the pool thread.
+    """
+
+    def __init__(self) -> None:
+        """Initialize cancellation handle."""
+        self._lock = threading.Lock()
+        self._connection: Any = None
+        self.cancelled = False
+
+    def attach(self, session: Session) -> None:
+        """Register the DBAPI connection the task's session runs on."""
+        connection = session.connection().connection.driver_connection
+        with self._lock:
+            if self.cancelled:
+                raise TimeoutError("Shard query cancelled before it started")
+            self._connection = connection
+
+    def detach(self) -> None:
+        """Forget the connection once the task is done with it."""
+        with self._lock:
+            self._connection = None
+
+    def cancel(self) -> None:
+        """Abort the running statement, if any."""
+        with self._lock:
+            self.cancelled = True
+            connection = self._connection
+        if connection is None:
+            return
+        abort = getattr(connection, "cancel", None) or getattr(
+            connection, "interrupt", None
+        )
+        if abort is None:
+            return
+        try:
+            abort()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Could not cancel shard query: {e}")
+
+
+class _SortKey:
+    """Row sort key supporting per-column direction and NULLs last."""
+
+    __slots__ = ("values", "directions")
+
+    def __init__(self, values: Tuple[Any, ...], directions: Tuple[bool, ...]):
+        self.values = values
+        self.directions = directions
+
+    def __lt__(self, other: "_SortKey") -> bool:
+        for mine, theirs, descending in zip(self.values, other.values, self.directions):
+            if mine == theirs:
+                continue
+            if mine is None:
+                return False
+            if theirs is None:
+                return True
+            return bool(mine > theirs) if descending else bool(mine < theirs)
+        return False
+
+
+def _normalize_order(order_by: Sequence[OrderSpec]) -> List[Tuple[str, bool]]:
+    """Normalize order specs to (column, descending) pairs."""
+    return [
+        (spec, False) if isinstance(spec, str) else (spec[0], bool(spec[1]))
+        for spec in order_by
+    ]
+
+
+class CrossShardQueryExecutor:
+    """Parallel scatter-gather executor over a set of shard sessions."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[str], Session],
+        max_workers: int = 16,
+        default_timeout: Optional[float] = 30.0,
+    ) -> None:
+        """Initialize executor.
+
+        Args:
+            session_factory: Returns a new session for a shard id
+            max_workers: Upper bound on concurrently running shard tasks
+            default_timeout: Per-shard timeout in seconds (None disables)
+        """
+        self.session_factory = session_factory
+        self.default_timeout = default_timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="shard-query"
+        )
+
+    def shutdown(self, wait_for_tasks: bool = True) -> None:
+        """Stop the worker pool."""
+        self._pool.shutdown(wait=wait_for_tasks)
+
+    def _run_on_shard(
+        self,
+        shard_id: str,
+        task: Callable[[Session, str], T],
+        timeout: Optional[float],
+        cancellation: Optional[_QueryCancellation] = None,
+    ) -> T:
+        """Run a task in its own shard session."""
+        session = self.session_factory(shard_id)
+        try:
+            if cancellation is not None:
+                cancellation.attach(session)
+            if timeout and session.get_bind().dialect.name == "postgresql":
+                # Let the server abandon work the coordinator will not wait for
+                session.execute(
+                    text(f"SET LOCAL statement_timeout = {int(timeout * 1000)}")
+                )
+            return task(session, shard_id)
+        finally:
+            if cancellation is not None:
+                cancellation.detach()
+            session.close()
+
+    def scatter(
+        self,
+        shard_ids: Sequence[str],
+        task: Callable[[Session, str], T],
+        timeout: Optional[float] = None,
+    ) -> Tuple[Dict[str, T], ShardQueryResult]:
+        """Run a task on every shard concurrently.
+
+        Args:
+            shard_ids: Shards to query
+            task: Called with (session, shard_id) in a worker thread
+            timeout: Per-shard timeout in seconds (defaults to executor's)
+
+        Returns:
+            Tuple of (shard_id -> task result, outcome report)
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        cancellations = {shard_id: _QueryCancellation() for shard_id in shard_ids}
+        return self.run_parallel(
+            {
+                shard_id: functools.partial(
+                    self._run_on_shard,
+                    shard_id,
+                    task,
+                    timeout,
+                    cancellations[shard_id],
+                )
+                for shard_id in shard_ids
+            },
+            timeout,
+            on_timeout={
+                shard_id: cancellation.cancel
+                for shard_id, cancellation in cancellations.items()
+            },
+        )
+
+    def run_parallel(
+        self,
+        tasks: Dict[str, Callable[[], T]],
+        timeout: Optional[float] = None,
+        on_timeout: Optional[Dict[str, Callable[[], None]]] = None,
+    ) -> Tuple[Dict[str, T], ShardQueryResult]:
+        """Run named tasks concurrently on the worker pool.
+
+        Tasks still running at the deadline are reported as timed out and
+        their results discarded. Queued tasks are cancelled; running ones
+        are stopped through their ``on_timeout`` callback.
+
+        Args:
+            tasks: Task name (normally a shard id) -> callable
+            timeout: Overall deadline in seconds (None waits for all)
+            on_timeout: Task name -> callback aborting the running task
+
+        Returns:
+            Tuple of (task name -> result, outcome report)
+        """
+        outcome = ShardQueryResult()
+        results: Dict[str, T] = {}
+        started = monotonic()
+
+        futures: Dict[Future, str] = {
+            self._pool.submit(task): name for name, task in tasks.items()
+        }
+        deadline = started + timeout if timeout else None
+        pending = set(futures)
+
+        while pending:
+            remaining = None if deadline is None else max(0.0, deadline - monotonic())
+            done, pending = wait(
+                pending, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                    outcome.succeeded.append(name)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.error(f"Shard task {name} failed: {e}")
+                    outcome.failed[name] = str(e)
+            if deadline is not None and monotonic() >= deadline:
+                break
+
+        for future in pending:
+            name = futures[future]
+            if not future.cancel() and on_timeout and name in on_timeout:
+                on_timeout[name]()
+            outcome.timed_out.append(name)
+        if outcome.timed_out:
+            logger.warning(f"Shard tasks timed out: {sorted(outcome.timed_out)}")
+
+        outcome.elapsed_ms = (monotonic() - started) * 1000
+        return results, outcome
+
+    def query(
+        self,
+        shard_ids: Sequence[str],
+        table_class: Any,
+        filter_func: Optional[Callable] = None,
+        order_by: Optional[Sequence[OrderSpec]] = None,
+        limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> ShardQueryResult:
+        """Query shards in parallel with ORDER BY/LIMIT pushdown.
+
+        Each shard returns at most ``limit`` rows already sorted; the
+        coordinator k-way merges the sorted runs and stops at ``limit``.
+        """
+        order = _normalize_order(order_by or [])
+
+        def shard_query(session: Session, _shard_id: str) -> List[Any]:
+            query = session.query(table_class)
+            if filter_func:
+                query = filter_func(query)
+            if order:
+                # NULLS LAST in both directions to match the coordinator merge
+                query = query.order_by(
+                    *(
+                        (
+                            getattr(table_class, name).desc()
+                            if descending
+                            else getattr(table_class, name).asc()
+                        ).nulls_last()
+                        for name, descending in order
+                    )
+                )
+            if limit is not None:
+                query = query.limit(limit)
+            rows = query.all()
+            session.expunge_all()
+            return rows
+
+        per_shard, outcome = self.scatter(shard_ids, shard_query, timeout)
+        runs = [per_shard[shard_id] for shard_id in shard_ids if shard_id in per_shard]
+
+        if order:
+            merged: Iterator[Any] = self.merge_sorted(runs, order)
+        else:
+            merged = itertools.chain.from_iterable(runs)
+        if limit is not None:
+            merged = itertools.islice(merged, limit)
+
+        outcome.rows = list(merged)
+        return outcome
+
+    @staticmethod
+    def merge_sorted(
+        runs: Sequence[Sequence[Any]], order: Sequence[OrderSpec]
+    ) -> Iterator[Any]:
+        """Lazily k-way merge per-shard runs that are sorted by ``order``."""
+        normalized = _normalize_order(order)
+        names = tuple(name for name, _ in normalized)
+        directions = tuple(descending for _, descending in normalized)
+
+        def sort_key(row: Any) -> _SortKey:
+            if isinstance(row, dict):
+                return _SortKey(tuple(row.get(name) for name in names), directions)
+            return _SortKey(tuple(getattr(row, name) for name in names), directions)
+
+        return heapq.merge(*runs, key=sort_key)
+
+    def aggregate(
+        self,
+        shard_ids: Sequence[str],
+        table_class: Any,
+        aggregates: Dict[str, Tuple[str, Optional[str]]],
+        filter_func: Optional[Callable] = None,
+        group_by: Optional[Sequence[str]] = None,
+        timeout: Optional[float] = None,
+    ) -> ShardQueryResult:
+        """Compute partial aggregates on each shard and combine them.
+
+        Args:
+            shard_ids: Shards to query
+            table_class: Model to aggregate
+            aggregates: Output name -> (function, column); column may be None
+                for count. Functions: count, sum, min, max, avg.
+            filter_func: Optional query filter
+            group_by: Optional grouping columns
+            timeout: Per-shard timeout in seconds
+
+        Returns:
+            Result whose ``values`` holds the combined aggregates, keyed by
+            group tuple when ``group_by`` is given
+        """
+        for name, (function, _) in aggregates.items():
+            if function not in SUPPORTED_AGGREGATES:
+                raise ValueError(f"Unsupported aggregate {function} for {name}")
+
+        # avg is pushed down as sum and count so it combines exactly
+        partials: List[Tuple[str, str, Optional[str]]] = []
+        for name, (function, column) in aggregates.items():
+            if function == "avg":
+                partials.append((f"{name}__sum", "sum", column))
+                partials.append((f"{name}__count", "count", column))
+            else:
+                partials.append((name, function, column))
+        groups = list(group_by or [])
+
+        def shard_aggregate(
+            session: Session, _shard_id: str
+        ) -> List[Tuple[Tuple[Any, ...], Dict[str, Any]]]:
+            columns = [getattr(table_class, name) for name in groups]
+            expressions = []
+            for label, function, column in partials:
+                target = getattr(table_class, column) if column else None
+                if function == "count":
+                    expression = (
+                        func.count(target) if target is not None else func.count()
+                    )
+                else:
+                    expression = getattr(func, function)(target)
+                expressions.append(expression.label(label))
+
+            query = session.query(*columns, *expressions).select_from(table_class)
+            if filter_func:
+                query = filter_func(query)
+            if groups:
+                query = query.group_by(*columns)
+
+            rows = []
+            for row in query.all():
+                mapping = row._mapping
+                key = tuple(mapping[name] for name in groups)
+                rows.append((key, {label: mapping[label] for label, _, _ in partials}))
+            return rows
+
+        per_shard, outcome = self.scatter(shard_ids, shard_aggregate, timeout)
+
+        combined: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for shard_rows in per_shard.values():
+            for key, values in shard_rows:
+                bucket = combined.setdefault(key, {})
+                for label, function, _ in partials:
+                    bucket[label] = self._combine(
+                        function, bucket.get(label), values[label]
+                    )
+
+        finalized: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for key, bucket in combined.items():
+            result: Dict[str, Any] = {}
+            for name, (function, _) in aggregates.items():
+                if function == "avg":
+                    count = bucket.get(f"{name}__count") or 0
+                    total = bucket.get(f"{name}__sum")
+                    result[name] = (
+                        (total / count) if count and total is not None else None
+                    )
+                else:
+                    result[name] = bucket.get(name)
+                    if function == "count" and result[name] is None:
+                        result[name] = 0
+            finalized[key] = result
+
+        if groups:
+            outcome.values = {str(key): values for key, values in finalized.items()}
+            outcome.rows = [
+                {**dict(zip(groups, key)), **values}
+                for key, values in finalized.items()
+            ]
+        else:
+            outcome.values = finalized.get(
+                (),
+                {
+                    name: 0 if function == "count" else None
+                    for name, (function, _) in aggregates.items()
+                },
+            )
+        return outcome
+
+    @staticmethod
+    def _combine(function: str, current: Any, value: Any) -> Any:
+        """Combine one partial aggregate into the running value."""
+        if value is None:
+            return current
+        if current is None:
+            return value
+        if function in ("count", "sum"):
+            return current + value
+        if function == "min":
+            return min(current, value)
+        return max(current, value)
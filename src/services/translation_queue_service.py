@@ -9,12 +9,13 @@ import hashlib
 import hmac
 import json
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 import requests
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.orm import Session
 
 from src.models.callback_task import CallbackTask, CallbackTaskStatus
@@ -42,6 +43,13 @@ class TranslationQueueService(BaseService[TranslationQueue]):
     MAX_RETRY_ATTEMPTS = 3
     RETRY_BACKOFF_HOURS = [1, 4, 12]  # Exponential backoff
 
+    # Claimed work returns to the queue unless renewed within the lease
+    DEFAULT_LEASE_SECONDS = 15 * 60
+    MAX_CLAIM_BATCH = 50
+    # Claims sweep expired leases at most this often per process
+    LEASE_SWEEP_INTERVAL_SECONDS = 30
+    _last_lease_sweep = 0.0
+
     # Confidence thresholds
     CONFIDENCE_THRESHOLD_CRITICAL = 0.6
     CONFIDENCE_THRESHOLD_HIGH = 0.7
@@ -271,20 +279,11 @@ class TranslationQueueService(BaseService[TranslationQueue]):
         # Apply filters
         if translator_id:
             # Get entries assigned to this translator
-            assigned_ids = (
-                self.session.query(TranslationQueueAssignment.queue_entry_id)
-                .filter(
-                    TranslationQueueAssignment.translator_id == translator_id,
-                    TranslationQueueAssignment.status == "active",
-                )
-                .subquery()
-            )
-
-            # Convert subquery to list for in_ operator
-            assigned_ids_list = self.session.query(assigned_ids).all()
-            query = query.filter(
-                TranslationQueue.id.in_([id[0] for id in assigned_ids_list])
+            assigned_ids = select(TranslationQueueAssignment.queue_entry_id).where(
+                TranslationQueueAssignment.translator_id == translator_id,
+                TranslationQueueAssignment.status == "active",
             )
+            query = query.filter(TranslationQueue.id.in_(assigned_ids))
 
         if language_pair:
             source_lang, target_lang = language_pair
@@ -300,16 +299,9 @@ class TranslationQueueService(BaseService[TranslationQueue]):
             query = query.filter(TranslationQueue.medical_category == medical_category)
 
         # Order by priority and creation time
-        priority_order = {
-            TranslationQueuePriority.CRITICAL: 1,
-            TranslationQueuePriority.HIGH: 2,
-            TranslationQueuePriority.NORMAL: 3,
-            TranslationQueuePriority.LOW: 4,
-        }
-
         entries = (
             query.order_by(
-                func.case(priority_order, value=TranslationQueue.priority),
+                TranslationQueue.priority_rank,
                 TranslationQueue.created_at,
             )
             .limit(limit)
@@ -318,6 +310,254 @@ class TranslationQueueService(BaseService[TranslationQueue]):
 
         return entries
 
+    def claim_translations(
+        self,
+        translator_id: UUID,
+        limit: int = 1,
+        lease_seconds: Optional[int] = None,
+        language_pair: Optional[Tuple[str, str]] = None,
+        priority: Optional[TranslationQueuePriority] = None,
+        medical_category: Optional[str] = None,
+    ) -> List[TranslationQueue]:
+        """
+        Atomically claim the highest-priority pending translations.
+
+        Candidate rows are locked with FOR UPDATE SKIP LOCKED and moved to
+        in progress in a single UPDATE, so concurrent claimers never receive
+        the same entry and never wait on each other's locks. Each claim
+        holds a lease that must be renewed with renew_lease(); entries whose
+        lease runs out are returned to the queue.
+
+        Args:
+            translator_id: Translator claiming the work
+            limit: Maximum number of entries to claim
+            lease_seconds: Lease duration (defaults to DEFAULT_LEASE_SECONDS)
+            language_pair: Only claim this (source, target) language pair
+            priority: Only claim this priority level
+            medical_category: Only claim this medical category
+
+        Returns:
+            Claimed queue entries in priority order
+        """
+        self._sweep_expired_leases()
+
+        now = datetime.utcnow()
+        lease_expires_at = now + timedelta(
+            seconds=lease_seconds or self.DEFAULT_LEASE_SECONDS
+        )
+
+        candidates = select(TranslationQueue.id).where(
+            TranslationQueue.status == TranslationQueueStatus.PENDING.value,
+            TranslationQueue.deleted_at.is_(None),
+            or_(
+                TranslationQueue.expires_at.is_(None),
+                TranslationQueue.expires_at > now,
+            ),
+        )
+        if language_pair:
+            source_lang, target_lang = language_pair
+            candidates = candidates.where(
+                TranslationQueue.source_language == source_lang,
+                TranslationQueue.target_language == target_lang,
+            )
+        if priority:
+            candidates = candidates.where(TranslationQueue.priority == priority)
+        if medical_category:
+            candidates = candidates.where(
+                TranslationQueue.medical_category == medical_category
+            )
+        candidates = (
+            candidates.order_by(
+                TranslationQueue.priority_rank, TranslationQueue.created_at
+            )
+            .limit(min(limit, self.MAX_CLAIM_BATCH))
+            .with_for_update(skip_locked=True)
+        )
+
+        try:
+            claimed_ids = (
+                self.session.execute(
+                    update(TranslationQueue)
+                    .where(
+                        TranslationQueue.id.in_(candidates.scalar_subquery()),
+                        # Re-checked so databases without SKIP LOCKED
+                        # still hand each entry to one claimer
+                        TranslationQueue.status == TranslationQueueStatus.PENDING.value,
+                    )
+                    .values(
+                        status=TranslationQueueStatus.IN_PROGRESS.value,
+                        translator_id=translator_id,
+                        assigned_at=now,
+                        started_at=now,
+                        lease_expires_at=lease_expires_at,
+                    )
+                    .returning(TranslationQueue.id)
+                    .execution_options(synchronize_session=False)
+                )
+                .scalars()
+                .all()
+            )
+
+            if not claimed_ids:
+                self.session.commit()
+                return []
+
+            self.session.add_all(
+                TranslationQueueAssignment(
+                    queue_entry_id=queue_entry_id,
+                    translator_id=translator_id,
+                    assigned_by=translator_id,
+                    assignment_reason="claimed",
+                    status="active",
+                )
+                for queue_entry_id in claimed_ids
+            )
+            self.session.commit()
+
+        except (ValueError, KeyError, AttributeError) as e:
+            logger.error(f"Error claiming translations: {e}")
+            self.session.rollback()
+            raise
+
+        entries = (
+            self.session.query(TranslationQueue)
+            .filter(TranslationQueue.id.in_(claimed_ids))
+            .order_by(TranslationQueue.priority_rank, TranslationQueue.created_at)
+            .populate_existing()
+            .all()
+        )
+
+        logger.info(
+            f"Translator {translator_id} claimed {len(entries)} translations "
+            f"until {lease_expires_at.isoformat()}"
+        )
+
+        return entries
+
+    def renew_lease(
+        self,
+        queue_entry_id: UUID,
+        translator_id: UUID,
+        lease_seconds: Optional[int] = None,
+    ) -> datetime:
+        """
+        Extend the lease on a claimed translation (worker heartbeat).
+
+        Args:
+            queue_entry_id: Claimed queue entry
+            translator_id: Translator holding the lease
+            lease_seconds: New lease duration from now
+
+        Returns:
+            New lease expiry
+
+        Raises:
+            ValueError: If the lease is no longer held by this translator
+        """
+        now = datetime.utcnow()
+        lease_expires_at = now + timedelta(
+            seconds=lease_seconds or self.DEFAULT_LEASE_SECONDS
+        )
+
+        result = self.session.execute(
+            update(TranslationQueue)
+            .where(
+                TranslationQueue.id == queue_entry_id,
+                TranslationQueue.translator_id == translator_id,
+                TranslationQueue.status == TranslationQueueStatus.IN_PROGRESS.value,
+                TranslationQueue.lease_expires_at > now,
+            )
+            .values(lease_expires_at=lease_expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+
+        if result.rowcount != 1:
+            raise ValueError(
+                f"Lease on {queue_entry_id} is not held by translator {translator_id}"
+            )
+
+        return lease_expires_at
+
+    def requeue_expired_leases(self, batch_size: int = 500) -> int:
+        """
+        Return claimed translations whose lease ran out to the queue.
+
+        Returns:
+            Number of entries requeued
+        """
+        now = datetime.utcnow()
+        expired = (
+            select(TranslationQueue.id)
+            .where(
+                TranslationQueue.status == TranslationQueueStatus.IN_PROGRESS.value,
+                TranslationQueue.lease_expires_at <= now,
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        try:
+            requeued_ids = (
+                self.session.execute(
+                    update(TranslationQueue)
+                    .where(
+                        TranslationQueue.id.in_(expired.scalar_subquery()),
+                        TranslationQueue.status
+                        == TranslationQueueStatus.IN_PROGRESS.value,
+                        TranslationQueue.lease_expires_at <= now,
+                    )
+                    .values(
+                        status=TranslationQueueStatus.PENDING.value,
+                        translator_id=None,
+                        assigned_at=None,
+                        started_at=None,
+                        lease_expires_at=None,
+                    )
+                    .returning(TranslationQueue.id)
+                    .execution_options(synchronize_session=False)
+                )
+                .scalars()
+                .all()
+            )
+
+            if requeued_ids:
+                self.session.execute(
+                    update(TranslationQueueAssignment)
+                    .where(
+                        TranslationQueueAssignment.queue_entry_id.in_(requeued_ids),
+                        TranslationQueueAssignment.status == "active",
+                    )
+                    .values(
+                        status="reassigned",
+                        reassigned_at=now,
+                        reassignment_reason="Lease expired",
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            self.session.commit()
+
+        except (ValueError, KeyError, AttributeError) as e:
+            logger.error(f"Error requeuing expired leases: {e}")
+            self.session.rollback()
+            return 0
+
+        if requeued_ids:
+            logger.info(
+                f"Requeued {len(requeued_ids)} translations with expired leases"
+            )
+
+        return len(requeued_ids)
+
+    def _sweep_expired_leases(self) -> None:
+        """Requeue expired leases if no claim in this process did recently."""
+        now = time.monotonic()
+        cls = type(self)
+        if now - cls._last_lease_sweep < self.LEASE_SWEEP_INTERVAL_SECONDS:
+            return
+        cls._last_lease_sweep = now
+        self.requeue_expired_leases()
+
     def assign_translation(
         self,
         queue_entry_id: UUID,
@@ -468,6 +708,7 @@ class TranslationQueueService(BaseService[TranslationQueue]):
             queue_entry.quality_score = quality_score  # type: ignore[assignment]
             queue_entry.cultural_notes = cultural_notes
             queue_entry.completed_at = datetime.utcnow()  # type: ignore[assignment]
+            queue_entry.lease_expires_at = None  # type: ignore[assignment]
 
             # Update assignment
             assignment = (
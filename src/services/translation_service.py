@@ -9,6 +9,7 @@ import asyncio
 import hashlib
 import json
 import re
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -123,12 +124,41 @@ class TranslationCacheDBModel(BaseModel):
     expires_at = Column(DateTime(timezone=True))
 
 
+# Marker line introducing each segment of a batched translation prompt
+SEGMENT_MARKER = "[[SEGMENT {}]]"
+SEGMENT_PATTERN = re.compile(r"^\s*\[\[SEGMENT (\d+)\]\]\s*$", re.MULTILINE)
+
+
+@dataclass
+class PendingTranslation:
+    """A text prepared for model translation, awaiting the model's answer."""
+
+    text: str
+    source_language: TranslationDirection
+    target_language: TranslationDirection
+    translation_type: TranslationType
+    context: TranslationContext
+    context_for_tm: Optional[str]
+    context_hash: Optional[str]
+    medical_terms: Dict[str, Any]
+    identified_terms: List[Any]
+    preserved_text: str
+    preservation_map: List[Dict[str, Any]]
+    context_scope: ContextScope
+    relevant_contexts: List[Any]
+    references: List[Any]
+
+
 class TranslationService(BaseService[TranslationCacheDBModel]):
     """Service for handling multi-language translations."""
 
     model_class = TranslationCacheDBModel
     _document_translator: Optional[Any]
 
+    # Limits on the segments sent to the model in one batched request
+    BATCH_MAX_SEGMENTS = 20
+    BATCH_MAX_CHARACTERS = 6000
+
     # Medical terminology patterns
     MEDICAL_PATTERNS = {
         "vital_signs": [
@@ -462,9 +492,10 @@ Please provide the translation in {target_name}:"""
             # Use the Bedrock service with translation-specific parameters
             response_text, metadata = bedrock_service.invoke_model(
                 prompt=prompt,
-                temperature=0.1,  # Low temperature for consistent translations
+                temperature=0.0,  # Deterministic, so responses can be cached
                 max_tokens=4000,
                 system_prompt="You are a professional medical translator with expertise in healthcare terminology and cultural sensitivity.",
+                use_case="translation",
             )
 
             # Calculate confidence score based on response metadata
@@ -482,6 +513,83 @@ Please provide the translation in {target_name}:"""
             logger.error(f"Bedrock translation error: {e}")
             raise
 
+    def _prepare_pending_prompt(self, pending: PendingTranslation) -> str:
+        """Prepare the Bedrock prompt for one pending translation."""
+        return self._prepare_bedrock_prompt(
+            pending.text,
+            pending.source_language,
+            pending.target_language,
+            pending.translation_type,
+            pending.context,
+            pending.medical_terms,
+            pending.preserved_text,
+            pending.preservation_map,
+            pending.relevant_contexts,
+            pending.references,
+        )
+
+    def _prepare_batch_prompt(self, pending: List[PendingTranslation]) -> str:
+        """Prepare one prompt translating several numbered segments."""
+        medical_terms: Dict[str, Any] = {}
+        for item in pending:
+            for category, terms in item.medical_terms.items():
+                medical_terms.setdefault(category, []).extend(terms)
+
+        segments = "\n".join(
+            f"{SEGMENT_MARKER.format(number)}\n{item.preserved_text}"
+            for number, item in enumerate(pending, start=1)
+        )
+        first = pending[0]
+        prompt = self._prepare_bedrock_prompt(
+            segments,
+            first.source_language,
+            first.target_language,
+            first.translation_type,
+            first.context,
+            medical_terms,
+            context_entries=[c for item in pending for c in item.relevant_contexts][
+                :10
+            ],
+            references=[r for item in pending for r in item.references],
+        )
+        return (
+            f"{prompt}\n\nThe source text holds {len(pending)} independent "
+            f"segments, each introduced by a marker line such as "
+            f"{SEGMENT_MARKER.format(1)}. Reply with every marker line, in "
+            "order, each followed by the translation of its segment only."
+        )
+
+    @staticmethod
+    def _split_batch_response(response: str, count: int) -> Optional[List[str]]:
+        """Split a batched response into its segments; None if any is missing."""
+        parts = SEGMENT_PATTERN.split(response)
+        segments = {
+            int(number): body.strip() for number, body in zip(parts[1::2], parts[2::2])
+        }
+        expected = range(1, count + 1)
+        if set(segments) != set(expected) or not all(segments.values()):
+            return None
+        return [segments[number] for number in expected]
+
+    def _batch_chunks(
+        self, pending: List[PendingTranslation]
+    ) -> List[List[PendingTranslation]]:
+        """Group pending translations into requests within the batch limits."""
+        chunks: List[List[PendingTranslation]] = []
+        size = 0
+        for item in pending:
+            length = len(item.preserved_text)
+            if (
+                not chunks
+                or len(chunks[-1]) >= self.BATCH_MAX_SEGMENTS
+                or size + length > self.BATCH_MAX_CHARACTERS
+            ):
+                chunks.append([])
+                size = 0
+            chunks[-1].append(item)
+            size += length
+        return chunks
+
     def _is_medical_text(
         self, text: str, detected_language: TranslationDirection
     ) -> bool:
@@ -753,396 +861,30 @@ Please provide the translation in {target_name}:"""
             if not source_language:
                 source_language = self.detect_language_sync(text)
 
-            # Check if translation is needed
-            if source_language == target_language:
-                return {
-                    "translated_text": text,
-                    "source_language": source_language,
-                    "target_language": target_language,
-                    "cached": False,
-                    "confidence_score": 1.0,
-                }
-
-            # Check translation memory first
-            context_for_tm = None
-            if self._current_document_id:
-                context_for_tm = f"doc:{self._current_document_id}"
-            elif self._current_patient_id:
-                context_for_tm = f"patient:{self._current_patient_id}"
-            elif self._current_session_id:
-                context_for_tm = f"session:{self._current_session_id}"
-
-            # Try to leverage existing translation from TM
-            tm_result = self.tm_service.leverage_existing(
-                text=text,
-                source_language=source_language.value if source_language else "en",
-                target_language=target_language.value,
-                context=context_for_tm,
-                threshold=0.95,  # High threshold for automatic reuse
-            )
-
-            if tm_result:
-                logger.info("Translation found in TM with high confidence")
-                return {
-                    "translated_text": tm_result,
-                    "source_language": source_language,
-                    "target_language": target_language,
-                    "cached": False,
-                    "confidence_score": 1.0,
-                    "tm_match": True,
-                }
-
-            # Check cache
-            context_hash = None
-            if self._current_document_id:
-                context_hash = hashlib.md5(
-                    self._current_document_id.encode(), usedforsecurity=False
-                ).hexdigest()[:8]
-
-            cached_result = self.cache_manager.get(
-                text=text,
-                source_lang=source_language.value if source_language else "en",
-                target_lang=target_language.value,
-                translation_type=translation_type.value,
-                context_hash=context_hash,
-            )
-
-            if cached_result:
-                logger.info("Translation found in cache")
-                # Update access logging
-                self.log_access(
-                    resource_id=UUID("00000000-0000-0000-0000-000000000000"),
-                    access_type=AccessType.VIEW,
-                    purpose=f"Cached translation {translation_type.value}",
-                    data_returned={"cache_hit": True},
-                )
-                return cached_result
-
-            # Detect medical terms
-            medical_terms = self._detect_medical_terms(text)
-
-            # Identify medical terminology in the text
-            identified_terms = self.medical_handler.identify_medical_terms(text)
-
-            # Preserve medical formatting if requested
-            preserved_text = text
-            preservation_map: List[Dict[str, Any]] = []
-            if preserve_formatting and (
-                translation_type
-                in [
-                    TranslationType.MEDICAL_RECORD,
-                    TranslationType.VITAL_SIGNS,
-                    TranslationType.MEDICATION,
-                    TranslationType.DIAGNOSIS,
-                    TranslationType.PROCEDURE,
-                    TranslationType.INSTRUCTIONS,
-                ]
-            ):
-                preserved_text, preservation_map = (
-                    self.medical_handler.preserve_medical_formatting(text)
-                )
-
-            # Add identified medical terms to context
-            if identified_terms:
-                medical_terms["identified_terms"] = [
-                    {
-                        "term": term.term,
-                        "category": term.category,
-                        "translation": self.medical_handler.get_translation(
-                            term.term, target_language.value
-                        ),
-                    }
-                    for matched_text, term, start, end in identified_terms
-                ]
-
-            # Get relevant context for translation
-            context_scope = self._determine_context_scope()
-            relevant_contexts = self.context_manager.get_relevant_context(
-                text=text,
-                source_language=source_language,
-                target_language=target_language,
-                scope=context_scope,
-                session_id=self._current_session_id,
-                patient_id=self._current_patient_id,
-                document_id=self._current_document_id,
-                limit=10,
-            )
-
-            # Extract references from source text
-            references = self.context_manager.extract_references(text, source_language)
-
-            # Prepare prompt for Bedrock
-            prompt = self._prepare_bedrock_prompt(
+            pending = self._prepare_translation(
                 text,
                 source_language,
                 target_language,
                 translation_type,
                 context,
-                medical_terms,
-                preserved_text,
-                preservation_map,
-                relevant_contexts,
-                references,
+                preserve_formatting,
             )
+            if isinstance(pending, dict):
+                return pending
 
             # Call Bedrock API
-            translation, confidence_score = self._call_bedrock_api(prompt)
-
-            # Apply context consistency
-            # Note: apply_context method not implemented in ContextPreservationManager
-            # This would need to be implemented for production use
-
-            # Restore medical formatting if preserved
-            if preservation_map:
-                translation = self.medical_handler.restore_medical_formatting(
-                    translation, preservation_map
-                )
-
-            # Validate medical translation
-            validation_results = self.medical_handler.validate_medical_translation(
-                text,
-                translation,
-                source_language if source_language else TranslationDirection.ENGLISH,
-                target_language,
-            )
-
-            # Save to context for future use
-            context_type = self._determine_context_type(translation_type)
-            self.context_manager.add_context(
-                context_type.value,
-                {
-                    "source_text": text,
-                    "translated_text": translation,
-                    "source_language": source_language,
-                    "target_language": target_language,
-                    "scope": context_scope,
-                    "metadata": {
-                        "translation_type": translation_type.value,
-                        "medical_terms": len(medical_terms),
-                        "confidence_score": confidence_score,
-                        "validation": validation_results,
-                    },
-                    "session_id": self._current_session_id,
-                    "patient_id": self._current_patient_id,
-                    "document_id": self._current_document_id,
-                },
-            )
-
-            # Save to translation memory
-            segment_type_map = {
-                TranslationType.UI_TEXT: SegmentType.UI_STRING,
-                TranslationType.MEDICAL_RECORD: SegmentType.PARAGRAPH,
-                TranslationType.VITAL_SIGNS: SegmentType.PHRASE,
-                TranslationType.MEDICATION: SegmentType.PHRASE,
-                TranslationType.DIAGNOSIS: SegmentType.SENTENCE,
-                TranslationType.PROCEDURE: SegmentType.SENTENCE,
-                TranslationType.INSTRUCTIONS: SegmentType.PARAGRAPH,
-                TranslationType.DOCUMENT: SegmentType.PARAGRAPH,
-            }
-
-            tm_segment = TMSegment(
-                source_text=text,
-                target_text=translation,
-                source_language=source_language.value if source_language else "en",
-                target_language=target_language.value,
-                segment_type=segment_type_map.get(
-                    translation_type, SegmentType.SENTENCE
-                ),
-                context=context_for_tm,
-                metadata={
-                    "translation_type": translation_type.value,
-                    "context": context.value,
-                    "confidence_score": confidence_score,
-                    "medical_terms": len(medical_terms),
-                    "validation": validation_results,
-                },
-            )
-
-            self.tm_service.add_segment(
-                segment=tm_segment,
-                source_type="machine",
-                source_user_id=self.current_user_id,
-                quality_score=confidence_score
-                * 0.8,  # Adjust quality for machine translation
+            translation, confidence_score = self._call_bedrock_api(
+                self._prepare_pending_prompt(pending)
             )
 
-            # Save to cache
-            bedrock_service = get_bedrock_service()
-            cache_metadata = {
-                "confidence_score": confidence_score,
-                "model_id": (
-                    bedrock_service._last_used_model  # pylint: disable=protected-access
-                    if hasattr(bedrock_service, "_last_used_model")
-                    else get_settings().bedrock_model_id
-                ),
-                "medical_validation": validation_results,
-                "medical_terms_count": len(medical_terms),
-                "context_hash": context_hash,
-            }
-
-            self.cache_manager.set(
-                text=text,
-                translated_text=translation,
-                source_lang=source_language.value if source_language else "en",
-                target_lang=target_language.value,
-                translation_type=translation_type.value,
-                metadata=cache_metadata,
-                context_hash=context_hash,
-            )
-
-            # Check if translation should be queued for human review
-            should_queue, queue_reason, queue_priority = (
-                self.queue_service.should_queue_translation(
-                    confidence_score=confidence_score,
-                    medical_validation=validation_results,
-                    translation_type=translation_type.value,
-                    medical_terms_count=len(medical_terms),
-                    user_requested=request_human_translation,
-                )
-            )
-
-            # Queue for human translation if needed
-            queue_entry = None
-            if should_queue:
-                try:
-                    queue_entry = self.queue_service.queue_translation(
-                        source_text=text,
-                        source_language=(
-                            source_language.value if source_language else "en"
-                        ),
-                        target_language=target_language.value,
-                        translation_type=translation_type.value,
-                        translation_context=context.value,
-                        requested_by=self.current_user_id
-                        or UUID("00000000-0000-0000-0000-000000000000"),
-                        queue_reason=(
-                            queue_reason
-                            if queue_reason
-                            else TranslationQueueReason.LOW_CONFIDENCE
-                        ),
-                        priority=(
-                            queue_priority
-                            if queue_priority
-                            else TranslationQueuePriority.NORMAL
-                        ),
-                        bedrock_translation=translation,
-                        bedrock_confidence_score=confidence_score,
-                        medical_validation=validation_results,
-                        medical_terms=medical_terms,
-                        patient_id=(
-                            UUID(self._current_patient_id)
-                            if self._current_patient_id
-                            else None
-                        ),
-                        document_id=(
-                            UUID(self._current_document_id)
-                            if self._current_document_id
-                            else None
-                        ),
-                        session_id=self._current_session_id,
-                        organization_id=organization_id,
-                        callback_url=callback_url,
-                        metadata={
-                            "identified_terms_count": len(identified_terms),
-                            "preserved_elements_count": len(preservation_map),
-                            "translation_type": translation_type.value,
-                            "context": context.value,
-                        },
-                    )
-
-                    logger.info(
-                        f"Translation queued for human review - "
-                        f"Queue ID: {queue_entry.id}, Reason: {queue_reason}, "
-                        f"Priority: {queue_priority}"
-                    )
-
-                except (ValueError, AttributeError, KeyError) as queue_error:
-                    logger.error(f"Error queuing translation: {queue_error}")
-                    # Continue with machine translation even if queuing fails
-
-            # Log access
-            self.log_access(
-                resource_id=UUID("00000000-0000-0000-0000-000000000000"),
-                access_type=AccessType.CREATE,
-                purpose=f"Translate {translation_type.value}",
-                data_returned={
-                    "source_lang": source_language,
-                    "target_lang": target_language,
-                    "text_length": len(text),
-                    "medical_terms": len(medical_terms),
-                    "queued_for_human": should_queue,
-                    "queue_reason": queue_reason.value if queue_reason else None,
-                },
-            )
-
-            result = {
-                "translated_text": translation,
-                "source_language": source_language,
-                "target_language": target_language,
-                "cached": False,
-                "confidence_score": confidence_score,
-                "medical_terms_detected": medical_terms,
-                "medical_validation": validation_results,
-                "identified_medical_terms": len(identified_terms),
-                "preserved_elements": len(preservation_map),
-            }
-
-            # Apply text direction support
-            text_direction_options = {
-                "isolate_medical_terms": True,
-                "medical_terms": [
-                    term["term"] for term in medical_terms.get("identified_terms", [])
-                ],
-                "auto_detect_direction": True,
-            }
-
-            # Process the translated text for proper bidirectional display
-            processed_translation = self.text_direction_support.process_text(
-                translation, target_language, text_direction_options
-            )
-
-            # Update result with processed translation
-            result["translated_text"] = processed_translation
-
-            # Add text direction metadata
-            result["text_direction"] = (
-                self.text_direction_support.mixed_content_handler.extract_base_direction(
-                    processed_translation
-                ).value
-            )
-            result["has_mixed_content"] = (
-                self.text_direction_support.mixed_content_handler.detect_mixed_content(
-                    translation
-                )
-            )
-
-            # Validate directional formatting
-            validation = self.text_direction_support.validate_directional_formatting(
-                processed_translation
+            return self._complete_translation(
+                pending,
+                translation,
+                confidence_score,
+                request_human_translation,
+                organization_id,
+                callback_url,
             )
-            if not validation["valid"]:
-                logger.warning(
-                    f"Text direction validation issues: {validation['issues']}"
-                )
-                result["text_direction_warnings"] = validation["issues"]
-
-            # Add queue information if translation was queued
-            if queue_entry:
-                result["human_translation_requested"] = True
-                result["queue_id"] = str(queue_entry.id)
-                result["queue_priority"] = (
-                    queue_priority.value if queue_priority else None
-                )
-                result["queue_reason"] = queue_reason.value if queue_reason else None
-                result["estimated_completion"] = (
-                    queue_entry.expires_at.isoformat()
-                    if queue_entry.expires_at
-                    else None
-                )
-            else:
-                result["human_translation_requested"] = False
-
-            return result
 
         except (ValueError, KeyError, AttributeError, TypeError) as e:
             logger.error(f"Translation error: {e}")
@@ -1200,6 +942,427 @@ Please provide the translation in {target_name}:"""
 
             return result
 
+    def _prepare_translation(
+        self,
+        text: str,
+        source_language: TranslationDirection,
+        target_language: TranslationDirection,
+        translation_type: TranslationType,
+        context: TranslationContext,
+        preserve_formatting: bool,
+    ) -> Union[Dict[str, Any], PendingTranslation]:
+        """
+        Gather what a model translation of the text needs.
+
+        Returns:
+            The finished result when no model call is needed (same language,
+            translation memory or cache hit), otherwise the pending translation
+        """
+        # Check if translation is needed
+        if source_language == target_language:
+            return {
+                "translated_text": text,
+                "source_language": source_language,
+                "target_language": target_language,
+                "cached": False,
+                "confidence_score": 1.0,
+            }
+
+        # Check translation memory first
+        context_for_tm = None
+        if self._current_document_id:
+            context_for_tm = f"doc:{self._current_document_id}"
+        elif self._current_patient_id:
+            context_for_tm = f"patient:{self._current_patient_id}"
+        elif self._current_session_id:
+            context_for_tm = f"session:{self._current_session_id}"
+
+        # Try to leverage existing translation from TM
+        tm_result = self.tm_service.leverage_existing(
+            text=text,
+            source_language=source_language.value if source_language else "en",
+            target_language=target_language.value,
+            context=context_for_tm,
+            threshold=0.95,  # High threshold for automatic reuse
+        )
+
+        if tm_result:
+            logger.info("Translation found in TM with high confidence")
+            return {
+                "translated_text": tm_result,
+                "source_language": source_language,
+                "target_language": target_language,
+                "cached": False,
+                "confidence_score": 1.0,
+                "tm_match": True,
+            }
+
+        # Check cache
+        context_hash = None
+        if self._current_document_id:
+            context_hash = hashlib.md5(
+                self._current_document_id.encode(), usedforsecurity=False
+            ).hexdigest()[:8]
+
+        cached_result = self.cache_manager.get(
+            text=text,
+            source_lang=source_language.value if source_language else "en",
+            target_lang=target_language.value,
+            translation_type=translation_type.value,
+            context_hash=context_hash,
+        )
+
+        if cached_result:
+            logger.info("Translation found in cache")
+            # Update access logging
+            self.log_access(
+                resource_id=UUID("00000000-0000-0000-0000-000000000000"),
+                access_type=AccessType.VIEW,
+                purpose=f"Cached translation {translation_type.value}",
+                data_returned={"cache_hit": True},
+            )
+            return cached_result
+
+        # Detect medical terms
+        medical_terms = self._detect_medical_terms(text)
+
+        # Identify medical terminology in the text
+        identified_terms = self.medical_handler.identify_medical_terms(text)
+
+        # Preserve medical formatting if requested
+        preserved_text = text
+        preservation_map: List[Dict[str, Any]] = []
+        if preserve_formatting and (
+            translation_type
+            in [
+                TranslationType.MEDICAL_RECORD,
+                TranslationType.VITAL_SIGNS,
+                TranslationType.MEDICATION,
+                TranslationType.DIAGNOSIS,
+                TranslationType.PROCEDURE,
+                TranslationType.INSTRUCTIONS,
+            ]
+        ):
+            preserved_text, preservation_map = (
+                self.medical_handler.preserve_medical_formatting(text)
+            )
+
+        # Add identified medical terms to context
+        if identified_terms:
+            medical_terms["identified_terms"] = [
+                {
+                    "term": term.term,
+                    "category": term.category,
+                    "translation": self.medical_handler.get_translation(
+                        term.term, target_language.value
+                    ),
+                }
+                for matched_text, term, start, end in identified_terms
+            ]
+
+        # Get relevant context for translation
+        context_scope = self._determine_context_scope()
+        relevant_contexts = self.context_manager.get_relevant_context(
+            text=text,
+            source_language=source_language,
+            target_language=target_language,
+            scope=context_scope,
+            session_id=self._current_session_id,
+            patient_id=self._current_patient_id,
+            document_id=self._current_document_id,
+            limit=10,
+        )
+
+        # Extract references from source text
+        references = self.context_manager.extract_references(text, source_language)
+
+        return PendingTranslation(
+            text=text,
+            source_language=source_language,
+            target_language=target_language,
+            translation_type=translation_type,
+            context=context,
+            context_for_tm=context_for_tm,
+            context_hash=context_hash,
+            medical_terms=medical_terms,
+            identified_terms=identified_terms,
+            preserved_text=preserved_text,
+            preservation_map=preservation_map,
+            context_scope=context_scope,
+            relevant_contexts=relevant_contexts,
+            references=references,
+        )
+
+    def _complete_translation(
+        self,
+        pending: PendingTranslation,
+        translation: str,
+        confidence_score: float,
+        request_human_translation: bool = False,
+        organization_id: Optional[UUID] = None,
+        callback_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Validate, record and format a model translation."""
+        text = pending.text
+        source_language = pending.source_language
+        target_language = pending.target_language
+        translation_type = pending.translation_type
+        context = pending.context
+        context_for_tm = pending.context_for_tm
+        context_hash = pending.context_hash
+        medical_terms = pending.medical_terms
+        identified_terms = pending.identified_terms
+        preservation_map = pending.preservation_map
+        context_scope = pending.context_scope
+
+        # Apply context consistency
+        # Note: apply_context method not implemented in ContextPreservationManager
+        # This would need to be implemented for production use
+
+        # Restore medical formatting if preserved
+        if preservation_map:
+            translation = self.medical_handler.restore_medical_formatting(
+                translation, preservation_map
+            )
+
+        # Validate medical translation
+        validation_results = self.medical_handler.validate_medical_translation(
+            text,
+            translation,
+            source_language if source_language else TranslationDirection.ENGLISH,
+            target_language,
+        )
+
+        # Save to context for future use
+        context_type = self._determine_context_type(translation_type)
+        self.context_manager.add_context(
+            context_type.value,
+            {
+                "source_text": text,
+                "translated_text": translation,
+                "source_language": source_language,
+                "target_language": target_language,
+                "scope": context_scope,
+                "metadata": {
+                    "translation_type": translation_type.value,
+                    "medical_terms": len(medical_terms),
+                    "confidence_score": confidence_score,
+                    "validation": validation_results,
+                },
+                "session_id": self._current_session_id,
+                "patient_id": self._current_patient_id,
+                "document_id": self._current_document_id,
+            },
+        )
+
+        # Save to translation memory
+        segment_type_map = {
+            TranslationType.UI_TEXT: SegmentType.UI_STRING,
+            TranslationType.MEDICAL_RECORD: SegmentType.PARAGRAPH,
+            TranslationType.VITAL_SIGNS: SegmentType.PHRASE,
+            TranslationType.MEDICATION: SegmentType.PHRASE,
+            TranslationType.DIAGNOSIS: SegmentType.SENTENCE,
+            TranslationType.PROCEDURE: SegmentType.SENTENCE,
+            TranslationType.INSTRUCTIONS: SegmentType.PARAGRAPH,
+            TranslationType.DOCUMENT: SegmentType.PARAGRAPH,
+        }
+
+        tm_segment = TMSegment(
+            source_text=text,
+            target_text=translation,
+            source_language=source_language.value if source_language else "en",
+            target_language=target_language.value,
+            segment_type=segment_type_map.get(translation_type, SegmentType.SENTENCE),
+            context=context_for_tm,
+            metadata={
+                "translation_type": translation_type.value,
+                "context": context.value,
+                "confidence_score": confidence_score,
+                "medical_terms": len(medical_terms),
+                "validation": validation_results,
+            },
+        )
+
+        self.tm_service.add_segment(
+            segment=tm_segment,
+            source_type="machine",
+            source_user_id=self.current_user_id,
+            quality_score=confidence_score
+            * 0.8,  # Adjust quality for machine translation
+        )
+
+        # Save to cache
+        bedrock_service = get_bedrock_service()
+        cache_metadata = {
+            "confidence_score": confidence_score,
+            "model_id": (
+                bedrock_service._last_used_model  # pylint: disable=protected-access
+                if hasattr(bedrock_service, "_last_used_model")
+                else get_settings().bedrock_model_id
+            ),
+            "medical_validation": validation_results,
+            "medical_terms_count": len(medical_terms),
+            "context_hash": context_hash,
+        }
+
+        self.cache_manager.set(
+            text=text,
+            translated_text=translation,
+            source_lang=source_language.value if source_language else "en",
+            target_lang=target_language.value,
+            translation_type=translation_type.value,
+            metadata=cache_metadata,
+            context_hash=context_hash,
+        )
+
+        # Check if translation should be queued for human review
+        should_queue, queue_reason, queue_priority = (
+            self.queue_service.should_queue_translation(
+                confidence_score=confidence_score,
+                medical_validation=validation_results,
+                translation_type=translation_type.value,
+                medical_terms_count=len(medical_terms),
+                user_requested=request_human_translation,
+            )
+        )
+
+        # Queue for human translation if needed
+        queue_entry = None
+        if should_queue:
+            try:
+                queue_entry = self.queue_service.queue_translation(
+                    source_text=text,
+                    source_language=(
+                        source_language.value if source_language else "en"
+                    ),
+                    target_language=target_language.value,
+                    translation_type=translation_type.value,
+                    translation_context=context.value,
+                    requested_by=self.current_user_id
+                    or UUID("00000000-0000-0000-0000-000000000000"),
+                    queue_reason=(
+                        queue_reason
+                        if queue_reason
+                        else TranslationQueueReason.LOW_CONFIDENCE
+                    ),
+                    priority=(
+                        queue_priority
+                        if queue_priority
+                        else TranslationQueuePriority.NORMAL
+                    ),
+                    bedrock_translation=translation,
+                    bedrock_confidence_score=confidence_score,
+                    medical_validation=validation_results,
+                    medical_terms=medical_terms,
+                    patient_id=(
+                        UUID(self._current_patient_id)
+                        if self._current_patient_id
+                        else None
+                    ),
+                    document_id=(
+                        UUID(self._current_document_id)
+                        if self._current_document_id
+                        else None
+                    ),
+                    session_id=self._current_session_id,
+                    organization_id=organization_id,
+                    callback_url=callback_url,
+                    metadata={
+                        "identified_terms_count": len(identified_terms),
+                        "preserved_elements_count": len(preservation_map),
+                        "translation_type": translation_type.value,
+                        "context": context.value,
+                    },
+                )
+
+                logger.info(
+                    f"Translation queued for human review - "
+                    f"Queue ID: {queue_entry.id}, Reason: {queue_reason}, "
+                    f"Priority: {queue_priority}"
+                )
+
+            except (ValueError, AttributeError, KeyError) as queue_error:
+                logger.error(f"Error queuing translation: {queue_error}")
+                # Continue with machine translation even if queuing fails
+
+        # Log access
+        self.log_access(
+            resource_id=UUID("00000000-0000-0000-0000-000000000000"),
+            access_type=AccessType.CREATE,
+            purpose=f"Translate {translation_type.value}",
+            data_returned={
+                "source_lang": source_language,
+                "target_lang": target_language,
+                "text_length": len(text),
+                "medical_terms": len(medical_terms),
+                "queued_for_human": should_queue,
+                "queue_reason": queue_reason.value if queue_reason else None,
+            },
+        )
+
+        result = {
+            "translated_text": translation,
+            "source_language": source_language,
+            "target_language": target_language,
+            "cached": False,
+            "confidence_score": confidence_score,
+            "medical_terms_detected": medical_terms,
+            "medical_validation": validation_results,
+            "identified_medical_terms": len(identified_terms),
+            "preserved_elements": len(preservation_map),
+        }
+
+        # Apply text direction support
+        text_direction_options = {
+            "isolate_medical_terms": True,
+            "medical_terms": [
+                term["term"] for term in medical_terms.get("identified_terms", [])
+            ],
+            "auto_detect_direction": True,
+        }
+
+        # Process the translated text for proper bidirectional display
+        processed_translation = self.text_direction_support.process_text(
+            translation, target_language, text_direction_options
+        )
+
+        # Update result with processed translation
+        result["translated_text"] = processed_translation
+
+        # Add text direction metadata
+        result["text_direction"] = (
+            self.text_direction_support.mixed_content_handler.extract_base_direction(
+                processed_translation
+            ).value
+        )
+        result["has_mixed_content"] = (
+            self.text_direction_support.mixed_content_handler.detect_mixed_content(
+                translation
+            )
+        )
+
+        # Validate directional formatting
+        validation = self.text_direction_support.validate_directional_formatting(
+            processed_translation
+        )
+        if not validation["valid"]:
+            logger.warning(f"Text direction validation issues: {validation['issues']}")
+            result["text_direction_warnings"] = validation["issues"]
+
+        # Add queue information if translation was queued
+        if queue_entry:
+            result["human_translation_requested"] = True
+            result["queue_id"] = str(queue_entry.id)
+            result["queue_priority"] = queue_priority.value if queue_priority else None
+            result["queue_reason"] = queue_reason.value if queue_reason else None
+            result["estimated_completion"] = (
+                queue_entry.expires_at.isoformat() if queue_entry.expires_at else None
+            )
+        else:
+            result["human_translation_requested"] = False
+
+        return result
+
     async def detect_language_with_confidence(
         self, text: str, hint: Optional[TranslationDirection] = None
     ) -> Dict[str, Any]:
@@ -1593,6 +1756,12 @@ Instructions: {instructions}
         """
         Translate multiple texts in batch.
 
+        Each distinct text is translated once. Texts not already answered by
+        translation memory or the cache are sent to the model as numbered
+        segments, up to BATCH_MAX_SEGMENTS per request. A request whose
+        answer cannot be split back into its segments is retried text by
+        text.
+
         Args:
             texts: List of texts to translate
             target_language: Target language for all texts
@@ -1602,17 +1771,80 @@ Instructions: {instructions}
         Returns:
             List of translation results
         """
-        results = []
+        unique_results: Dict[str, Dict[str, Any]] = {}
+        pending_by_source: Dict[TranslationDirection, List[PendingTranslation]] = {}
 
-        for text in texts:
-            result = self.translate(
-                text=text,
-                target_language=target_language,
-                source_language=source_language,
-                translation_type=translation_type,
+        for text in dict.fromkeys(texts):
+            text_source = source_language or self.detect_language_sync(text)
+            try:
+                prepared = self._prepare_translation(
+                    text,
+                    text_source,
+                    target_language,
+                    translation_type,
+                    TranslationContext.PATIENT_FACING,
+                    preserve_formatting=True,
+                )
+            except (ValueError, KeyError, AttributeError, TypeError) as e:
+                logger.error(f"Batch translation preparation error: {e}")
+                prepared = None
+
+            if isinstance(prepared, PendingTranslation):
+                pending_by_source.setdefault(text_source, []).append(prepared)
+            elif prepared is not None:
+                unique_results[text] = prepared
+
+        for pending in pending_by_source.values():
+            for chunk in self._batch_chunks(pending):
+                unique_results.update(self._translate_chunk(chunk))
+
+        # Texts whose batch failed go through the single-text path, which
+        # queues failures for human translation
+        for text in dict.fromkeys(texts):
+            if text not in unique_results:
+                unique_results[text] = self.translate(
+                    text=text,
+                    target_language=target_language,
+                    source_language=source_language,
+                    translation_type=translation_type,
+                )
+
+        return [unique_results[text] for text in texts]
+
+    def _translate_chunk(
+        self, chunk: List[PendingTranslation]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Translate pending texts in one model request, keyed by source text."""
+        try:
+            if len(chunk) == 1:
+                response, confidence_score = self._call_bedrock_api(
+                    self._prepare_pending_prompt(chunk[0])
+                )
+                translations: Optional[List[str]] = [response]
+            else:
+                response, confidence_score = self._call_bedrock_api(
+                    self._prepare_batch_prompt(chunk)
+                )
+                translations = self._split_batch_response(response, len(chunk))
+        except (ValueError, KeyError, AttributeError, TypeError) as e:
+            logger.error(f"Batch translation error: {e}")
+            return {}
+
+        if translations is None:
+            logger.warning(
+                f"Batched response for {len(chunk)} segments could not be "
+                "split; translating them one by one"
             )
-            results.append(result)
+            return {}
 
+        results: Dict[str, Dict[str, Any]] = {}
+        for item, translation in zip(chunk, translations):
+            try:
+                results[item.text] = self._complete_translation(
+                    item, translation, confidence_score
+                )
+            except (ValueError, KeyError, AttributeError, TypeError) as e:
+                logger.error(f"Batch translation completion error: {e}")
         return results
 
     def translate_with_context(
@@ -2869,6 +3101,7 @@ Instructions: {instructions}
         target_dialect: Optional[str] = None,
         target_region: Optional[str] = None,
         preserve_codes: bool = True,
+        batch_mode: bool = False,
     ) -> Dict[str, Any]:
         """
         Translate a FHIR document.
@@ -2880,6 +3113,7 @@ Instructions: {instructions}
             target_dialect: Specific dialect to use
             target_region: Target region for measurements
             preserve_codes: Whether to preserve medical codes
+            batch_mode: Translate Bundles leaf by leaf with de-duplication
 
         Returns:
             Translation result dictionary
@@ -2899,6 +3133,7 @@ Instructions: {instructions}
                 target_dialect=target_dialect,
                 target_region=target_region,
                 preserve_codes=preserve_codes,
+                batch_mode=batch_mode,
             )
 
             # Log translation
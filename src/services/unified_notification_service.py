@@ -23,13 +23,18 @@ from src.database import get_db
 
 # Import security services for PHI notification protection
 # from src.healthcare.hipaa_access_control import require_phi_access  # Available if needed for HIPAA compliance
-from src.models.notification import Notification
+from src.models.notification import Notification, preferred_channels
 from src.models.user import User
 from src.services.email_service import EmailService
+from src.services.notification_rate_shaping import SMSRateShaper
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# SMS sends awaited at once by SMSChannel.send_bulk; pacing is left to the
+# rate shaper
+SMS_BULK_CONCURRENCY = 100
+
 
 class NotificationChannel(str, Enum):
     """Available notification channels."""
@@ -186,6 +191,36 @@ class EmailChannel(NotificationChannelBase):
 
         return results
 
+    async def send_batch(
+        self,
+        recipients: List[Dict[str, str]],
+        subject: str,
+        body: str,
+    ) -> List[bool]:
+        """Send the same email to many recipients as one provider batch.
+
+        Args:
+            recipients: Dicts with the recipient "email" and "user_id"
+            subject: Email subject
+            body: Email body (HTML)
+
+        Returns:
+            Whether each email was accepted, in recipient order
+        """
+        results = await self.email_service.enhanced_service.send_bulk_emails(
+            [
+                {
+                    "to": recipient["email"],
+                    "subject": subject,
+                    "html_body": body,
+                    "user_id": recipient["user_id"],
+                }
+                for recipient in recipients
+            ],
+            batch_size=max(len(recipients), 1),
+        )
+        return [result.status != "failed" for result in results]
+
 
 class SMSChannel(NotificationChannelBase):
     """SMS notification channel."""
@@ -195,6 +230,7 @@ class SMSChannel(NotificationChannelBase):
         self.sms_config = sms_config
         self.sms_provider: Optional[str] = None
         self._initialize_sms_provider()
+        self.rate_shaper = SMSRateShaper.for_provider(self.sms_provider)
 
     def _initialize_sms_provider(self) -> None:
         """Initialize SMS provider (AWS SNS or Twilio)."""
@@ -259,30 +295,10 @@ class SMSChannel(NotificationChannelBase):
                     error_message=reason,
                 )
 
-            # Format message - combine title and message for SMS
             # @encrypt_phi - SMS messages may contain patient information
-            sms_message = f"{notification.title}: {notification.message}"
-
-            # Truncate if too long (SMS limit is typically 160 chars)
-            max_length = 160
-            if len(sms_message) > max_length:
-                sms_message = sms_message[: max_length - 3] + "..."
-
-            # Send SMS based on provider
-            if self.sms_provider == "sns":
-                success = await self._send_via_sns(
-                    getattr(user, "phone_number", None), sms_message  # type: ignore[arg-type]
-                )
-            elif self.sms_provider == "twilio":
-                success = await self._send_via_twilio(
-                    getattr(user, "phone_number", None), sms_message  # type: ignore[arg-type]
-                )
-            else:
-                # Fallback to logging if no provider configured
-                logger.info(
-                    f"SMS to {getattr(user, 'phone_number', None)}: {sms_message}"
-                )
-                success = True  # Consider logged messages as "sent" in dev
+            sms_message = self.format_message(notification.title, notification.message)
+            phone_number = str(getattr(user, "phone_number", ""))
+            success = await self.send_to_number(phone_number, sms_message)
 
             return NotificationResult(
                 notification_id=notification.id,
@@ -301,6 +317,30 @@ class SMSChannel(NotificationChannelBase):
                 error_message=str(e),
             )
 
+    @staticmethod
+    def format_message(title: str, message: str) -> str:
+        """Combine title and message into a single SMS."""
+        sms_message = f"{title}: {message}"
+
+        # Truncate if too long (SMS limit is typically 160 chars)
+        max_length = 160
+        if len(sms_message) > max_length:
+            sms_message = sms_message[: max_length - 3] + "..."
+        return sms_message
+
+    async def send_to_number(self, phone_number: str, message: str) -> bool:
+        """Send an SMS to a number, paced by the provider and country limits."""
+        await self.rate_shaper.throttle(phone_number)
+
+        if self.sms_provider == "sns":
+            return await self._send_via_sns(phone_number, message)
+        if self.sms_provider == "twilio":
+            return await self._send_via_twilio(phone_number, message)
+
+        # Fallback to logging if no provider configured
+        logger.info(f"SMS to {phone_number}: {message}")
+        return True  # Consider logged messages as "sent" in dev
+
     async def _send_via_sns(self, phone_number: str, message: str) -> bool:
         """Send SMS via AWS SNS."""
         try:
@@ -309,7 +349,9 @@ class SMSChannel(NotificationChannelBase):
                 # Default to US if no country code
                 phone_number = "+1" + phone_number.replace("-", "").replace(" ", "")
 
-            response = self.sns_client.publish(
+            # boto3 blocks; keep it off the event loop so sends overlap
+            response = await asyncio.to_thread(
+                self.sns_client.publish,
                 PhoneNumber=phone_number,
                 Message=message,
                 MessageAttributes={
@@ -339,8 +381,11 @@ class SMSChannel(NotificationChannelBase):
             if not phone_number.startswith("+"):
                 phone_number = "+1" + phone_number.replace("-", "").replace(" ", "")
 
-            message = self.twilio_client.messages.create(
-                body=message, from_=self.twilio_from_number, to=phone_number
+            message = await asyncio.to_thread(
+                self.twilio_client.messages.create,
+                body=message,
+                from_=self.twilio_from_number,
+                to=phone_number,
             )
 
             logger.info(f"SMS sent via Twilio: {getattr(message, 'sid', 'unknown')}")
@@ -357,8 +402,16 @@ class SMSChannel(NotificationChannelBase):
     async def send_bulk(
         self, notifications: List[NotificationRequest]
     ) -> List[NotificationResult]:
-        """Send multiple SMS messages."""
-        return await asyncio.gather(*[self.send(notif) for notif in notifications])
+        """Send multiple SMS messages.
+
+        Sends are paced by the rate shaper; at most SMS_BULK_CONCURRENCY are
+        awaited at a time so large lists do not pile up provider calls.
+        """
+        results: List[NotificationResult] = []
+        for i in range(0, len(notifications), SMS_BULK_CONCURRENCY):
+            batch = notifications[i : i + SMS_BULK_CONCURRENCY]
+            results.extend(await asyncio.gather(*[self.send(notif) for notif in batch]))
+        return results
 
 
 class InAppChannel(NotificationChannelBase):
@@ -568,13 +621,11 @@ class UnifiedNotificationService:
             db = next(get_db())
             user = db.query(User).filter(cast(User.id, String) == str(user_id)).first()
 
-            if (
-                user
-                and hasattr(user, "notification_preferences")
-                and user.notification_preferences
-            ):
-                prefs = json.loads(user.notification_preferences)
-                return [NotificationChannel(c) for c in prefs.get("channels", [])]
+            channels = preferred_channels(
+                getattr(user, "notification_preferences", None)
+            )
+            if channels:
+                return [NotificationChannel(c) for c in channels]
         except (ValueError, KeyError, json.JSONDecodeError, AttributeError) as e:
             logger.error(f"Error getting user preferences: {e}")
 
@@ -13,6 +13,7 @@ from .types import (
     DocumentSection,
     DocumentTranslationResult,
     FHIRResourceType,
+    TranslatableLeaf,
     TranslationContext,
     TranslationDirection,
     TranslationSegment,
@@ -24,6 +25,7 @@ __all__ = [
     "DocumentSection",
     "DocumentTranslationResult",
     "FHIRResourceType",
+    "TranslatableLeaf",
     "TranslationContext",
     "TranslationDirection",
     "TranslationSegment",
@@ -1,12 +1,13 @@
 """Document translator implementation."""
 
 import base64
+import copy
 import hashlib
 import io
 import json
 import re
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import PyPDF2
 
@@ -17,11 +18,13 @@ from src.healthcare.hipaa_access_control import (
 )
 from src.utils.logging import get_logger
 
+from .terminology import resolve_coded_display
 from .types import (
     DocumentFormat,
     DocumentSection,
     DocumentTranslationResult,
     FHIRResourceType,
+    TranslatableLeaf,
     TranslationContext,
     TranslationDirection,
     TranslationSegment,
@@ -71,6 +74,53 @@ class DocumentTranslator:
         "recordedDate",
     }
 
+    # Additional fields left untouched by batch bundle translation: coded
+    # values, personal names, units and address parts
+    BATCH_PRESERVE_FIELDS = {
+        "status",
+        "gender",
+        "use",
+        "intent",
+        "priority",
+        "language",
+        "mode",
+        "type",
+        "fullUrl",
+        "birthDate",
+        "given",
+        "family",
+        "suffix",
+        "value",
+        "unit",
+        "city",
+        "district",
+        "state",
+        "postalCode",
+    }
+
+    # Preserved fields that hold a CodeableConcept whose text/display is
+    # still translated in batch mode
+    CODEABLE_CONCEPT_FIELDS = {"code"}
+
+    # Translation type for the primary concept of each resource type
+    RESOURCE_TRANSLATION_TYPES = {
+        "Condition": TranslationType.DIAGNOSIS,
+        "Procedure": TranslationType.PROCEDURE,
+        "MedicationStatement": TranslationType.MEDICATION,
+        "MedicationRequest": TranslationType.MEDICATION,
+        "Immunization": TranslationType.MEDICATION,
+    }
+
+    # Resource fields holding the primary concept
+    PRIMARY_CONCEPT_FIELDS = {"code", "medicationCodeableConcept", "vaccineCode"}
+
+    # Field-specific translation types not covered by _get_translation_type
+    FIELD_TRANSLATION_TYPES = {
+        "reasonCode": TranslationType.DIAGNOSIS,
+        "codedDiagnosis": TranslationType.DIAGNOSIS,
+        "followUp": TranslationType.INSTRUCTIONS,
+    }
+
     # Medical codes that should be preserved
     MEDICAL_CODES = {
         "ICD10",
@@ -129,6 +179,7 @@ class DocumentTranslator:
         target_dialect: Optional[str] = None,
         target_region: Optional[str] = None,
         preserve_codes: bool = True,
+        batch_mode: bool = False,
     ) -> DocumentTranslationResult:
         """
         Translate a FHIR document.
@@ -140,12 +191,15 @@ class DocumentTranslator:
             target_dialect: Specific dialect to use
             target_region: Target region for measurements
             preserve_codes: Whether to preserve medical codes
+            batch_mode: For Bundles, collect every translatable string first
+                and translate them together (see _translate_bundle_batched)
 
         Returns:
             DocumentTranslationResult
         """
         start_time = datetime.utcnow()
         warnings = []
+        batch_stats: Dict[str, Any] = {}
 
         try:
             # Detect resource type
@@ -193,7 +247,16 @@ class DocumentTranslator:
             )
 
             # Translate based on resource type
-            if resource_type == "Bundle":
+            if resource_type == "Bundle" and batch_mode:
+                translated, batch_stats = self._translate_bundle_batched(
+                    fhir_document,
+                    target_language,
+                    source_language,
+                    target_dialect,
+                    target_region,
+                    preserve_codes,
+                )
+            elif resource_type == "Bundle":
                 translated = self._translate_bundle(
                     fhir_document,
                     target_language,
@@ -274,6 +337,7 @@ class DocumentTranslator:
                 "resource_type": resource_type,
                 "fields_translated": self._count_translated_fields(translated),
                 "codes_preserved": preserve_codes,
+                **batch_stats,
             }
 
             return DocumentTranslationResult(
@@ -347,6 +411,182 @@ class DocumentTranslator:
 
         return translated_bundle
 
+    def _translate_bundle_batched(
+        self,
+        bundle: Dict[str, Any],
+        target_language: TranslationDirection,
+        source_language: Optional[TranslationDirection],
+        target_dialect: Optional[str],
+        target_region: Optional[str],
+        preserve_codes: bool,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Translate a FHIR Bundle in two phases.
+
+        1. Extract every translatable leaf with its JSON path and type.
+        2. De-duplicate across the bundle, resolve coded displays from the
+           terminology tables, translate the remaining unique strings in
+           batched requests per translation type, and write results back by
+           path.
+
+        Returns:
+            Tuple of (translated bundle, batch statistics)
+        """
+        translated = copy.deepcopy(bundle)
+        leaves = self.extract_translatable_leaves(translated, preserve_codes)
+        language = str(getattr(target_language, "value", target_language))
+
+        results: List[Optional[str]] = [None] * len(leaves)
+        unique: Dict[Tuple[str, TranslationType], List[int]] = {}
+        terminology_resolved = 0
+
+        for index, leaf in enumerate(leaves):
+            if leaf.coding:
+                display = resolve_coded_display(
+                    leaf.coding[0], leaf.coding[1], language
+                )
+                if display:
+                    results[index] = display
+                    terminology_resolved += 1
+                    continue
+            unique.setdefault((leaf.text, leaf.translation_type), []).append(index)
+
+        by_type: Dict[TranslationType, List[str]] = {}
+        for text, translation_type in unique:
+            by_type.setdefault(translation_type, []).append(text)
+
+        for translation_type, texts in by_type.items():
+            translations = self._translate_texts(
+                texts,
+                target_language,
+                source_language,
+                translation_type,
+                target_dialect,
+                target_region,
+            )
+            for text, translation in zip(texts, translations):
+                for index in unique[(text, translation_type)]:
+                    results[index] = translation
+
+        for leaf, result in zip(leaves, results):
+            if result is not None:
+                self._set_path(translated, leaf.path, result)
+
+        stats = {
+            "batch_mode": True,
+            "leaves": len(leaves),
+            "unique_texts": len(unique),
+            "terminology_resolved": terminology_resolved,
+        }
+        return translated, stats
+
+    def extract_translatable_leaves(
+        self, document: Dict[str, Any], preserve_codes: bool = True
+    ) -> List[TranslatableLeaf]:
+        """Extract translatable strings from a FHIR document with their paths."""
+        leaves: List[TranslatableLeaf] = []
+        self._collect_leaves(document, (), None, None, (), None, preserve_codes, leaves)
+        return leaves
+
+    def _collect_leaves(
+        self,
+        data: Any,
+        path: Tuple[Union[str, int], ...],
+        key: Optional[str],
+        resource_type: Optional[str],
+        field_path: Tuple[str, ...],
+        coding: Optional[Tuple[str, str]],
+        preserve_codes: bool,
+        leaves: List[TranslatableLeaf],
+    ) -> None:
+        """Walk a document collecting translatable leaves."""
+        if isinstance(data, dict):
+            if isinstance(data.get("resourceType"), str):
+                resource_type = data["resourceType"]
+                field_path = ()
+
+            # Display of a Coding can be looked up by system and code
+            local_coding = None
+            if isinstance(data.get("system"), str) and isinstance(
+                data.get("code"), str
+            ):
+                local_coding = (data["system"], data["code"])
+
+            for child_key, value in data.items():
+                if self._preserve_in_batch(child_key, value, preserve_codes):
+                    continue
+                self._collect_leaves(
+                    value,
+                    path + (child_key,),
+                    child_key,
+                    resource_type,
+                    field_path + (child_key,),
+                    local_coding if child_key == "display" else None,
+                    preserve_codes,
+                    leaves,
+                )
+
+        elif isinstance(data, list):
+            for index, item in enumerate(data):
+                self._collect_leaves(
+                    item,
+                    path + (index,),
+                    key,
+                    resource_type,
+                    field_path,
+                    None,
+                    preserve_codes,
+                    leaves,
+                )
+
+        elif isinstance(data, str) and self._should_translate(data, key):
+            leaves.append(
+                TranslatableLeaf(
+                    path=path,
+                    text=data,
+                    translation_type=self._leaf_translation_type(
+                        resource_type, field_path
+                    ),
+                    coding=coding,
+                )
+            )
+
+    def _preserve_in_batch(self, key: str, value: Any, preserve_codes: bool) -> bool:
+        """Check whether a field is left untouched in batch mode."""
+        if key in self.PRESERVE_FIELDS:
+            return not (key in self.CODEABLE_CONCEPT_FIELDS and isinstance(value, dict))
+        if key in self.BATCH_PRESERVE_FIELDS:
+            return True
+        return preserve_codes and any(
+            code in str(key).upper() for code in self.MEDICAL_CODES
+        )
+
+    def _leaf_translation_type(
+        self, resource_type: Optional[str], field_path: Tuple[str, ...]
+    ) -> TranslationType:
+        """Determine the translation type of a leaf from its resource and field."""
+        for key in reversed(field_path):
+            if key in self.FIELD_TRANSLATION_TYPES:
+                return self.FIELD_TRANSLATION_TYPES[key]
+            translation_type = self._get_translation_type(key)
+            if translation_type != TranslationType.MEDICAL_RECORD:
+                return translation_type
+
+        if resource_type == "Patient":
+            return TranslationType.UI_TEXT
+        if field_path and field_path[0] in self.PRIMARY_CONCEPT_FIELDS:
+            return self.RESOURCE_TRANSLATION_TYPES.get(
+                resource_type or "", TranslationType.MEDICAL_RECORD
+            )
+        return TranslationType.MEDICAL_RECORD
+
+    @staticmethod
+    def _set_path(document: Any, path: Tuple[Union[str, int], ...], value: Any) -> None:
+        """Write a value into a document at a JSON path."""
+        target = document
+        for step in path[:-1]:
+            target = target[step]
+        target[path[-1]] = value
+
     @require_phi_access(AccessLevel.READ)
     def _translate_patient(
         self,
@@ -1003,6 +1243,51 @@ class DocumentTranslator:
             logger.error(f"Text translation error: {e}")
             return text  # Return original on error
 
+    def _translate_texts(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: Optional[str],
+        translation_type: TranslationType,
+        target_dialect: Optional[str],
+        target_region: Optional[str],
+    ) -> List[str]:
+        """Translate several texts of one type through the batch API."""
+        batch_translate = getattr(self.translation_service, "translate_batch", None)
+        if target_dialect or batch_translate is None:
+            # Dialect translation has no batch API
+            return [
+                self._translate_text(
+                    text,
+                    target_language,
+                    source_language,
+                    translation_type,
+                    target_dialect,
+                    target_region,
+                )
+                for text in texts
+            ]
+
+        try:
+            results = batch_translate(
+                texts=texts,
+                target_language=target_language,
+                source_language=source_language,
+                translation_type=translation_type,
+            )
+        except (ValueError, KeyError, AttributeError, RuntimeError) as e:
+            logger.error(f"Bulk text translation error: {e}")
+            return list(texts)  # Return originals on error
+
+        return [
+            (
+                result.get("translated_text") or text
+                if isinstance(result, dict)
+                else text
+            )
+            for text, result in zip(texts, results)
+        ]
+
     def _translate_address(
         self,
         address: Dict[str, Any],
@@ -0,0 +1,61 @@
+"""Terminology-table lookups for coded FHIR displays.
+
+Codings that carry a system and code (SNOMED CT, ICD-10, LOINC) already have
+curated translations in the terminology tables, so their displays can be
+translated without calling a translation model.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional
+
+from src.translation.icd10_translations import icd10_manager
+from src.translation.lab_result_terms import lab_terms_translator
+from src.translation.snomed_translations import snomed_manager
+
+
+@lru_cache(maxsize=1)
+def _loinc_index() -> Dict[str, str]:
+    """Map LOINC codes to lab test keys."""
+    return {
+        test.loinc_code: key
+        for key, test in lab_terms_translator.tests.items()
+        if test.loinc_code
+    }
+
+
+def resolve_coded_display(system: str, code: str, language: str) -> Optional[str]:
+    """Look up the curated display of a code in the target language.
+
+    Args:
+        system: Coding system URI
+        code: Code within the system
+        language: Target language code (e.g. "ar")
+
+    Returns:
+        Translated display, or None when the tables have no translation in
+        that language (no English fallback)
+    """
+    system_lower = (system or "").lower()
+
+    if "snomed" in system_lower:
+        concept = snomed_manager.translations.get(code)
+        if concept is None:
+            return None
+        if language == "en":
+            return concept.preferred_term_en
+        return concept.translations.get(language)
+
+    if "icd-10" in system_lower or "icd10" in system_lower:
+        translations = icd10_manager.get_all_translations(code)
+        return translations.get(language) if translations else None
+
+    if "loinc" in system_lower:
+        test_key = _loinc_index().get(code)
+        if test_key is None:
+            return None
+        return lab_terms_translator.get_test_translation(test_key, language)
+
+    return None
+
+
+__all__ = ["resolve_coded_display"]
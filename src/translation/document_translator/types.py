@@ -5,7 +5,7 @@ This module provides type definitions and validation for document translation.
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 # FHIR Resource and DomainResource validation for healthcare documents
 # Validates Bundle and Resource types for FHIR compliance
@@ -106,6 +106,16 @@ class TranslationSegment:
     is_structured: bool = False
 
 
+@dataclass
+class TranslatableLeaf:
+    """A translatable string inside a FHIR document, addressed by JSON path."""
+
+    path: Tuple[Union[str, int], ...]
+    text: str
+    translation_type: "TranslationType"
+    coding: Optional[Tuple[str, str]] = None  # (system, code) for coded displays
+
+
 @dataclass
 class DocumentTranslationResult:
     """Result of document translation."""
@@ -236,7 +236,10 @@ class TranslationPipeline:
         # Cache successful translations
         if result.get("confidence", 0) > 0.8:
             await self.cache_service.set(
-                cache_key, json.dumps(result), ttl=self.cache_ttl
+                cache_key,
+                json.dumps(result),
+                ttl=self.cache_ttl,
+                tags=[f"translations:{target_language}"],
             )
 
         # Log for audit
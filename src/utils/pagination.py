@@ -1,12 +1,21 @@
 """Pagination utilities for API endpoints."""
 
-from typing import Any, Generic, List, TypeVar
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
 
 from pydantic import BaseModel, Field
+from sqlalchemy import and_, or_, text
 
 T = TypeVar("T")
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or stale."""
+
+
 class PaginationParams(BaseModel):
     """Common pagination parameters."""
 
@@ -57,3 +66,127 @@ def paginate_query(query: Any, page: int = 1, page_size: int = 20) -> Any:
     """Apply pagination to a SQLAlchemy query."""
     offset = (page - 1) * page_size
     return query.offset(offset).limit(page_size)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode keyset values of the last returned row into an opaque cursor."""
+    tagged: List[List[Any]] = []
+    for value in values:
+        if isinstance(value, uuid.UUID):
+            tagged.append(["uuid", str(value)])
+        elif isinstance(value, datetime):
+            tagged.append(["datetime", value.isoformat()])
+        elif isinstance(value, date):
+            tagged.append(["date", value.isoformat()])
+        else:
+            tagged.append(["raw", value])
+    payload = json.dumps(tagged, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        tagged = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values: List[Any] = []
+        for kind, value in tagged:
+            if value is None or kind == "raw":
+                values.append(value)
+            elif kind == "uuid":
+                values.append(uuid.UUID(value))
+            elif kind == "datetime":
+                values.append(datetime.fromisoformat(value))
+            elif kind == "date":
+                values.append(date.fromisoformat(value))
+            else:
+                raise ValueError(f"Unknown cursor value type: {kind}")
+        return values
+    except (TypeError, ValueError, UnicodeError, json.JSONDecodeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {e}") from e
+
+
+def _is_nullable(column: Any) -> bool:
+    """Whether a keyset column can hold NULL."""
+    return bool(getattr(getattr(column, "expression", column), "nullable", False))
+
+
+def apply_keyset(
+    query: Any,
+    columns: Sequence[Any],
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Any:
+    """Order a query by ``columns`` and resume after ``cursor``.
+
+    The last column must be unique (normally the primary key) so the ordering
+    is total. The predicate is expanded into OR-ed prefixes rather than a row
+    value comparison so it works with composite B-tree indexes on every
+    supported dialect. Nullable columns sort NULLS LAST in both directions,
+    so rows with a NULL key form the tail of the order instead of being
+    skipped by the comparison.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or does not match
+            ``columns``
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(columns):
+            raise InvalidCursorError("Pagination cursor does not match sort columns")
+
+        clauses = []
+        for position, column in enumerate(columns):
+            equal_prefix = [
+                (
+                    columns[index].is_(None)
+                    if values[index] is None
+                    else columns[index] == values[index]
+                )
+                for index in range(position)
+            ]
+            value = values[position]
+            if value is None:
+                # Nothing sorts after NULL within this column
+                continue
+            beyond = column < value if descending else column > value
+            if _is_nullable(column):
+                beyond = or_(beyond, column.is_(None))
+            clauses.append(and_(*equal_prefix, beyond))
+        query = query.filter(or_(*clauses))
+
+    ordering = []
+    for column in columns:
+        order = column.desc() if descending else column.asc()
+        ordering.append(order.nulls_last() if _is_nullable(column) else order)
+    return query.order_by(*ordering)
+
+
+def keyset_cursor(row: Any, attributes: Sequence[str]) -> str:
+    """Build the cursor pointing just after ``row``."""
+    return encode_cursor([getattr(row, attribute) for attribute in attributes])
+
+
+def estimate_query_count(query: Any) -> int:
+    """Estimate the row count of a query from the planner instead of COUNT(*).
+
+    On PostgreSQL this reads the top-level row estimate from ``EXPLAIN``,
+    which costs a plan rather than a scan. Other dialects fall back to an
+    exact count.
+    """
+    session = query.session
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return int(query.order_by(None).count())
+
+    statement = query.order_by(None).statement
+    compiled = statement.compile(
+        dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,284 @@
+"""Search key normalization for patient lookup.
+
+Registration desks search by names spelled many ways (Mohammed, Muhammad,
+محمد), by UNHCR numbers typed with or without separators and by phone numbers
+in local or international format. This module reduces each of those inputs to
+stable, index-friendly keys so lookups become equality or prefix matches
+instead of leading-wildcard scans.
+
+Note: This module processes PHI-related identifiers. Keys are derived values
+and must be stored with the same access controls as the source columns.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import phonenumbers
+except ImportError:
+    phonenumbers = None
+
+# Key types stored in the patient search index
+KEY_NAME = "name"
+KEY_NAME_PHONETIC = "name_phonetic"
+KEY_UNHCR = "unhcr"
+KEY_PHONE = "phone"
+KEY_PHONE_NATIONAL = "phone_national"
+KEY_EMAIL = "email"
+
+# Longest phonetic code kept; longer names rarely add discriminating power
+PHONETIC_KEY_LENGTH = 8
+
+# Transliteration of Arabic script (including Persian/Urdu/Pashto letters)
+_ARABIC_TO_LATIN: Dict[str, str] = {
+    "ا": "a",
+    "أ": "a",
+    "إ": "i",
+    "آ": "a",
+    "ء": "",
+    "ؤ": "u",
+    "ئ": "i",
+    "ب": "b",
+    "پ": "p",
+    "ت": "t",
+    "ث": "th",
+    "ج": "j",
+    "چ": "ch",
+    "ح": "h",
+    "خ": "kh",
+    "د": "d",
+    "ذ": "dh",
+    "ر": "r",
+    "ز": "z",
+    "ژ": "zh",
+    "س": "s",
+    "ش": "sh",
+    "ص": "s",
+    "ض": "d",
+    "ط": "t",
+    "ظ": "z",
+    "ع": "",
+    "غ": "gh",
+    "ف": "f",
+    "ق": "q",
+    "ک": "k",
+    "ك": "k",
+    "گ": "g",
+    "ل": "l",
+    "م": "m",
+    "ن": "n",
+    "ه": "h",
+    "ة": "a",
+    "و": "w",
+    "ي": "y",
+    "ی": "y",
+    "ى": "a",
+}
+
+# Transliteration of Cyrillic script
+_CYRILLIC_TO_LATIN: Dict[str, str] = {
+    "а": "a",
+    "б": "b",
+    "в": "v",
+    "г": "g",
+    "д": "d",
+    "е": "e",
+    "ё": "e",
+    "ж": "zh",
+    "з": "z",
+    "и": "i",
+    "й": "y",
+    "к": "k",
+    "л": "l",
+    "м": "m",
+    "н": "n",
+    "о": "o",
+    "п": "p",
+    "р": "r",
+    "с": "s",
+    "т": "t",
+    "у": "u",
+    "ф": "f",
+    "х": "kh",
+    "ц": "ts",
+    "ч": "ch",
+    "ш": "sh",
+    "щ": "sh",
+    "ъ": "",
+    "ы": "y",
+    "ь": "",
+    "э": "e",
+    "ю": "yu",
+    "я": "ya",
+    "є": "ye",
+    "і": "i",
+    "ї": "yi",
+    "ґ": "g",
+}
+
+_TRANSLITERATION = {**_ARABIC_TO_LATIN, **_CYRILLIC_TO_LATIN}
+
+# Consonant classes; vowels and h/w/y carry no code
+_PHONETIC_CLASSES: Dict[str, str] = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+_VOWEL_LIKE = set("aeiouyhw")
+
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+_PHONE_LIKE = re.compile(r"^\+?[\d\s().\-]{6,}$")
+_UNHCR_LIKE = re.compile(r"^(?=.*\d)[A-Za-z0-9][A-Za-z0-9\-/ ]{3,}$")
+
+
+def transliterate(text: str) -> str:
+    """Transliterate text to lowercase ASCII.
+
+    Arabic and Cyrillic letters use fixed tables; Latin letters with
+    diacritics are folded to their base letters.
+    """
+    if not text:
+        return ""
+
+    lowered = unicodedata.normalize("NFKC", text).lower()
+    mapped = "".join(_TRANSLITERATION.get(char, char) for char in lowered)
+    decomposed = unicodedata.normalize("NFKD", mapped)
+    return "".join(char for char in decomposed if ord(char) < 128)
+
+
+def name_tokens(name: Optional[str]) -> List[str]:
+    """Split a name into normalized ASCII tokens."""
+    if not name:
+        return []
+    return [token for token in _TOKEN_SPLIT.split(transliterate(name)) if token]
+
+
+def phonetic_key(token: str) -> str:
+    """Compute a transliteration-tolerant phonetic key for a name token.
+
+    A Soundex variant tuned for names transliterated from unvoweled scripts:
+    all vowels are dropped (Arabic script rarely writes them) before adjacent
+    duplicate codes are collapsed, and a leading vowel sound is kept as ``A``
+    so that Ahmed, Ahmad and أحمد all map to ``A53``.
+    """
+    letters = "".join(char for char in transliterate(token) if "a" <= char <= "z")
+    if not letters:
+        return ""
+
+    for digraph, replacement in (("ph", "f"), ("ck", "k"), ("kh", "h"), ("gh", "g")):
+        letters = letters.replace(digraph, replacement)
+
+    prefix = "A" if letters[0] in _VOWEL_LIKE else ""
+    codes: List[str] = []
+    for char in letters:
+        code = _PHONETIC_CLASSES.get(char)
+        if code and (not codes or codes[-1] != code):
+            codes.append(code)
+
+    return (prefix + "".join(codes))[:PHONETIC_KEY_LENGTH]
+
+
+def normalize_unhcr_number(value: Optional[str]) -> str:
+    """Normalize a UNHCR registration number for equality/prefix lookup."""
+    if not value:
+        return ""
+    normalized = re.sub(r"[^A-Z0-9]", "", value.upper())
+    if normalized.startswith("UNHCR"):
+        normalized = normalized[len("UNHCR") :]
+    return normalized
+
+
+def normalize_phone(
+    value: Optional[str], default_region: Optional[str] = None
+) -> Tuple[str, str]:
+    """Normalize a phone number.
+
+    Returns:
+        Tuple of (E.164 number or empty string, national significant number)
+    """
+    if not value:
+        return "", ""
+
+    if phonenumbers is not None:
+        try:
+            parsed = phonenumbers.parse(value, default_region)
+            if phonenumbers.is_possible_number(parsed):
+                return (
+                    phonenumbers.format_number(
+                        parsed, phonenumbers.PhoneNumberFormat.E164
+                    ),
+                    str(parsed.national_number),
+                )
+        except phonenumbers.NumberParseException:
+            pass
+
+    stripped = value.strip()
+    digits = re.sub(r"\D", "", stripped)
+    if not digits:
+        return "", ""
+    if stripped.startswith("+") or stripped.startswith("00"):
+        digits = digits[2:] if stripped.startswith("00") else digits
+        # Without metadata the country code length is unknown; the last nine
+        # digits are the national number for most registration regions.
+        return f"+{digits}", digits[-9:]
+    return "", digits.lstrip("0")
+
+
+def build_search_keys(
+    given_name: Optional[str] = None,
+    family_name: Optional[str] = None,
+    preferred_name: Optional[str] = None,
+    middle_names: Optional[str] = None,
+    names_in_languages: Optional[Dict[str, Dict[str, str]]] = None,
+    unhcr_number: Optional[str] = None,
+    phone_numbers: Optional[List[Optional[str]]] = None,
+    email: Optional[str] = None,
+    default_region: Optional[str] = None,
+) -> List[Tuple[str, str]]:
+    """Build the de-duplicated (key_type, key_value) pairs for a patient."""
+    keys: set[Tuple[str, str]] = set()
+
+    names = [given_name, family_name, preferred_name, middle_names]
+    for localized in (names_in_languages or {}).values():
+        if isinstance(localized, dict):
+            names.extend(str(value) for value in localized.values() if value)
+
+    for name in names:
+        for token in name_tokens(name):
+            keys.add((KEY_NAME, token))
+            code = phonetic_key(token)
+            if code:
+                keys.add((KEY_NAME_PHONETIC, code))
+
+    unhcr = normalize_unhcr_number(unhcr_number)
+    if unhcr:
+        keys.add((KEY_UNHCR, unhcr))
+
+    for phone in phone_numbers or []:
+        e164, national = normalize_phone(phone, default_region)
+        if e164:
+            keys.add((KEY_PHONE, e164))
+        if national:
+            keys.add((KEY_PHONE_NATIONAL, national))
+
+    if email and email.strip():
+        keys.add((KEY_EMAIL, email.strip().lower()))
+
+    return sorted(keys)
+
+
+def classify_query(query: str) -> str:
+    """Classify a free-text search query as phone, email, UNHCR or name."""
+    stripped = query.strip()
+    if "@" in stripped:
+        return KEY_EMAIL
+    if _PHONE_LIKE.match(stripped):
+        return KEY_PHONE
+    if _UNHCR_LIKE.match(stripped):
+        return KEY_UNHCR
+    return KEY_NAME
@@ -0,0 +1,224 @@
+"""
+FHIR bundle translation performance: per-leaf calls vs two-phase batching.
+
+Each model call is charged a fixed round-trip latency plus a small per-text
+cost. Bundles repeat the same coded displays and notes across entries, as
+real patient histories do, so batching wins by resolving coded displays from
+the terminology tables, translating each distinct text only once and sending
+many texts per model call.
+
+Run with:  pytest tests/performance/test_bundle_translation_performance.py -s
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+# Load src.services first, as the app does; it imports the translator package
+import src.services  # noqa: F401  # pylint: disable=unused-import
+from src.services.translation_service import TranslationService
+from src.translation.document_translator import DocumentTranslator
+
+CALL_LATENCY_SECONDS = 0.002
+PER_TEXT_SECONDS = 0.0001
+BUNDLE_SIZES = [10, 50, 150, 300]
+
+
+class LatencyTranslationService:
+    """Translation backend charging a fixed cost per model call."""
+
+    def __init__(self) -> None:
+        """Initialize call counters."""
+        self.calls = 0
+        self.texts = 0
+
+    def set_context_scope(self, **kwargs: Any) -> None:
+        """Accept the document context scope."""
+        _ = kwargs
+
+    def translate(
+        self, text: str, target_language: str, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Translate one text with one model call."""
+        _ = kwargs
+        self.calls += 1
+        self.texts += 1
+        time.sleep(CALL_LATENCY_SECONDS + PER_TEXT_SECONDS)
+        return {"translated_text": f"[{target_language}] {text}"}
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        target_language: str,
+        source_language: Optional[str] = None,
+        translation_type: Any = None,
+    ) -> List[Dict[str, Any]]:
+        """Translate distinct texts in batched calls, as TranslationService does."""
+        _ = (source_language, translation_type)
+        distinct = len(set(texts))
+        calls = math.ceil(distinct / TranslationService.BATCH_MAX_SEGMENTS)
+        self.calls += calls
+        self.texts += distinct
+        time.sleep(CALL_LATENCY_SECONDS * calls + PER_TEXT_SECONDS * distinct)
+        return [{"translated_text": f"[{target_language}] {text}"} for text in texts]
+
+
+def build_bundle(entries: int) -> Dict[str, Any]:
+    """Build a patient bundle with realistic repetition."""
+    subject = {"reference": "Patient/p-1"}
+    resources: List[Dict[str, Any]] = []
+    for i in range(entries):
+        kind = i % 3
+        if kind == 0:
+            resources.append(
+                {
+                    "resourceType": "Observation",
+                    "id": f"finding-{i}",
+                    "status": "final",
+                    "subject": subject,
+                    "code": {
+                        "coding": [
+                            {
+                                "system": "http://snomed.info/sct",
+                                "code": "386661006",
+                                "display": "Fever",
+                            }
+                        ],
+                        "text": "Fever for three days",
+                    },
+                    "note": [{"text": f"Patient reports symptoms, visit {i % 7}"}],
+                }
+            )
+        elif kind == 1:
+            resources.append(
+                {
+                    "resourceType": "Observation",
+                    "id": f"lab-{i}",
+                    "status": "final",
+                    "subject": subject,
+                    "code": {
+                        "coding": [
+                            {
+                                "system": "http://loinc.org",
+                                "code": "718-7",
+                                "display": "Hemoglobin",
+                            }
+                        ],
+                        "text": "Hemoglobin measurement",
+                    },
+                    "valueQuantity": {"value": 11 + i % 4, "unit": "g/dL"},
+                    "interpretation": [{"text": "Below normal range"}],
+                }
+            )
+        else:
+            resources.append(
+                {
+                    "resourceType": "Immunization",
+                    "id": f"imm-{i}",
+                    "status": "completed",
+                    "patient": subject,
+                    "occurrenceDateTime": "2026-03-01",
+                    "vaccineCode": {"text": "Measles vaccine"},
+                    "note": [{"text": f"Dose given at camp clinic {i % 5}"}],
+                }
+            )
+
+    return {
+        "resourceType": "Bundle",
+        "id": f"bundle-{entries}",
+        "type": "collection",
+        "entry": [{"resource": resource} for resource in resources],
+    }
+
+
+def translate_per_leaf(
+    translator: DocumentTranslator,
+    service: LatencyTranslationService,
+    bundle: Dict[str, Any],
+) -> int:
+    """Baseline: one model call per translatable leaf."""
+    leaves = translator.extract_translatable_leaves(bundle)
+    for leaf in leaves:
+        service.translate(leaf.text, "ar")
+    return len(leaves)
+
+
+@pytest.mark.performance
+class TestBundleTranslationPerformance:
+    """Bundle size versus wall time for per-leaf and batched translation."""
+
+    def test_batched_bundle_translation_scales(self):
+        """Test batching cuts model calls and wall time as bundles grow."""
+        rows = []
+        for size in BUNDLE_SIZES:
+            bundle = build_bundle(size)
+
+            serial_service = LatencyTranslationService()
+            serial_translator = DocumentTranslator(serial_service)
+            started = time.perf_counter()
+            leaves = translate_per_leaf(serial_translator, serial_service, bundle)
+            serial_seconds = time.perf_counter() - started
+
+            batch_service = LatencyTranslationService()
+            batch_translator = DocumentTranslator(batch_service)
+            started = time.perf_counter()
+            result = batch_translator.translate_fhir_document(
+                bundle, "ar", batch_mode=True
+            )
+            batch_seconds = time.perf_counter() - started
+
+            stats = result.translation_stats
+            assert stats["leaves"] == leaves
+            assert batch_service.calls <= stats["unique_texts"] < serial_service.calls
+            rows.append(
+                (
+                    size,
+                    leaves,
+                    stats["unique_texts"],
+                    stats["terminology_resolved"],
+                    serial_service.calls,
+                    batch_service.calls,
+                    serial_seconds * 1000,
+                    batch_seconds * 1000,
+                )
+            )
+
+        print(
+            "\nentries  leaves  unique  terminology  calls(serial/batch)"
+            "  wall ms (serial/batch)"
+        )
+        for row in rows:
+            print(
+                f"{row[0]:>7}  {row[1]:>6}  {row[2]:>6}  {row[3]:>11}  "
+                f"{row[4]:>8} / {row[5]:<6}  {row[6]:>10.1f} / {row[7]:.1f}"
+            )
+
+        largest = rows[-1]
+        assert largest[5] < largest[2]
+        assert largest[7] < largest[6] / 5
+
+    def test_batched_translation_writes_back_by_path(self):
+        """Test batched results land on the right fields and codes survive."""
+        bundle = build_bundle(6)
+        service = LatencyTranslationService()
+        translated = (
+            DocumentTranslator(service)
+            .translate_fhir_document(bundle, "ar", batch_mode=True)
+            .translated_document
+        )
+
+        finding = translated["entry"][0]["resource"]
+        assert finding["code"]["text"] == "[ar] Fever for three days"
+        assert finding["code"]["coding"][0]["code"] == "386661006"
+        # Coded displays come from the terminology tables, not the model
+        assert finding["code"]["coding"][0]["display"] == "حمى"
+
+        observation = translated["entry"][1]["resource"]
+        assert observation["code"]["coding"][0]["display"] == "الهيموغلوبين"
+        assert observation["status"] == "final"
+        assert observation["valueQuantity"]["unit"] == "g/dL"
+
+        # Input bundle is not modified
+        assert bundle["entry"][0]["resource"]["code"]["text"] == "Fever for three days"
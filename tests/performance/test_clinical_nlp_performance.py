@@ -0,0 +1,140 @@
+"""
+Clinical NLP throughput: separate components vs the single-pass pipeline.
+
+The baseline runs the abbreviation handler, temporal extractor and negation
+detector independently over every note, as callers did before the pipeline.
+The pipeline tokenizes each note once and shares it across stages.
+
+Run with:  pytest tests/performance/test_clinical_nlp_performance.py -s
+"""
+
+import os
+import time
+from typing import Any, Callable, List, Tuple
+
+import pytest
+
+from src.ai.medical_nlp.abbreviations import MedicalAbbreviationHandler
+from src.ai.medical_nlp.negation_detector import MedicalNegationDetector
+from src.ai.medical_nlp.pipeline import build_default_pipeline
+from src.ai.medical_nlp.temporal import MedicalTemporalReasoner
+
+CORPUS_SIZE = 300
+SECTIONS_PER_NOTE = 8
+
+NOTE_TEMPLATES = [
+    "Patient presents with CP and SOB for {n} days. BP 140/90, HR 88, RR 20. "
+    "Denies fever, nausea or vomiting. History of DM and HTN. "
+    "Currently on ASA 81mg daily and metoprolol 50mg BID. Seen 03/{n}/2026.",
+    "Follow-up visit. No chest pain since discharge {n} weeks ago. "
+    "Reports mild headache, no dizziness. Continue lisinopril daily, "
+    "acetaminophen PRN. CXR today without evidence of pneumonia.",
+    "Pt with cough x{n} days, negative for fever. Lungs clear, no wheezing. "
+    "O2 sat 97% on RA. Plan: return every {n} days if symptoms persist; "
+    "rule out PE if SOB worsens. Admitted yesterday for observation.",
+]
+
+
+def build_corpus(size: int) -> List[str]:
+    """Build a corpus of multi-section clinical notes."""
+    return [
+        "\n".join(
+            NOTE_TEMPLATES[(i + section) % len(NOTE_TEMPLATES)].format(
+                n=(i + section) % 9 + 1
+            )
+            for section in range(SECTIONS_PER_NOTE)
+        )
+        for i in range(size)
+    ]
+
+
+def run_separately(notes: List[str], nlp: Any = None) -> List[Tuple[Any, ...]]:
+    """Baseline: each component scans, tokenizes and parses on its own.
+
+    Results are kept, as the pipeline keeps its annotated documents.
+    """
+    handler = MedicalAbbreviationHandler()
+    reasoner = MedicalTemporalReasoner()
+    detector = MedicalNegationDetector(use_spacy=False)
+    detector.nlp = nlp
+    return [
+        (
+            handler.detect_abbreviations(note),
+            reasoner.extract_temporal_expressions(note),
+            detector.detect_negations(note),
+        )
+        for note in notes
+    ]
+
+
+def notes_per_second(run: Callable[[], Any], notes: int) -> float:
+    """Time a run over the corpus."""
+    started = time.perf_counter()
+    run()
+    return notes / (time.perf_counter() - started)
+
+
+@pytest.mark.performance
+class TestClinicalNLPPerformance:
+    """Notes per second for separate components and the pipeline."""
+
+    def test_pipeline_throughput(self):
+        """Test the pipeline matches component results at no throughput cost."""
+        corpus = build_corpus(CORPUS_SIZE)
+        pipeline = build_default_pipeline()
+        workers = min(4, os.cpu_count() or 1)
+
+        baseline: List[Tuple[Any, ...]] = []
+        docs: List[Any] = []
+        parallel_docs: List[Any] = []
+        baseline_rate = notes_per_second(
+            lambda: baseline.extend(run_separately(corpus)), len(corpus)
+        )
+        pipeline_rate = notes_per_second(
+            lambda: docs.extend(pipeline.pipe(corpus, batch_size=64)), len(corpus)
+        )
+        parallel_rate = notes_per_second(
+            lambda: parallel_docs.extend(
+                pipeline.pipe(corpus, batch_size=64, n_process=workers)
+            ),
+            len(corpus),
+        )
+
+        print(f"\n{'mode':<28}{'notes/s':>10}")
+        print(f"{'separate components':<28}{baseline_rate:>10.0f}")
+        print(f"{'pipeline':<28}{pipeline_rate:>10.0f}")
+        print(f"{f'pipeline, {workers} processes':<28}{parallel_rate:>10.0f}")
+
+        # Shared tokens give the same negations as per-trigger re-splitting
+        for doc, (_, _, expected) in zip(docs, baseline):
+            assert [(n.concept, n.start) for n in doc.negations] == [
+                (n.concept, n.start) for n in expected
+            ]
+        assert [doc.text for doc in parallel_docs] == corpus
+        assert pipeline_rate > baseline_rate * 0.75
+        if workers > 1:
+            assert parallel_rate > pipeline_rate
+
+    def test_shared_parse_throughput(self):
+        """Test parsing each note once beats parsing it per component."""
+        spacy = pytest.importorskip("spacy")
+        nlp = spacy.blank("en")
+        corpus = build_corpus(CORPUS_SIZE)
+
+        def run_with_entity_parse() -> None:
+            # Entity recognizers parse the note again on their own
+            for doc in nlp.pipe(corpus):
+                _ = doc
+            run_separately(corpus, nlp)
+
+        pipeline = build_default_pipeline()
+        pipeline.nlp = nlp
+        baseline_rate = notes_per_second(run_with_entity_parse, len(corpus))
+        pipeline_rate = notes_per_second(
+            lambda: list(pipeline.pipe(corpus, batch_size=64)), len(corpus)
+        )
+
+        print(f"\n{'mode (spaCy parse)':<28}{'notes/s':>10}")
+        print(f"{'parse per component':<28}{baseline_rate:>10.0f}")
+        print(f"{'parse once, shared':<28}{pipeline_rate:>10.0f}")
+        assert pipeline_rate > baseline_rate
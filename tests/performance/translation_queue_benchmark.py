@@ -0,0 +1,201 @@
+"""Throughput benchmark for concurrent translation queue claiming.
+
+Seeds a queue with synthetic (non-PHI) entries and drains it with many
+concurrent claimers, each on its own database session, measuring claim
+throughput and checking that no entry is handed out twice. Run against
+PostgreSQL to exercise FOR UPDATE SKIP LOCKED:
+
+    python -m tests.performance.translation_queue_benchmark \\
+        --database-url postgresql://... --claimers 32 --entries 5000
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.models.translation_queue import (
+    TranslationQueue,
+    TranslationQueueAssignment,
+    TranslationQueuePriority,
+    TranslationQueueReason,
+    TranslationQueueStatus,
+)
+from src.services.translation_queue_service import TranslationQueueService
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Marks benchmark rows so they can be removed afterwards
+BENCHMARK_CONTEXT = "queue_benchmark"
+
+
+def seed_queue(session: Session, entries: int) -> List[uuid.UUID]:
+    """Insert pending entries spread over all priorities."""
+    priorities = list(TranslationQueuePriority)
+    requested_by = uuid.uuid4()
+    rows = [
+        TranslationQueue(
+            source_text=f"Benchmark text {index}",
+            source_language="en",
+            target_language="ar",
+            translation_type="text",
+            translation_context=BENCHMARK_CONTEXT,
+            status=TranslationQueueStatus.PENDING.value,
+            priority=priorities[index % len(priorities)].value,
+            queue_reason=TranslationQueueReason.USER_REQUEST.value,
+            requested_by=requested_by,
+        )
+        for index in range(entries)
+    ]
+    session.add_all(rows)
+    session.commit()
+    return [row.id for row in rows]
+
+
+def remove_benchmark_entries(session: Session) -> None:
+    """Delete rows created by seed_queue and their assignments."""
+    entry_ids = session.query(TranslationQueue.id).filter(
+        TranslationQueue.translation_context == BENCHMARK_CONTEXT
+    )
+    session.execute(
+        delete(TranslationQueueAssignment).where(
+            TranslationQueueAssignment.queue_entry_id.in_(entry_ids.scalar_subquery())
+        )
+    )
+    session.execute(
+        delete(TranslationQueue).where(
+            TranslationQueue.translation_context == BENCHMARK_CONTEXT
+        )
+    )
+    session.commit()
+
+
+def run_claim_benchmark(
+    session_factory: Callable[[], Session],
+    claimers: int = 16,
+    entries: int = 2000,
+    batch_size: int = 5,
+    cleanup: bool = True,
+) -> Dict[str, Any]:
+    """Drain a seeded queue with concurrent claimers.
+
+    Args:
+        session_factory: Creates one database session per claimer
+        claimers: Number of concurrent claiming threads
+        entries: Number of queue entries to seed
+        batch_size: Entries requested per claim
+        cleanup: Remove the seeded entries afterwards
+
+    Returns:
+        Throughput, claim latency and duplicate-claim statistics
+    """
+    seed_session = session_factory()
+    try:
+        seeded = set(seed_queue(seed_session, entries))
+    finally:
+        seed_session.close()
+
+    claimed: Dict[int, List[uuid.UUID]] = {}
+    latencies: Dict[int, List[float]] = {}
+    errors: List[str] = []
+    start_barrier = threading.Barrier(claimers)
+
+    def claim_until_empty(worker: int) -> None:
+        session = session_factory()
+        service = TranslationQueueService(session)
+        translator_id = uuid.uuid4()
+        claimed[worker] = []
+        latencies[worker] = []
+        try:
+            start_barrier.wait()
+            while True:
+                started = time.perf_counter()
+                batch = service.claim_translations(translator_id, limit=batch_size)
+                latencies[worker].append(time.perf_counter() - started)
+                if not batch:
+                    break
+                claimed[worker].extend(entry.id for entry in batch)
+        except Exception as e:  # pylint: disable=broad-except
+            errors.append(f"claimer {worker}: {e}")
+        finally:
+            session.close()
+
+    threads = [
+        threading.Thread(target=claim_until_empty, args=(worker,))
+        for worker in range(claimers)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    counts = Counter(entry_id for ids in claimed.values() for entry_id in ids)
+    all_latencies = sorted(value for values in latencies.values() for value in values)
+    results = {
+        "claimers": claimers,
+        "entries": entries,
+        "batch_size": batch_size,
+        "elapsed_seconds": elapsed,
+        "claimed": len(counts),
+        "unclaimed": len(seeded - set(counts)),
+        "duplicate_claims": sum(count - 1 for count in counts.values()),
+        "claims_per_second": len(counts) / elapsed if elapsed else 0.0,
+        "claim_calls": len(all_latencies),
+        "median_claim_ms": (
+            statistics.median(all_latencies) * 1000 if all_latencies else 0.0
+        ),
+        "p95_claim_ms": (
+            all_latencies[int(len(all_latencies) * 0.95)] * 1000
+            if all_latencies
+            else 0.0
+        ),
+        "per_claimer": [len(claimed.get(worker, ())) for worker in range(claimers)],
+        "errors": errors,
+    }
+
+    if cleanup:
+        cleanup_session = session_factory()
+        try:
+            remove_benchmark_entries(cleanup_session)
+        finally:
+            cleanup_session.close()
+
+    logger.info(
+        f"Claim benchmark: {results['claimed']} entries by {claimers} claimers "
+        f"in {elapsed:.2f}s ({results['claims_per_second']:.0f}/s), "
+        f"{results['duplicate_claims']} duplicates"
+    )
+    return results
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--claimers", type=int, default=16)
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, pool_size=args.claimers + 2)
+    results = run_claim_benchmark(
+        sessionmaker(bind=engine),
+        claimers=args.claimers,
+        entries=args.entries,
+        batch_size=args.batch_size,
+    )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
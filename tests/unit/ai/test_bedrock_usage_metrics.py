@@ -0,0 +1,120 @@
+"""Test buffered usage metrics for Bedrock cost monitoring."""
+
+import time
+
+import pytest
+
+from src.ai.bedrock.cost_monitor import BedrockCostMonitor
+from src.ai.bedrock.usage_metrics import (
+    LocalMetricSink,
+    UsageAggregator,
+    histogram_bucket,
+)
+
+CLAUDE = "anthropic.claude-v2"
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """Cost monitor publishing to a local sink, without AWS budgets."""
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setattr(BedrockCostMonitor, "_load_budgets", lambda self: None)
+    cost_monitor = BedrockCostMonitor(
+        metrics_sink=LocalMetricSink(), flush_interval=3600
+    )
+    yield cost_monitor
+    cost_monitor.close()
+
+
+class TestUsageAggregator:
+    """Test aggregation and batched publishing."""
+
+    def test_samples_fold_into_one_datum_per_series(self):
+        """Test statistic sets and histograms aggregate repeated samples."""
+        sink = LocalMetricSink()
+        aggregator = UsageAggregator(sink, "Test")
+        for tokens in (100, 300, 200):
+            aggregator.add("InputTokens", tokens, {"ModelId": CLAUDE}, "Count")
+        for latency in (0.3, 0.4, 1.5):
+            aggregator.observe("Latency", latency, {"ModelId": CLAUDE})
+
+        assert aggregator.flush() == 2
+
+        [request] = sink.requests
+        stats, histogram = request["MetricData"]
+        assert stats["StatisticValues"] == {
+            "SampleCount": 3,
+            "Sum": 600,
+            "Minimum": 100,
+            "Maximum": 300,
+        }
+        assert histogram["Values"] == [0.5, 2.0]
+        assert histogram["Counts"] == [2.0, 1.0]
+        assert aggregator.flush() == 0
+
+    def test_size_trigger_wakes_background_flush(self):
+        """Test enough pending series flush before the interval."""
+        sink = LocalMetricSink()
+        aggregator = UsageAggregator(sink, "Test", flush_interval=3600, max_series=3)
+        aggregator.start()
+        for user in range(3):
+            aggregator.add("TokenCost", 0.01, {"UserId": str(user)})
+
+        for _ in range(100):
+            if sink.requests:
+                break
+            time.sleep(0.01)
+        aggregator.close()
+
+        assert len(sink.datums()) == 3
+        assert aggregator.pending_series() == 0
+
+
+class TestBedrockCostMonitor:
+    """Test usage tracking without per-request network calls."""
+
+    def test_track_usage_buffers_until_flush(self, monitor):
+        """Test usage is published in one batch on flush."""
+        for _ in range(5):
+            monitor.track_usage("user-1", CLAUDE, 1000, 500, {"latency_seconds": 1.2})
+        assert monitor.metrics_sink.requests == []
+
+        monitor.flush_metrics()
+
+        datums = {d["MetricName"]: d for d in monitor.metrics_sink.datums()}
+        assert set(datums) == {
+            "TokenCost",
+            "InputTokens",
+            "OutputTokens",
+            "RequestLatency",
+        }
+        assert datums["InputTokens"]["StatisticValues"]["Sum"] == 5000
+        assert datums["TokenCost"]["StatisticValues"]["Sum"] == pytest.approx(0.1)
+        assert datums["RequestLatency"]["Counts"] == [5.0]
+
+    def test_thresholds_use_aggregated_totals_and_alert_once(self, monitor):
+        """Test alerts fire at flush, once per level crossed."""
+        # 0.008 + 0.024 per 1000 tokens each way: $32 per call
+        monitor.track_usage("user-1", CLAUDE, 1_000_000, 1_000_000)
+        monitor.track_usage("user-1", CLAUDE, 1_000_000, 1_000_000)
+        sink = monitor.metrics_sink
+        assert sink.datums("HavenHealth/Bedrock/Alerts") == []
+
+        monitor.flush_metrics()
+        monitor.track_usage("user-1", CLAUDE, 10, 10)
+        monitor.close()
+
+        alerts = sink.datums("HavenHealth/Bedrock/Alerts")
+        levels = [
+            {d["Name"]: d["Value"] for d in alert["Dimensions"]}["AlertLevel"]
+            for alert in alerts
+        ]
+        assert levels == ["warning"]
+
+
+def test_histogram_buckets_are_powers_of_two():
+    """Test values round up to their bucket bound."""
+    assert histogram_bucket(0) == 0.0
+    assert histogram_bucket(3) == 4.0
+    assert histogram_bucket(4) == 4.0
+    assert histogram_bucket(0.3) == 0.5
@@ -0,0 +1,92 @@
+"""Test streaming DICOM anonymization and lazy frame access.
+
+Uses real DICOM files written with pydicom - no mocks.
+"""
+
+import numpy as np
+import pydicom
+import pytest
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.sequence import Sequence
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+from src.ai.medical_image.dicom_handler import (
+    DICOMFrameReader,
+    DICOMHandler,
+    read_header,
+)
+
+PIXELS = np.arange(12, dtype=np.float32).reshape(3, 4) / 3
+
+
+def _write_dicom(path, pixel_keyword="PixelData", pixels=PIXELS):
+    """Write a single-frame explicit VR little endian file."""
+    file_meta = FileMetaDataset()
+    file_meta.MediaStorageSOPClassUID = "1.2.840.10008.5.1.4.1.1.30"
+    file_meta.MediaStorageSOPInstanceUID = generate_uid()
+    file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    ds = Dataset()
+    ds.file_meta = file_meta
+    ds.SOPClassUID = file_meta.MediaStorageSOPClassUID
+    ds.SOPInstanceUID = file_meta.MediaStorageSOPInstanceUID
+    ds.PatientName = "Doe^Jane"
+    ds.PatientID = "12345"
+    ds.InstitutionName = "Camp Clinic"
+    item = Dataset()
+    item.CodeValue = "T-D3000"
+    ds.AnatomicRegionSequence = Sequence([item])
+    ds.Rows, ds.Columns = pixels.shape
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    if pixel_keyword is not None:
+        ds.BitsAllocated = pixels.dtype.itemsize * 8
+        setattr(ds, pixel_keyword, pixels.tobytes())
+    ds.save_as(path, enforce_file_format=True)
+    return path
+
+
+class TestStreamingAnonymization:
+    """Test anonymization copies every kind of pixel data."""
+
+    @pytest.mark.parametrize(
+        "keyword, pixels",
+        [
+            ("PixelData", (PIXELS * 100).astype(np.uint16)),
+            ("FloatPixelData", PIXELS),
+            ("DoubleFloatPixelData", PIXELS.astype(np.float64)),
+        ],
+    )
+    def test_pixels_survive_anonymization(self, tmp_path, keyword, pixels):
+        """Test the pixel data element is copied byte for byte."""
+        source = _write_dicom(tmp_path / "in.dcm", keyword, pixels)
+        target = tmp_path / "out.dcm"
+
+        DICOMHandler().anonymize_dicom(str(source), str(target))
+
+        ds = pydicom.dcmread(target)
+        assert getattr(ds, keyword) == pixels.tobytes()
+        assert ds.PatientName == "Anonymous"
+        assert "InstitutionName" not in ds
+        assert ds.AnatomicRegionSequence[0].CodeValue == "T-D3000"
+
+    def test_image_without_pixel_data_fails_loudly(self, tmp_path):
+        """Test a missing pixel data element is an error, not dropped pixels."""
+        source = _write_dicom(tmp_path / "in.dcm", pixel_keyword=None)
+
+        with open(source, "rb") as fp, pytest.raises(ValueError):
+            read_header(fp)
+        with pytest.raises(ValueError):
+            DICOMHandler().anonymize_dicom(str(source), str(tmp_path / "out.dcm"))
+
+
+class TestFrameReader:
+    """Test frames are memory-mapped with the element's value type."""
+
+    def test_float_pixel_data_is_mapped(self, tmp_path):
+        """Test Float Pixel Data maps as float32 frames."""
+        source = _write_dicom(tmp_path / "in.dcm", "FloatPixelData")
+
+        with DICOMFrameReader(str(source)) as reader:
+            assert reader.memory_mapped
+            np.testing.assert_array_equal(reader.frame(0), PIXELS)
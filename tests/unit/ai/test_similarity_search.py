@@ -0,0 +1,69 @@
+"""Test vectorized similarity search over indexers and plain mappings."""
+
+import numpy as np
+
+from src.ai.medical_image.image_indexing import ImageIndex, ImageIndexer
+from src.ai.medical_image.similarity_search import SimilaritySearchEngine
+
+
+def _entry(image_id, features):
+    """Index entry with the given feature vector."""
+    return ImageIndex(
+        image_id=image_id,
+        modality="CT",
+        body_part="chest",
+        features=np.asarray(features, dtype=np.float32),
+        metadata={"name": image_id},
+    )
+
+
+def _image(value):
+    """Uniform 8x8 image, whose histogram has a single bin set."""
+    return np.full((8, 8), value, dtype=np.uint8)
+
+
+class TestIndexerBackedSearch:
+    """Test search follows the indexer it was built from."""
+
+    def test_search_after_indexer_load(self, tmp_path):
+        """Test results come from entries restored by load()."""
+        source = ImageIndexer()
+        source.add_image("dark", _image(10), {"name": "dark"})
+        source.add_image("bright", _image(200), {"name": "bright"})
+        path = tmp_path / "index.npz"
+        source.save(path)
+
+        indexer = ImageIndexer()
+        indexer.add_image("stale", _image(10), {"name": "stale"})
+        engine = SimilaritySearchEngine(indexer)
+        indexer.load(path)
+
+        query = np.histogram(_image(200), bins=256, range=(0, 256))[0]
+        results = engine.search_similar(query.astype(np.float32), top_k=1)
+        assert [r.image_id for r in results] == ["bright"]
+        assert results[0].metadata == {"name": "bright"}
+        assert "stale" not in engine.index
+
+
+class TestMappingBackedSearch:
+    """Test the stacked matrix for plain mappings stays current."""
+
+    def test_replaced_features_are_restacked(self):
+        """Test replacing an id's entry changes its similarity."""
+        index = {"a": _entry("a", [1, 0]), "b": _entry("b", [0, 1])}
+        engine = SimilaritySearchEngine(index)
+        assert engine.search_similar(np.array([1, 0]), top_k=1)[0].image_id == "a"
+
+        index["a"] = _entry("a", [0, 1])
+        index["b"] = _entry("b", [1, 0])
+        results = engine.search_similar(np.array([1, 0]), top_k=2)
+        assert [r.image_id for r in results] == ["b", "a"]
+        assert results[1].similarity_score == 0.0
+
+    def test_emptied_mapping_returns_nothing(self):
+        """Test removing every entry leaves no stale rows."""
+        index = {"a": _entry("a", [1, 0])}
+        engine = SimilaritySearchEngine(index)
+        assert engine.search_similar(np.array([1, 0]))
+        index.clear()
+        assert engine.search_similar(np.array([1, 0])) == []
@@ -0,0 +1,178 @@
+"""Test request-scoped batching loaders for GraphQL resolvers."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.api.dataloaders import (
+    DataLoader,
+    RequestLoaders,
+    filter_verifications,
+    get_loaders,
+    verification_record_ids,
+)
+from src.models.base import BaseModel
+from src.models.record_access_grant import RecordAccessGrant
+from src.models.verification import VerificationStatus
+
+
+class RecordingBatch:
+    """Batch function recording the keys of every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(list(keys))
+        return {key: key * 10 for key in keys if key >= 0}
+
+
+class TestDataLoader:
+    """Test batching and per-request caching."""
+
+    def test_async_loads_in_one_tick_share_a_batch(self):
+        """Test concurrent resolvers are answered by one batch call."""
+        batch = RecordingBatch()
+        loader = DataLoader(batch)
+
+        async def resolve_all():
+            return await asyncio.gather(
+                loader.load(1),
+                loader.load(2),
+                loader.load(1),
+                loader.load_many([3, -1]),
+            )
+
+        assert asyncio.run(resolve_all()) == [10, 20, 10, [30, None]]
+        assert batch.calls == [[1, 2, 3, -1]]
+
+    def test_sync_loads_are_cached(self):
+        """Test repeated and primed keys skip the batch function."""
+        batch = RecordingBatch()
+        loader = DataLoader(batch, default_factory=list, max_batch_size=2)
+        loader.prime(5, 55)
+
+        assert loader.load_many_sync([1, 2, 3, 5, 1]) == [10, 20, 30, 55, 10]
+        assert loader.load_sync(-4) == []
+        assert loader.load_sync(2) == 20
+        assert batch.calls == [[1, 2], [3], [-4]]
+
+        loader.clear(2)
+        loader.load_sync(2)
+        assert batch.calls[-1] == [2]
+
+    def test_loaders_are_created_once_per_context(self):
+        """Test resolvers of one request share loaders bound to their session."""
+        info = SimpleNamespace(context={"db": None})
+        loaders = get_loaders(info)
+        session = object()
+        assert get_loaders(info, session) is loaders
+        assert loaders.db is session
+        assert get_loaders(SimpleNamespace(context={})) is not loaders
+
+
+class TestVerificationFilters:
+    """Test in-memory filtering of a patient's loaded verifications."""
+
+    def test_active_and_record_filters(self):
+        """Test filters match the per-query semantics they replace."""
+        record_id = str(uuid.uuid4())
+        evidence = [{"type": "record", "data": {"record_id": record_id}}]
+        now = datetime.utcnow()
+
+        def verification(**overrides):
+            fields = {
+                "verification_type": "health_record",
+                "status": VerificationStatus.COMPLETED,
+                "revoked": False,
+                "expires_at": None,
+                "evidence_provided": evidence,
+            }
+            fields.update(overrides)
+            return SimpleNamespace(**fields)
+
+        active = verification()
+        expired = verification(expires_at=now - timedelta(days=1))
+        revoked = verification(revoked=True)
+        identity = verification(verification_type="identity")
+        loaded = [active, expired, revoked, identity]
+
+        assert filter_verifications(loaded, "health_record") == [active]
+        assert filter_verifications(loaded, "health_record", active_only=False) == [
+            active,
+            expired,
+            revoked,
+        ]
+        assert verification_record_ids(active) == [record_id]
+        assert verification_record_ids(verification(evidence_provided=None)) == []
+
+
+class TestRequestLoaders:
+    """Test the SQL issued by request loaders."""
+
+    def test_prime_skips_deleted_patients(self):
+        """Test soft-deleted patients are not served from the cache."""
+        fetched = []
+        loaders = RequestLoaders(None)
+        loaders.patients.batch_fn = lambda ids: fetched.extend(ids) or {}
+
+        live = SimpleNamespace(id=uuid.uuid4(), deleted_at=None)
+        deleted = SimpleNamespace(id=uuid.uuid4(), deleted_at=datetime.utcnow())
+        loaders.prime_patients([live, deleted])
+
+        assert loaders.patients.load_sync(live.id) is live
+        assert loaders.patients.load_sync(deleted.id) is None
+        assert fetched == [deleted.id]
+
+    def test_grant_lookups_share_one_query(self):
+        """Test N grant checks run one query and honour the grant window."""
+        engine = create_engine("sqlite://")
+        BaseModel.metadata.create_all(
+            engine, tables=[BaseModel.metadata.tables["record_access_grants"]]
+        )
+        session = sessionmaker(bind=engine)()
+        now = datetime.utcnow()
+        viewer = str(uuid.uuid4())
+        patient_id = uuid.uuid4()
+        records = [uuid.uuid4() for _ in range(6)]
+        windows = [
+            (now - timedelta(days=1), None),
+            (now - timedelta(days=1), now + timedelta(days=1)),
+            (now - timedelta(days=2), now - timedelta(days=1)),  # expired
+            (now + timedelta(days=1), None),  # not yet valid
+        ]
+        for record_id, (granted_at, expires_at) in zip(records, windows):
+            session.add(
+                RecordAccessGrant(
+                    viewer_id=viewer,
+                    record_id=record_id,
+                    patient_id=patient_id,
+                    granted_at=granted_at,
+                    expires_at=expires_at,
+                )
+            )
+        session.commit()
+
+        statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        loaders = RequestLoaders(session)
+
+        async def check_all():
+            return await asyncio.gather(
+                *(loaders.record_grants.load((viewer, r)) for r in records)
+            )
+
+        assert asyncio.run(check_all()) == [True, True, False, False, False, False]
+        assert len(statements) == 1
+        assert loaders.patient_grants.load_many_sync(
+            [(viewer, patient_id), (str(uuid.uuid4()), patient_id)]
+        ) == [True, False]
+        assert len(statements) == 2
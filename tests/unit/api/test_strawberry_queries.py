@@ -0,0 +1,55 @@
+"""Test the Strawberry health record query helpers."""
+
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.strawberry_queries import log_record_view
+from src.models.access_log import AccessContext, AccessLog, AccessType
+from src.models.base import BaseModel
+from src.models.health_record import HealthRecord, RecordType
+
+
+def make_session():
+    """SQLite session with the record and audit tables."""
+    engine = create_engine("sqlite://")
+    tables = ("patients", "health_records", "access_logs")
+    BaseModel.metadata.create_all(
+        engine, tables=[BaseModel.metadata.tables[name] for name in tables]
+    )
+    return sessionmaker(bind=engine)()
+
+
+class TestHealthRecordAudit:
+    """Test record reads leave an audit trail."""
+
+    def test_record_view_writes_access_log(self):
+        """Test a permitted read records a VIEW entry for the viewer."""
+        session = make_session()
+        record = HealthRecord(
+            patient_id=uuid.uuid4(),
+            record_type=RecordType.LAB_RESULT,
+            title="Lab",
+            encrypted_content="-",
+            record_date=datetime.utcnow(),
+            emergency_accessible=False,
+        )
+        session.add(record)
+        session.flush()
+        user = SimpleNamespace(id=uuid.uuid4(), role="doctor")
+
+        log_record_view(session, user, record)
+        session.flush()
+
+        entries = session.query(AccessLog).all()
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry.user_id == user.id
+        assert entry.resource_type == "healthrecord"
+        assert entry.resource_id == record.id
+        assert entry.patient_id == record.patient_id
+        assert entry.access_type == AccessType.VIEW
+        assert entry.access_context == AccessContext.API
@@ -0,0 +1,115 @@
+"""Test benchmark statistics, fixtures and baseline regression checks."""
+
+import random
+from datetime import datetime
+
+from src.healthcare.hl7_lazy_parser import LazyHL7Message
+from src.healthcare.performance import benchmark_fixtures as fixtures
+from src.healthcare.performance.benchmark_verification import (
+    BenchmarkResult,
+    BenchmarkStatus,
+    PerformanceTarget,
+    detect_regressions,
+    percentile,
+    summarize_timings,
+)
+
+
+def make_result(name: str, comparison: str, value: float, p95: float = 0.0):
+    """Build a measured benchmark result."""
+    target = PerformanceTarget(
+        name=name,
+        component="Test",
+        metric="throughput" if comparison == "greater_than" else "latency",
+        target_value=1,
+        unit="ops",
+        comparison=comparison,
+    )
+    return BenchmarkResult(
+        target=target,
+        actual_value=value,
+        status=BenchmarkStatus.PASSED,
+        timestamp=datetime.now(),
+        samples=10,
+        details={"p95": p95} if p95 else {},
+    )
+
+
+class TestBenchmarkStatistics:
+    """Test percentile and timing summaries."""
+
+    def test_percentile_interpolates(self):
+        """Test percentiles interpolate between ranks."""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.5
+        assert percentile(values, 99) == 99.01
+        assert percentile([7.0], 95) == 7.0
+        assert percentile([], 95) == 0.0
+
+    def test_summary_reports_throughput(self):
+        """Test throughput is items over measured wall time."""
+        summary = summarize_timings([1.0, 2.0, 3.0, 4.0], elapsed_s=0.01)
+        assert summary["throughput"] == 400
+        assert summary["p50"] == 2.5
+        assert summary["max"] == 4.0
+
+
+class TestBaselineRegressions:
+    """Test comparison of results against a stored baseline."""
+
+    def test_direction_and_tolerance(self):
+        """Test regressions follow each metric's direction."""
+        baseline = {
+            "build_id": "build-1",
+            "benchmarks": {
+                "Latency": {"value": 10.0, "p95": 20.0},
+                "Throughput": {"value": 100.0},
+                "Stable": {"value": 10.0},
+            },
+        }
+        results = [
+            make_result("Latency", "less_than", 10.5, p95=30.0),
+            make_result("Throughput", "greater_than", 70.0),
+            make_result("Stable", "less_than", 11.0),
+            make_result("New", "less_than", 99.0),
+        ]
+
+        regressions = detect_regressions(results, baseline, tolerance=0.2)
+        assert [(r["benchmark"], r["metric"]) for r in regressions] == [
+            ("Latency", "p95"),
+            ("Throughput", "throughput"),
+        ]
+        assert regressions[1]["change_pct"] == -30.0
+        assert regressions[0]["baseline_build"] == "build-1"
+
+    def test_errors_are_not_regressions(self):
+        """Test benchmarks that failed to run are not compared."""
+        result = make_result("Latency", "less_than", 0)
+        result.status = BenchmarkStatus.ERROR
+        assert not detect_regressions(
+            [result], {"benchmarks": {"Latency": {"value": 10.0}}}
+        )
+
+
+class TestBenchmarkFixtures:
+    """Test synthetic fixtures are reproducible and well formed."""
+
+    def test_fixtures_are_seeded(self):
+        """Test the same seed produces the same fixtures."""
+        first = fixtures.make_fhir_resources(30, random.Random(1))
+        assert first == fixtures.make_fhir_resources(30, random.Random(1))
+        assert {kind for kind, _ in first} == {"Patient", "Observation", "Immunization"}
+
+    def test_hl7_messages_parse(self):
+        """Test generated messages carry their type and observations."""
+        messages = fixtures.make_hl7_messages(4, random.Random(1))
+        parsed = [LazyHL7Message(raw) for raw in messages]
+        assert [m.message_type for m in parsed] == ["ADT^A01", "ORU^R01"] * 2
+        assert len(parsed[1].segments("OBX")) == 3
+        assert parsed[0].get("PID.3.1").startswith("MRN")
+
+    def test_sync_conflict_rate(self):
+        """Test the requested share of record pairs diverge."""
+        pairs = fixtures.make_sync_records(1000, random.Random(1), 0.1)
+        diverged = sum(1 for local, server in pairs if local != server)
+        assert 60 < diverged < 140
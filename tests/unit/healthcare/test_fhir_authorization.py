@@ -554,3 +554,121 @@ class TestFHIRAuthorizationHandler:
 
         assert handler1 is handler2
         assert isinstance(handler1, FHIRAuthorizationHandler)
+
+
+class TestAuthorizationDecisionCache:
+    """Test compiled rules, cached decisions and bulk authorization."""
+
+    def test_authorize_many_filters_bundle(self, auth_handler, patient_context):
+        """Test a search result is filtered with one evaluation per patient."""
+        observations = [
+            {
+                "resourceType": "Observation",
+                "id": f"obs-{index}",
+                "patient": {"reference": f"Patient/patient-{index % 2 + 123}"},
+            }
+            for index in range(10)
+        ]
+
+        allowed = auth_handler.filter_authorized(
+            patient_context, ResourcePermission.READ, observations
+        )
+        decisions = auth_handler.authorize_many(
+            patient_context, ResourcePermission.READ, observations
+        )
+
+        assert [r["id"] for r in allowed] == [f"obs-{i}" for i in range(0, 10, 2)]
+        assert [d.allowed for d in decisions] == [True, False] * 5
+        assert auth_handler.get_cache_stats() == {"size": 2, "hits": 2, "misses": 2}
+        assert decisions[0].audit_info["denied_ids"] == [
+            f"obs-{i}" for i in range(1, 10, 2)
+        ]
+
+    def test_consent_and_policy_changes_invalidate(
+        self, auth_handler, practitioner_context, observation_resource
+    ):
+        """Test cached decisions never outlive the consent or policy they used."""
+        request = AuthorizationRequest(
+            context=practitioner_context,
+            resource_type="Observation",
+            action=ResourcePermission.READ,
+            resource_id="obs-001",
+            resource_data=observation_resource,
+        )
+        assert auth_handler.check_authorization(request).allowed is True
+        assert auth_handler.check_authorization(request).allowed is True
+
+        auth_handler.add_consent(
+            ConsentRecord(patient_id="patient-123", consented_actors=["someone-else"])
+        )
+        assert auth_handler.check_authorization(request).allowed is False
+
+        auth_handler.add_consent(
+            ConsentRecord(patient_id="patient-123", consented_actors=["org-001"])
+        )
+        assert auth_handler.check_authorization(request).allowed is True
+
+        auth_handler.add_policy(
+            AuthorizationPolicy(
+                id="deny-final",
+                name="Deny final observations",
+                description="Test policy",
+                conditions={"status": "final"},
+                effect="deny",
+                resource_types=["*"],
+                actions=[ResourcePermission.READ],
+            )
+        )
+        decision = auth_handler.check_authorization(request)
+        assert decision.allowed is False
+        assert decision.reasons == ["Denied by policy: Deny final observations"]
+
+    def test_in_place_edits_invalidate(
+        self, auth_handler, practitioner_context, observation_resource
+    ):
+        """Test toggling a policy or editing a consent changes cached decisions."""
+        request = AuthorizationRequest(
+            context=practitioner_context,
+            resource_type="Observation",
+            action=ResourcePermission.READ,
+            resource_id="obs-001",
+            resource_data=observation_resource,
+        )
+        policy = AuthorizationPolicy(
+            id="deny-final",
+            name="Deny final observations",
+            description="Test policy",
+            enabled=False,
+            conditions={"status": "final"},
+            effect="deny",
+            resource_types=["Observation"],
+            actions=[ResourcePermission.READ],
+        )
+        auth_handler.add_policy(policy)
+        assert auth_handler.check_authorization(request).allowed is True
+
+        policy.enabled = True
+        assert auth_handler.check_authorization(request).allowed is False
+        policy.enabled = False
+        assert auth_handler.check_authorization(request).allowed is True
+
+        consent = ConsentRecord(patient_id="patient-123", consented_actors=["org-001"])
+        auth_handler.add_consent(consent)
+        assert auth_handler.check_authorization(request).allowed is True
+
+        consent.consented_actors = ["someone-else"]
+        assert auth_handler.check_authorization(request).allowed is False
+        consent.active = False
+        assert auth_handler.check_authorization(request).allowed is True
+
+    def test_wildcard_rules_cover_unnamed_types(self, auth_handler, admin_context):
+        """Test wildcard scopes apply to resource types no rule names."""
+        request = AuthorizationRequest(
+            context=admin_context,
+            resource_type="Encounter",
+            action=ResourcePermission.HISTORY,
+        )
+        assert auth_handler.check_authorization(request).allowed is True
+
+        request.action = ResourcePermission.PATCH
+        assert auth_handler.check_authorization(request).allowed is False
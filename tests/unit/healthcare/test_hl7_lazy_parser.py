@@ -0,0 +1,121 @@
+"""Test lazy HL7 parsing, batch streaming and bulk mapping."""
+
+import io
+
+import pytest
+
+from src.healthcare.hl7_lazy_parser import (
+    LazyHL7Message,
+    iter_hl7_messages,
+    parse_hl7_batch,
+)
+from src.healthcare.hl7_mapper import HL7Mapper
+
+
+def make_oru(control_id: str, value: str = "13.2") -> str:
+    """Build an ORU message with repetitions, components and escapes."""
+    return "\r".join(
+        [
+            "MSH|^~\\&|LIS|LAB|HAVEN|CLINIC|20260101120000||ORU^R01^ORU_R01|"
+            f"{control_id}|P|2.5.1",
+            "PID|1||MRN1^^^HOSP^MR~UNHCR9^^^UNHCR^PI||Doe^Jane^Q||19800101|F",
+            f"OBX|1|NM|718-7^Hemoglobin^LN||{value}|g/dL^grams per deciliter|"
+            "12-16|N|||F",
+            "OBX|2|TX|NOTE^Comment||A\\T\\B \\F\\ split\\.br\\next||||||F",
+        ]
+    )
+
+
+class TestLazyHL7Message:
+    """Test lazy field, component and escape decoding."""
+
+    def test_header_fields(self):
+        """Test MSH numbering, where MSH-1 is the separator."""
+        message = LazyHL7Message(make_oru("C1"))
+        msh = message.segment("MSH")
+        assert msh.field(1) == "|"
+        assert msh.field(2) == "^~\\&"
+        assert message.message_type == "ORU^R01"
+        assert message.control_id == "C1"
+        assert message.version == "2.5.1"
+
+    def test_components_and_repetitions(self):
+        """Test component, repetition and path access."""
+        message = LazyHL7Message(make_oru("C1"))
+        assert message.get("PID.3.1") == "MRN1"
+        assert message.get("PID.3[2].1") == "UNHCR9"
+        assert message.get("PID.3[2].4") == "UNHCR"
+        assert message.get("PID.5.2") == "Jane"
+        assert message.get("OBX[2].3.1") == "NOTE"
+        assert message.get("OBX[3].5") == ""
+        assert message.segment("PID").repetitions(3)[1].startswith("UNHCR9")
+
+    def test_escape_sequences(self):
+        """Test escapes are decoded only in returned values."""
+        message = LazyHL7Message(make_oru("C1"))
+        assert message.get("OBX[2].5") == "A&B | split\nnext"
+        assert "\\T\\" in message.segment("OBX", 2).field(5)
+
+    def test_rejects_non_hl7(self):
+        """Test text without an MSH segment is rejected."""
+        with pytest.raises(ValueError):
+            LazyHL7Message("PID|1||X")
+
+
+class TestHL7Streaming:
+    """Test batch envelopes and chunked reading."""
+
+    def test_batch_envelope_and_chunk_boundaries(self):
+        """Test FHS/BHS batches split into messages across small reads."""
+        batch = "\r\n".join(
+            [
+                "FHS|^~\\&|LIS|LAB",
+                "BHS|^~\\&|LIS|LAB|HAVEN|CLINIC|20260101||NIGHTLY||B-77",
+                make_oru("C1"),
+                make_oru("C2"),
+                "BTS|2",
+                "FTS|1",
+            ]
+        )
+        messages = list(iter_hl7_messages(io.StringIO(batch), chunk_size=7))
+        assert [m.control_id for m in messages] == ["C1", "C2"]
+        assert messages[1].segment_ids == ["MSH", "PID", "OBX", "OBX"]
+
+        parsed, header = parse_hl7_batch(batch)
+        assert len(parsed) == 2
+        assert header == {"batch_name": "NIGHTLY", "batch_control_id": "B-77"}
+
+    def test_mllp_framed_dump(self):
+        """Test captured MLLP framing is treated as message boundaries."""
+        dump = "".join(f"\x0b{make_oru(f'C{i}')}\x1c\r" for i in range(3))
+        assert [m.control_id for m in iter_hl7_messages([dump])] == ["C0", "C1", "C2"]
+
+
+class TestHL7BulkIngest:
+    """Test bulk mapping through the HL7 mapper."""
+
+    def test_bulk_ingest_matches_single_mapping(self, tmp_path):
+        """Test worker processes map a dump in order."""
+        path = tmp_path / "feed.hl7"
+        path.write_text(
+            "\r".join(make_oru(f"C{i}", str(i)) for i in range(40)), newline=""
+        )
+        mapper = HL7Mapper()
+
+        serial = list(mapper.bulk_from_hl7(path, batch_size=8))
+        parallel = list(mapper.bulk_from_hl7(path, workers=2, batch_size=8))
+        assert serial == parallel
+        assert [r["message_control_id"] for r in serial] == [f"C{i}" for i in range(40)]
+        assert serial[5]["patient"]["family_name"] == "Doe"
+        assert serial[5]["observations"][0] == {
+            "code": "718-7",
+            "display": "Hemoglobin",
+            "value": "5",
+            "unit": "g/dL",
+            "reference_range": "12-16",
+            "status": "F",
+        }
+        assert mapper.from_hl7(make_oru("C5", "5")) == {
+            **serial[5],
+            "raw_message": make_oru("C5", "5"),
+        }
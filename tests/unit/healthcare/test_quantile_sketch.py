@@ -0,0 +1,125 @@
+"""Test streaming quantile sketches and sketch-backed metric windows."""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.healthcare.performance.performance_monitor import (
+    MetricDataPoint,
+    MetricType,
+    MetricWindow,
+    PerformanceMonitor,
+)
+from src.healthcare.performance.quantile_sketch import QuantileSketch
+
+
+def latency_samples(count: int, seed: int = 7):
+    """Long-tailed latency values in milliseconds."""
+    rng = random.Random(seed)
+    return [rng.lognormvariate(4, 1) for _ in range(count)]
+
+
+class TestQuantileSketch:
+    """Test sketch accuracy, merging and serialization."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test quantiles stay within the configured relative error."""
+        values = latency_samples(20000) + [0.0, -3.0]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.25, 0.5, 0.9, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.0101)
+        assert sketch.quantile(0) == -3.0
+        assert sketch.quantile(1) == max(values)
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+    def test_merge_and_subtract(self):
+        """Test merged sketches equal one sketch over all values."""
+        values = latency_samples(5000)
+        whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for index, value in enumerate(values):
+            whole.add(value)
+            (first if index % 2 else second).add(value)
+
+        merged = first.copy()
+        merged.merge(second)
+        assert merged.count == whole.count
+        assert merged.quantile(0.99) == whole.quantile(0.99)
+
+        merged.subtract(second)
+        assert merged.count == first.count
+        assert merged.quantile(0.95) == first.quantile(0.95)
+
+        with pytest.raises(ValueError):
+            merged.merge(QuantileSketch(relative_accuracy=0.05))
+
+    def test_subtract_recomputes_removed_extremes(self):
+        """Test removing the smallest value moves min to the live buckets."""
+        low, high = QuantileSketch(), QuantileSketch()
+        low.add(1.0)
+        high.add(100.0)
+        high.add(200.0)
+
+        merged = low.copy()
+        merged.merge(high)
+        merged.subtract(low)
+
+        assert merged.min == pytest.approx(100.0, rel=0.01)
+        assert merged.max == 200.0
+        for q in (0.5, 0.95, 0.99):
+            assert merged.quantile(q) == pytest.approx(high.quantile(q), rel=0.01)
+
+    def test_round_trip(self):
+        """Test sketches survive JSON serialization."""
+        sketch = QuantileSketch()
+        for value in latency_samples(1000):
+            sketch.add(value)
+        restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        assert restored.quantile(0.99) == sketch.quantile(0.99)
+        assert restored.min == sketch.min
+
+
+class TestMetricWindow:
+    """Test time-sliced windows."""
+
+    def test_old_slices_expire(self):
+        """Test points older than the window stop counting."""
+        window = MetricWindow(name="1min", duration=timedelta(minutes=1))
+        old = datetime.now() - timedelta(minutes=5)
+        window.add_point(MetricDataPoint(timestamp=old, value=1000.0))
+        window.add_point(MetricDataPoint(timestamp=datetime.now(), value=10.0))
+
+        stats = window.get_statistics()
+        assert stats["count"] == 1
+        assert stats["max"] == 10.0
+        assert stats["p99"] == 10.0
+
+    def test_monitors_merge_across_workers(self):
+        """Test windows exported by one monitor merge into another."""
+        values = latency_samples(2000)
+        primary, worker = PerformanceMonitor(), PerformanceMonitor()
+        for monitor in (primary, worker):
+            monitor.register_metric("api_latency", MetricType.LATENCY)
+        for value in values[:1000]:
+            primary.record_metric("api_latency", value)
+        for value in values[1000:]:
+            worker.record_metric("api_latency", value)
+
+        primary.merge_windows(json.loads(json.dumps(worker.export_windows())))
+
+        reference = QuantileSketch()
+        for value in values:
+            reference.add(value)
+        stats = primary.get_metric_statistics("api_latency", "5min")
+        assert stats["count"] == 2000
+        assert stats["p95"] == pytest.approx(reference.quantile(0.95))
+        assert stats["min"] == min(values)
+
+        dashboard = primary.generate_performance_dashboard()
+        assert dashboard["trends"]["api_latency"]["count"][-1]["value"] > 0
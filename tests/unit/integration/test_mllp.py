@@ -0,0 +1,205 @@
+"""Test MLLP framing, pooled pipelined sends and the inbound listener."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.integration import mllp
+from src.integration.mllp import (
+    MLLPConnectionPool,
+    MLLPError,
+    MLLPFrameDecoder,
+    MLLPServer,
+    acknowledged_control_id,
+    build_ack,
+    get_mllp_pool,
+    message_control_id,
+    wrap_message,
+)
+
+
+def make_message(control_id: str) -> str:
+    """Build a minimal ORU message."""
+    return "\r".join(
+        [
+            "MSH|^~\\&|HAVEN|CLINIC|LIS|LAB|20260101120000||ORU^R01|"
+            f"{control_id}|P|2.5",
+            "PID|1||MRN123",
+            "OBX|1|NM|718-7^Hemoglobin||13.2|g/dL||N|||F",
+        ]
+    )
+
+
+class TestMLLPFraming:
+    """Test frame reassembly and ACK construction."""
+
+    def test_frames_split_and_coalesced(self):
+        """Test frames split across reads and several per read."""
+        stream = b"noise" + wrap_message("A") + wrap_message("B") + wrap_message("C")
+        decoder = MLLPFrameDecoder()
+        frames = []
+        for i in range(0, len(stream), 3):
+            frames.extend(decoder.feed(stream[i : i + 3]))
+        assert frames == [b"A", b"B", b"C"]
+
+    def test_oversized_frame_rejected(self):
+        """Test an unterminated frame cannot grow without bound."""
+        decoder = MLLPFrameDecoder(max_frame_size=10)
+        with pytest.raises(MLLPError):
+            decoder.feed(b"\x0b" + b"x" * 20)
+
+    def test_build_ack_echoes_control_id(self):
+        """Test the ACK references the original message."""
+        ack = build_ack(make_message("CTRL1"))
+        assert ack.startswith("MSH|^~\\&|LIS|LAB|HAVEN|CLINIC|")
+        assert "|ACK^R01|" in ack
+        assert acknowledged_control_id(ack) == "CTRL1"
+        assert message_control_id(make_message("CTRL1")) == "CTRL1"
+
+
+class TestMLLPTransport:
+    """Test the pooled client against the listener."""
+
+    @pytest.mark.asyncio
+    async def test_pipelined_sends_are_correlated(self):
+        """Test concurrent sends share connections and get their own ACKs."""
+        received = []
+
+        async def handler(message: str):
+            received.append(message_control_id(message))
+            return None
+
+        server = MLLPServer(handler, host="127.0.0.1", port=0)
+        await server.start()
+        port = server.sockets[0].getsockname()[1]
+        pool = MLLPConnectionPool("127.0.0.1", port, max_connections=2, timeout=5)
+        try:
+            ids = [f"MSG{i}" for i in range(50)]
+            acks = await asyncio.gather(
+                *(pool.send(make_message(control_id)) for control_id in ids)
+            )
+            assert [acknowledged_control_id(ack) for ack in acks] == ids
+            assert sorted(received) == sorted(ids)
+            assert pool.stats["connects"] <= 2
+        finally:
+            await pool.close()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_handler_error_is_acknowledged_with_ae(self):
+        """Test a failing handler produces an AE acknowledgment."""
+
+        async def handler(message: str):
+            raise ValueError("bad message")
+
+        server = MLLPServer(handler, host="127.0.0.1", port=0)
+        await server.start()
+        port = server.sockets[0].getsockname()[1]
+        pool = MLLPConnectionPool("127.0.0.1", port, timeout=5)
+        try:
+            ack = await pool.send(make_message("BAD1"))
+            assert "MSA|AE|BAD1" in ack
+        finally:
+            await pool.close()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_endpoint_raises_after_retries(self):
+        """Test connection failures back off and then raise."""
+        pool = MLLPConnectionPool(
+            "127.0.0.1", 1, timeout=1, connect_retries=2, backoff_base=0.01
+        )
+        with pytest.raises(MLLPError):
+            await pool.send(make_message("X1"))
+        assert pool.stats["connect_failures"] == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_fails_only_that_request(self):
+        """Test a slow ACK times out alone and later sends reuse the stream."""
+
+        async def handler(message: str):
+            if message_control_id(message) == "SLOW1":
+                await asyncio.sleep(1.4)
+            return None
+
+        server = MLLPServer(handler, host="127.0.0.1", port=0)
+        await server.start()
+        port = server.sockets[0].getsockname()[1]
+        pool = MLLPConnectionPool("127.0.0.1", port, max_connections=1, timeout=1)
+        try:
+            slow = asyncio.ensure_future(pool.send(make_message("SLOW1")))
+            await asyncio.sleep(0.6)
+            queued = await pool.send(make_message("NEXT1"))
+            assert acknowledged_control_id(queued) == "NEXT1"
+            with pytest.raises(asyncio.TimeoutError):
+                await slow
+
+            after = await pool.send(make_message("AFTER1"))
+            assert acknowledged_control_id(after) == "AFTER1"
+            assert pool.stats["connects"] == 1
+        finally:
+            await pool.close()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_unmatched_ack_is_dropped(self):
+        """Test an ACK for another control ID does not answer a request."""
+
+        async def handler(message: str):
+            return build_ack(make_message("OTHER1"))
+
+        server = MLLPServer(handler, host="127.0.0.1", port=0)
+        await server.start()
+        port = server.sockets[0].getsockname()[1]
+        pool = MLLPConnectionPool("127.0.0.1", port, timeout=0.5)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.send(make_message("MINE1"))
+        finally:
+            await pool.close()
+            await server.stop()
+
+    def test_connections_on_an_old_loop_are_closed(self):
+        """Test moving a pool to a new event loop closes the old streams."""
+        server_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=server_loop.run_forever, daemon=True)
+        thread.start()
+
+        async def handler(message: str):
+            return None
+
+        server = MLLPServer(handler, host="127.0.0.1", port=0)
+        asyncio.run_coroutine_threadsafe(server.start(), server_loop).result(5)
+        port = server.sockets[0].getsockname()[1]
+        pool = MLLPConnectionPool("127.0.0.1", port, timeout=5)
+        try:
+            asyncio.run(pool.send(make_message("LOOP1")))
+            asyncio.run(pool.send(make_message("LOOP2")))
+            assert pool.stats["connects"] == 2
+
+            deadline = time.monotonic() + 5
+            while len(server._handlers) > 1 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert len(server._handlers) == 1
+        finally:
+            asyncio.run(pool.close())
+            asyncio.run_coroutine_threadsafe(server.stop(), server_loop).result(5)
+            server_loop.call_soon_threadsafe(server_loop.stop)
+            thread.join(5)
+            server_loop.close()
+
+
+class TestSharedPools:
+    """Test the per-endpoint pool registry."""
+
+    def test_conflicting_settings_are_rejected(self, monkeypatch):
+        """Test a second caller cannot silently get other pool settings."""
+        monkeypatch.setattr(mllp, "_pools", {})
+        pool = get_mllp_pool("lis.example", 2575, timeout=10, max_connections=2)
+
+        assert get_mllp_pool("lis.example", 2575) is pool
+        assert get_mllp_pool("lis.example", 2575, timeout=10) is pool
+        with pytest.raises(ValueError, match="max_connections"):
+            get_mllp_pool("lis.example", 2575, max_connections=8)
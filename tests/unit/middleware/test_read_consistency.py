@@ -0,0 +1,118 @@
+"""Test read-your-writes replica routing and its middleware.
+
+Uses real SQLite engines and a real FastAPI app - no mocks.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.middleware.read_consistency import (
+    CONSISTENCY_HEADER,
+    ReadConsistencyMiddleware,
+)
+from src.services.read_replicas import (
+    ReadReplica,
+    ReadReplicaManager,
+    current_read_consistency,
+    format_lsn,
+    parse_lsn,
+    read_your_writes,
+)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Replica manager with one SQLite replica at a known replay position."""
+    manager = ReadReplicaManager(f"sqlite:///{tmp_path / 'master'}.db")
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica'}.db")
+    manager.replicas["replica_1"] = ReadReplica(
+        name="replica_1",
+        connection_url=str(engine.url),
+        replay_lsn=parse_lsn("0/2000"),
+    )
+    manager.engines["replica_1"] = engine
+    manager.session_factories["replica_1"] = sessionmaker(bind=engine)
+    return manager
+
+
+class TestReadYourWritesRouting:
+    """Test reads are routed by measured replay positions."""
+
+    def test_caught_up_replica_serves_reads(self, manager):
+        """Test a replica past the token serves the read."""
+        with read_your_writes("0/1000"):
+            session = manager.get_read_session()
+        assert session.info["replica_name"] == "replica_1"
+        session.close()
+
+    def test_lagging_replica_falls_back_to_master(self, manager):
+        """Test reads beyond the measured position go to the master."""
+        with read_your_writes("0/3000"):
+            session = manager.get_read_session()
+        assert session.info["replica_name"] == "master"
+        session.close()
+
+    def test_lag_monitor_probes_off_the_event_loop(self, manager):
+        """Test health probes run in a worker thread."""
+        probe_threads = []
+        original = manager._check_replica
+
+        def recording_check(replica_name, master_lsn):
+            probe_threads.append(threading.current_thread())
+            return original(replica_name, master_lsn)
+
+        manager._check_replica = recording_check
+
+        async def run_round():
+            await manager.check_all_replicas()
+            await manager.check_replica_health("replica_1")
+            return threading.current_thread()
+
+        loop_thread = asyncio.run(run_round())
+        assert len(probe_threads) == 2
+        assert loop_thread not in probe_threads
+        assert manager.replicas["replica_1"].last_check is not None
+
+
+class TestReadConsistencyMiddleware:
+    """Test the consistency token round trip over HTTP."""
+
+    @pytest.fixture
+    def client(self):
+        """App whose endpoints read and advance the request's position."""
+        app = FastAPI()
+        app.add_middleware(ReadConsistencyMiddleware)
+
+        @app.get("/read")
+        async def read():
+            min_lsn = current_read_consistency().min_lsn
+            return {"min_lsn": format_lsn(min_lsn) if min_lsn else None}
+
+        @app.post("/write")
+        async def write():
+            current_read_consistency().advance(parse_lsn("0/5000"))
+            return {}
+
+        return TestClient(app)
+
+    def test_client_token_scopes_reads(self, client):
+        """Test the X-Min-LSN header sets the request's read position."""
+        response = client.get("/read", headers={CONSISTENCY_HEADER: "0/1A2B"})
+        assert response.json() == {"min_lsn": "0/1A2B"}
+        assert CONSISTENCY_HEADER not in response.headers
+
+    def test_write_returns_new_token(self, client):
+        """Test a request that writes returns its position to the client."""
+        response = client.post("/write", headers={CONSISTENCY_HEADER: "0/1000"})
+        assert response.headers[CONSISTENCY_HEADER] == "0/5000"
+
+    def test_requests_do_not_share_positions(self, client):
+        """Test a position from one request does not leak into the next."""
+        client.post("/write")
+        assert client.get("/read").json() == {"min_lsn": None}
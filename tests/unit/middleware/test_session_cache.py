@@ -0,0 +1,186 @@
+"""Test the validated-session cache and write-behind activity."""
+
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+import src.models  # noqa: F401  # register the tables sessions reference
+from src.middleware import session_cache as session_cache_module
+from src.middleware.session_cache import (
+    SessionActivityBuffer,
+    SessionValidationCache,
+    detach,
+)
+from src.models.auth import UserAuth, UserRole, UserSession
+from src.models.base import BaseModel
+
+
+def make_db():
+    """SQLite session factory with the auth tables."""
+    engine = create_engine("sqlite://")
+    tables = ("user_auth", "user_sessions")
+    BaseModel.metadata.create_all(
+        engine, tables=[BaseModel.metadata.tables[name] for name in tables]
+    )
+    return sessionmaker(bind=engine)
+
+
+def add_session(db, user, timeout_policy="sliding", **fields):
+    """Insert an active web session for `user`."""
+    now = datetime.utcnow()
+    session = UserSession(
+        user_id=user.id,
+        token=uuid.uuid4().hex,
+        timeout_policy=timeout_policy,
+        expires_at=now + timedelta(minutes=10),
+        absolute_expires_at=now + timedelta(hours=8),
+        last_activity_at=now,
+        **fields,
+    )
+    db.add(session)
+    return session
+
+
+def add_user(db):
+    """Insert a patient user."""
+    user = UserAuth(
+        patient_id=uuid.uuid4(),
+        email=f"{uuid.uuid4().hex}@example.org",
+        password_hash="-",
+        role=UserRole.PATIENT,
+        created_by=uuid.uuid4(),
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+class TestSessionValidationCache:
+    """Test cached validations are revoked by commits."""
+
+    def test_revocations_follow_commits(self, monkeypatch):
+        """Test deactivation and user changes evict; activity does not."""
+        cache = SessionValidationCache()
+        monkeypatch.setattr(session_cache_module, "session_cache", cache)
+        Session = make_db()
+        db = Session()
+        user = add_user(db)
+        first, second = add_session(db, user), add_session(db, user)
+        db.commit()
+
+        client = ("10.0.0.1", "app/1.0")
+        for session in (first, second):
+            detach(db, session)
+            cache.put(session, user, client)
+        detach(db, user)
+        first_id, second_id = str(first.id), str(second.id)
+        assert cache.get(first_id, client)[0] is first
+        assert cache.get(first_id, ("10.0.0.2", "app/1.0")) is None
+
+        db = Session()
+        row = db.get(UserSession, first.id)
+        row.last_activity_at = datetime.utcnow()
+        row.expires_at = datetime.utcnow() + timedelta(minutes=30)
+        db.commit()
+        assert cache.get(first_id, client) is not None
+
+        row.is_active = False
+        db.commit()
+        assert cache.get(first_id, client) is None
+        assert cache.get(second_id, client) is not None
+
+        db.get(UserAuth, user.id).is_locked = True
+        db.commit()
+        assert cache.get(second_id, client) is None
+
+    def test_bulk_statements_revoke(self, monkeypatch):
+        """Test bulk UPDATE and DELETE evict the sessions they match."""
+        cache = SessionValidationCache()
+        monkeypatch.setattr(session_cache_module, "session_cache", cache)
+        Session = make_db()
+        db = Session()
+        user, other = add_user(db), add_user(db)
+        first, second = add_session(db, user), add_session(db, user)
+        kept = add_session(db, other)
+        db.commit()
+        for session, owner in ((first, user), (second, user), (kept, other)):
+            detach(db, session)
+            cache.put(session, owner)
+        detach(db, user, other)
+
+        db = Session()
+        buffer = SessionActivityBuffer()
+        buffer.record(first)
+        assert buffer.flush(db) == 1
+        db.query(UserSession).filter(UserSession.id == first.id).update(
+            {"last_activity_at": datetime.utcnow()}
+        )
+        db.commit()
+        assert cache.get(str(first.id)) is not None
+
+        db.query(UserSession).filter(UserSession.user_id == user.id).update(
+            {"is_active": False}
+        )
+        db.rollback()
+        assert cache.get(str(first.id)) is not None
+
+        db.query(UserSession).filter(UserSession.user_id == user.id).update(
+            {"is_active": False}
+        )
+        db.commit()
+        assert cache.get(str(first.id)) is None
+        assert cache.get(str(second.id)) is None
+        assert cache.get(str(kept.id)) is not None
+
+        db.execute(delete(UserAuth).where(UserAuth.id == other.id))
+        db.commit()
+        assert cache.get(str(kept.id)) is None
+
+    def test_fill_after_revocation_is_dropped(self):
+        """Test a validation racing a revocation is not cached."""
+        cache = SessionValidationCache()
+        Session = make_db()
+        db = Session()
+        user = add_user(db)
+        session = add_session(db, user)
+        db.commit()
+        detach(db, session, user)
+
+        generation = cache.generation
+        cache.revoke([str(session.id)], publish=False)
+        assert not cache.put(session, user, generation=generation)
+        assert cache.put(session, user, generation=cache.generation)
+
+
+class TestSessionActivityBuffer:
+    """Test buffered activity is written in batches."""
+
+    def test_flush_coalesces_and_extends_sliding_sessions(self):
+        """Test the latest activity per session is written once."""
+        Session = make_db()
+        db = Session()
+        user = add_user(db)
+        sliding = add_session(db, user)
+        fixed = add_session(db, user, timeout_policy="absolute")
+        db.commit()
+        absolute = sliding.absolute_expires_at
+        fixed_expiry = fixed.expires_at
+
+        buffer = SessionActivityBuffer()
+        seen = datetime.utcnow() + timedelta(minutes=1)
+        latest = seen + timedelta(hours=9)
+        buffer.record(sliding, seen)
+        buffer.record(fixed, seen)
+        buffer.record(sliding, latest)
+        assert len(buffer) == 2
+        assert buffer.pending_expiry(str(sliding.id)) == absolute
+
+        assert buffer.flush(db) == 2
+        assert buffer.flush(db) == 0
+        db.expire_all()
+        assert sliding.last_activity_at == latest
+        assert sliding.expires_at == absolute
+        assert fixed.last_activity_at == seen
+        assert fixed.expires_at == fixed_expiry
@@ -0,0 +1,128 @@
+"""Test SQL-side access filtering for health records."""
+
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.models.base import BaseModel
+from src.models.health_record import HealthRecord, RecordType
+from src.models.record_access_grant import (
+    RecordAccessGrant,
+    rebuild_record_access_grants,
+)
+from src.services.health_record_service import HealthRecordService, record_viewer_id
+
+
+def make_session():
+    """SQLite session with the health record tables."""
+    engine = create_engine("sqlite://")
+    tables = ("patients", "health_records", "record_access_grants")
+    BaseModel.metadata.create_all(
+        engine, tables=[BaseModel.metadata.tables[name] for name in tables]
+    )
+    return sessionmaker(bind=engine)()
+
+
+def add_records(session, patient_id, count):
+    """Insert records without content (encryption is not under test)."""
+    records = []
+    for index in range(count):
+        record = HealthRecord(
+            patient_id=patient_id,
+            record_type=RecordType.LAB_RESULT,
+            title=f"Lab {index}",
+            encrypted_content="-",
+            record_date=datetime.utcnow() - timedelta(days=index),
+            emergency_accessible=False,
+        )
+        session.add(record)
+        records.append(record)
+    session.flush()
+    return records
+
+
+class TestRecordAccessGrants:
+    """Test grants are written and enforced in SQL."""
+
+    def test_search_counts_only_visible_records(self):
+        """Test pagination and totals reflect the viewer's grants."""
+        session = make_session()
+        patient_id = uuid.uuid4()
+        viewer = uuid.uuid4()
+        records = add_records(session, patient_id, 10)
+        for record in records[:4]:
+            record.authorize_viewer(str(viewer))
+        expired = datetime.utcnow() - timedelta(hours=1)
+        records[4].authorize_viewer(str(viewer), expired)
+        session.flush()
+
+        assert session.query(RecordAccessGrant).count() == 5
+        assert records[0].check_access(str(viewer))
+        assert not records[4].check_access(str(viewer))
+
+        service = HealthRecordService(session)
+        page, total = service.search_records(limit=3, viewer_id=viewer)
+        assert total == 4
+        assert [r.id for r in page] == [r.id for r in records[:3]]
+
+        _, total = service.search_records(limit=3, offset=3, viewer_id=uuid.uuid4())
+        assert total == 0
+
+    def test_emergency_and_provider_access(self):
+        """Test role and provider rules match check_access."""
+        session = make_session()
+        provider = uuid.uuid4()
+        records = add_records(session, uuid.uuid4(), 3)
+        records[0].emergency_accessible = True
+        records[1].provider_id = provider
+        session.flush()
+
+        def visible(user_id, role=None):
+            return {
+                record.title
+                for record in session.query(HealthRecord).filter(
+                    HealthRecord.access_predicate(user_id, role)
+                )
+            }
+
+        assert visible(str(uuid.uuid4()), "doctor") == {"Lab 0"}
+        assert visible(str(provider)) == {"Lab 1"}
+        assert visible("org-unhcr") == set()
+        for record in records:
+            assert record.check_access(str(provider)) == (record.title == "Lab 1")
+
+    def test_backfill_from_authorized_viewers(self):
+        """Test legacy JSON entries become grant rows."""
+        session = make_session()
+        records = add_records(session, uuid.uuid4(), 2)
+        expiry = (datetime.utcnow() + timedelta(days=1)).isoformat()
+        records[1].authorized_viewers = [
+            {"viewer_id": "viewer-1", "authorized_at": None, "expires_at": expiry},
+            {"viewer_id": "viewer-2", "expires_at": None},
+        ]
+        session.flush()
+
+        assert rebuild_record_access_grants(session, batch_size=1) == 2
+        visible = session.query(HealthRecord).filter(
+            HealthRecord.access_predicate("viewer-1")
+        )
+        assert [record.id for record in visible] == [records[1].id]
+
+    def test_record_viewer_for_patient_queries(self):
+        """Test only users without patient-wide access are filtered by grants."""
+        patient_id = uuid.uuid4()
+
+        def user(patient=None, read_all=False):
+            return SimpleNamespace(
+                id=uuid.uuid4(),
+                patient_id=patient,
+                has_permission=lambda permission: read_all,
+            )
+
+        delegate = user()
+        assert record_viewer_id(delegate, patient_id) == delegate.id
+        assert record_viewer_id(user(patient=patient_id), patient_id) is None
+        assert record_viewer_id(user(read_all=True), patient_id) is None
@@ -0,0 +1,149 @@
+"""Test Blind Index Keyring.
+
+HIPAA Compliant - Real HMAC computation, no mocks.
+
+Tests that blind indexes normalize PHI consistently, are domain separated
+per column, and stay searchable across key rotation.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.config import settings
+from src.models.encrypted_fields import blind_prefix_filter
+from src.models.patient_encrypted import PatientEncrypted
+from src.security.key_management.blind_index import (
+    BlindIndexKeyring,
+    normalize_for_index,
+    set_blind_index_keyring,
+)
+
+
+@pytest.mark.hipaa_required
+@pytest.mark.security
+class TestBlindIndexKeyring:
+    """Test blind index computation and rotation."""
+
+    @pytest.fixture
+    def keyring(self):
+        """Create a keyring with a fresh key."""
+        return BlindIndexKeyring.generate()
+
+    def test_normalized_values_share_index(self, keyring):
+        """Test equivalent spellings produce the same index."""
+        context = "patients.phone"
+        assert keyring.compute("+254 712 345 678", "phone", context) == (
+            keyring.compute("+254712345678", "phone", context)
+        )
+        assert keyring.compute(" Amina@Example.ORG", "email", "p.email") == (
+            keyring.compute("amina@example.org", "email", "p.email")
+        )
+        assert keyring.compute("AB-123 456", "identifier", "p.id") == (
+            keyring.compute("ab123456", "identifier", "p.id")
+        )
+        assert keyring.compute(date(1990, 5, 1), "date", "p.dob") == (
+            keyring.compute("1990-05-01", "date", "p.dob")
+        )
+
+    def test_national_phone_uses_deployment_country(self, keyring, monkeypatch):
+        """Test numbers without a country code match their E.164 form."""
+        monkeypatch.setattr(settings, "DEPLOYMENT_COUNTRY", "KE")
+        context = "patients.phone"
+        assert keyring.compute("0712345678", "phone", context) == (
+            keyring.compute("+254712345678", "phone", context)
+        )
+
+    def test_index_is_domain_separated(self, keyring):
+        """Test the same value indexes differently per column."""
+        assert keyring.compute("AB123", "identifier", "t.passport") != (
+            keyring.compute("AB123", "identifier", "t.national_id")
+        )
+
+    def test_index_is_keyed(self, keyring):
+        """Test a different key yields a different index."""
+        other = BlindIndexKeyring.generate()
+        assert keyring.compute("x@y.org", "email", "c") != (
+            other.compute("x@y.org", "email", "c")
+        )
+
+    def test_empty_values_not_indexed(self, keyring):
+        """Test None and blank values produce no index."""
+        assert keyring.compute(None, "text", "c") is None
+        assert keyring.compute("   ", "text", "c") is None
+        assert keyring.compute_all("", "email", "c") == []
+
+    def test_rotation_keeps_old_indexes_searchable(self, keyring):
+        """Test lookups match rows indexed before a rotation."""
+        before = keyring.compute("Hassan", "text", "c")
+        new_version = keyring.rotate()
+
+        after = keyring.compute("Hassan", "text", "c")
+        assert after.startswith(f"{new_version}:")
+        assert {before, after} == set(keyring.compute_all("Hassan", "text", "c"))
+
+        keyring.retire(1)
+        assert keyring.compute_all("Hassan", "text", "c") == [after]
+
+    def test_active_key_cannot_be_retired(self, keyring):
+        """Test retiring the active key is rejected."""
+        with pytest.raises(ValueError):
+            keyring.retire(keyring.active_version)
+
+    def test_prefix_tokens(self, keyring):
+        """Test each word contributes its indexed prefixes."""
+        tokens = keyring.compute_prefixes("Abu Hassan", "text", "c", (3, 4))
+        assert keyring.compute_prefix_all("has", "text", "c")[0] in tokens
+        assert keyring.compute_prefix_all("hass", "text", "c")[0] in tokens
+        assert keyring.compute_prefix_all("abu", "text", "c")[0] in tokens
+        assert keyring.compute_prefix_all("hasa", "text", "c")[0] not in tokens
+
+    def test_serialization_round_trip(self, keyring):
+        """Test keyring survives vault serialization."""
+        keyring.rotate()
+        restored = BlindIndexKeyring.from_dict(keyring.to_dict())
+        assert restored.active_version == keyring.active_version
+        assert restored.compute("a@b.org", "email", "c") == (
+            keyring.compute("a@b.org", "email", "c")
+        )
+
+    def test_unknown_normalizer_rejected(self):
+        """Test unknown field kinds raise ValueError."""
+        with pytest.raises(ValueError):
+            normalize_for_index("x", "unknown")
+
+
+@pytest.mark.hipaa_required
+@pytest.mark.security
+class TestBlindPrefixFilter:
+    """Test prefix filters on a blind-indexed column."""
+
+    @pytest.fixture(autouse=True)
+    def keyring(self):
+        """Install a fresh keyring for the model hooks."""
+        keyring = BlindIndexKeyring.generate()
+        set_blind_index_keyring(keyring)
+        yield keyring
+        set_blind_index_keyring(None)
+
+    def _token(self, keyring, prefix):
+        """Prefix token for the example model's last name."""
+        return keyring.compute_prefix_all(
+            prefix, "text", "patients_encrypted_example.last_name"
+        )[0]
+
+    def test_long_prefix_uses_longest_indexed_length(self, keyring):
+        """Test prefixes longer than any indexed length still filter."""
+        clause = blind_prefix_filter(PatientEncrypted.last_name, " Hassanein ")
+        bound = clause.compile().params
+        assert [self._token(keyring, "hassa")] in bound.values()
+
+    def test_short_prefix_rejected(self):
+        """Test prefixes shorter than the shortest indexed length."""
+        with pytest.raises(ValueError, match="at least 3 characters"):
+            blind_prefix_filter(PatientEncrypted.last_name, "Ha")
+
+    def test_multi_word_prefix_rejected(self):
+        """Test prefix searches take a single word."""
+        with pytest.raises(ValueError, match="one word"):
+            blind_prefix_filter(PatientEncrypted.last_name, "Abu Has")
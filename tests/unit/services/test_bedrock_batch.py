@@ -0,0 +1,178 @@
+"""Test adaptive-concurrency batch invocation for Bedrock."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.services.bedrock_batch import (
+    AIMDLimiter,
+    BedrockBatchInvoker,
+    budgets_from_quotas,
+)
+from src.services.bedrock_service import BedrockModel, BedrockRateLimitException
+
+# Generous budgets so only the limiter shapes the test traffic
+UNLIMITED = {None: (1e9, 1e12), "anthropic_claude": (1e9, 1e12)}
+
+
+class FakeBedrock:
+    """Blocking invoke_model stand-in recording concurrency."""
+
+    def __init__(self, throttle_first=0, delay=0.01):
+        """Throttle the first calls, then answer after a delay."""
+        self.throttle_first = throttle_first
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, prompt, model_id=None, system_prompt=None, **kwargs):
+        """Echo the prompt, or raise a throttle."""
+        with self._lock:
+            self.calls.append(prompt)
+            if len(self.calls) <= self.throttle_first:
+                raise BedrockRateLimitException("Rate limit exceeded.")
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        # Later prompts finish first, so ordering is the invoker's doing
+        time.sleep(self.delay / (1 + int(prompt.split()[-1]) % 5))
+        with self._lock:
+            self.active -= 1
+        return prompt.upper(), {"model_id": model_id}
+
+
+class TestBedrockBatchInvoker:
+    """Test ordering, coalescing and throttle handling."""
+
+    @pytest.mark.asyncio
+    async def test_stream_is_ordered_and_coalesces_duplicates(self):
+        """Test results follow input order and duplicates share a call."""
+        bedrock = FakeBedrock()
+        invoker = BedrockBatchInvoker(
+            bedrock.invoke_model,
+            UNLIMITED,
+            limiter=AIMDLimiter(initial=8, maximum=8),
+            default_model_id=BedrockModel.CLAUDE_V2,
+        )
+        prompts = [f"prompt {i // 2}" for i in range(60)]
+
+        results = [r async for r in invoker.stream(prompts, max_tokens=100)]
+
+        assert [text for text, _ in results] == [p.upper() for p in prompts]
+        assert results[0][1] == {"model_id": BedrockModel.CLAUDE_V2}
+        assert len(bedrock.calls) + invoker.stats["coalesced"] == 60
+        assert invoker.stats["coalesced"] > 0
+        assert 1 < bedrock.peak <= 8
+        invoker.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_throttling_halves_limit_and_retries(self):
+        """Test throttled prompts are retried after the limit is cut."""
+        bedrock = FakeBedrock(throttle_first=1)
+        limiter = AIMDLimiter(initial=8, maximum=8)
+        invoker = BedrockBatchInvoker(
+            bedrock.invoke_model, UNLIMITED, limiter=limiter, retry_delay=0.001
+        )
+
+        result = await invoker.invoke("prompt 1")
+
+        assert result[0] == "PROMPT 1"
+        assert invoker.stats["throttled"] == 1
+        assert 4 <= limiter.limit < 5
+        assert limiter.in_flight == 0
+        invoker.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_persistent_throttling_becomes_error_result(self):
+        """Test a prompt out of attempts yields an error result."""
+        bedrock = FakeBedrock(throttle_first=10)
+        invoker = BedrockBatchInvoker(
+            bedrock.invoke_model, UNLIMITED, max_attempts=3, retry_delay=0.001
+        )
+
+        [result] = await invoker.invoke_all(["prompt 1"])
+
+        assert result == ("", {"error": "Rate limit exceeded."})
+        assert len(bedrock.calls) == 3
+        invoker.shutdown()
+
+    def test_callers_on_separate_loops_share_invoker(self):
+        """Test event loops in different threads can use one invoker."""
+        bedrock = FakeBedrock(delay=0.2)
+        invoker = BedrockBatchInvoker(
+            bedrock.invoke_model, UNLIMITED, limiter=AIMDLimiter(initial=1)
+        )
+        results = {}
+
+        def caller(name):
+            results[name] = asyncio.run(invoker.invoke_all(["prompt 1"] * 2))
+
+        threads = [threading.Thread(target=caller, args=(n,)) for n in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == {n: [("PROMPT 1", {"model_id": None})] * 2 for n in range(2)}
+        assert invoker.run_all(["prompt 2"]) == [("PROMPT 2", {"model_id": None})]
+        invoker.shutdown()
+
+
+class TestAIMDLimiter:
+    """Test the concurrency limit's reactions."""
+
+    def test_increase_is_additive_and_decrease_counts_once(self):
+        """Test the limit grows per round and a throttle burst cuts once."""
+        now = [0.0]
+        limiter = AIMDLimiter(initial=4, maximum=10, clock=lambda: now[0])
+        for _ in range(4):
+            limiter.on_success(started=0.0, latency=1.0)
+        assert 4.9 < limiter.limit < 5.0
+
+        now[0] = 5.0
+        limiter.on_throttle(started=1.0)
+        limiter.on_throttle(started=2.0)
+        assert 2.4 < limiter.limit < 2.5
+
+    def test_rising_latency_trims_limit(self):
+        """Test sustained slow responses reduce the limit."""
+        limiter = AIMDLimiter(initial=10, maximum=10, clock=lambda: 0.0)
+        limiter.on_success(started=0.0, latency=1.0)
+        for _ in range(10):
+            limiter.on_success(started=0.0, latency=5.0)
+        assert limiter.limit < 10
+
+
+def test_budgets_follow_reported_quotas():
+    """Test budgets use current limits and fall back to recommendations."""
+    quotas = {
+        "anthropic_claude_requests_per_minute": {"current_limit": 1000},
+        "anthropic_claude_tokens_per_minute": {"current_limit": 400000},
+        "titan_requests_per_minute": {"error": "AccessDenied"},
+        "concurrent_requests": {"current_limit": 20},
+    }
+
+    budgets, concurrency = budgets_from_quotas(quotas, "development")
+
+    assert budgets["anthropic_claude"] == (900.0, 360000.0)
+    assert budgets["titan"] == (54.0, 90000.0)
+    assert concurrency == 18.0
+
+
+def test_waiters_resume_when_slots_free():
+    """Test acquire blocks at the limit until a slot is released."""
+
+    async def scenario():
+        limiter = AIMDLimiter(initial=1, maximum=1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        limiter.release()
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 1
+
+    asyncio.run(scenario())
@@ -5,6 +5,7 @@ NO MOCKS for AWS services - Uses real Bedrock runtime and models as required.
 Target: 95% statement coverage for AI/ML compliance.
 """
 
+import math
 from datetime import datetime, timedelta
 
 import pytest
@@ -290,6 +291,16 @@ class TestBedrockService:
         results = service.batch_invoke([], BedrockModel.CLAUDE_V2)
         assert results == []
 
+    def test_batch_client_leaves_throttling_to_the_limiter(self):
+        """Test the batch client makes one attempt and pools to the limiter."""
+        service = BedrockService()
+        invoker = service.batch_invoker
+
+        config = service._batch_runtime.meta.config
+        assert config.retries["total_max_attempts"] == 1
+        assert config.max_pool_connections == math.ceil(invoker.limiter.maximum)
+        invoker.shutdown()
+
     def test_get_bedrock_service_singleton(self):
         """Test singleton pattern for bedrock service."""
         service1 = get_bedrock_service()
@@ -0,0 +1,163 @@
+"""Test shard rebalancing and routing of moved records.
+
+Uses real SQLite shard databases - no mocks.
+"""
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, event
+from sqlalchemy.orm import declarative_base, relationship
+
+from src.services import database_sharding
+from src.services.database_sharding import (
+    DatabaseShardManager,
+    ShardConfig,
+    ShardedTable,
+    ShardingStrategy,
+    ShardKey,
+    shard_directory_metadata,
+)
+
+RebalanceBase = declarative_base()
+
+
+class RebalancePatient(RebalanceBase, ShardedTable):
+    """Sharded parent table."""
+
+    __tablename__ = "rebalance_patients"
+    __shard_key__ = ShardKey("patient_key", ShardingStrategy.HASH, shard_count=2)
+
+    id = Column(Integer, primary_key=True)
+    patient_key = Column(String(20), nullable=False)
+    records = relationship("RebalanceRecord")
+
+
+class RebalanceRecord(RebalanceBase):
+    """Child rows that must stay on their patient's shard."""
+
+    __tablename__ = "rebalance_records"
+
+    id = Column(Integer, primary_key=True)
+    patient_id = Column(Integer, ForeignKey("rebalance_patients.id"), nullable=False)
+    note = Column(String(50))
+
+
+def _manager(tmp_path, with_directory=True):
+    """Shard manager over two file-backed shards and a shared directory."""
+    manager = DatabaseShardManager()
+    for shard_id in ("shard_0", "shard_1"):
+        url = f"sqlite:///{tmp_path / shard_id}.db"
+        RebalanceBase.metadata.create_all(create_engine(url))
+        manager.add_shard(ShardConfig(shard_id=shard_id, connection_url=url))
+    if with_directory:
+        manager.configure_directory(f"sqlite:///{tmp_path / 'directory'}.db")
+        shard_directory_metadata.create_all(manager.directory_engine)
+    return manager
+
+
+class TestRebalanceShards:
+    """Test rebalancing moves record groups and routes them durably."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Manager whose records all sit on shard_0."""
+        manager = _manager(tmp_path)
+        session = manager.get_session("shard_0")
+        for index in range(10):
+            session.add(RebalancePatient(id=index, patient_key=f"P{index}"))
+            session.add_all(
+                RebalanceRecord(id=index * 10 + n, patient_id=index, note="x")
+                for n in range(3)
+            )
+        session.commit()
+        session.close()
+        yield manager
+        manager.query_executor.shutdown()
+
+    def _patients(self, manager, shard_id):
+        """Patient keys on a shard with their child record ids."""
+        session = manager.get_session(shard_id)
+        try:
+            return {
+                patient.patient_key: [record.id for record in patient.records]
+                for patient in session.query(RebalancePatient).all()
+            }
+        finally:
+            session.close()
+
+    def test_moved_records_take_their_children(self, manager):
+        """Test children move with their parent and none are orphaned."""
+        result = manager.rebalance_shards(RebalancePatient, dry_run=False)
+
+        assert result["records_moved"] == {"shard_0": 5}
+        moved = self._patients(manager, "shard_1")
+        assert len(moved) == 5
+        assert all(len(records) == 3 for records in moved.values())
+
+        session = manager.get_session("shard_0")
+        try:
+            assert session.query(RebalanceRecord).count() == 15
+        finally:
+            session.close()
+
+    def test_other_routers_find_moved_records(self, manager, tmp_path):
+        """Test a fresh manager on the same directory routes to the new shard."""
+        manager.rebalance_shards(RebalancePatient, dry_run=False)
+        moved = self._patients(manager, "shard_1")
+
+        other = _manager(tmp_path)
+        for key in moved:
+            assert other.get_shard_for_key(RebalancePatient, key) == "shard_1"
+        other.query_executor.shutdown()
+
+    def test_routing_reuses_the_directory_copy(self, manager):
+        """Test repeated routing reads the directory once, not per key."""
+        manager.rebalance_shards(RebalancePatient, dry_run=False)
+        moved = self._patients(manager, "shard_1")
+        statements = []
+        event.listen(
+            manager.directory_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        for _ in range(3):
+            for key in moved:
+                assert manager.get_shard_for_key(RebalancePatient, key) == "shard_1"
+
+        assert len(statements) == 1
+
+    def test_cached_routers_pick_up_moves_on_refresh(
+        self, manager, tmp_path, monkeypatch
+    ):
+        """Test a router that cached the directory sees later moves."""
+        other = _manager(tmp_path)
+        keys = [f"P{index}" for index in range(10)]
+        before = {key: other.get_shard_for_key(RebalancePatient, key) for key in keys}
+
+        manager.rebalance_shards(RebalancePatient, dry_run=False)
+        moved = self._patients(manager, "shard_1")
+        for key in keys:
+            assert other.get_shard_for_key(RebalancePatient, key) == before[key]
+
+        monkeypatch.setattr(database_sharding, "OVERRIDE_REFRESH_SECONDS", -1)
+        for key in moved:
+            assert other.get_shard_for_key(RebalancePatient, key) == "shard_1"
+        other.query_executor.shutdown()
+
+    def test_query_all_shards_audits_once(self, manager, monkeypatch):
+        """Test the fan-out does not re-enter the audited query_shards."""
+
+        def audited_again(*args, **kwargs):
+            raise AssertionError("query_shards checked and audited twice")
+
+        monkeypatch.setattr(manager, "query_shards", audited_again)
+        rows = manager.query_all_shards(RebalancePatient)
+        assert len(rows) == 10
+
+    def test_rebalance_requires_directory(self, tmp_path):
+        """Test records are not moved without a shared directory."""
+        manager = _manager(tmp_path, with_directory=False)
+        result = manager.rebalance_shards(RebalancePatient, dry_run=False)
+        assert result["error"] == "Shard directory not configured"
+        assert "records_moved" not in result
+        manager.query_executor.shutdown()
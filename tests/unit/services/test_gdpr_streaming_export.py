@@ -0,0 +1,225 @@
+"""Test the streaming, resumable GDPR export pipeline."""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.models.audit_log import AuditLog
+from src.models.auth import UserAuth, UserRole
+from src.models.base import BaseModel
+from src.models.gdpr_export import GDPRExportJob, GDPRExportStatus
+from src.services.gdpr_streaming_export import (
+    GDPRStreamingExporter,
+    read_export_archive,
+)
+
+CATEGORIES = ["account_information", "audit_logs"]
+
+
+class FakeKeyProvider:
+    """Issues local data keys in place of KMS."""
+
+    def generate_data_key(self, context):
+        """Return a random key and its 'wrapped' form."""
+        key = os.urandom(32)
+        return key, b"wrapped:" + context["export_id"].encode() + b":" + key
+
+    def decrypt_data_key(self, encrypted_key, context):
+        """Unwrap a key, checking it belongs to the export."""
+        prefix = b"wrapped:" + context["export_id"].encode() + b":"
+        assert encrypted_key.startswith(prefix)
+        return encrypted_key[len(prefix) :]
+
+
+def make_session_factory(tmp_path):
+    """File-backed SQLite so export threads share the data."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'export.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    tables = ("gdpr_export_jobs", "user_auth", "audit_logs")
+    BaseModel.metadata.create_all(
+        engine, tables=[BaseModel.metadata.tables[name] for name in tables]
+    )
+    return sessionmaker(bind=engine)
+
+
+def add_subject(session_factory, log_count):
+    """Insert a patient account with audit history; return the patient id."""
+    db = session_factory()
+    patient_id = uuid.uuid4()
+    db.add(
+        UserAuth(
+            patient_id=patient_id,
+            email=f"{patient_id.hex}@example.org",
+            password_hash="secret-hash",
+            role=UserRole.PATIENT,
+            created_by=uuid.uuid4(),
+        )
+    )
+    start = datetime(2020, 1, 1)
+    # Shared timestamps make the cursor rely on the id tie-breaker
+    db.add_all(
+        AuditLog(
+            action="record_accessed",
+            patient_id=patient_id,
+            ip_address="10.0.0.1",
+            details={"sequence": index},
+            created_at=start + timedelta(days=index // 3),
+        )
+        for index in range(log_count)
+    )
+    db.commit()
+    db.close()
+    return patient_id
+
+
+def read_records(job, key_provider):
+    """Decrypted (category, record) pairs of a finished export."""
+    return list(read_export_archive(job["archive_path"], key_provider))
+
+
+class TestGDPRStreamingExporter:
+    """Test paged export, packaging and resumption."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_exports_page_every_record(self, tmp_path):
+        """Test each subject's archive holds all of, and only, their data."""
+        session_factory = make_session_factory(tmp_path)
+        keys = FakeKeyProvider()
+        exporter = GDPRStreamingExporter(
+            session_factory,
+            output_dir=str(tmp_path / "exports"),
+            key_provider=keys,
+            page_size=7,
+            max_concurrent=2,
+        )
+        subjects = [add_subject(session_factory, count) for count in (20, 3, 0)]
+        jobs = [
+            exporter.create_job(subject, subject, CATEGORIES) for subject in subjects
+        ]
+
+        summaries = await exporter.run_exports([job.id for job in jobs])
+
+        assert [s["status"] for s in summaries] == ["completed"] * 3
+        assert [s["record_count"] for s in summaries] == [21, 4, 1]
+        records = read_records(summaries[0], keys)
+        logs = [r for category, r in records if category == "audit_logs"]
+        assert sorted(log["details"]["sequence"] for log in logs) == list(range(20))
+        order = [(log["created_at"], log["id"]) for log in logs]
+        assert order == sorted(order)
+        assert {log["patient_id"] for log in logs} == {str(subjects[0])}
+        [(_, account)] = [r for r in records if r[0] == "account_information"]
+        assert account["email"] == f"{subjects[0].hex}@example.org"
+        assert "password_hash" not in account
+        assert not os.path.exists(tmp_path / "exports" / f"{jobs[0].id}.parts")
+
+    @pytest.mark.asyncio
+    async def test_failed_export_resumes_after_last_page(self, tmp_path, monkeypatch):
+        """Test a retry continues from the checkpoint without duplicates."""
+        session_factory = make_session_factory(tmp_path)
+        keys = FakeKeyProvider()
+        subject = add_subject(session_factory, 20)
+        exporter = GDPRStreamingExporter(
+            session_factory,
+            output_dir=str(tmp_path / "exports"),
+            key_provider=keys,
+            page_size=5,
+        )
+        job = exporter.create_job(subject, subject, ["audit_logs"])
+
+        write_segment = exporter._write_segment
+        calls = []
+
+        def failing_write(*args):
+            calls.append(args[3])
+            if len(calls) == 3:
+                raise OSError("disk full")
+            return write_segment(*args)
+
+        monkeypatch.setattr(exporter, "_write_segment", failing_write)
+        failed = exporter.run_job(job.id)
+        assert failed["status"] == GDPRExportStatus.FAILED.value
+        assert failed["categories"]["audit_logs"]["records"] == 10
+
+        monkeypatch.setattr(exporter, "_write_segment", write_segment)
+        [done] = await exporter.resume_exports()
+
+        assert done["status"] == GDPRExportStatus.COMPLETED.value
+        sequences = [r["details"]["sequence"] for _, r in read_records(done, keys)]
+        assert sorted(sequences) == list(range(20))
+        db = session_factory()
+        assert db.get(GDPRExportJob, job.id).attempts == 2
+        assert await exporter.resume_exports() == []
+
+    @pytest.mark.asyncio
+    async def test_resume_stays_on_the_segments_storage(self, tmp_path, monkeypatch):
+        """Test a worker on other storage leaves a started export alone."""
+        session_factory = make_session_factory(tmp_path)
+        keys = FakeKeyProvider()
+        subject = add_subject(session_factory, 10)
+
+        def exporter(storage_id):
+            return GDPRStreamingExporter(
+                session_factory,
+                output_dir=str(tmp_path / storage_id),
+                key_provider=keys,
+                page_size=5,
+                storage_id=storage_id,
+            )
+
+        first, other = exporter("host-a"), exporter("host-b")
+        job = first.create_job(subject, subject, ["audit_logs"])
+        write_segment = first._write_segment
+
+        def failing_write(*args):
+            if args[3] == 1:
+                raise OSError("disk full")
+            return write_segment(*args)
+
+        monkeypatch.setattr(first, "_write_segment", failing_write)
+        assert first.run_job(job.id)["status"] == GDPRExportStatus.FAILED.value
+
+        assert await other.resume_exports() == []
+        monkeypatch.setattr(first, "_write_segment", write_segment)
+        [done] = await first.resume_exports()
+        assert done["status"] == GDPRExportStatus.COMPLETED.value
+        assert len(read_records(done, keys)) == 10
+
+    @pytest.mark.asyncio
+    async def test_failing_export_stops_after_max_attempts(self, tmp_path):
+        """Test an export that always fails is not retried forever."""
+        session_factory = make_session_factory(tmp_path)
+        subject = add_subject(session_factory, 1)
+        exporter = GDPRStreamingExporter(
+            session_factory,
+            output_dir=str(tmp_path / "exports"),
+            key_provider=FakeKeyProvider(),
+            max_attempts=2,
+        )
+        job = exporter.create_job(subject, subject, ["audit_logs"])
+
+        def broken_write(*args):
+            raise OSError("disk full")
+
+        exporter._write_segment = broken_write
+        assert len(await exporter.resume_exports()) == 1
+        [last] = await exporter.resume_exports()
+        assert last["status"] == GDPRExportStatus.FAILED.value
+        assert await exporter.resume_exports() == []
+
+        db = session_factory()
+        db.query(GDPRExportJob).update(
+            {"status": GDPRExportStatus.RUNNING.value, "lease_expires_at": None}
+        )
+        db.commit()
+        assert await exporter.resume_exports() == []
+        db.expire_all()
+        abandoned = db.get(GDPRExportJob, job.id)
+        assert abandoned.status == GDPRExportStatus.FAILED.value
+        assert abandoned.attempts == 2
+        db.close()
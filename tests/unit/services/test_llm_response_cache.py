@@ -0,0 +1,129 @@
+"""Test the tiered LLM response cache."""
+
+import os
+
+from src.services.llm_response_cache import (
+    CACHE_POLICIES,
+    CachePolicy,
+    DiskTier,
+    LLMResponseCache,
+    MemoryTier,
+    response_cache_key,
+)
+
+POLICIES = {
+    "default": CachePolicy(ttl=60),
+    "translation": CachePolicy(ttl=600, max_temperature=0.1),
+}
+
+
+class FakeCostMonitor:
+    """Records the savings credited by cache hits."""
+
+    def __init__(self):
+        """Start with no hits."""
+        self.hits = []
+
+    def record_cache_hit(self, **kwargs):
+        """Keep the hit for inspection."""
+        self.hits.append(kwargs)
+
+
+class TestResponseCacheKey:
+    """Test key canonicalization."""
+
+    def test_equivalent_prompts_share_a_key(self):
+        """Test line endings, trailing spaces and param order are ignored."""
+        key = response_cache_key(
+            "anthropic.claude-v2",
+            "Translate:\r\nTake two tablets daily.  \r\n",
+            params={"temperature": 0.0, "max_tokens": 100},
+        )
+        same = response_cache_key(
+            "anthropic.claude-v2",
+            "Translate:\nTake two tablets daily.",
+            params={"max_tokens": 100, "temperature": 0.0, "top_p": None},
+        )
+        assert key == same
+        assert key.startswith("llm:v1:")
+
+    def test_model_and_parameters_change_the_key(self):
+        """Test different models or parameters never share answers."""
+        base = response_cache_key("anthropic.claude-v2", "Hello", None, {"t": 0})
+        assert base != response_cache_key("amazon.titan-text-express-v1", "Hello")
+        assert base != response_cache_key("anthropic.claude-v2", "Hello", None, {})
+        assert base != response_cache_key("anthropic.claude-v2", "Hello", "Be brief")
+
+
+class TestLLMResponseCache:
+    """Test tiered lookups, policies and savings accounting."""
+
+    def test_disk_hit_fills_memory_and_credits_savings(self, tmp_path):
+        """Test a slower-tier hit is promoted and reported to cost monitoring."""
+        disk = DiskTier(str(tmp_path))
+        monitor = FakeCostMonitor()
+        writer = LLMResponseCache([MemoryTier(), disk], POLICIES)
+        key = response_cache_key("anthropic.claude-v2", "Consent form")
+        metadata = {
+            "model_id": "anthropic.claude-v2",
+            "latency_seconds": 2.5,
+            "input_tokens": 120,
+            "output_tokens": 300,
+        }
+        writer.set(key, "Formulario de consentimiento", metadata, "translation")
+
+        # A fresh process only has the disk tier populated
+        memory = MemoryTier()
+        reader = LLMResponseCache([memory, disk], POLICIES, cost_monitor=monitor)
+        response, hit = reader.get(key, "translation")
+
+        assert response == "Formulario de consentimiento"
+        assert hit["cache_hit"] is True
+        assert hit["cache_tier"] == "disk"
+        assert hit["latency_seconds"] < 2.5
+        assert memory.get(key)["response"] == response
+        assert reader.get(key, "translation")[1]["cache_tier"] == "memory"
+        assert reader.stats()["hits"] == {"memory": 1, "disk": 1}
+        assert monitor.hits[0]["input_tokens"] == 120
+        assert monitor.hits[0]["output_tokens"] == 300
+        assert monitor.hits[0]["use_case"] == "translation"
+        assert reader.get("llm:v1:missing") is None
+        assert reader.stats()["misses"] == 1
+
+    def test_policy_limits_cacheable_temperature(self):
+        """Test only deterministic calls for the use case are cacheable."""
+        cache = LLMResponseCache([MemoryTier()], POLICIES)
+        assert cache.is_cacheable(None, 0.0)
+        assert not cache.is_cacheable(None, 0.1)
+        assert cache.is_cacheable("translation", 0.1)
+        assert not cache.is_cacheable("translation", 0.7)
+        assert cache.policy("unknown") == POLICIES["default"]
+
+    def test_shipped_policies_cache_only_temperature_zero(self):
+        """Test no shipped use case caches sampled responses."""
+        cache = LLMResponseCache([MemoryTier()], CACHE_POLICIES)
+        for use_case in CACHE_POLICIES:
+            assert cache.is_cacheable(use_case, 0.0)
+            assert not cache.is_cacheable(use_case, 0.1)
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    """Test the disk tier stays under its size limit."""
+    disk = DiskTier(str(tmp_path), max_bytes=1500)
+    entry = {"response": "x" * 400, "metadata": {}, "expires_at": 4e9}
+    keys = [response_cache_key("m", f"prompt {i}") for i in range(3)]
+    for index, key in enumerate(keys):
+        disk.set(key, entry, 60)
+        os.utime(disk._path(key), (index, index))
+    assert disk.get(keys[0]) is not None  # Marks the oldest entry as used
+
+    disk.set(response_cache_key("m", "prompt 3"), entry, 60)
+
+    assert disk.get(keys[1]) is None
+    assert disk.get(keys[0]) is not None
+    total = sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(tmp_path)
+        for name in names
+    )
+    assert total <= 1500
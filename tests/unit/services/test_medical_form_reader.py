@@ -0,0 +1,65 @@
+"""Test the medical form reader's OCR worker lifecycle and PDF fallback."""
+
+import asyncio
+
+import pytest
+
+from src.services import medical_form_reader as form_reader_module
+from src.services.medical_form_reader import MedicalFormReader
+
+
+@pytest.fixture
+def config():
+    """Reader configuration without layout model downloads."""
+    return {
+        **form_reader_module.medical_form_reader.config,
+        "enable_layout_analysis": False,
+        "ocr_engine": "tesseract",
+        "ocr_workers": 1,
+    }
+
+
+class TestOcrPoolLifecycle:
+    """Test the Tesseract process pool is shut down."""
+
+    def test_context_manager_shuts_down_pool(self, config):
+        """Test leaving the context stops the worker processes."""
+        with MedicalFormReader(config) as reader:
+            pool = reader._get_ocr_pool()
+            assert reader._get_ocr_pool() is pool
+        assert reader._ocr_pool is None
+        with pytest.raises(RuntimeError):
+            pool.submit(print)
+
+    def test_async_context_manager_shuts_down_pool(self, config):
+        """Test leaving the async context stops the worker processes."""
+
+        async def use_reader():
+            async with MedicalFormReader(config) as reader:
+                pool = reader._get_ocr_pool()
+            return reader, pool
+
+        reader, pool = asyncio.run(use_reader())
+        assert reader._ocr_pool is None
+        with pytest.raises(RuntimeError):
+            pool.submit(print)
+
+    def test_close_without_pool_is_noop(self, config):
+        """Test closing a reader that never ran Tesseract."""
+        reader = MedicalFormReader(config)
+        reader.close()
+        reader.close()
+        assert reader._ocr_pool is None
+
+
+class TestPdfWithoutPdf2image:
+    """Test PDFs fail cleanly when pdf2image is missing."""
+
+    def test_extraction_reports_missing_dependency(self, config, monkeypatch):
+        """Test a PDF yields an error result instead of a TypeError."""
+        monkeypatch.setattr(form_reader_module, "PDF2IMAGE_AVAILABLE", False)
+        with MedicalFormReader(config) as reader:
+            result = asyncio.run(reader.extract_data(b"%PDF-1.4\n%%EOF\n"))
+
+        assert result.extracted_fields == {}
+        assert result.metadata["error"] == "pdf2image is not installed"
@@ -0,0 +1,53 @@
+"""Test the in-process near cache used in front of Redis."""
+
+import time
+
+from src.services.near_cache import MISSING, NearCache
+
+
+class TestNearCache:
+    """Test LRU bounds, TTL expiry and invalidation."""
+
+    def test_get_set_and_cached_none(self):
+        """Test stored values, including None, are returned."""
+        cache = NearCache(max_entries=10, ttl=60)
+        cache.set("a", {"x": 1})
+        cache.set("b", None)
+        assert cache.get("a") == {"x": 1}
+        assert cache.get("b") is None
+        assert cache.get("c") is MISSING
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = NearCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        cache = NearCache(max_entries=10, ttl=0.05)
+        cache.set("a", 1)
+        time.sleep(0.06)
+        assert cache.get("a") is MISSING
+
+    def test_invalidate_keys_and_pattern(self):
+        """Test key and glob invalidation."""
+        cache = NearCache(max_entries=10, ttl=60)
+        for key in ("role_permissions:admin", "role_permissions:nurse", "other"):
+            cache.set(key, key)
+        assert cache.invalidate(["other", "missing"]) == 1
+        assert cache.invalidate_pattern("role_permissions:*") == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_fill_racing_invalidation_is_dropped(self):
+        """Test a read-through fill started before an invalidation is skipped."""
+        cache = NearCache(max_entries=10, ttl=60)
+        generation = cache.generation
+        cache.invalidate(["a"])
+        assert not cache.set("a", "stale", generation=generation)
+        assert cache.get("a") is MISSING
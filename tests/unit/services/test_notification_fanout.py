@@ -0,0 +1,259 @@
+"""Test the mass-notification fan-out engine and SMS rate shaping."""
+
+import asyncio
+import json
+import uuid
+from collections import Counter
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.models.auth import UserAuth, UserRole
+from src.models.base import BaseModel
+from src.models.notification import (
+    Notification,
+    NotificationCampaign,
+    NotificationCampaignStatus,
+)
+from src.services.notification_fanout import (
+    SMS_WINDOW,
+    NotificationFanout,
+    interleave_by_country,
+)
+from src.services.notification_rate_shaping import (
+    SMSRateShaper,
+    TokenBucket,
+    sms_country,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+class Crash(BaseException):
+    """Simulates the worker process dying."""
+
+
+class FakeEmailChannel:
+    """Records batches instead of emailing."""
+
+    def __init__(self):
+        """Start with no batches."""
+        self.batches = []
+
+    async def send_batch(self, recipients, subject, body):
+        """Accept every email."""
+        self.batches.append([r["email"] for r in recipients])
+        return [True] * len(recipients)
+
+
+class FakeSMSChannel:
+    """Records texts instead of sending; optionally dies after some sends."""
+
+    def __init__(self, crash_after=None):
+        """Start with no texts."""
+        self.sent = []
+        self.crash_after = crash_after
+
+    @staticmethod
+    def format_message(title, message):
+        """Combine title and message."""
+        return f"{title}: {message}"
+
+    async def send_to_number(self, phone_number, message):
+        """Record the text."""
+        if self.crash_after is not None and len(self.sent) >= self.crash_after:
+            raise Crash()
+        self.sent.append(phone_number)
+        return True
+
+
+def make_db():
+    """SQLite session with the notification and user tables."""
+    engine = create_engine("sqlite://")
+    tables = (
+        "user_auth",
+        "notifications",
+        "notification_campaigns",
+        "notification_campaign_recipients",
+        "notification_campaign_progress",
+    )
+    BaseModel.metadata.create_all(
+        engine, tables=[BaseModel.metadata.tables[name] for name in tables]
+    )
+    return sessionmaker(bind=engine)()
+
+
+def add_users(db, count):
+    """Insert active users with an email and a phone number."""
+    users = [
+        UserAuth(
+            patient_id=uuid.uuid4(),
+            email=f"user{index}@example.org",
+            phone_number=f"+25470000{index:04d}",
+            password_hash="-",
+            role=UserRole.PATIENT,
+            created_by=uuid.uuid4(),
+        )
+        for index in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return [user.id for user in users]
+
+
+def make_fanout(db, sms_channel=None, **kwargs):
+    """Fan-out engine with fake channels and no email pacing."""
+    fanout = NotificationFanout(
+        db,
+        email_channel=FakeEmailChannel(),
+        sms_channel=sms_channel or FakeSMSChannel(),
+        **kwargs,
+    )
+    fanout.email_bucket = TokenBucket(1e9)
+    return fanout
+
+
+class TestRateShaping:
+    """Test token buckets and per-country SMS limits."""
+
+    def test_token_bucket_paces_after_burst(self):
+        """Test a burst is free and later tokens wait their turn."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, clock=clock)
+
+        assert [bucket.reserve() for _ in range(10)] == [0.0] * 10
+        assert bucket.reserve() == pytest.approx(0.1)
+        assert bucket.reserve() == pytest.approx(0.2)
+        clock.now = 1.0
+        assert bucket.reserve() == pytest.approx(0.0)
+
+    def test_country_limits(self):
+        """Test only configured countries get their own bucket."""
+        shaper = SMSRateShaper(20, country_rates={"KE": 2})
+
+        assert sms_country("+254700000001") == "KE"
+        assert sms_country("555-0100") == "US"
+        assert shaper.country_bucket("KE").rate == 2
+        assert shaper.country_bucket("UG") is None
+        assert interleave_by_country(
+            ["+254700000001", "+254700000002", "+256700000001"]
+        ) == ["+254700000001", "+256700000001", "+254700000002"]
+
+
+class TestNotificationFanout:
+    """Test campaign delivery and crash recovery."""
+
+    @pytest.mark.asyncio
+    async def test_campaign_delivers_every_channel(self):
+        """Test in-app rows, email batches and texts for each recipient."""
+        db = make_db()
+        user_ids = add_users(db, 120)
+        unknown_user = uuid.uuid4()
+        fanout = make_fanout(db)
+
+        campaign = fanout.create_campaign(
+            user_ids + [unknown_user, user_ids[0]],
+            "outbreak_alert",
+            "Cholera alert",
+            "Boil drinking water.",
+            channels=["in_app", "email", "sms"],
+        )
+        summary = await fanout.run_campaign(campaign.id)
+
+        assert summary["status"] == NotificationCampaignStatus.COMPLETED.value
+        assert summary["total"] == 121
+        assert summary["channels"]["in_app"]["sent"] == 121
+        assert summary["channels"]["email"]["skipped"] == 1
+        assert summary["channels"]["sms"]["sent"] == 120
+        assert db.query(Notification).count() == 121
+        assert max(len(b) for b in fanout.email_channel.batches) <= 50
+        assert len(set(fanout.sms_channel.sent)) == 120
+
+    @pytest.mark.asyncio
+    async def test_crashed_campaign_resumes_from_checkpoint(self):
+        """Test another worker finishes a campaign without redoing windows."""
+        db = make_db()
+        user_ids = add_users(db, 250)
+        crashing = FakeSMSChannel(crash_after=150)
+        first = make_fanout(db, crashing, worker_id="a", lease_seconds=0)
+        campaign = first.create_campaign(
+            user_ids, "outbreak_alert", "Alert", "Go to clinic.", channels=["sms"]
+        )
+
+        with pytest.raises(Crash):
+            await first.run_campaign(campaign.id)
+        progress = first.get_campaign_progress(campaign.id)
+        assert progress["status"] == NotificationCampaignStatus.RUNNING.value
+        assert progress["channels"]["sms"]["sent"] == SMS_WINDOW
+
+        second = make_fanout(db, worker_id="b")
+        [summary] = await second.resume_campaigns()
+
+        assert summary["status"] == NotificationCampaignStatus.COMPLETED.value
+        assert summary["channels"]["sms"]["sent"] == 250
+        resent = second.sms_channel.sent
+        assert len(resent) == 250 - SMS_WINDOW
+        delivered = Counter(crashing.sent + resent)
+        assert len(delivered) == 250
+        assert max(delivered.values()) == 2
+        assert await second.resume_campaigns() == []
+
+    @pytest.mark.asyncio
+    async def test_recipients_only_get_their_chosen_channels(self):
+        """Test notification preferences narrow each recipient's channels."""
+        db = make_db()
+        sms_only, in_app_only, default = user_ids = add_users(db, 3)
+        preferences = {sms_only: ["sms"], in_app_only: ["in_app", "push"]}
+        for user in db.query(UserAuth):
+            if user.id in preferences:
+                user.notification_preferences = json.dumps(
+                    {"channels": preferences[user.id]}
+                )
+        db.commit()
+        fanout = make_fanout(db)
+
+        campaign = fanout.create_campaign(
+            user_ids,
+            "clinic_closure",
+            "Closed",
+            "Clinic closed today.",
+            channels=["in_app", "email", "sms"],
+        )
+        summary = await fanout.run_campaign(campaign.id)
+
+        assert {n.user_id for n in db.query(Notification)} == {in_app_only, default}
+        assert fanout.email_channel.batches == [["user2@example.org"]]
+        assert sorted(fanout.sms_channel.sent) == ["+254700000000", "+254700000002"]
+        assert summary["channels"]["sms"]["skipped"] == 1
+        assert summary["channels"]["email"]["skipped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_lease_is_renewed_within_a_window(self):
+        """Test a slow window keeps the lease until the campaign stops."""
+        db = make_db()
+        user_ids = add_users(db, 1)
+        fanout = make_fanout(db, worker_id="a", lease_seconds=3)
+        campaign = fanout.create_campaign(
+            user_ids, "outbreak_alert", "Alert", "Go to clinic.", channels=["sms"]
+        )
+        assert fanout._claim(campaign.id)
+        claimed = db.get(NotificationCampaign, campaign.id).lease_expires_at
+
+        heartbeat = asyncio.ensure_future(fanout._heartbeat(campaign.id))
+        await asyncio.sleep(1.2)
+        db.expire_all()
+        assert db.get(NotificationCampaign, campaign.id).lease_expires_at > claimed
+
+        fanout.cancel_campaign(campaign.id)
+        await asyncio.wait_for(heartbeat, timeout=2)
@@ -0,0 +1,138 @@
+"""Test request-scoped query profiling and N+1 detection."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from src.middleware.query_profiling import QueryProfilingMiddleware
+from src.services.query_monitoring import (
+    QueryMonitoringService,
+    fingerprint_statement,
+    profile_request,
+    query_scope,
+    statement_pattern,
+)
+
+
+def make_engine(monitor: QueryMonitoringService):
+    """SQLite engine with a small table, monitored by `monitor`."""
+    # One shared connection, so the endpoint's worker thread sees the table
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE records (id INTEGER, patient_id INTEGER)"))
+        for i in range(30):
+            conn.execute(
+                text("INSERT INTO records VALUES (:id, :patient)"),
+                {"id": i, "patient": i % 3},
+            )
+    monitor.start_monitoring(engine)
+    return engine
+
+
+def load_records_one_by_one(engine, count: int) -> None:
+    """Issue one SELECT per record, the classic N+1 shape."""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT id FROM records")).fetchall()
+        for i in range(count):
+            conn.execute(
+                text("SELECT patient_id FROM records WHERE id = :id"), {"id": i}
+            ).fetchall()
+
+
+class TestStatementFingerprints:
+    """Test statement normalization."""
+
+    def test_values_and_in_lists_collapse(self):
+        """Test statements differing only in values share a fingerprint."""
+        assert fingerprint_statement(
+            "SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)"
+        ) == fingerprint_statement("SELECT * FROM t WHERE id IN (%(id_1_1)s)")
+        assert fingerprint_statement(
+            "SELECT * FROM t WHERE name = 'a'  AND n = 5"
+        ) == fingerprint_statement("SELECT * FROM t WHERE name = 'b' AND n = 7")
+
+    def test_long_statements_keep_distinct_fingerprints(self):
+        """Test statements differing past the display length stay apart."""
+        columns = ", ".join(f"column_{name}" for name in "abcdefghijklmnopqrstuvwxyz")
+        first = f"SELECT {columns} FROM t WHERE a = :a"
+        second = f"SELECT {columns} FROM t WHERE b = :b"
+
+        assert fingerprint_statement(first) != fingerprint_statement(second)
+        assert statement_pattern(first) == statement_pattern(second)
+        assert statement_pattern(first).endswith("...")
+
+
+class TestRequestProfiling:
+    """Test statements grouped by request."""
+
+    def test_repeated_select_is_flagged(self):
+        """Test an N+1 loop is reported with its scope."""
+        monitor = QueryMonitoringService(n_plus_one_threshold=10)
+        engine = make_engine(monitor)
+
+        with profile_request("GET /records", user_id="u1", monitor=monitor) as profile:
+            with query_scope("Query.records"):
+                load_records_one_by_one(engine, 15)
+
+        assert profile.query_count == 16
+        assert monitor.queries[-1].endpoint == "GET /records"
+        assert monitor.queries[-1].user_id == "u1"
+
+        report = monitor.get_endpoint_report()
+        assert report[0]["endpoint"] == "GET /records"
+        assert report[0]["n_plus_one_requests"] == 1
+        finding = report[0]["n_plus_one"][0]
+        assert finding["scope"] == "Query.records"
+        assert finding["max_repeats"] == 15
+        assert "WHERE id = ?" in finding["pattern"]
+
+    def test_below_threshold_not_flagged(self):
+        """Test a handful of repeats is not reported."""
+        monitor = QueryMonitoringService(n_plus_one_threshold=10)
+        engine = make_engine(monitor)
+        with profile_request("GET /records", monitor=monitor):
+            load_records_one_by_one(engine, 5)
+        assert monitor.get_endpoint_report()[0]["n_plus_one"] == []
+
+    def test_unsampled_requests_skip_profiling(self):
+        """Test sampling mode records nothing per statement."""
+        monitor = QueryMonitoringService(request_sample_rate=0.0)
+        engine = make_engine(monitor)
+        stored = len(monitor.queries)
+        with profile_request("GET /records", monitor=monitor) as profile:
+            load_records_one_by_one(engine, 15)
+
+        assert not profile.sampled
+        assert profile.query_count == 0
+        assert len(monitor.queries) == stored
+        assert monitor.get_endpoint_report() == []
+
+
+class TestQueryProfilingMiddleware:
+    """Test HTTP requests are profiled per route."""
+
+    def test_requests_grouped_by_route_template(self):
+        """Test different IDs on one route share a report."""
+        monitor = QueryMonitoringService(n_plus_one_threshold=10)
+        engine = make_engine(monitor)
+        app = FastAPI()
+        app.add_middleware(QueryProfilingMiddleware, monitor=monitor)
+
+        @app.get("/patients/{patient_id}/records")
+        def list_records(patient_id: int):
+            load_records_one_by_one(engine, 12)
+            return {"patient": patient_id}
+
+        client = TestClient(app)
+        for patient_id in (1, 2):
+            assert client.get(f"/patients/{patient_id}/records").status_code == 200
+
+        report = monitor.get_endpoint_report()
+        assert [r["endpoint"] for r in report] == ["GET /patients/{patient_id}/records"]
+        assert report[0]["requests"] == 2
+        assert report[0]["n_plus_one"][0]["requests"] == 2
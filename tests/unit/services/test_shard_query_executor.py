@@ -0,0 +1,138 @@
+"""Test cross-shard scatter-gather execution.
+
+Uses real in-memory SQLite shards - no mocks.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, text
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.services.shard_query_executor import CrossShardQueryExecutor
+
+ShardBase = declarative_base()
+
+
+class ShardRecord(ShardBase):
+    """Minimal sharded table."""
+
+    __tablename__ = "shard_records"
+
+    id = Column(Integer, primary_key=True)
+    score = Column(Integer)
+    camp = Column(String(20))
+
+
+class TestCrossShardQueryExecutor:
+    """Test ordered merge, partial aggregates and failure reporting."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create three populated shards and an executor over them."""
+        factories = {}
+        for shard_index, shard_id in enumerate(["shard_a", "shard_b", "shard_c"]):
+            engine = create_engine(
+                "sqlite://",
+                connect_args={"check_same_thread": False},
+                poolclass=StaticPool,
+            )
+            ShardBase.metadata.create_all(engine)
+            factories[shard_id] = sessionmaker(bind=engine)
+            session = factories[shard_id]()
+            session.add_all(
+                ShardRecord(
+                    id=shard_index * 100 + i,
+                    score=None if i == 3 else (i * 7 + shard_index) % 11,
+                    camp="north" if i % 2 else "south",
+                )
+                for i in range(10)
+            )
+            session.commit()
+            session.close()
+
+        executor = CrossShardQueryExecutor(lambda shard_id: factories[shard_id]())
+        executor.shard_ids = list(factories)
+        yield executor
+        executor.shutdown()
+
+    def test_ordered_limit_matches_global_sort(self, executor):
+        """Test pushed-down ORDER BY/LIMIT merges to the global top rows."""
+        result = executor.query(
+            executor.shard_ids,
+            ShardRecord,
+            order_by=[("score", True), "id"],
+            limit=7,
+        )
+
+        everything = executor.query(executor.shard_ids, ShardRecord).rows
+        expected = sorted(
+            (row for row in everything if row.score is not None),
+            key=lambda row: (-row.score, row.id),
+        )[:7]
+        assert [row.id for row in result.rows] == [row.id for row in expected]
+        assert not result.partial
+
+    def test_nulls_sort_last(self, executor):
+        """Test NULL sort values come after all non-NULL values."""
+        rows = executor.query(executor.shard_ids, ShardRecord, order_by=["score"]).rows
+        assert [row.score for row in rows[-3:]] == [None, None, None]
+
+    def test_aggregates_combine_across_shards(self, executor):
+        """Test count/avg/max combine exactly, with and without grouping."""
+        total = executor.aggregate(
+            executor.shard_ids, ShardRecord, {"records": ("count", None)}
+        )
+        assert total.values == {"records": 30}
+
+        grouped = executor.aggregate(
+            executor.shard_ids,
+            ShardRecord,
+            {"records": ("count", None), "mean": ("avg", "score")},
+            group_by=["camp"],
+        )
+        by_camp = {row["camp"]: row for row in grouped.rows}
+        assert by_camp["north"]["records"] == 15
+        assert by_camp["north"]["mean"] == pytest.approx(6.5)
+
+    def test_failed_shard_reported(self, executor):
+        """Test a failing shard is reported while others still return."""
+
+        def task(session, shard_id):
+            if shard_id == "shard_b":
+                raise ValueError("shard unavailable")
+            return session.query(ShardRecord).count()
+
+        results, outcome = executor.scatter(executor.shard_ids, task)
+        assert results == {"shard_a": 10, "shard_c": 10}
+        assert outcome.partial
+        assert outcome.failed == {"shard_b": "shard unavailable"}
+
+    def test_unsupported_aggregate_rejected(self, executor):
+        """Test unknown aggregate functions raise ValueError."""
+        with pytest.raises(ValueError):
+            executor.aggregate(
+                executor.shard_ids, ShardRecord, {"x": ("median", "score")}
+            )
+
+    def test_timed_out_query_is_interrupted(self, executor):
+        """Test a running shard query is aborted at the deadline."""
+        slow_sql = text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+            "SELECT count(*) FROM n"
+        )
+
+        def task(session, shard_id):
+            if shard_id == "shard_b":
+                return session.execute(slow_sql).scalar()
+            return session.query(ShardRecord).count()
+
+        started = time.monotonic()
+        results, outcome = executor.scatter(executor.shard_ids, task, timeout=0.3)
+        assert outcome.timed_out == ["shard_b"]
+        assert results == {"shard_a": 10, "shard_c": 10}
+
+        # The interrupted worker frees up instead of running forever
+        executor.shutdown()
+        assert time.monotonic() - started < 10
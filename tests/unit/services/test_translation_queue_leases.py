@@ -0,0 +1,95 @@
+"""Test lease-based claiming of translation queue entries."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.models.base import BaseModel
+from src.models.translation_queue import (
+    TranslationQueue,
+    TranslationQueueAssignment,
+    TranslationQueuePriority,
+    TranslationQueueStatus,
+)
+from src.services.translation_queue_service import TranslationQueueService
+from tests.performance.translation_queue_benchmark import (
+    run_claim_benchmark,
+    seed_queue,
+)
+
+
+def make_session_factory(url="sqlite://"):
+    """Session factory with the translation queue tables."""
+    engine = create_engine(url, connect_args={"timeout": 30})
+    tables = ("translation_queue", "translation_queue_assignment")
+    BaseModel.metadata.create_all(
+        engine, tables=[BaseModel.metadata.tables[name] for name in tables]
+    )
+    return sessionmaker(bind=engine)
+
+
+class TestClaimTranslations:
+    """Test claims, heartbeats and lease expiry."""
+
+    def test_claims_follow_priority_and_never_overlap(self):
+        """Test critical work is claimed first and entries go to one claimer."""
+        session = make_session_factory()()
+        seed_queue(session, 8)
+        service = TranslationQueueService(session)
+        first, second = uuid.uuid4(), uuid.uuid4()
+
+        claimed = service.claim_translations(first, limit=3)
+        assert [entry.priority for entry in claimed] == [
+            TranslationQueuePriority.CRITICAL,
+            TranslationQueuePriority.CRITICAL,
+            TranslationQueuePriority.HIGH,
+        ]
+        assert all(entry.translator_id == first for entry in claimed)
+        assert all(entry.lease_expires_at for entry in claimed)
+
+        rest = service.claim_translations(second, limit=10)
+        assert len(rest) == 5
+        assert not {e.id for e in claimed} & {e.id for e in rest}
+        assert service.claim_translations(second) == []
+        assert session.query(TranslationQueueAssignment).count() == 8
+
+    def test_expired_leases_are_requeued(self):
+        """Test a silent claimer loses its entry; a live one keeps it."""
+        session = make_session_factory()()
+        seed_queue(session, 2)
+        service = TranslationQueueService(session)
+        stalled, alive = uuid.uuid4(), uuid.uuid4()
+
+        lost = service.claim_translations(stalled)[0]
+        kept = service.claim_translations(alive)[0]
+        lost.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        session.commit()
+        assert service.renew_lease(kept.id, alive) > datetime.utcnow()
+
+        assert service.requeue_expired_leases() == 1
+        session.expire_all()
+        assert lost.status == TranslationQueueStatus.PENDING
+        assert lost.translator_id is None
+        assert kept.status == TranslationQueueStatus.IN_PROGRESS
+
+        with pytest.raises(ValueError):
+            service.renew_lease(lost.id, stalled)
+        assert [e.id for e in service.claim_translations(alive)] == [lost.id]
+
+
+class TestClaimBenchmark:
+    """Test the concurrent claim benchmark."""
+
+    def test_concurrent_claimers_drain_queue_once(self, tmp_path):
+        """Test every entry is claimed exactly once under contention."""
+        factory = make_session_factory(f"sqlite:///{tmp_path / 'queue.db'}")
+        results = run_claim_benchmark(factory, claimers=8, entries=120, batch_size=4)
+
+        assert results["errors"] == []
+        assert results["claimed"] == 120
+        assert results["unclaimed"] == 0
+        assert results["duplicate_claims"] == 0
+        assert factory().query(TranslationQueue).count() == 0
@@ -11,6 +11,7 @@ These tests follow production requirements:
 
 import asyncio
 import os
+import re
 import uuid
 from typing import Any, Optional
 
@@ -785,3 +786,69 @@ class TestTranslationService:
         assert isinstance(conversation_results, dict)
         assert "messages" in conversation_results
         assert len(conversation_results["messages"]) == len(messages)
+
+
+class CountingTranslationService(TranslationService):
+    """Translation service whose model echoes segments and counts requests."""
+
+    def __init__(self, session, split_segments=True):
+        """Answer batched prompts segment by segment unless told not to."""
+        super().__init__(session)
+        self.prompts = []
+        self.split_segments = split_segments
+
+    def _call_bedrock_api(self, prompt):
+        """Return one translation per numbered segment in the prompt."""
+        self.prompts.append(prompt)
+        segments = re.findall(r"^\[\[SEGMENT (\d+)\]\]\n(.*)$", prompt, re.MULTILINE)
+        if not segments or not self.split_segments:
+            return "Traduction", 0.95
+        return (
+            "\n".join(f"[[SEGMENT {n}]]\nFR {text}" for n, text in segments),
+            0.95,
+        )
+
+
+class TestTranslateBatchRequests:
+    """Test batch translation sends several texts per model request."""
+
+    TEXTS = [f"Return to clinic in {days} days" for days in range(2, 8)]
+
+    @pytest.fixture
+    def session(self, tmp_path):
+        """Session on a fresh database."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'translation'}.db")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+
+    def test_distinct_texts_share_one_request(self, session):
+        """Test N texts need fewer than N model requests."""
+        service = CountingTranslationService(session)
+        texts = self.TEXTS + self.TEXTS[:2]
+
+        results = service.translate_batch(
+            texts=texts,
+            target_language=TranslationDirection.FRENCH,
+            source_language=TranslationDirection.ENGLISH,
+        )
+
+        assert len(service.prompts) == 1
+        assert len(service.prompts) < len(self.TEXTS)
+        assert [r["translated_text"] for r in results] == [
+            f"FR {text}" for text in texts
+        ]
+
+    def test_unsplittable_response_falls_back_per_text(self, session):
+        """Test a response missing segment markers is retried text by text."""
+        service = CountingTranslationService(session, split_segments=False)
+
+        results = service.translate_batch(
+            texts=self.TEXTS,
+            target_language=TranslationDirection.FRENCH,
+            source_language=TranslationDirection.ENGLISH,
+        )
+
+        assert len(service.prompts) == 1 + len(self.TEXTS)
+        assert all(r["translated_text"] == "Traduction" for r in results)
@@ -0,0 +1,189 @@
+"""Tests for patient search key normalization.
+
+These tests verify that name spellings across scripts, UNHCR numbers and
+phone numbers reduce to the same index keys used by patient search.
+"""
+
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import Column, Date, Integer, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from src.utils.pagination import (
+    InvalidCursorError,
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    keyset_cursor,
+)
+from src.utils.search_keys import (
+    KEY_EMAIL,
+    KEY_NAME,
+    KEY_PHONE,
+    KEY_UNHCR,
+    build_search_keys,
+    classify_query,
+    name_tokens,
+    normalize_phone,
+    normalize_unhcr_number,
+    phonetic_key,
+)
+
+
+class TestPhoneticKey:
+    """Test transliteration-aware phonetic keys."""
+
+    @pytest.mark.parametrize(
+        "spellings",
+        [
+            ["Mohammed", "Muhammad", "Mohamed", "محمد"],
+            ["Ahmed", "Ahmad", "أحمد"],
+            ["Yusuf", "Youssef"],
+            ["Fatima", "Fatma", "فاطمة"],
+            ["Qasim", "Kasim"],
+        ],
+    )
+    def test_spelling_variants_share_key(self, spellings):
+        """Test common spelling variants collapse to one key."""
+        keys = {phonetic_key(spelling) for spelling in spellings}
+        assert len(keys) == 1
+        assert keys.pop()
+
+    def test_distinct_names_differ(self):
+        """Test unrelated names keep distinct keys."""
+        assert phonetic_key("Amina") != phonetic_key("Ibrahim")
+
+    def test_empty_input(self):
+        """Test tokens without letters produce no key."""
+        assert phonetic_key("") == ""
+        assert phonetic_key("123") == ""
+
+    def test_name_tokens_fold_diacritics(self):
+        """Test tokens are lowercased ASCII without diacritics."""
+        assert name_tokens("José  Núñez-García") == ["jose", "nunez", "garcia"]
+
+
+class TestIdentifierNormalization:
+    """Test UNHCR number and phone normalization."""
+
+    def test_unhcr_number_separators_ignored(self):
+        """Test separators and the UNHCR prefix are stripped."""
+        assert normalize_unhcr_number("UNHCR-123-456") == "123456"
+        assert normalize_unhcr_number("abc 12/345") == "ABC12345"
+
+    def test_phone_international_and_local(self):
+        """Test international numbers yield E.164 and a national number."""
+        e164, national = normalize_phone("+254 712 345 678")
+        assert e164 == "+254712345678"
+        assert national == "712345678"
+
+        _, local_national = normalize_phone("0712 345 678")
+        assert local_national == "712345678"
+
+    def test_build_search_keys(self):
+        """Test keys cover names, identifiers and contacts without duplicates."""
+        keys = build_search_keys(
+            given_name="Amina",
+            family_name="Hassan",
+            names_in_languages={"ar": {"given": "أمينة", "family": "حسن"}},
+            unhcr_number="UNHCR-123-45678",
+            phone_numbers=["+254712345678", None],
+            email=" Amina@Example.org ",
+        )
+
+        assert (KEY_NAME, "amina") in keys
+        assert (KEY_UNHCR, "12345678") in keys
+        assert (KEY_PHONE, "+254712345678") in keys
+        assert (KEY_EMAIL, "amina@example.org") in keys
+        assert len(keys) == len(set(keys))
+
+    @pytest.mark.parametrize(
+        "query,expected",
+        [
+            ("0712 345 678", KEY_PHONE),
+            ("+254712345678", KEY_PHONE),
+            ("ABC-12345", KEY_UNHCR),
+            ("amina hassan", KEY_NAME),
+            ("amina@example.org", KEY_EMAIL),
+        ],
+    )
+    def test_classify_query(self, query, expected):
+        """Test free-text queries are routed to the right key type."""
+        assert classify_query(query) == expected
+
+
+class TestKeysetCursor:
+    """Test keyset pagination cursors."""
+
+    def test_cursor_round_trip(self):
+        """Test typed values survive encoding."""
+        values = ["Hassan", date(1990, 1, 2), uuid.uuid4(), None, 7]
+        assert decode_cursor(encode_cursor(values)) == values
+
+    def test_invalid_cursor_rejected(self):
+        """Test malformed cursors raise InvalidCursorError."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor")
+
+    def test_cursor_must_match_columns(self):
+        """Test a cursor for other sort columns is rejected."""
+        cursor = encode_cursor([1])
+        with pytest.raises(InvalidCursorError):
+            apply_keyset(
+                None, [_Person.date_of_birth, _Person.id], cursor  # type: ignore
+            )
+
+
+_Base = declarative_base()
+
+
+class _Person(_Base):  # type: ignore[misc, valid-type]
+    """Minimal table with a nullable sort key."""
+
+    __tablename__ = "keyset_person"
+
+    id = Column(Integer, primary_key=True)
+    date_of_birth = Column(Date, nullable=True)
+
+
+class TestKeysetNullableColumns:
+    """Test keyset pages over a nullable sort column."""
+
+    @pytest.fixture
+    def session(self):
+        """Session over people where some birth dates are unknown."""
+        engine = create_engine("sqlite://")
+        _Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            births = [date(1990, 1, 1), None, date(1985, 5, 5), None, date(1990, 1, 1)]
+            births += [date(2001, 3, 3), None]
+            session.add_all(
+                _Person(id=index + 1, date_of_birth=born)
+                for index, born in enumerate(births)
+            )
+            session.commit()
+            yield session
+
+    @staticmethod
+    def _page_through(session, descending):
+        """Collect ids page by page, two rows at a time."""
+        seen, cursor = [], None
+        columns = [_Person.date_of_birth, _Person.id]
+        while True:
+            query = apply_keyset(
+                session.query(_Person), columns, cursor, descending=descending
+            )
+            rows = query.limit(3).all()
+            seen.extend(row.id for row in rows[:2])
+            if len(rows) <= 2:
+                return seen
+            cursor = keyset_cursor(rows[1], ["date_of_birth", "id"])
+
+    @pytest.mark.parametrize("descending", [False, True])
+    def test_null_rows_are_paged(self, session, descending):
+        """Test rows with NULL keys are returned once, after the others."""
+        seen = self._page_through(session, descending)
+        assert sorted(seen) == list(range(1, 8))
+        assert seen[-3:] == ([7, 4, 2] if descending else [2, 4, 7])